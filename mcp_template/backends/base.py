@@ -140,6 +140,20 @@ class BaseDeploymentBackend(ABC):
         """
         pass
 
+    def select_endpoint(self, deployment_id: str) -> Optional[str]:
+        """
+        Pick the endpoint the next request to a deployment should go to.
+
+        Backends able to route to individual replicas override this.
+
+        Args:
+            deployment_id: Name or ID of the deployment
+
+        Returns:
+            Endpoint URL, or None to use the deployment's own endpoint
+        """
+        return None
+
     def set_config(self, config: Dict[str, Any]) -> None:
         """SSet backend config.
 
@@ -19,6 +19,7 @@ from rich.panel import Panel
 from mcp_template.backends import BaseDeploymentBackend
 from mcp_template.template.utils.discovery import TemplateDiscovery
 from mcp_template.utils import SubProcessRunDummyResult
+from mcp_template.utils.image_utils import TOOLS_LABEL, build_tools_label
 
 logger = logging.getLogger(__name__)
 console = Console()
@@ -346,7 +347,13 @@ class DockerDeploymentService(BaseDeploymentBackend):
         return volumes
 
     def _prepare_port_mappings(self, template_data: Dict[str, Any]) -> List[str]:
-        """Prepare port mappings for container deployment, using a free port if needed."""
+        """
+        Prepare port mappings for container deployment, using a free port if needed.
+
+        A host port that is already taken is published as port 0, so Docker
+        picks a free port when the container starts instead of racing other
+        deployments for one chosen here.
+        """
         ports = []
         template_ports = template_data.get("ports", {})
         for host_port, container_port in template_ports.items():
@@ -358,14 +365,11 @@ class DockerDeploymentService(BaseDeploymentBackend):
                     s.bind(("", port_to_use))
                     s.listen(1)
                 except OSError:
-                    # Port is in use, find a free port
-                    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as free_sock:
-                        free_sock.bind(("", 0))
-                        port_to_use = free_sock.getsockname()[1]
+                    # Port is in use, let Docker assign a free port atomically
+                    port_to_use = 0
                     logger.warning(
-                        "Port %s is in use, remapping to free port %s for container port %s",
+                        "Port %s is in use, remapping container port %s to a free port",
                         host_port,
-                        port_to_use,
                         container_port,
                     )
             ports.extend(["-p", f"{port_to_use}:{container_port}"])
@@ -1004,7 +1008,12 @@ EOF""",
         )
 
         # Build the Docker image
-        build_command = [BACKEND_TYPE, "build", "-t", image_name, str(template_dir)]
+        build_command = [BACKEND_TYPE, "build", "-t", image_name]
+        if template_data.get("tools"):
+            # Declare the tools so discovery can read them without a container
+            tools_label = build_tools_label(template_data["tools"])
+            build_command.extend(["--label", f"{TOOLS_LABEL}={tools_label}"])
+        build_command.append(str(template_dir))
         self._run_command(build_command)
 
     def connect_to_deployment(self, deployment_id: str):
@@ -2,22 +2,86 @@
 Kubernetes deployment backend for managing deployments on Kubernetes clusters.
 """
 
+import hashlib
+import itertools
+import json
 import logging
+import threading
 import time
 import uuid
 from contextlib import suppress
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
-from kubernetes import client, config
+from cachetools import LRUCache
+from kubernetes import client, config, watch
 from kubernetes.client.rest import ApiException
 
 from mcp_template.backends import BaseDeploymentBackend
+from mcp_template.backends.kubernetes_stdio import (
+    StdioPodSpec,
+    StdioSessionError,
+    get_stdio_pool,
+)
 from mcp_template.utils.image_utils import normalize_image_name
 
 logger = logging.getLogger(__name__)
 
+MANAGED_BY_SELECTOR = "app.kubernetes.io/managed-by=mcp-templates"
+INSTANCE_LABEL = "app.kubernetes.io/instance"
+
+# Annotation recording the hash of the rendered manifest an object was
+# applied from, so changes to the desired state are found without a spec diff
+MANIFEST_HASH_ANNOTATION = "mcp-template.io/manifest-hash"
+
+# Server-side apply identifies our changes by field manager
+FIELD_MANAGER = "mcp-templates"
+APPLY_PATCH_CONTENT_TYPE = "application/apply-patch+yaml"
+
+# How long ready pod endpoints of a service are reused before re-listing
+ENDPOINT_CACHE_TTL_SECONDS = 5
+
+# Number of rendered manifest sets kept in memory
+RENDER_CACHE_SIZE = 256
+
+_render_cache: LRUCache = LRUCache(maxsize=RENDER_CACHE_SIZE)
+_render_cache_lock = threading.Lock()
+
+
+def _stable_hash(data: Any) -> str:
+    """Return a stable hash of JSON-like data, independent of key order."""
+    encoded = json.dumps(data, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def _has_drifted(desired: Any, live: Any) -> bool:
+    """
+    Whether a live object no longer carries every value of its manifest.
+
+    Fields the API server added (defaults, status, other field managers) are
+    ignored; only the values the manifest sets are compared. Empty values
+    match missing ones, as the API omits them when serializing.
+    """
+    empty = (None, {}, [])
+    if desired in empty:
+        return live not in empty
+    if isinstance(desired, dict):
+        if not isinstance(live, dict):
+            return True
+        return any(_has_drifted(value, live.get(key)) for key, value in desired.items())
+    if isinstance(desired, list):
+        if not isinstance(live, list) or len(desired) != len(live):
+            return True
+        return any(_has_drifted(d, item) for d, item in zip(desired, live))
+    return desired != live
+
+
+def clear_render_cache() -> None:
+    """Drop all memoized manifest renders."""
+    with _render_cache_lock:
+        _render_cache.clear()
+
 
 class KubernetesDeploymentService(BaseDeploymentBackend):
     """Kubernetes deployment service for managing MCP server deployments.
@@ -39,6 +103,10 @@ class KubernetesDeploymentService(BaseDeploymentBackend):
         super().__init__()
         self.namespace = namespace
         self.kubeconfig_path = kubeconfig_path
+        self.in_cluster = False
+        self._endpoint_cache: Dict[str, Tuple[float, List[str]]] = {}
+        self._endpoint_counters: Dict[str, Any] = {}
+        self._endpoint_lock = threading.Lock()
         self._ensure_kubernetes_available()
         self._ensure_namespace_exists()
 
@@ -64,6 +132,7 @@ class KubernetesDeploymentService(BaseDeploymentBackend):
                 try:
                     # Try in-cluster config first (for running inside a pod)
                     config.load_incluster_config()
+                    self.in_cluster = True
                 except config.config_exception.ConfigException:
                     # Fall back to local kubeconfig
                     config.load_kube_config()
@@ -72,6 +141,8 @@ class KubernetesDeploymentService(BaseDeploymentBackend):
             self.apps_v1 = client.AppsV1Api()
             self.core_v1 = client.CoreV1Api()
             self.autoscaling_v1 = client.AutoscalingV1Api()
+            self.autoscaling_v2 = client.AutoscalingV2Api()
+            self.discovery_v1 = client.DiscoveryV1Api()
 
             # Test connection
             self.core_v1.get_api_resources()
@@ -106,14 +177,16 @@ class KubernetesDeploymentService(BaseDeploymentBackend):
             else:
                 raise
 
+    def _safe_name(self, template_id: str) -> str:
+        """Turn a template id into a DNS-1123 compliant name."""
+        safe_name = template_id.lower().replace("_", "-").replace(" ", "-")
+        return "".join(c for c in safe_name if c.isalnum() or c == "-")
+
     def _generate_deployment_name(self, template_id: str) -> str:
         """Generate a unique deployment name."""
         # Use template_id as base name, add random suffix for uniqueness
-        safe_name = template_id.lower().replace("_", "-").replace(" ", "-")
-        # Kubernetes names must be DNS-1123 compliant
-        safe_name = "".join(c for c in safe_name if c.isalnum() or c == "-")
         suffix = str(uuid.uuid4())[:8]
-        return f"{safe_name}-{suffix}"
+        return f"{self._safe_name(template_id)}-{suffix}"
 
     def _create_helm_values(
         self,
@@ -175,6 +248,8 @@ class KubernetesDeploymentService(BaseDeploymentBackend):
                 ),
             },
             "replicaCount": k8s_config.get("replicas", 1),
+            "revisionHistoryLimit": k8s_config.get("revision_history_limit", 10),
+            "autoscaling": self._autoscaling_values(k8s_config),
             "mcp": {
                 "type": server_type,
                 "port": port,
@@ -197,10 +272,53 @@ class KubernetesDeploymentService(BaseDeploymentBackend):
 
         return values
 
+    def _autoscaling_values(self, k8s_config: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the chart's autoscaling values from the Kubernetes config."""
+        autoscaling = k8s_config.get("autoscaling") or {}
+        min_replicas = autoscaling.get("min_replicas", k8s_config.get("replicas", 1))
+        return {
+            "enabled": bool(autoscaling.get("enabled", False)),
+            "minReplicas": min_replicas,
+            "maxReplicas": autoscaling.get("max_replicas", max(min_replicas, 10)),
+            "targetCPUUtilizationPercentage": autoscaling.get(
+                "target_cpu_utilization", 80
+            ),
+            "targetMemoryUtilizationPercentage": autoscaling.get(
+                "target_memory_utilization"
+            ),
+        }
+
     def _render_helm_template(
         self, deployment_name: str, values: Dict[str, Any]
     ) -> List[Dict[str, Any]]:
-        """Render Helm chart templates with values."""
+        """
+        Render Helm chart templates with values.
+
+        Renders are memoized by release name, namespace and values hash. The
+        returned manifests are shared between callers and must not be modified.
+        """
+        key = (self.namespace, deployment_name, _stable_hash(values))
+        with _render_cache_lock:
+            manifests = _render_cache.get(key)
+        if manifests is not None:
+            return manifests
+
+        manifests = self._render_manifests(deployment_name, values)
+        for manifest in manifests:
+            # Hash before annotating, the annotation must not feed its own hash
+            manifest_hash = _stable_hash(manifest)
+            manifest["metadata"].setdefault("annotations", {})[
+                MANIFEST_HASH_ANNOTATION
+            ] = manifest_hash
+
+        with _render_cache_lock:
+            _render_cache[key] = manifests
+        return manifests
+
+    def _render_manifests(
+        self, deployment_name: str, values: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        """Render the chart's manifests without memoization."""
         # Get chart directory
         chart_dir = Path(__file__).parent.parent.parent / "charts" / "mcp-server"
 
@@ -234,6 +352,9 @@ class KubernetesDeploymentService(BaseDeploymentBackend):
             configmap_manifest = self._render_configmap(context)
             manifests.append(configmap_manifest)
 
+        if values.get("autoscaling", {}).get("enabled"):
+            manifests.append(self._render_hpa(context))
+
         return manifests
 
     def _render_deployment(self, context: Dict[str, Any]) -> Dict[str, Any]:
@@ -259,6 +380,12 @@ class KubernetesDeploymentService(BaseDeploymentBackend):
             },
             "spec": {
                 "replicas": values["replicaCount"],
+                "revisionHistoryLimit": values.get("revisionHistoryLimit", 10),
+                "strategy": {
+                    # Reconfiguring rolls pods without dropping capacity
+                    "type": "RollingUpdate",
+                    "rollingUpdate": {"maxUnavailable": 0, "maxSurge": 1},
+                },
                 "selector": {
                     "matchLabels": {
                         "app.kubernetes.io/name": name,
@@ -296,6 +423,10 @@ class KubernetesDeploymentService(BaseDeploymentBackend):
             },
         }
 
+        # The autoscaler owns the replica count
+        if values.get("autoscaling", {}).get("enabled"):
+            del deployment["spec"]["replicas"]
+
         # Add HTTP-specific configuration
         if values["mcp"]["type"] == "http":
             container = deployment["spec"]["template"]["spec"]["containers"][0]
@@ -352,6 +483,55 @@ class KubernetesDeploymentService(BaseDeploymentBackend):
             },
         }
 
+    def _render_hpa(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        """Render HorizontalPodAutoscaler manifest."""
+        autoscaling = context["Values"]["autoscaling"]
+        name = context["Release"]["Name"]
+        namespace = context["Release"]["Namespace"]
+
+        metrics = []
+        for resource, key in (
+            ("cpu", "targetCPUUtilizationPercentage"),
+            ("memory", "targetMemoryUtilizationPercentage"),
+        ):
+            if autoscaling.get(key):
+                metrics.append(
+                    {
+                        "type": "Resource",
+                        "resource": {
+                            "name": resource,
+                            "target": {
+                                "type": "Utilization",
+                                "averageUtilization": autoscaling[key],
+                            },
+                        },
+                    }
+                )
+
+        return {
+            "apiVersion": "autoscaling/v2",
+            "kind": "HorizontalPodAutoscaler",
+            "metadata": {
+                "name": name,
+                "namespace": namespace,
+                "labels": {
+                    "app.kubernetes.io/name": name,
+                    "app.kubernetes.io/instance": name,
+                    "app.kubernetes.io/managed-by": "mcp-templates",
+                },
+            },
+            "spec": {
+                "scaleTargetRef": {
+                    "apiVersion": "apps/v1",
+                    "kind": "Deployment",
+                    "name": name,
+                },
+                "minReplicas": autoscaling["minReplicas"],
+                "maxReplicas": autoscaling["maxReplicas"],
+                "metrics": metrics,
+            },
+        }
+
     def _render_configmap(self, context: Dict[str, Any]) -> Dict[str, Any]:
         """Render ConfigMap manifest."""
         values = context["Values"]
@@ -396,7 +576,12 @@ class KubernetesDeploymentService(BaseDeploymentBackend):
             Dict containing deployment information
         """
         try:
-            deployment_name = self._generate_deployment_name(template_id)
+            # A named deployment is created or updated in place, otherwise a
+            # new uniquely named deployment is created
+            deployment_name = (backend_config or {}).get("deployment_name")
+            in_place = bool(deployment_name)
+            if not in_place:
+                deployment_name = self._generate_deployment_name(template_id)
             logger.info(f"Deploying template {template_id} as {deployment_name}")
 
             # Create Helm values using both template config and Kubernetes config
@@ -410,136 +595,24 @@ class KubernetesDeploymentService(BaseDeploymentBackend):
             # Apply manifests to cluster
             created_resources = []
             for manifest in manifests:
-                try:
-                    if dry_run:
-                        logger.info(
-                            f"[DRY RUN] Would create {manifest['kind']} {manifest['metadata']['name']} in namespace {manifest['metadata']['namespace']}"
-                        )
-                        created_resources.append(
-                            (manifest["kind"], manifest["metadata"]["name"])
-                        )
-                        continue
-                    if manifest["kind"] == "Deployment":
-                        # Convert manifest dict to proper Kubernetes object
-                        deployment_obj = client.V1Deployment(
-                            api_version=manifest["apiVersion"],
-                            kind=manifest["kind"],
-                            metadata=client.V1ObjectMeta(
-                                name=manifest["metadata"]["name"],
-                                namespace=manifest["metadata"]["namespace"],
-                                labels=manifest["metadata"]["labels"],
-                            ),
-                            spec=client.V1DeploymentSpec(
-                                replicas=manifest["spec"]["replicas"],
-                                selector=client.V1LabelSelector(
-                                    match_labels=manifest["spec"]["selector"][
-                                        "matchLabels"
-                                    ]
-                                ),
-                                template=client.V1PodTemplateSpec(
-                                    metadata=client.V1ObjectMeta(
-                                        labels=manifest["spec"]["template"]["metadata"][
-                                            "labels"
-                                        ]
-                                    ),
-                                    spec=client.V1PodSpec(
-                                        containers=[
-                                            client.V1Container(
-                                                name=container["name"],
-                                                image=container["image"],
-                                                image_pull_policy=container[
-                                                    "imagePullPolicy"
-                                                ],
-                                                env=[
-                                                    client.V1EnvVar(
-                                                        name=env["name"],
-                                                        value=env["value"],
-                                                    )
-                                                    for env in container["env"]
-                                                ],
-                                                ports=[
-                                                    client.V1ContainerPort(
-                                                        name=port["name"],
-                                                        container_port=port[
-                                                            "containerPort"
-                                                        ],
-                                                        protocol=port["protocol"],
-                                                    )
-                                                    for port in container.get(
-                                                        "ports", []
-                                                    )
-                                                ],
-                                                resources=client.V1ResourceRequirements(
-                                                    requests=container["resources"].get(
-                                                        "requests"
-                                                    ),
-                                                    limits=container["resources"].get(
-                                                        "limits"
-                                                    ),
-                                                ),
-                                                command=container.get("command"),
-                                            )
-                                            for container in manifest["spec"][
-                                                "template"
-                                            ]["spec"]["containers"]
-                                        ]
-                                    ),
-                                ),
-                            ),
-                        )
-                        result = self.apps_v1.create_namespaced_deployment(
-                            namespace=self.namespace, body=deployment_obj
-                        )
-                        created_resources.append(("Deployment", result.metadata.name))
-
-                    elif manifest["kind"] == "Service":
-                        service_obj = client.V1Service(
-                            api_version=manifest["apiVersion"],
-                            kind=manifest["kind"],
-                            metadata=client.V1ObjectMeta(
-                                name=manifest["metadata"]["name"],
-                                namespace=manifest["metadata"]["namespace"],
-                                labels=manifest["metadata"]["labels"],
-                            ),
-                            spec=client.V1ServiceSpec(
-                                type=manifest["spec"]["type"],
-                                ports=[
-                                    client.V1ServicePort(
-                                        name=port["name"],
-                                        port=port["port"],
-                                        target_port=port["targetPort"],
-                                        protocol=port["protocol"],
-                                    )
-                                    for port in manifest["spec"]["ports"]
-                                ],
-                                selector=manifest["spec"]["selector"],
-                            ),
-                        )
-                        result = self.core_v1.create_namespaced_service(
-                            namespace=self.namespace, body=service_obj
-                        )
-                        created_resources.append(("Service", result.metadata.name))
-
-                    elif manifest["kind"] == "ConfigMap":
-                        configmap_obj = client.V1ConfigMap(
-                            api_version=manifest["apiVersion"],
-                            kind=manifest["kind"],
-                            metadata=client.V1ObjectMeta(
-                                name=manifest["metadata"]["name"],
-                                namespace=manifest["metadata"]["namespace"],
-                                labels=manifest["metadata"]["labels"],
-                            ),
-                            data=manifest["data"],
-                        )
-                        result = self.core_v1.create_namespaced_config_map(
-                            namespace=self.namespace, body=configmap_obj
-                        )
-                        created_resources.append(("ConfigMap", result.metadata.name))
+                resource = (manifest["kind"], manifest["metadata"]["name"])
+                if dry_run:
+                    logger.info(
+                        f"[DRY RUN] Would apply {manifest['kind']} {manifest['metadata']['name']} in namespace {manifest['metadata']['namespace']}"
+                    )
+                    created_resources.append(resource)
+                    continue
 
+                try:
+                    # Server-side apply creates missing objects and patches
+                    # existing ones, so a running deployment rolls in place
+                    self._apply_manifest(manifest)
+                    created_resources.append(resource)
                 except ApiException as e:
-                    logger.error(f"Failed to create {manifest['kind']}: {e}")
-                    # Cleanup any created resources
-                    self._cleanup_resources(created_resources)
+                    logger.error(f"Failed to apply {manifest['kind']}: {e}")
+                    # Cleanup resources of a new deployment, never a live one
+                    if not in_place:
+                        self._cleanup_resources(created_resources)
                     raise
 
             if not dry_run:
@@ -574,31 +647,335 @@ class KubernetesDeploymentService(BaseDeploymentBackend):
                 "deployed_at": datetime.now().isoformat(),
             }
 
-    def _wait_for_deployment_ready(self, deployment_name: str, timeout: int = 300):
-        """Wait for deployment to be ready."""
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            try:
-                deployment = self.apps_v1.read_namespaced_deployment(
-                    name=deployment_name, namespace=self.namespace
+    def plan_deployments(
+        self, deployments: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Plan deployments by diffing their desired manifests against the cluster.
+
+        Live state is read with one list call per resource kind, however many
+        deployments are planned. An object needs an update when its manifest
+        hash annotation differs from the desired manifest, or when any field
+        the manifest manages was changed out of band (kubectl edit or scale,
+        an image set by hand).
+
+        Args:
+            deployments: Deployment requests, each with template_id, config and
+                template_data, and optionally deployment_name (defaults to the
+                template id) and pull_image
+
+        Returns:
+            One plan per deployment with its manifests and the change needed
+            for each resource: create, update, unchanged or delete
+        """
+        live = self._list_live_resources()
+
+        plans = []
+        for request in deployments:
+            template_id = request["template_id"]
+            deployment_name = request.get("deployment_name") or self._safe_name(
+                template_id
+            )
+            values = self._create_helm_values(
+                template_id,
+                request.get("config", {}),
+                request.get("template_data", {}),
+                self._config,
+            )
+            values["image"]["pullPolicy"] = (
+                "Always" if request.get("pull_image", True) else "IfNotPresent"
+            )
+            manifests = self._render_helm_template(deployment_name, values)
+
+            changes = []
+            desired = set()
+            for manifest in manifests:
+                resource = (manifest["kind"], manifest["metadata"]["name"])
+                desired.add(resource)
+                if resource not in live:
+                    action = "create"
+                elif self._needs_update(manifest, live[resource]):
+                    action = "update"
+                else:
+                    action = "unchanged"
+                changes.append(
+                    {"kind": resource[0], "name": resource[1], "action": action}
                 )
 
-                if (
-                    deployment.status.ready_replicas
-                    and deployment.status.ready_replicas == deployment.spec.replicas
-                ):
-                    logger.info(f"Deployment {deployment_name} is ready")
-                    return
+            # Resources of this release the desired state no longer has
+            for resource, info in live.items():
+                if info["instance"] == deployment_name and resource not in desired:
+                    changes.append(
+                        {"kind": resource[0], "name": resource[1], "action": "delete"}
+                    )
 
-            except ApiException:
-                pass
+            plans.append(
+                {
+                    "template_id": template_id,
+                    "deployment_name": deployment_name,
+                    "manifests": manifests,
+                    "changes": changes,
+                    "changed": any(c["action"] != "unchanged" for c in changes),
+                }
+            )
+
+        return plans
+
+    def apply_plan(
+        self, plans: List[Dict[str, Any]], dry_run: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Apply the changes of planned deployments with server-side apply.
+
+        Unchanged resources cost no API writes.
+
+        Args:
+            plans: Plans returned by plan_deployments
+            dry_run: Only log the changes that would be made
+
+        Returns:
+            Dict with the applied, deleted and unchanged resources and errors
+        """
+        applied, deleted, unchanged, errors = [], [], [], []
+        for plan in plans:
+            manifests = {
+                (manifest["kind"], manifest["metadata"]["name"]): manifest
+                for manifest in plan["manifests"]
+            }
+            for change in plan["changes"]:
+                resource = (change["kind"], change["name"])
+                if change["action"] == "unchanged":
+                    unchanged.append(resource)
+                    continue
+                if dry_run:
+                    logger.info(
+                        f"[DRY RUN] Would {change['action']} {change['kind']} "
+                        f"{change['name']} in namespace {self.namespace}"
+                    )
+                    continue
 
-            time.sleep(5)
+                try:
+                    if change["action"] == "delete":
+                        self._cleanup_resources([resource])
+                        deleted.append(resource)
+                    else:
+                        self._apply_manifest(manifests[resource])
+                        applied.append(resource)
+                except ApiException as e:
+                    logger.error(
+                        f"Failed to apply {change['kind']} {change['name']}: {e}"
+                    )
+                    errors.append(
+                        {"kind": resource[0], "name": resource[1], "error": str(e)}
+                    )
+
+        return {
+            "success": not errors,
+            "applied": applied,
+            "deleted": deleted,
+            "unchanged": unchanged,
+            "errors": errors,
+        }
+
+    def _apply_manifest(self, manifest: Dict[str, Any]):
+        """Create or update an object from its manifest with server-side apply."""
+        apply = {
+            "Deployment": self.apps_v1.patch_namespaced_deployment,
+            "Service": self.core_v1.patch_namespaced_service,
+            "ConfigMap": self.core_v1.patch_namespaced_config_map,
+            "HorizontalPodAutoscaler": (
+                self.autoscaling_v2.patch_namespaced_horizontal_pod_autoscaler
+            ),
+        }[manifest["kind"]]
+        return apply(
+            name=manifest["metadata"]["name"],
+            namespace=self.namespace,
+            body=manifest,
+            field_manager=FIELD_MANAGER,
+            force=True,
+            _content_type=APPLY_PATCH_CONTENT_TYPE,
+        )
+
+    def _needs_update(self, manifest: Dict[str, Any], live: Dict[str, Any]) -> bool:
+        """Whether a live object differs from its desired manifest."""
+        desired_hash = manifest["metadata"]["annotations"][MANIFEST_HASH_ANNOTATION]
+        if live["hash"] != desired_hash:
+            return True
+
+        managed = {
+            field: value
+            for field, value in manifest.items()
+            if field not in ("apiVersion", "kind", "metadata")
+        }
+        managed["metadata"] = {"labels": manifest["metadata"].get("labels", {})}
+        if _has_drifted(managed, live["object"]):
+            logger.debug(
+                "%s %s drifted from its manifest",
+                manifest["kind"],
+                manifest["metadata"]["name"],
+            )
+            return True
+        return False
+
+    def _list_live_resources(self) -> Dict[Tuple[str, str], Dict[str, Any]]:
+        """
+        Map every managed (kind, name) in the namespace to its live state.
+
+        Each entry has the object's release, manifest hash and the object
+        itself serialized to manifest form (camelCase keys).
+        """
+        listings = {
+            "Deployment": self.apps_v1.list_namespaced_deployment,
+            "Service": self.core_v1.list_namespaced_service,
+            "ConfigMap": self.core_v1.list_namespaced_config_map,
+            "HorizontalPodAutoscaler": (
+                self.autoscaling_v2.list_namespaced_horizontal_pod_autoscaler
+            ),
+        }
+
+        serialize = self.core_v1.api_client.sanitize_for_serialization
+        live = {}
+        for kind, list_objects in listings.items():
+            objects = list_objects(
+                namespace=self.namespace, label_selector=MANAGED_BY_SELECTOR
+            )
+            for obj in objects.items:
+                labels = obj.metadata.labels or {}
+                annotations = obj.metadata.annotations or {}
+                live[(kind, obj.metadata.name)] = {
+                    "instance": labels.get(INSTANCE_LABEL),
+                    "hash": annotations.get(MANIFEST_HASH_ANNOTATION),
+                    "object": serialize(obj),
+                }
+        return live
+
+    def update_deployment(
+        self,
+        deployment_name: str,
+        template_id: str,
+        config: Dict[str, Any],
+        template_data: Dict[str, Any],
+        pull_image: bool = True,
+    ) -> Dict[str, Any]:
+        """
+        Reconfigure a running deployment with a rolling update.
+
+        Args:
+            deployment_name: Name of the deployment to update
+            template_id: Template the deployment runs
+            config: New template configuration parameters
+            template_data: Template metadata and configuration
+            pull_image: Whether to always pull the container image
+
+        Returns:
+            Dict containing deployment information
+        """
+        return self.deploy_template(
+            template_id,
+            config,
+            template_data,
+            {"deployment_name": deployment_name},
+            pull_image=pull_image,
+        )
+
+    def wait_for_rollout(self, deployment_name: str, timeout: int = 300) -> None:
+        """
+        Wait for a deployment's rollout to complete, following it with a watch.
+
+        A rollout is complete when the controller observed the latest spec and
+        every replica is updated and available, the same check as
+        ``kubectl rollout status``.
+
+        Args:
+            deployment_name: Name of the deployment
+            timeout: Seconds to wait
+
+        Raises:
+            RuntimeError: If the rollout does not complete in time
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = int(deadline - time.monotonic())
+            if remaining <= 0:
+                break
+
+            stream = watch.Watch()
+            try:
+                for event in stream.stream(
+                    self.apps_v1.list_namespaced_deployment,
+                    namespace=self.namespace,
+                    field_selector=f"metadata.name={deployment_name}",
+                    timeout_seconds=remaining,
+                ):
+                    if self._rollout_complete(event["object"]):
+                        logger.info(f"Deployment {deployment_name} is ready")
+                        return
+            except ApiException as e:
+                # The watch can expire, resume it while time remains
+                logger.debug(f"Watch on deployment {deployment_name} ended: {e}")
+                time.sleep(min(1, max(0, deadline - time.monotonic())))
+            finally:
+                stream.stop()
 
         raise RuntimeError(
             f"Deployment {deployment_name} did not become ready within {timeout} seconds"
         )
 
+    @staticmethod
+    def _rollout_complete(deployment) -> bool:
+        """Check whether a deployment finished rolling out its latest spec."""
+        status = deployment.status
+        if status is None:
+            return False
+
+        generation = deployment.metadata.generation or 0
+        if (status.observed_generation or 0) < generation:
+            return False
+
+        replicas = deployment.spec.replicas or 0
+        return (
+            (status.updated_replicas or 0) >= replicas
+            and (status.replicas or 0) <= (status.updated_replicas or 0)
+            and (status.available_replicas or 0) >= replicas
+        )
+
+    def _wait_for_deployment_ready(self, deployment_name: str, timeout: int = 300):
+        """Wait for deployment to be ready."""
+        self.wait_for_rollout(deployment_name, timeout=timeout)
+
+    def get_rollout_history(self, deployment_name: str) -> List[Dict[str, Any]]:
+        """
+        List the revisions of a deployment, oldest first.
+
+        Args:
+            deployment_name: Name of the deployment
+
+        Returns:
+            One entry per retained ReplicaSet with its revision and image
+        """
+        replica_sets = self.apps_v1.list_namespaced_replica_set(
+            namespace=self.namespace,
+            label_selector=f"{INSTANCE_LABEL}={deployment_name}",
+        )
+
+        history = []
+        for replica_set in replica_sets.items:
+            annotations = replica_set.metadata.annotations or {}
+            revision = annotations.get("deployment.kubernetes.io/revision")
+            if revision is None:
+                continue
+            containers = replica_set.spec.template.spec.containers or []
+            history.append(
+                {
+                    "revision": int(revision),
+                    "name": replica_set.metadata.name,
+                    "image": containers[0].image if containers else None,
+                    "replicas": replica_set.status.replicas or 0,
+                }
+            )
+
+        return sorted(history, key=lambda entry: entry["revision"])
+
     def _cleanup_resources(self, resources: List[tuple]):
         """Cleanup created resources on failure."""
         for resource_type, resource_name in resources:
@@ -615,6 +992,10 @@ class KubernetesDeploymentService(BaseDeploymentBackend):
                     self.core_v1.delete_namespaced_config_map(
                         name=resource_name, namespace=self.namespace
                     )
+                elif resource_type == "HorizontalPodAutoscaler":
+                    self.autoscaling_v2.delete_namespaced_horizontal_pod_autoscaler(
+                        name=resource_name, namespace=self.namespace
+                    )
                 logger.info(f"Cleaned up {resource_type} {resource_name}")
             except ApiException as e:
                 logger.warning(
@@ -686,7 +1067,7 @@ class KubernetesDeploymentService(BaseDeploymentBackend):
         try:
             deployments = self.apps_v1.list_namespaced_deployment(
                 namespace=self.namespace,
-                label_selector="app.kubernetes.io/managed-by=mcp-templates",
+                label_selector=MANAGED_BY_SELECTOR,
             )
 
             result = []
@@ -724,6 +1105,18 @@ class KubernetesDeploymentService(BaseDeploymentBackend):
                 if e.status != 404:
                     logger.warning(f"Failed to delete service {deployment_name}: {e}")
 
+            # Delete autoscaler
+            try:
+                self.autoscaling_v2.delete_namespaced_horizontal_pod_autoscaler(
+                    name=deployment_name, namespace=self.namespace
+                )
+                logger.info(f"Deleted autoscaler {deployment_name}")
+            except ApiException as e:
+                if e.status != 404:
+                    logger.warning(
+                        f"Failed to delete autoscaler {deployment_name}: {e}"
+                    )
+
             # Delete configmap
             try:
                 self.core_v1.delete_namespaced_config_map(
@@ -760,6 +1153,201 @@ class KubernetesDeploymentService(BaseDeploymentBackend):
             logger.error(f"Failed to stop deployment {deployment_name}: {e}")
             return False
 
+    def scale_deployment(self, deployment_name: str, replicas: int) -> bool:
+        """
+        Scale a deployment to a number of replicas.
+
+        Deployments with an autoscaler are resized by it again on its next
+        evaluation, within its minimum and maximum.
+
+        Args:
+            deployment_name: Name of the deployment
+            replicas: Desired number of replicas
+
+        Returns:
+            True if the scale was updated, False otherwise
+        """
+        if replicas < 0:
+            raise ValueError("Replicas must not be negative")
+
+        try:
+            self.apps_v1.patch_namespaced_deployment_scale(
+                name=deployment_name,
+                namespace=self.namespace,
+                body={"spec": {"replicas": replicas}},
+            )
+        except ApiException as e:
+            logger.error(f"Failed to scale deployment {deployment_name}: {e}")
+            return False
+
+        with self._endpoint_lock:
+            self._endpoint_cache.pop(deployment_name, None)
+        logger.info(f"Scaled deployment {deployment_name} to {replicas} replicas")
+        return True
+
+    def get_ready_endpoints(self, deployment_name: str) -> List[str]:
+        """
+        Get the HTTP endpoints of a deployment's ready pods from its EndpointSlices.
+
+        Results are reused for ENDPOINT_CACHE_TTL_SECONDS.
+
+        Args:
+            deployment_name: Name of the deployment, which is also its service name
+
+        Returns:
+            Pod endpoint URLs, empty if none are ready or they cannot be listed
+        """
+        now = time.monotonic()
+        with self._endpoint_lock:
+            cached = self._endpoint_cache.get(deployment_name)
+        if cached and cached[0] > now:
+            return cached[1]
+
+        endpoints = []
+        try:
+            slices = self.discovery_v1.list_namespaced_endpoint_slice(
+                namespace=self.namespace,
+                label_selector=f"kubernetes.io/service-name={deployment_name}",
+            )
+        except ApiException as e:
+            logger.debug(f"Failed to list endpoints of {deployment_name}: {e}")
+            return []
+
+        for endpoint_slice in slices.items:
+            port = next(
+                (p.port for p in endpoint_slice.ports or [] if p.name == "http"),
+                None,
+            )
+            if port is None:
+                continue
+            for endpoint in endpoint_slice.endpoints or []:
+                # An unknown readiness is treated as ready, as kube-proxy does
+                if endpoint.conditions and endpoint.conditions.ready is False:
+                    continue
+                if endpoint.addresses:
+                    endpoints.append(f"http://{endpoint.addresses[0]}:{port}")
+
+        endpoints.sort()
+        with self._endpoint_lock:
+            self._endpoint_cache[deployment_name] = (
+                now + ENDPOINT_CACHE_TTL_SECONDS,
+                endpoints,
+            )
+        return endpoints
+
+    def select_endpoint(self, deployment_id: str) -> Optional[str]:
+        """
+        Pick a ready pod of a deployment, round robin across replicas.
+
+        Pod IPs are only routable inside the cluster, so outside of it the
+        service endpoint is used instead.
+        """
+        if not self.in_cluster:
+            return None
+
+        endpoints = self.get_ready_endpoints(deployment_id)
+        if not endpoints:
+            return None
+
+        with self._endpoint_lock:
+            counter = self._endpoint_counters.setdefault(
+                deployment_id, itertools.count()
+            )
+            return endpoints[next(counter) % len(endpoints)]
+
+    def run_stdio_command(
+        self,
+        template_id: str,
+        config: Dict[str, Any],
+        template_data: Dict[str, Any],
+        json_input: str,
+        pull_image: bool = True,
+    ) -> Dict[str, Any]:
+        """
+        Run a stdio MCP request against a warm pod of the template.
+
+        The request goes over a websocket attach session from the namespace's
+        stdio pod pool, so repeated calls reuse the same initialized server.
+
+        Args:
+            template_id: Template to run
+            config: Prepared template configuration
+            template_data: Template definition
+            json_input: JSON-RPC request to send
+            pull_image: Whether new pods always pull the image
+
+        Returns:
+            Result dict in the same shape as the Docker backend's
+        """
+        try:
+            tool_request = json.loads(json_input)
+        except json.JSONDecodeError:
+            return {
+                "template_id": template_id,
+                "status": "failed",
+                "error": "Invalid JSON input",
+                "executed_at": datetime.now().isoformat(),
+            }
+
+        spec = self._stdio_pod_spec(template_id, config, template_data, pull_image)
+        pool = get_stdio_pool(self.core_v1, self.namespace)
+        try:
+            with pool.session(spec) as session:
+                response = session.request(
+                    tool_request.get("method"), tool_request.get("params", {})
+                )
+        except (StdioSessionError, ApiException) as e:
+            logger.error("Stdio command failed for template %s: %s", template_id, e)
+            return {
+                "template_id": template_id,
+                "status": "failed",
+                "stdout": "",
+                "stderr": "",
+                "error": str(e),
+                "executed_at": datetime.now().isoformat(),
+            }
+
+        return {
+            "template_id": template_id,
+            "status": "completed",
+            "stdout": json.dumps({"jsonrpc": "2.0", **response}) + "\n",
+            "stderr": "",
+            "executed_at": datetime.now().isoformat(),
+        }
+
+    def _stdio_pod_spec(
+        self,
+        template_id: str,
+        config: Dict[str, Any],
+        template_data: Dict[str, Any],
+        pull_image: bool,
+    ) -> StdioPodSpec:
+        """Build the pod spec a template's stdio server runs with."""
+        env = {
+            key: str(value) for key, value in template_data.get("env_vars", {}).items()
+        }
+        for key, value in config.items():
+            if key == "env" and isinstance(value, dict):
+                env.update({k: str(v) for k, v in value.items()})
+            elif isinstance(value, bool):
+                env[key] = "true" if value else "false"
+            elif isinstance(value, list):
+                env[key] = ",".join(str(item) for item in value)
+            elif value is not None:
+                env[key] = str(value)
+
+        image = template_data.get("image") or template_data.get(
+            "docker_image", f"mcp-{template_id}:latest"
+        )
+        return StdioPodSpec.build(
+            image=normalize_image_name(image),
+            name=f"{self._safe_name(template_id)}-stdio",
+            env=env,
+            # Like `docker run image <command>`, these are entrypoint arguments
+            args=template_data.get("command") or None,
+            image_pull_policy="Always" if pull_image else "IfNotPresent",
+        )
+
     def get_deployment_info(
         self, deployment_name: str, include_logs: bool = False, lines: int = 10
     ) -> Dict[str, Any]:
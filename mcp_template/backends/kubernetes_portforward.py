@@ -0,0 +1,365 @@
+"""
+Port-forward tunnels to cluster-internal Kubernetes services.
+
+Outside the cluster, service DNS names and ClusterIPs are not routable. A
+tunnel listens on a local port and forwards every accepted connection to a
+ready pod behind the service over the API server's port-forward websocket,
+like `kubectl port-forward` but without a subprocess. Tunnels are keyed by
+service and port, shared by discovery and tool calls, and close themselves
+once they have been idle for long enough.
+"""
+
+import atexit
+import logging
+import os
+import select
+import socket
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit
+
+from kubernetes import client, config
+from kubernetes.stream import portforward
+
+logger = logging.getLogger(__name__)
+
+# Seconds a tunnel without open connections is kept before it closes
+PORT_FORWARD_IDLE_TIMEOUT = int(
+    os.environ.get("MCP_K8S_PORT_FORWARD_IDLE_TIMEOUT", "300")
+)
+
+CLUSTER_SERVICE_SUFFIX = ".svc.cluster.local"
+
+# How often a tunnel without connections checks whether it has gone idle
+POLL_INTERVAL_SECONDS = 0.5
+
+
+def in_cluster() -> bool:
+    """Whether this process runs in a pod, where service names resolve."""
+    return "KUBERNETES_SERVICE_HOST" in os.environ
+
+
+def parse_service_url(url: str) -> Optional[Tuple[str, str, int]]:
+    """
+    Split a cluster-internal service URL.
+
+    Args:
+        url: URL like http://demo.mcp-servers.svc.cluster.local:8080/mcp
+
+    Returns:
+        (service, namespace, port), or None for any other URL
+    """
+    parsed = urlsplit(url)
+    host = parsed.hostname or ""
+    if not host.endswith(CLUSTER_SERVICE_SUFFIX):
+        return None
+
+    parts = host[: -len(CLUSTER_SERVICE_SUFFIX)].split(".")
+    if len(parts) != 2:
+        return None
+
+    port = parsed.port or (443 if parsed.scheme == "https" else 80)
+    return parts[0], parts[1], port
+
+
+def _pod_ready(pod) -> bool:
+    if pod.status.phase != "Running" or pod.metadata.deletion_timestamp:
+        return False
+    statuses = pod.status.container_statuses or []
+    return bool(statuses) and all(status.ready for status in statuses)
+
+
+class PortForwardTunnel:
+    """Local listener forwarding connections to one service port."""
+
+    def __init__(
+        self,
+        core_v1,
+        namespace: str,
+        service: str,
+        port: int,
+        idle_timeout: int = PORT_FORWARD_IDLE_TIMEOUT,
+    ):
+        """
+        Start listening on a free local port.
+
+        Args:
+            core_v1: Kubernetes CoreV1Api client
+            namespace: Namespace of the service
+            service: Service name
+            port: Service port
+            idle_timeout: Seconds without connections before the tunnel closes
+        """
+        self.core_v1 = core_v1
+        self.namespace = namespace
+        self.service = service
+        self.port = port
+        self.idle_timeout = idle_timeout
+        self.closed = False
+        self._active = 0
+        self._last_used = time.monotonic()
+        self._target: Optional[Tuple[str, int]] = None
+        self._lock = threading.Lock()
+
+        self._listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._listener.bind(("127.0.0.1", 0))
+        self._listener.listen(16)
+        self._listener.settimeout(POLL_INTERVAL_SECONDS)
+        self.local_port = self._listener.getsockname()[1]
+
+        threading.Thread(
+            target=self._serve,
+            name=f"port-forward {namespace}/{service}:{port}",
+            daemon=True,
+        ).start()
+        logger.info(
+            "Forwarding 127.0.0.1:%d to service %s/%s:%d",
+            self.local_port,
+            namespace,
+            service,
+            port,
+        )
+
+    @property
+    def idle(self) -> bool:
+        """Whether the tunnel has had no connections for idle_timeout seconds."""
+        with self._lock:
+            return (
+                self._active == 0
+                and time.monotonic() - self._last_used > self.idle_timeout
+            )
+
+    def close(self) -> None:
+        """Stop accepting connections. Open connections finish on their own."""
+        self.closed = True
+        try:
+            self._listener.close()
+        except OSError:
+            pass
+
+    def _serve(self) -> None:
+        while not self.closed:
+            try:
+                conn, _ = self._listener.accept()
+            except socket.timeout:
+                if self.idle:
+                    logger.debug("Closing idle tunnel to %s", self.service)
+                    self.close()
+                continue
+            except OSError:
+                break
+
+            with self._lock:
+                self._active += 1
+                self._last_used = time.monotonic()
+            threading.Thread(target=self._forward, args=(conn,), daemon=True).start()
+
+    def _forward(self, conn: socket.socket) -> None:
+        forward = None
+        try:
+            pod_name, target_port = self._resolve_target()
+            forward = portforward(
+                self.core_v1.connect_get_namespaced_pod_portforward,
+                pod_name,
+                self.namespace,
+                ports=str(target_port),
+            )
+            self._pump(conn, forward.socket(target_port))
+        except Exception as e:
+            logger.debug("Forwarded connection to %s failed: %s", self.service, e)
+            # The pod may be gone, pick again on the next connection
+            with self._lock:
+                self._target = None
+        finally:
+            conn.close()
+            if forward is not None:
+                forward.close()
+            with self._lock:
+                self._active -= 1
+                self._last_used = time.monotonic()
+
+    def _pump(self, local, remote) -> None:
+        """Copy bytes both ways until either side closes."""
+        peers = {local: remote, remote: local}
+        while True:
+            readable, _, _ = select.select(list(peers), [], [])
+            for sock in readable:
+                data = sock.recv(65536)
+                if not data:
+                    return
+                peers[sock].sendall(data)
+
+    def _resolve_target(self) -> Tuple[str, int]:
+        """Pick a ready pod behind the service and the container port to use."""
+        with self._lock:
+            if self._target is not None:
+                return self._target
+
+        service = self.core_v1.read_namespaced_service(
+            name=self.service, namespace=self.namespace
+        )
+        port_spec = next(
+            (p for p in service.spec.ports or [] if p.port == self.port), None
+        )
+        if port_spec is None:
+            raise LookupError(f"Service {self.service} has no port {self.port}")
+        if not service.spec.selector:
+            raise LookupError(f"Service {self.service} has no pod selector")
+
+        label_selector = ",".join(
+            f"{key}={value}" for key, value in sorted(service.spec.selector.items())
+        )
+        pods = self.core_v1.list_namespaced_pod(
+            namespace=self.namespace, label_selector=label_selector
+        ).items
+
+        target_port = port_spec.target_port or self.port
+        for pod in pods:
+            if not _pod_ready(pod):
+                continue
+            if isinstance(target_port, str) and not target_port.isdigit():
+                # Named target port, look it up on the pod's containers
+                named = [
+                    p.container_port
+                    for c in pod.spec.containers
+                    for p in c.ports or []
+                    if p.name == target_port
+                ]
+                if not named:
+                    continue
+                target = (pod.metadata.name, named[0])
+            else:
+                target = (pod.metadata.name, int(target_port))
+
+            with self._lock:
+                self._target = target
+            return target
+
+        raise LookupError(f"No ready pod behind service {self.service}")
+
+
+class PortForwardPool:
+    """Tunnels to cluster services, shared and reused by service and port."""
+
+    def __init__(self, core_v1, idle_timeout: int = PORT_FORWARD_IDLE_TIMEOUT):
+        """
+        Initialize the pool.
+
+        Args:
+            core_v1: Kubernetes CoreV1Api client
+            idle_timeout: Seconds without connections before a tunnel closes
+        """
+        self.core_v1 = core_v1
+        self.idle_timeout = idle_timeout
+        self._tunnels: Dict[Tuple[str, str, int], PortForwardTunnel] = {}
+        self._lock = threading.Lock()
+
+    def tunnel(self, namespace: str, service: str, port: int) -> PortForwardTunnel:
+        """Get the open tunnel to a service port, starting one if needed."""
+        key = (namespace, service, port)
+        with self._lock:
+            tunnel = self._tunnels.get(key)
+            if tunnel is None or tunnel.closed:
+                tunnel = PortForwardTunnel(
+                    self.core_v1, namespace, service, port, self.idle_timeout
+                )
+                self._tunnels[key] = tunnel
+            return tunnel
+
+    def local_url(self, url: str) -> str:
+        """
+        Rewrite a cluster service URL to go through a local tunnel.
+
+        Args:
+            url: Any URL
+
+        Returns:
+            The URL with its host replaced by a tunnel, or unchanged if it
+            does not point at a cluster service
+        """
+        target = parse_service_url(url)
+        if target is None:
+            return url
+
+        service, namespace, port = target
+        tunnel = self.tunnel(namespace, service, port)
+        parsed = urlsplit(url)
+        return urlunsplit(parsed._replace(netloc=f"127.0.0.1:{tunnel.local_port}"))
+
+    def close(self) -> None:
+        """Close every tunnel of the pool."""
+        with self._lock:
+            tunnels = list(self._tunnels.values())
+            self._tunnels.clear()
+        for tunnel in tunnels:
+            tunnel.close()
+
+
+_pool: Optional[PortForwardPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_port_forward_pool(core_v1=None) -> Optional[PortForwardPool]:
+    """
+    Get the process-wide port-forward pool.
+
+    Args:
+        core_v1: Kubernetes CoreV1Api client. If omitted when the pool is
+            created, the kubeconfig is loaded unless a client configuration
+            is already in place.
+
+    Returns:
+        The shared pool, or None if no cluster is configured
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            if core_v1 is None:
+                try:
+                    if not client.Configuration.get_default_copy().host:
+                        config.load_kube_config()
+                    core_v1 = client.CoreV1Api()
+                except Exception as e:
+                    logger.debug("No Kubernetes configuration for tunnels: %s", e)
+                    return None
+            _pool = PortForwardPool(core_v1)
+        return _pool
+
+
+def close_port_forward_pool() -> None:
+    """Close all tunnels and drop the shared pool."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.close()
+
+
+def route_cluster_url(url: str) -> str:
+    """
+    Make a cluster service URL reachable from this process.
+
+    Inside the cluster, and for any other URL, the URL is returned as is.
+    Outside the cluster, service URLs are rewritten to a local tunnel.
+
+    Args:
+        url: URL to route
+
+    Returns:
+        URL to connect to
+    """
+    if in_cluster() or parse_service_url(url) is None:
+        return url
+
+    pool = get_port_forward_pool()
+    if pool is None:
+        return url
+    try:
+        return pool.local_url(url)
+    except OSError as e:
+        logger.warning("Failed to open tunnel for %s: %s", url, e)
+        return url
+
+
+atexit.register(close_port_forward_pool)
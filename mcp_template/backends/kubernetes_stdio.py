@@ -0,0 +1,479 @@
+"""
+Stdio transport for MCP servers running in Kubernetes pods.
+
+Sessions attach to a pod's stdin and stdout through the API server's
+websocket attach endpoint, so no kubectl process is forked. A session runs
+the MCP initialize handshake once and then serves any number of requests.
+Pods are pooled per spec and kept warm until they sit idle for too long, so
+stdio-only servers handle many calls without pod churn.
+"""
+
+import atexit
+import hashlib
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from kubernetes import watch
+from kubernetes.stream import stream
+
+from mcp_template.utils.cleanup_reaper import POD_NAME_LABEL, pod_reaper
+
+logger = logging.getLogger(__name__)
+
+
+def _int_from_env(name: str, default: int) -> int:
+    """Read an integer setting from the environment."""
+    value = os.getenv(name)
+    if value is None:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        logger.warning("Invalid %s value '%s', using default %d", name, value, default)
+        return default
+
+
+# Seconds to wait for the response to one request
+STDIO_REQUEST_TIMEOUT = _int_from_env("MCP_STDIO_TIMEOUT", 30)
+
+# Seconds an unused warm pod is kept before it is deleted
+STDIO_POD_IDLE_TIMEOUT = _int_from_env("MCP_K8S_STDIO_IDLE_TIMEOUT", 300)
+
+STDIO_POD_READY_TIMEOUT = 60
+STDIO_CONTAINER_NAME = "mcp-server"
+STDIO_SPEC_LABEL = "mcp-template.io/stdio-spec"
+
+INITIALIZE_PARAMS = {
+    "protocolVersion": "2025-03-26",
+    "capabilities": {},
+    "clientInfo": {"name": "mcp-template", "version": "1.0.0"},
+}
+
+
+class StdioSessionError(RuntimeError):
+    """Raised when a stdio session cannot be started or stops responding."""
+
+
+@dataclass(frozen=True)
+class StdioPodSpec:
+    """Everything that makes two stdio pods interchangeable."""
+
+    image: str
+    name: str = "mcp-stdio"
+    env: Tuple[Tuple[str, str], ...] = ()
+    command: Tuple[str, ...] = ()
+    args: Tuple[str, ...] = ()
+    image_pull_policy: str = "IfNotPresent"
+
+    @classmethod
+    def build(
+        cls,
+        image: str,
+        name: str = "mcp-stdio",
+        env: Optional[Mapping[str, Any]] = None,
+        command: Optional[Sequence[str]] = None,
+        args: Optional[Sequence[str]] = None,
+        image_pull_policy: str = "IfNotPresent",
+    ) -> "StdioPodSpec":
+        """
+        Build a spec from plain mappings and lists.
+
+        MCP_TRANSPORT is always set to stdio.
+
+        Args:
+            image: Container image
+            name: Base of the generated pod names
+            env: Environment variables of the server
+            command: Container command override
+            args: Container arguments
+            image_pull_policy: Kubernetes image pull policy
+
+        Returns:
+            Hashable pod spec
+        """
+        env = {key: str(value) for key, value in (env or {}).items()}
+        env["MCP_TRANSPORT"] = "stdio"
+        return cls(
+            image=image,
+            name=name,
+            env=tuple(sorted(env.items())),
+            command=tuple(command or ()),
+            args=tuple(args or ()),
+            image_pull_policy=image_pull_policy,
+        )
+
+    @property
+    def key(self) -> str:
+        """Short stable hash of the spec, usable as a label value."""
+        encoded = json.dumps(
+            [
+                self.image,
+                self.env,
+                self.command,
+                self.args,
+                self.image_pull_policy,
+            ]
+        ).encode("utf-8")
+        return hashlib.sha256(encoded).hexdigest()[:16]
+
+
+class StdioAttachSession:
+    """JSON-RPC session over the attached stdin/stdout of one pod."""
+
+    def __init__(
+        self,
+        core_v1,
+        namespace: str,
+        pod_name: str,
+        container: str = STDIO_CONTAINER_NAME,
+        timeout: int = STDIO_REQUEST_TIMEOUT,
+    ):
+        """
+        Initialize the session. Nothing is sent until connect() is called.
+
+        Args:
+            core_v1: Kubernetes CoreV1Api client
+            namespace: Namespace of the pod
+            pod_name: Name of the pod to attach to
+            container: Name of the container running the server
+            timeout: Default seconds to wait for each response
+        """
+        self.core_v1 = core_v1
+        self.namespace = namespace
+        self.pod_name = pod_name
+        self.container = container
+        self.timeout = timeout
+        self.initialized = False
+        self.last_used = time.monotonic()
+        self._ws = None
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def connect(self) -> None:
+        """Open the websocket attach stream to the pod."""
+        self._ws = stream(
+            self.core_v1.connect_get_namespaced_pod_attach,
+            self.pod_name,
+            self.namespace,
+            container=self.container,
+            stdin=True,
+            stdout=True,
+            # Only stdout carries JSON-RPC; an unread stderr channel would
+            # buffer server logs in the client for the life of the session
+            stderr=False,
+            tty=False,
+            _preload_content=False,
+        )
+
+    @property
+    def is_open(self) -> bool:
+        """Whether the attach stream is still usable."""
+        return self._ws is not None and self._ws.is_open()
+
+    def request(
+        self,
+        method: str,
+        params: Optional[Dict[str, Any]] = None,
+        timeout: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Send a request and wait for its response.
+
+        The server is initialized on the first request of the session.
+
+        Args:
+            method: JSON-RPC method
+            params: Method parameters
+            timeout: Seconds to wait for the response
+
+        Returns:
+            The JSON-RPC response
+
+        Raises:
+            StdioSessionError: If the stream closes or no response arrives
+        """
+        with self._lock:
+            if not self.is_open:
+                raise StdioSessionError(f"Attach stream to {self.pod_name} is closed")
+
+            if not self.initialized:
+                self._request("initialize", INITIALIZE_PARAMS, self.timeout)
+                self._send({"jsonrpc": "2.0", "method": "notifications/initialized"})
+                self.initialized = True
+
+            response = self._request(method, params, timeout or self.timeout)
+            self.last_used = time.monotonic()
+            return response
+
+    def close(self) -> None:
+        """Close the attach stream."""
+        if self._ws is not None:
+            try:
+                self._ws.close()
+            except Exception as e:
+                logger.debug("Failed to close attach stream: %s", e)
+            self._ws = None
+
+    def _send(self, message: Dict[str, Any]) -> None:
+        self._ws.write_stdin(json.dumps(message) + "\n")
+
+    def _request(
+        self, method: str, params: Optional[Dict[str, Any]], timeout: float
+    ) -> Dict[str, Any]:
+        request_id = next(self._ids)
+        message = {"jsonrpc": "2.0", "id": request_id, "method": method}
+        if params is not None:
+            message["params"] = params
+        self._send(message)
+
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise StdioSessionError(
+                    f"No response to {method} from {self.pod_name} "
+                    f"within {timeout} seconds"
+                )
+
+            line = self._ws.readline_stdout(timeout=remaining)
+            if not line:
+                if not self._ws.is_open():
+                    raise StdioSessionError(
+                        f"Attach stream to {self.pod_name} closed during {method}"
+                    )
+                continue
+
+            try:
+                response = json.loads(line)
+            except json.JSONDecodeError:
+                logger.debug("Ignoring non JSON-RPC output: %s", line)
+                continue
+
+            # Notifications and responses to abandoned requests are skipped
+            if isinstance(response, dict) and response.get("id") == request_id:
+                return response
+
+
+class StdioPodPool:
+    """Warm pods with attached stdio sessions, pooled per pod spec."""
+
+    def __init__(
+        self,
+        core_v1,
+        namespace: str,
+        idle_timeout: int = STDIO_POD_IDLE_TIMEOUT,
+        ready_timeout: int = STDIO_POD_READY_TIMEOUT,
+    ):
+        """
+        Initialize the pool.
+
+        Args:
+            core_v1: Kubernetes CoreV1Api client
+            namespace: Namespace the pods are created in
+            idle_timeout: Seconds an unused pod is kept before deletion
+            ready_timeout: Seconds to wait for a new pod to start
+        """
+        self.core_v1 = core_v1
+        self.namespace = namespace
+        self.idle_timeout = idle_timeout
+        self.ready_timeout = ready_timeout
+        self._idle: Dict[str, List[StdioAttachSession]] = defaultdict(list)
+        self._lock = threading.Lock()
+        self._reaper = pod_reaper(core_v1, namespace)
+
+    @contextmanager
+    def session(self, spec: StdioPodSpec) -> Iterator[StdioAttachSession]:
+        """
+        Borrow a session to a warm pod running spec.
+
+        A pod is started when no idle one is available. The session goes
+        back to the pool afterwards, unless the block raised, in which case
+        the pod is deleted.
+
+        Args:
+            spec: Pod spec of the server
+
+        Yields:
+            Attached, exclusively borrowed session
+        """
+        self.reap_idle()
+        session = self._checkout(spec.key) or self._start(spec)
+        try:
+            yield session
+        except BaseException:
+            self._discard(session)
+            raise
+
+        with self._lock:
+            self._idle[spec.key].append(session)
+
+    def reap_idle(self) -> int:
+        """
+        Delete pods that have not been used for idle_timeout seconds.
+
+        Returns:
+            Number of pods deleted
+        """
+        cutoff = time.monotonic() - self.idle_timeout
+        expired = []
+        with self._lock:
+            for key, sessions in list(self._idle.items()):
+                keep = [s for s in sessions if s.last_used >= cutoff and s.is_open]
+                expired.extend(s for s in sessions if s not in keep)
+                if keep:
+                    self._idle[key] = keep
+                else:
+                    del self._idle[key]
+
+        for session in expired:
+            self._discard(session)
+        return len(expired)
+
+    def close(self) -> None:
+        """Delete every idle pod of the pool."""
+        with self._lock:
+            sessions = [s for group in self._idle.values() for s in group]
+            self._idle.clear()
+        for session in sessions:
+            self._discard(session)
+
+    def pod_manifest(self, pod_name: str, spec: StdioPodSpec) -> Dict[str, Any]:
+        """Render the manifest of a long-lived stdio pod."""
+        container = {
+            "name": STDIO_CONTAINER_NAME,
+            "image": spec.image,
+            "imagePullPolicy": spec.image_pull_policy,
+            "env": [{"name": k, "value": v} for k, v in spec.env],
+            # stdin stays open between attaches, so the server outlives a session
+            "stdin": True,
+            "stdinOnce": False,
+            "tty": False,
+            "resources": {
+                "requests": {"memory": "64Mi", "cpu": "100m"},
+                "limits": {"memory": "256Mi", "cpu": "500m"},
+            },
+        }
+        if spec.command:
+            container["command"] = list(spec.command)
+        if spec.args:
+            container["args"] = list(spec.args)
+
+        return {
+            "apiVersion": "v1",
+            "kind": "Pod",
+            "metadata": {
+                "name": pod_name,
+                "namespace": self.namespace,
+                "labels": {
+                    "app.kubernetes.io/managed-by": "mcp-templates",
+                    "app.kubernetes.io/component": "stdio",
+                    POD_NAME_LABEL: pod_name,
+                    STDIO_SPEC_LABEL: spec.key,
+                },
+            },
+            "spec": {"restartPolicy": "Never", "containers": [container]},
+        }
+
+    def _checkout(self, key: str) -> Optional[StdioAttachSession]:
+        stale = []
+        found = None
+        with self._lock:
+            sessions = self._idle.get(key, [])
+            while sessions:
+                session = sessions.pop()
+                if session.is_open:
+                    found = session
+                    break
+                stale.append(session)
+
+        for session in stale:
+            self._discard(session)
+        return found
+
+    def _start(self, spec: StdioPodSpec) -> StdioAttachSession:
+        pod_name = f"{spec.name}-{uuid.uuid4().hex[:8]}"
+        self.core_v1.create_namespaced_pod(
+            namespace=self.namespace, body=self.pod_manifest(pod_name, spec)
+        )
+        logger.info("Started stdio pod %s for %s", pod_name, spec.image)
+
+        session = StdioAttachSession(self.core_v1, self.namespace, pod_name)
+        try:
+            self._wait_for_running(pod_name)
+            session.connect()
+        except Exception as e:
+            self._discard(session)
+            raise StdioSessionError(f"Failed to start stdio pod {pod_name}: {e}")
+        return session
+
+    def _wait_for_running(self, pod_name: str) -> None:
+        watcher = watch.Watch()
+        try:
+            for event in watcher.stream(
+                self.core_v1.list_namespaced_pod,
+                namespace=self.namespace,
+                field_selector=f"metadata.name={pod_name}",
+                timeout_seconds=self.ready_timeout,
+            ):
+                phase = event["object"].status.phase
+                if phase == "Running":
+                    return
+                if phase in ("Succeeded", "Failed"):
+                    raise StdioSessionError(f"Pod {pod_name} exited ({phase})")
+        finally:
+            watcher.stop()
+
+        raise StdioSessionError(
+            f"Pod {pod_name} not running after {self.ready_timeout} seconds"
+        )
+
+    def _discard(self, session: StdioAttachSession) -> None:
+        session.close()
+        # Deleted in the background, together with other discarded pods
+        self._reaper.submit(session.pod_name)
+
+
+_pools: Dict[str, StdioPodPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_stdio_pool(core_v1, namespace: str) -> StdioPodPool:
+    """
+    Get the process-wide stdio pod pool of a namespace.
+
+    Args:
+        core_v1: Kubernetes CoreV1Api client, used if the pool is created
+        namespace: Namespace of the pool
+
+    Returns:
+        Stdio pod pool shared by backends and probes
+    """
+    with _pools_lock:
+        pool = _pools.get(namespace)
+        if pool is None:
+            pool = _pools[namespace] = StdioPodPool(core_v1, namespace)
+        return pool
+
+
+def close_stdio_pools() -> None:
+    """Delete the warm pods of every pool."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        try:
+            pool.close()
+        except Exception as e:
+            logger.debug("Failed to close stdio pool of %s: %s", pool.namespace, e)
+
+
+atexit.register(close_stdio_pools)
@@ -23,6 +23,7 @@ from rich.console import Console
 from rich.panel import Panel
 
 from mcp_template.backends import BaseDeploymentBackend
+from mcp_template.utils.image_utils import TOOLS_LABEL, build_tools_label
 
 logger = logging.getLogger(__name__)
 console = Console()
@@ -222,11 +223,10 @@ class PodmanDeploymentService(BaseDeploymentBackend):
                     s.bind(("", port_to_use))
                     s.listen(1)
                 except OSError:
-                    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as free_sock:
-                        free_sock.bind(("", 0))
-                        port_to_use = free_sock.getsockname()[1]
+                    # Let Podman assign a free port atomically when starting
+                    port_to_use = 0
                     logger.warning(
-                        f"Port {host_port} is in use, remapping to free port {port_to_use} for container port {container_port}"
+                        f"Port {host_port} is in use, remapping container port {container_port} to a free port"
                     )
             ports.extend(["-p", f"{port_to_use}:{container_port}"])
         return ports
@@ -765,7 +765,12 @@ class PodmanDeploymentService(BaseDeploymentBackend):
             )
             raise ValueError(f"Internal template {template_id} missing Dockerfile")
         logger.info(f"Building image {image_name} for internal template {template_id}")
-        build_command = ["podman", "build", "-t", image_name, str(template_dir)]
+        build_command = ["podman", "build", "-t", image_name]
+        if template_data.get("tools"):
+            # Declare the tools so discovery can read them without a container
+            tools_label = build_tools_label(template_data["tools"])
+            build_command.extend(["--label", f"{TOOLS_LABEL}={tools_label}"])
+        build_command.append(str(template_dir))
         self._run_command(build_command)
 
     def stop_deployment(self, deployment_name: str, force: bool = False) -> bool:
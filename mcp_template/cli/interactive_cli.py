@@ -37,6 +37,7 @@ from rich.table import Table
 from mcp_template.client import MCPClient
 from mcp_template.core.cache import CacheManager
 from mcp_template.core.response_formatter import ResponseFormatter
+from mcp_template.template.utils.search import get_search_index
 
 console = Console()
 logger = logging.getLogger(__name__)
@@ -69,9 +70,17 @@ def setup_completion():
     if not READLINE_AVAILABLE:
         return
 
+    # readline calls the completer with state 0, 1, 2... for the same text,
+    # so options are computed once per completion and then replayed
+    completion = {"text": None, "options": []}
+
     def completer(text, state):
         """Custom completer for interactive CLI."""
         try:
+            if state > 0 and completion["text"] == text:
+                options = completion["options"]
+                return options[state] if state < len(options) else None
+
             # Get available options
             options = []
 
@@ -96,9 +105,13 @@ def setup_completion():
                 ]:
                     # Try to complete template names
                     try:
+                        # Shares the index of the current registry snapshot
+                        # instead of listing and copying templates per key
                         session = get_session()
-                        templates = session.client.list_templates()
-                        options = [t for t in templates if t.startswith(text)]
+                        discovery = session.client.template_manager.template_discovery
+                        options = get_search_index(discovery.get_snapshot()).complete(
+                            text
+                        )
                     except:
                         options = []
                 elif cmd == "configure":
@@ -106,6 +119,8 @@ def setup_completion():
                     config_keys = ["backend", "timeout", "port", "host"]
                     options = [k for k in config_keys if k.startswith(text)]
 
+            completion["text"], completion["options"] = text, options
+
             # Return the state-th option
             return options[state] if state < len(options) else None
 
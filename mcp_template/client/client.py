@@ -156,8 +156,10 @@ class MCPClient:
                         ].append(deployment_id)
 
             for template_name, template_info in templates.items():
-                template_info["deployments"] = deployment_info.get(template_name, {})
-                templates[template_name] = template_info
+                templates[template_name] = {
+                    **template_info,
+                    "deployments": deployment_info.get(template_name, {}),
+                }
 
         return templates
 
@@ -8,9 +8,24 @@ and cache management utilities.
 import json
 import logging
 import os
+import threading
 import time
 from pathlib import Path
-from typing import Any, Dict, Optional, Union
+from typing import Any, Dict, Hashable, Optional, Tuple, Union
+
+from cachetools import LRUCache
+
+from mcp_template.core.cache_store import (
+    CACHE_FORMATS,
+    COMPACT_CACHE_HEADER,
+    MCP_CACHE_FILE_PATTERN,
+    SQLITE_CACHE_FILENAME,
+    CacheEntryInfo,
+    CacheStore,
+    FileCacheStore,
+    SQLiteCacheStore,
+    is_expired,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -25,7 +40,110 @@ if isinstance(MCP_DEFAULT_CACHE_MAX_AGE_HOURS, str):
         )
         MCP_DEFAULT_CACHE_MAX_AGE_HOURS = 24.0
 
-MCP_CACHE_FILE_PATTERN = os.getenv("MCP_CACHE_FILE_PATTERN", "*.tools.json")
+MCP_CACHE_FORMAT = os.getenv("MCP_CACHE_FORMAT", "json")
+
+# Storage engine: "file" (one file per key, default) or "sqlite"
+MCP_CACHE_STORAGE = os.getenv("MCP_CACHE_STORAGE", "file")
+CACHE_STORAGES = ("file", "sqlite")
+
+
+def _int_from_env(name: str, default: int) -> int:
+    """Read an integer setting from the environment, falling back to default."""
+    value = os.getenv(name)
+    if value is None:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        logger.warning(
+            "Value %s of %s is not a valid integer. Using default %d",
+            value,
+            name,
+            default,
+        )
+        return default
+
+
+MCP_CACHE_MEMORY_MAX_ENTRIES = _int_from_env("MCP_CACHE_MEMORY_MAX_ENTRIES", 128)
+
+# Store bounds enforced by the sweeper, 0 disables a bound
+MCP_CACHE_MAX_ENTRIES = _int_from_env("MCP_CACHE_MAX_ENTRIES", 1000)
+MCP_CACHE_MAX_BYTES = _int_from_env("MCP_CACHE_MAX_BYTES", 64 * 1024 * 1024)
+
+# Minimum number of seconds between two opportunistic sweeps of one store
+MCP_CACHE_SWEEP_INTERVAL = _int_from_env("MCP_CACHE_SWEEP_INTERVAL", 300)
+
+# Accesses are recorded in the store at most this often per entry, so repeated
+# hits from the memory tier don't each cost a write
+CACHE_ACCESS_RESOLUTION_SECONDS = 60
+
+__all__ = [
+    "CACHE_FORMATS",
+    "CACHE_STORAGES",
+    "COMPACT_CACHE_HEADER",
+    "MCP_CACHE_FILE_PATTERN",
+    "CacheEntryInfo",
+    "CacheManager",
+    "CacheStore",
+    "FileCacheStore",
+    "MemoryCacheTier",
+    "SQLiteCacheStore",
+]
+
+
+class MemoryCacheTier:
+    """
+    Bounded in-memory LRU of parsed cache entries.
+
+    Entries are keyed by (store location, cache key) and tagged with the
+    store's change stamp, e.g. a file's (mtime_ns, size), so an entry
+    rewritten by another process or CacheManager instance is detected with
+    a single cheap lookup.
+    """
+
+    def __init__(self, max_entries: int = MCP_CACHE_MEMORY_MAX_ENTRIES):
+        self._entries: LRUCache = LRUCache(maxsize=max(max_entries, 1))
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, stamp: Hashable) -> Optional[Dict[str, Any]]:
+        """Return the parsed entry for key if its stamp still matches."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] != stamp:
+                del self._entries[key]
+                return None
+            return entry[1]
+
+    def put(self, key: Hashable, stamp: Hashable, data: Dict[str, Any]):
+        """Store a parsed entry for key."""
+        with self._lock:
+            self._entries[key] = (stamp, data)
+
+    def discard(self, key: Hashable):
+        """Forget the entry for key, if any."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """Forget all entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Shared by all CacheManager instances so that the many managers created
+# across one process reuse each other's parsed entries.
+_memory_tier = MemoryCacheTier()
+
+# Per store location: time of the last sweep, and of the last recorded access
+# per key. Shared for the same reason as the memory tier.
+_last_sweeps: Dict[str, float] = {}
+_last_accesses: Dict[Tuple[str, str], float] = {}
+_sweep_lock = threading.Lock()
 
 
 class CacheManager:
@@ -37,12 +155,28 @@ class CacheManager:
     - Configurable cache duration
     - Cache cleanup utilities
     - Safe file operations
+    - In-memory LRU tier in front of the store, invalidated by change stamps
+    - Optional compact format whose header can be read without the payload
+    - Pluggable storage engines (files by default, or SQLite in WAL mode)
+    - Opportunistic sweeper removing expired entries and evicting the least
+      recently used ones beyond max_entries/max_bytes
+    - Entries record the max age they were written with, so managers with
+      different max ages can share a store without expiring each other's entries
+
+    Entries served from the memory tier are shared between callers and must
+    be treated as read-only.
     """
 
     def __init__(
         self,
         cache_dir: Optional[Path] = None,
         max_age_hours: Union[float, int] = MCP_DEFAULT_CACHE_MAX_AGE_HOURS,
+        use_memory_cache: bool = True,
+        cache_format: str = MCP_CACHE_FORMAT,
+        storage: Union[str, CacheStore] = MCP_CACHE_STORAGE,
+        max_entries: Optional[int] = MCP_CACHE_MAX_ENTRIES,
+        max_bytes: Optional[int] = MCP_CACHE_MAX_BYTES,
+        sweep_interval: float = MCP_CACHE_SWEEP_INTERVAL,
     ):
         """
         Initialize cache manager.
@@ -50,10 +184,38 @@ class CacheManager:
         Args:
             cache_dir: Directory to store cache files (defaults to ~/.mcp/cache)
             max_age_hours: Maximum age of cache entries in hours
+            use_memory_cache: Keep parsed entries in the shared in-memory tier
+            cache_format: On-disk format of the file store, "json" or "compact"
+            storage: Storage engine name ("file" or "sqlite") or a CacheStore
+            max_entries: Maximum number of stored entries (None or 0 for no limit)
+            max_bytes: Maximum total size of stored entries (None or 0 for no limit)
+            sweep_interval: Minimum seconds between sweeps triggered by writes
         """
         self.cache_dir = cache_dir or Path.home() / ".mcp" / "cache"
         self.max_age_hours = max_age_hours
-        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.cache_format = cache_format
+        self.store = self._create_store(storage)
+        self._memory = _memory_tier if use_memory_cache else None
+        self.memory_hits = 0
+        self.memory_misses = 0
+        self.max_entries = max_entries or None
+        self.max_bytes = max_bytes or None
+        self.sweep_interval = sweep_interval
+
+    def _create_store(self, storage: Union[str, CacheStore]) -> CacheStore:
+        """Create the storage engine for this manager."""
+        if isinstance(storage, CacheStore):
+            return storage
+
+        if storage == "file":
+            return FileCacheStore(self.cache_dir, self.cache_format)
+        elif storage == "sqlite":
+            return SQLiteCacheStore(self.cache_dir / SQLITE_CACHE_FILENAME)
+        else:
+            raise ValueError(
+                f"Unsupported cache storage: {storage}. "
+                f"Valid options are: {', '.join(CACHE_STORAGES)}"
+            )
 
     def get(self, key: str) -> Optional[Dict[str, Any]]:
         """
@@ -65,39 +227,64 @@ class CacheManager:
         Returns:
             Cached data if valid and not expired, None otherwise
         """
-        cache_file = self._get_cache_file(key)
-
-        if not cache_file.exists():
+        memory_key = (self.store.location, key)
+        stamp = self.store.stamp(key)
+        if stamp is None:
+            self._forget(key)
             logger.debug("Cache miss for key: %s", key)
             return None
 
-        try:
-            with open(cache_file, "r", encoding="utf-8") as f:
-                cached_data = json.load(f)
+        cached_data = (
+            self._memory.get(memory_key, stamp) if self._memory is not None else None
+        )
+
+        if cached_data is not None:
+            self.memory_hits += 1
+        else:
+            self.memory_misses += 1
+            try:
+                cached_data = self.store.read(key, self._cutoff(time.time()))
+            except KeyError:
+                logger.debug("Cache miss for key: %s", key)
+                return None
+            except (ValueError, OSError) as e:
+                logger.warning("Failed to load cache for key %s: %s", key, e)
+                self._remove_entry(key)
+                return None
 
             # Validate cache structure
             if not isinstance(cached_data, dict) or "timestamp" not in cached_data:
                 logger.warning("Invalid cache format for key: %s", key)
-                self._remove_cache_file(cache_file)
-                return None
-
-            # Check if cache is expired
-            cache_age_hours = (time.time() - cached_data["timestamp"]) / 3600
-            if cache_age_hours > self.max_age_hours:
-                logger.debug(
-                    "Cache expired for key %s (age: %.1fh)", key, cache_age_hours
-                )
-                self._remove_cache_file(cache_file)
+                self._remove_entry(key)
                 return None
 
-            logger.debug("Cache hit for key: %s", key)
-            return cached_data
+            if self._memory is not None and "data" in cached_data:
+                self._memory.put(memory_key, stamp, cached_data)
 
-        except (json.JSONDecodeError, OSError, KeyError) as e:
+        try:
+            # Check if cache is expired, by the max age it was written with
+            cache_age_hours = (time.time() - cached_data["timestamp"]) / 3600
+            max_age = cached_data.get("max_age")
+            max_age_hours = self.max_age_hours if max_age is None else max_age / 3600
+        except (TypeError, KeyError) as e:
             logger.warning("Failed to load cache for key %s: %s", key, e)
-            self._remove_cache_file(cache_file)
+            self._remove_entry(key)
+            return None
+
+        if cache_age_hours > max_age_hours:
+            logger.debug("Cache expired for key %s (age: %.1fh)", key, cache_age_hours)
+            if max_age is None:
+                # Only stale for this manager, others may still use it
+                self._forget(key)
+            else:
+                self._remove_entry(key)
             return None
 
+        logger.debug("Cache hit for key: %s", key)
+        self._record_access(key)
+        # Shallow copy so callers can't replace top-level fields of the shared entry
+        return dict(cached_data)
+
     def set(self, key: str, data: Dict[str, Any]) -> bool:
         """
         Store data in cache.
@@ -109,35 +296,32 @@ class CacheManager:
         Returns:
             True if successfully cached, False otherwise
         """
-        cache_file = self._get_cache_file(key)
-
         try:
             # Separate data from metadata to avoid contamination
-            cache_data = {"data": data, "timestamp": time.time(), "cache_key": key}
-
-            # Write to temporary file first, then rename for atomicity
-            temp_file = cache_file.with_suffix(f"{cache_file.suffix}.tmp")
-
-            with open(temp_file, "w", encoding="utf-8") as f:
-                json.dump(cache_data, f, indent=2, default=str)
+            cache_data = {
+                "data": data,
+                "timestamp": time.time(),
+                "cache_key": key,
+                "max_age": self.max_age_hours * 3600,
+            }
+            stamp = self.store.write(key, cache_data)
 
-            # Atomic rename
-            temp_file.rename(cache_file)
+            # Write-through to the memory tier. The entry is a JSON round-trip
+            # so it matches what was stored and is detached from `data`.
+            if self._memory is not None:
+                cache_data["data"] = json.loads(json.dumps(data, default=str))
+                self._memory.put((self.store.location, key), stamp, cache_data)
 
             logger.debug("Cached data for key: %s", key)
-            return True
 
-        except (OSError, TypeError) as e:
+        except (OSError, TypeError, ValueError) as e:
             logger.warning("Failed to cache data for key %s: %s", key, e)
-            # Clean up temp file if it exists
-            temp_file = cache_file.with_suffix(f"{cache_file.suffix}.tmp")
-            if temp_file.exists():
-                try:
-                    temp_file.unlink()
-                except OSError:
-                    pass
+            self._forget(key)
             return False
 
+        self._maybe_sweep()
+        return True
+
     def remove(self, key: str) -> bool:
         """
         Remove cached data for a key.
@@ -148,8 +332,7 @@ class CacheManager:
         Returns:
             True if removed or didn't exist, False on error
         """
-        cache_file = self._get_cache_file(key)
-        return self._remove_cache_file(cache_file)
+        return self._remove_entry(key)
 
     def delete(self, key: str) -> bool:
         """
@@ -168,38 +351,30 @@ class CacheManager:
         Clear all cached data.
 
         Returns:
-            Number of files removed
+            Number of entries removed
         """
-        removed_count = 0
+        if self._memory is not None:
+            self._memory.clear()
 
         try:
-            for cache_file in self.cache_dir.glob(MCP_CACHE_FILE_PATTERN):
-                if self._remove_cache_file(cache_file):
-                    removed_count += 1
-
+            removed_count = self.store.clear()
             logger.info("Cleared %d cache files", removed_count)
             return removed_count
 
         except OSError as e:
             logger.error("Error clearing cache: %s", e)
-            return removed_count
+            return 0
 
     def clear_expired(self) -> int:
         """
         Clear expired cache entries.
 
         Returns:
-            Number of expired files removed
+            Number of expired entries removed
         """
-        removed_count = 0
-        current_time = time.time()
-
         try:
-            for cache_file in self.cache_dir.glob(MCP_CACHE_FILE_PATTERN):
-                if self._is_cache_expired(cache_file, current_time):
-                    if self._remove_cache_file(cache_file):
-                        removed_count += 1
-                        logger.debug("Removed expired cache: %s", cache_file.name)
+            now = time.time()
+            removed_count = self.store.clear_expired(self._cutoff(now), now)
 
             if removed_count > 0:
                 logger.info("Cleared %d expired cache files", removed_count)
@@ -208,25 +383,61 @@ class CacheManager:
 
         except OSError as e:
             logger.error("Error clearing expired cache: %s", e)
-            return removed_count
+            return 0
 
-    def _is_cache_expired(self, cache_file: Path, current_time: float) -> bool:
-        """Check if a cache file is expired or corrupted."""
-        try:
-            with open(cache_file, "r", encoding="utf-8") as f:
-                cached_data = json.load(f)
+    def sweep(self) -> int:
+        """
+        Remove expired entries and evict least recently used entries until the
+        store is within max_entries and max_bytes.
+
+        Entries expire after the max age they were written with. Only entry
+        metadata (size, access and write times, max age) is read, so a sweep
+        never decodes cached payloads.
 
-            # Check if expired
-            if "timestamp" in cached_data:
-                cache_age_hours = (current_time - cached_data["timestamp"]) / 3600
-                return cache_age_hours > self.max_age_hours
+        Returns:
+            Number of entries removed
+        """
+        now = time.time()
+        with _sweep_lock:
+            _last_sweeps[self.store.location] = now
+
+        try:
+            entries = self.store.scan()
+        except OSError as e:
+            logger.error("Error scanning cache: %s", e)
+            return 0
+
+        cutoff = self._cutoff(now)
+        doomed = []
+        live = []
+        for entry in entries:
+            if self._entry_expired(entry, cutoff, now):
+                doomed.append(entry.handle)
             else:
-                # Treat files without timestamp as expired
-                return True
+                live.append(entry)
+        live.sort(key=lambda entry: entry.accessed_at)
+
+        # Oldest accessed first, until both bounds hold
+        remaining_entries = len(live)
+        remaining_bytes = sum(entry.size for entry in live)
+        for entry in live:
+            if not self._exceeds_bounds(remaining_entries, remaining_bytes):
+                break
+            doomed.append(entry.handle)
+            remaining_entries -= 1
+            remaining_bytes -= entry.size
+
+        if not doomed:
+            return 0
 
-        except (json.JSONDecodeError, OSError, KeyError):
-            # Treat corrupted files as expired
-            return True
+        try:
+            removed_count = self.store.evict(doomed)
+        except OSError as e:
+            logger.error("Error evicting cache entries: %s", e)
+            return 0
+
+        logger.info("Swept %d cache entries", removed_count)
+        return removed_count
 
     def get_cache_info(self) -> Dict[str, Any]:
         """
@@ -236,33 +447,21 @@ class CacheManager:
             Dictionary with cache statistics
         """
         try:
-            cache_files = list(self.cache_dir.glob(MCP_CACHE_FILE_PATTERN))
-            total_files = len(cache_files)
-
-            if total_files == 0:
-                return {
-                    "total_files": 0,
-                    "expired_files": 0,
-                    "valid_files": 0,
-                    "cache_dir": str(self.cache_dir),
-                    "max_age_hours": self.max_age_hours,
-                }
-
-            expired_count = 0
-            current_time = time.time()
-
-            for cache_file in cache_files:
-                if self._is_cache_expired(cache_file, current_time):
-                    expired_count += 1
-
-            valid_count = total_files - expired_count
+            now = time.time()
+            total_files, expired_count = self.store.count(self._cutoff(now), now)
 
             return {
                 "total_files": total_files,
                 "expired_files": expired_count,
-                "valid_files": valid_count,
+                "valid_files": total_files - expired_count,
                 "cache_dir": str(self.cache_dir),
                 "max_age_hours": self.max_age_hours,
+                "cache_format": self.cache_format,
+                "storage": type(self.store).__name__,
+                "location": self.store.location,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                **self._memory_stats(),
             }
 
         except OSError as e:
@@ -273,20 +472,57 @@ class CacheManager:
                 "max_age_hours": self.max_age_hours,
             }
 
-    def _get_cache_file(self, key: str) -> Path:
-        """Get cache file path for a key."""
-        # Sanitize key for filename
-        safe_key = "".join(c for c in key if c.isalnum() or c in "._-")
-        return self.cache_dir / f"{safe_key}.tools.json"
-
-    def _remove_cache_file(self, cache_file: Path) -> bool:
-        """Safely remove a cache file."""
-        try:
-            if cache_file.exists():
-                cache_file.unlink()
-                logger.debug("Removed cache file: %s", cache_file.name)
+    def _cutoff(self, current_time: float) -> float:
+        """Timestamp below which entries are expired."""
+        return current_time - self.max_age_hours * 3600
+
+    def _entry_expired(self, entry: CacheEntryInfo, cutoff: float, now: float) -> bool:
+        """Check a scanned entry against its own max age."""
+        max_age = entry.max_age
+        if max_age is None and entry.timestamp < cutoff:
+            # Only entries this manager would expire need a closer look; a
+            # longer-lived entry must survive, a shorter-lived one can wait
+            # for the next sweep of a manager with its max age
+            max_age = self.store.max_age(entry.handle)
+        return is_expired(entry.timestamp, max_age, cutoff, now)
+
+    def _exceeds_bounds(self, entries: int, total_bytes: int) -> bool:
+        """Check whether the store is over max_entries or max_bytes."""
+        if self.max_entries is not None and entries > self.max_entries:
             return True
-
-        except OSError as e:
-            logger.warning("Failed to remove cache file %s: %s", cache_file.name, e)
-            return False
+        return self.max_bytes is not None and total_bytes > self.max_bytes
+
+    def _maybe_sweep(self):
+        """Sweep the store if it hasn't been swept for sweep_interval seconds."""
+        with _sweep_lock:
+            last_sweep = _last_sweeps.get(self.store.location, 0.0)
+            if time.time() - last_sweep < self.sweep_interval:
+                return
+        self.sweep()
+
+    def _record_access(self, key: str):
+        """Record a cache hit in the store for LRU eviction, at a coarse resolution."""
+        access_key = (self.store.location, key)
+        now = time.time()
+        if now - _last_accesses.get(access_key, 0.0) < CACHE_ACCESS_RESOLUTION_SECONDS:
+            return
+        _last_accesses[access_key] = now
+        self.store.touch(key)
+
+    def _memory_stats(self) -> Dict[str, int]:
+        """Get hit/miss counters of the in-memory tier."""
+        return {
+            "memory_hits": self.memory_hits,
+            "memory_misses": self.memory_misses,
+            "memory_entries": len(self._memory) if self._memory is not None else 0,
+        }
+
+    def _forget(self, key: str):
+        """Drop a key from the memory tier."""
+        if self._memory is not None:
+            self._memory.discard((self.store.location, key))
+
+    def _remove_entry(self, key: str) -> bool:
+        """Safely remove an entry from the memory tier and the store."""
+        self._forget(key)
+        return self.store.delete(key)
@@ -0,0 +1,691 @@
+"""
+Storage engines for the cache manager.
+
+A store persists cache entries ({"data", "timestamp", "cache_key", "max_age"})
+and knows how to find expired ones. Each entry carries the max age in seconds
+of the manager that wrote it, so entries written with different lifetimes can
+share one store. CacheManager owns the expiry policy and the in-memory tier;
+stores only deal with persistence.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import struct
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import (
+    Any,
+    BinaryIO,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+logger = logging.getLogger(__name__)
+
+MCP_CACHE_FILE_PATTERN = os.getenv("MCP_CACHE_FILE_PATTERN", "*.tools.json")
+
+# On-disk format of the file store: "json" (indented JSON document) or
+# "compact" (fixed-size binary header followed by the key and a compact
+# JSON payload)
+CACHE_FORMATS = ("json", "compact")
+COMPACT_CACHE_FILE_PATTERN = "*.tools.mcpc"
+
+# magic, version, padding, timestamp, max age, key length, payload length
+COMPACT_CACHE_MAGIC = b"MCPC"
+COMPACT_CACHE_VERSION = 2
+COMPACT_CACHE_HEADER = struct.Struct("<4sB3xddII")
+
+# Version 1 headers, written before entries recorded their max age
+_COMPACT_CACHE_HEADER_V1 = struct.Struct("<4sB3xdII")
+
+SQLITE_CACHE_FILENAME = "cache.sqlite3"
+
+
+def is_expired(
+    timestamp: float, max_age: Optional[float], cutoff: float, now: float
+) -> bool:
+    """
+    Check whether an entry is expired.
+
+    Args:
+        timestamp: Write time of the entry
+        max_age: Max age in seconds recorded with the entry, if any
+        cutoff: Timestamp below which entries without a max age are expired
+        now: Current time
+
+    Returns:
+        True if the entry outlived its own max age, or the cutoff if it has none
+    """
+    if max_age is None:
+        return timestamp < cutoff
+    return timestamp + max_age < now
+
+
+def _encode_payload(data: Any) -> bytes:
+    """Encode cache data as compact JSON."""
+    return json.dumps(data, separators=(",", ":"), default=str).encode("utf-8")
+
+
+class CacheEntryInfo(NamedTuple):
+    """Metadata of a stored entry, gathered without decoding it."""
+
+    handle: Hashable
+    size: int
+    accessed_at: float
+    timestamp: float
+    # Max age in seconds, None if unknown or not gathered by scan()
+    max_age: Optional[float] = None
+
+
+class CacheStore(ABC):
+    """Abstract base class for cache storage engines."""
+
+    @property
+    @abstractmethod
+    def location(self) -> str:
+        """Human readable location of the store (directory or database path)."""
+
+    @abstractmethod
+    def stamp(self, key: str) -> Optional[Hashable]:
+        """
+        Get a cheap token that changes whenever the stored entry changes.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Change token, or None if there is no entry for the key
+        """
+
+    @abstractmethod
+    def read(self, key: str, cutoff: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Read an entry.
+
+        Expired entries may be returned without their "data" field so callers
+        can reject them without paying for decoding.
+
+        Args:
+            key: Cache key
+            cutoff: Timestamp below which the entry is expired, if it has no
+                max age of its own
+
+        Returns:
+            Cache entry
+
+        Raises:
+            KeyError: If there is no entry for the key
+            ValueError: If the entry is corrupted
+            OSError: If the store can't be read
+        """
+
+    @abstractmethod
+    def write(self, key: str, cache_data: Dict[str, Any]) -> Hashable:
+        """
+        Write an entry atomically.
+
+        Args:
+            key: Cache key
+            cache_data: Entry with "data", "timestamp", "cache_key" and
+                optionally "max_age"
+
+        Returns:
+            Change token of the written entry
+        """
+
+    @abstractmethod
+    def delete(self, key: str) -> bool:
+        """Delete an entry. Returns True if removed or absent."""
+
+    @abstractmethod
+    def clear(self) -> int:
+        """Delete all entries. Returns the number of entries removed."""
+
+    @abstractmethod
+    def clear_expired(self, cutoff: float, now: Optional[float] = None) -> int:
+        """
+        Delete expired (and corrupted) entries.
+
+        Entries expire after their own max age, entries without one when older
+        than cutoff.
+        """
+
+    @abstractmethod
+    def count(self, cutoff: float, now: Optional[float] = None) -> Tuple[int, int]:
+        """Return (total entries, expired or corrupted entries)."""
+
+    @abstractmethod
+    def touch(self, key: str):
+        """Record an access to an entry without changing its change token."""
+
+    @abstractmethod
+    def scan(self) -> List[CacheEntryInfo]:
+        """
+        List size, last access and write time of every entry.
+
+        Only metadata is read, so this is cheap enough to run periodically.
+
+        Returns:
+            Entry metadata; handles are only meaningful to evict()
+        """
+
+    def max_age(self, handle: Hashable) -> Optional[float]:
+        """
+        Read the max age of an entry that scan() returned without one.
+
+        Args:
+            handle: Entry handle from scan()
+
+        Returns:
+            Max age in seconds, or None if the entry has none
+        """
+        return None
+
+    @abstractmethod
+    def evict(self, handles: Iterable[Hashable]) -> int:
+        """Delete the entries identified by scan() handles. Returns the count."""
+
+
+class FileCacheStore(CacheStore):
+    """
+    One file per key in a cache directory.
+
+    Writes go to a uniquely named temporary file that is renamed into place,
+    so concurrent writers never clobber each other's partial files.
+    """
+
+    def __init__(self, cache_dir: Path, cache_format: str = "json"):
+        """
+        Initialize file store.
+
+        Args:
+            cache_dir: Directory to store cache files
+            cache_format: On-disk format, "json" or "compact"
+        """
+        if cache_format not in CACHE_FORMATS:
+            raise ValueError(
+                f"Unsupported cache format: {cache_format}. "
+                f"Valid options are: {', '.join(CACHE_FORMATS)}"
+            )
+
+        self.cache_dir = cache_dir
+        self.cache_format = cache_format
+        self.file_pattern = (
+            COMPACT_CACHE_FILE_PATTERN
+            if cache_format == "compact"
+            else MCP_CACHE_FILE_PATTERN
+        )
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    @property
+    def location(self) -> str:
+        return str(self.cache_dir)
+
+    def path_for(self, key: str) -> Path:
+        """Get cache file path for a key."""
+        # Sanitize key for filename
+        safe_key = "".join(c for c in key if c.isalnum() or c in "._-")
+        suffix = ".tools.mcpc" if self.cache_format == "compact" else ".tools.json"
+        return self.cache_dir / f"{safe_key}{suffix}"
+
+    def stamp(self, key: str) -> Optional[Hashable]:
+        try:
+            stat = self.path_for(key).stat()
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def read(self, key: str, cutoff: Optional[float] = None) -> Dict[str, Any]:
+        try:
+            with open(self.path_for(key), "rb") as f:
+                return self._deserialize(f, cutoff)
+        except FileNotFoundError:
+            raise KeyError(key)
+
+    def write(self, key: str, cache_data: Dict[str, Any]) -> Hashable:
+        cache_file = self.path_for(key)
+        serialized = self._serialize(cache_data)
+
+        # Write to a unique temporary file first, then rename for atomicity
+        fd, temp_name = tempfile.mkstemp(
+            dir=self.cache_dir, prefix=f".{cache_file.name}.", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(serialized)
+            os.replace(temp_name, cache_file)
+        except BaseException:
+            try:
+                os.unlink(temp_name)
+            except OSError:
+                pass
+            raise
+
+        stat = cache_file.stat()
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def delete(self, key: str) -> bool:
+        return self._remove(self.path_for(key))
+
+    def clear(self) -> int:
+        removed_count = 0
+        for cache_file in self.cache_dir.glob(self.file_pattern):
+            if self._remove(cache_file):
+                removed_count += 1
+        return removed_count
+
+    def clear_expired(self, cutoff: float, now: Optional[float] = None) -> int:
+        now = time.time() if now is None else now
+        removed_count = 0
+        for cache_file in self.cache_dir.glob(self.file_pattern):
+            if self._is_expired(cache_file, cutoff, now) and self._remove(cache_file):
+                removed_count += 1
+                logger.debug("Removed expired cache: %s", cache_file.name)
+        return removed_count
+
+    def count(self, cutoff: float, now: Optional[float] = None) -> Tuple[int, int]:
+        now = time.time() if now is None else now
+        total = expired = 0
+        for cache_file in self.cache_dir.glob(self.file_pattern):
+            total += 1
+            if self._is_expired(cache_file, cutoff, now):
+                expired += 1
+        return total, expired
+
+    def touch(self, key: str):
+        # Only the access time is bumped; the mtime (and so the stamp) is kept
+        cache_file = self.path_for(key)
+        try:
+            stat = cache_file.stat()
+            os.utime(cache_file, ns=(time.time_ns(), stat.st_mtime_ns))
+        except OSError:
+            pass
+
+    def scan(self) -> List[CacheEntryInfo]:
+        entries = []
+        for cache_file in self.cache_dir.glob(self.file_pattern):
+            try:
+                stat = cache_file.stat()
+            except OSError:
+                continue
+            # Files are only ever replaced as a whole, so the mtime is the
+            # write time and entries don't need to be parsed for it. The max
+            # age is inside the file and only read on demand by max_age().
+            entries.append(
+                CacheEntryInfo(cache_file, stat.st_size, stat.st_atime, stat.st_mtime)
+            )
+        return entries
+
+    def max_age(self, handle: Hashable) -> Optional[float]:
+        try:
+            return self._read_expiry(handle)[1]
+        except (ValueError, OSError, TypeError, AttributeError):
+            return None
+
+    def evict(self, handles: Iterable[Hashable]) -> int:
+        return sum(1 for cache_file in handles if self._remove(cache_file))
+
+    def _is_expired(self, cache_file: Path, cutoff: float, now: float) -> bool:
+        """Check if a cache file is expired or corrupted."""
+        try:
+            timestamp, max_age = self._read_expiry(cache_file)
+            # Treat files without timestamp as expired
+            return timestamp is None or is_expired(timestamp, max_age, cutoff, now)
+        except (ValueError, OSError, TypeError, AttributeError):
+            # Treat corrupted files as expired
+            return True
+
+    def _read_expiry(self, cache_file: Path) -> Tuple[Optional[float], Optional[float]]:
+        """Read (timestamp, max age) of a cache file, decoding only the header if possible."""
+        with open(cache_file, "rb") as f:
+            if self.cache_format == "compact":
+                return self._read_compact_header(f)[:2]
+
+            entry = json.load(f)
+            return entry.get("timestamp"), entry.get("max_age")
+
+    def _remove(self, cache_file: Path) -> bool:
+        """Safely remove a cache file."""
+        try:
+            cache_file.unlink()
+            logger.debug("Removed cache file: %s", cache_file.name)
+            return True
+        except FileNotFoundError:
+            return True
+        except OSError as e:
+            logger.warning("Failed to remove cache file %s: %s", cache_file.name, e)
+            return False
+
+    def _serialize(self, cache_data: Dict[str, Any]) -> bytes:
+        """Encode a cache entry in the configured format."""
+        if self.cache_format != "compact":
+            return json.dumps(cache_data, indent=2, default=str).encode("utf-8")
+
+        key = cache_data["cache_key"].encode("utf-8")
+        payload = _encode_payload(cache_data["data"])
+        max_age = cache_data.get("max_age")
+        header = COMPACT_CACHE_HEADER.pack(
+            COMPACT_CACHE_MAGIC,
+            COMPACT_CACHE_VERSION,
+            cache_data["timestamp"],
+            -1.0 if max_age is None else max_age,
+            len(key),
+            len(payload),
+        )
+        return header + key + payload
+
+    def _deserialize(
+        self, stream: BinaryIO, cutoff: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Decode a cache entry written by _serialize."""
+        if self.cache_format != "compact":
+            return json.load(stream)
+
+        timestamp, max_age, key_length, payload_length = self._read_compact_header(
+            stream
+        )
+        cache_key = stream.read(key_length).decode("utf-8")
+        entry = {"timestamp": timestamp, "cache_key": cache_key, "max_age": max_age}
+
+        # Expired entries are returned without decoding the payload
+        if cutoff is not None and is_expired(timestamp, max_age, cutoff, time.time()):
+            return entry
+
+        payload = stream.read(payload_length)
+        if len(payload) != payload_length:
+            raise ValueError("Truncated cache payload")
+
+        entry["data"] = json.loads(payload)
+        return entry
+
+    def _read_compact_header(
+        self, stream: BinaryIO
+    ) -> Tuple[float, Optional[float], int, int]:
+        """Read (timestamp, max age, key length, payload length) from a compact entry."""
+        header = stream.read(_COMPACT_CACHE_HEADER_V1.size)
+        if len(header) != _COMPACT_CACHE_HEADER_V1.size:
+            raise ValueError("Truncated cache header")
+
+        magic, version = header[:4], header[4]
+        if magic != COMPACT_CACHE_MAGIC or version not in (1, COMPACT_CACHE_VERSION):
+            raise ValueError("Not a compact cache file")
+
+        if version == 1:
+            _, _, timestamp, key_length, payload_length = (
+                _COMPACT_CACHE_HEADER_V1.unpack(header)
+            )
+            return timestamp, None, key_length, payload_length
+
+        rest = COMPACT_CACHE_HEADER.size - len(header)
+        header += stream.read(rest)
+        if len(header) != COMPACT_CACHE_HEADER.size:
+            raise ValueError("Truncated cache header")
+
+        _, _, timestamp, max_age, key_length, payload_length = (
+            COMPACT_CACHE_HEADER.unpack(header)
+        )
+        return (
+            timestamp,
+            None if max_age < 0 else max_age,
+            key_length,
+            payload_length,
+        )
+
+
+class SQLiteCacheStore(CacheStore):
+    """
+    Single SQLite database in WAL mode.
+
+    WAL lets readers proceed without blocking on writers, upserts are atomic
+    across processes, and the expiry index turns expiry scans and bulk
+    expiry into single indexed queries instead of directory walks.
+    """
+
+    # Entries past their own expiry, or past the cutoff if they were written
+    # without one; both branches are served by idx_cache_entries_expires_at.
+    # Parameters are (now, cutoff).
+    _EXPIRED = "(expires_at < ? OR (expires_at IS NULL AND timestamp < ?))"
+
+    def __init__(self, db_path: Path, busy_timeout_ms: int = 5000):
+        """
+        Initialize SQLite store.
+
+        Args:
+            db_path: Path of the database file
+            busy_timeout_ms: How long writers wait for the write lock
+        """
+        self.db_path = db_path
+        self.busy_timeout_ms = busy_timeout_ms
+        self._local = threading.local()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        conn = self._connection()
+        with conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS cache_entries (
+                    cache_key TEXT PRIMARY KEY,
+                    timestamp REAL NOT NULL,
+                    version INTEGER NOT NULL DEFAULT 1,
+                    payload BLOB NOT NULL,
+                    size INTEGER NOT NULL DEFAULT 0,
+                    accessed_at REAL NOT NULL DEFAULT 0,
+                    max_age REAL,
+                    expires_at REAL
+                )
+                """)
+            self._migrate(conn)
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_cache_entries_timestamp "
+                "ON cache_entries (timestamp)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_cache_entries_accessed_at "
+                "ON cache_entries (accessed_at)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_cache_entries_expires_at "
+                "ON cache_entries (expires_at, timestamp)"
+            )
+
+    @staticmethod
+    def _migrate(conn: sqlite3.Connection):
+        """Add the accounting columns to databases created before they existed."""
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(cache_entries)")}
+        if "size" not in columns:
+            conn.execute(
+                "ALTER TABLE cache_entries ADD COLUMN size INTEGER NOT NULL DEFAULT 0"
+            )
+            conn.execute("UPDATE cache_entries SET size = LENGTH(payload)")
+        if "accessed_at" not in columns:
+            conn.execute(
+                "ALTER TABLE cache_entries "
+                "ADD COLUMN accessed_at REAL NOT NULL DEFAULT 0"
+            )
+            conn.execute("UPDATE cache_entries SET accessed_at = timestamp")
+        if "max_age" not in columns:
+            # Existing entries have no recorded max age and expire by cutoff
+            conn.execute("ALTER TABLE cache_entries ADD COLUMN max_age REAL")
+        if "expires_at" not in columns:
+            conn.execute("ALTER TABLE cache_entries ADD COLUMN expires_at REAL")
+            conn.execute(
+                "UPDATE cache_entries SET expires_at = timestamp + max_age "
+                "WHERE max_age IS NOT NULL"
+            )
+
+    @property
+    def location(self) -> str:
+        return str(self.db_path)
+
+    def _connection(self) -> sqlite3.Connection:
+        """Get this thread's connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                str(self.db_path), timeout=self.busy_timeout_ms / 1000
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def stamp(self, key: str) -> Optional[Hashable]:
+        try:
+            row = (
+                self._connection()
+                .execute(
+                    "SELECT timestamp, version FROM cache_entries WHERE cache_key = ?",
+                    (key,),
+                )
+                .fetchone()
+            )
+        except sqlite3.Error as e:
+            logger.warning("Failed to read cache stamp for key %s: %s", key, e)
+            return None
+        return tuple(row) if row else None
+
+    def read(self, key: str, cutoff: Optional[float] = None) -> Dict[str, Any]:
+        try:
+            row = (
+                self._connection()
+                .execute(
+                    "SELECT timestamp, max_age, payload FROM cache_entries "
+                    "WHERE cache_key = ?",
+                    (key,),
+                )
+                .fetchone()
+            )
+        except sqlite3.Error as e:
+            raise OSError(str(e)) from e
+
+        if row is None:
+            raise KeyError(key)
+
+        timestamp, max_age, payload = row
+        entry = {"timestamp": timestamp, "cache_key": key, "max_age": max_age}
+        if cutoff is None or not is_expired(timestamp, max_age, cutoff, time.time()):
+            entry["data"] = json.loads(payload)
+        return entry
+
+    def write(self, key: str, cache_data: Dict[str, Any]) -> Hashable:
+        payload = _encode_payload(cache_data["data"])
+        timestamp = cache_data["timestamp"]
+        max_age = cache_data.get("max_age")
+        expires_at = None if max_age is None else timestamp + max_age
+        try:
+            with self._connection() as conn:
+                conn.execute(
+                    """
+                    INSERT INTO cache_entries
+                        (cache_key, timestamp, version, payload, size, accessed_at,
+                         max_age, expires_at)
+                    VALUES (?, ?, 1, ?, ?, ?, ?, ?)
+                    ON CONFLICT (cache_key) DO UPDATE SET
+                        timestamp = excluded.timestamp,
+                        version = cache_entries.version + 1,
+                        payload = excluded.payload,
+                        size = excluded.size,
+                        accessed_at = excluded.accessed_at,
+                        max_age = excluded.max_age,
+                        expires_at = excluded.expires_at
+                    """,
+                    (
+                        key,
+                        timestamp,
+                        payload,
+                        len(payload),
+                        timestamp,
+                        max_age,
+                        expires_at,
+                    ),
+                )
+                row = conn.execute(
+                    "SELECT timestamp, version FROM cache_entries WHERE cache_key = ?",
+                    (key,),
+                ).fetchone()
+        except sqlite3.Error as e:
+            raise OSError(str(e)) from e
+
+        return tuple(row)
+
+    def delete(self, key: str) -> bool:
+        try:
+            with self._connection() as conn:
+                conn.execute("DELETE FROM cache_entries WHERE cache_key = ?", (key,))
+            return True
+        except sqlite3.Error as e:
+            logger.warning("Failed to remove cache entry %s: %s", key, e)
+            return False
+
+    def clear(self) -> int:
+        try:
+            with self._connection() as conn:
+                return conn.execute("DELETE FROM cache_entries").rowcount
+        except sqlite3.Error as e:
+            raise OSError(str(e)) from e
+
+    def clear_expired(self, cutoff: float, now: Optional[float] = None) -> int:
+        now = time.time() if now is None else now
+        try:
+            with self._connection() as conn:
+                return conn.execute(
+                    f"DELETE FROM cache_entries WHERE {self._EXPIRED}", (now, cutoff)
+                ).rowcount
+        except sqlite3.Error as e:
+            raise OSError(str(e)) from e
+
+    def count(self, cutoff: float, now: Optional[float] = None) -> Tuple[int, int]:
+        now = time.time() if now is None else now
+        conn = self._connection()
+        try:
+            (total,) = conn.execute("SELECT COUNT(*) FROM cache_entries").fetchone()
+            (expired,) = conn.execute(
+                f"SELECT COUNT(*) FROM cache_entries WHERE {self._EXPIRED}",
+                (now, cutoff),
+            ).fetchone()
+        except sqlite3.Error as e:
+            raise OSError(str(e)) from e
+        return total, expired
+
+    def touch(self, key: str):
+        try:
+            with self._connection() as conn:
+                conn.execute(
+                    "UPDATE cache_entries SET accessed_at = ? WHERE cache_key = ?",
+                    (time.time(), key),
+                )
+        except sqlite3.Error as e:
+            logger.debug("Failed to record access for key %s: %s", key, e)
+
+    def scan(self) -> List[CacheEntryInfo]:
+        try:
+            rows = (
+                self._connection()
+                .execute(
+                    "SELECT cache_key, size, accessed_at, timestamp, max_age "
+                    "FROM cache_entries"
+                )
+                .fetchall()
+            )
+        except sqlite3.Error as e:
+            raise OSError(str(e)) from e
+        return [CacheEntryInfo(*row) for row in rows]
+
+    def evict(self, handles: Iterable[Hashable]) -> int:
+        try:
+            with self._connection() as conn:
+                return conn.executemany(
+                    "DELETE FROM cache_entries WHERE cache_key = ?",
+                    [(key,) for key in handles],
+                ).rowcount
+        except sqlite3.Error as e:
+            raise OSError(str(e)) from e
@@ -5,12 +5,25 @@ This module provides a unified way to process configuration from multiple source
 and handle special properties like volume mounts and command arguments.
 """
 
+import copy
 import json
 import logging
+import threading
+from dataclasses import dataclass
+from functools import cached_property
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
 
 import yaml
+from cachetools import LRUCache
+
+from mcp_template.core.schema_validator import SchemaValidator, schema_hash
+
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    # PyYAML built without libyaml
+    from yaml import SafeLoader as YamlLoader
 
 logger = logging.getLogger(__name__)
 
@@ -39,6 +52,373 @@ class ValidationResult:
         return {"valid": self.valid, "errors": self.errors, "warnings": self.warnings}
 
 
+# Number of compiled configuration plans kept in memory
+CONFIG_PLAN_CACHE_SIZE = 128
+
+# Number of parsed configuration files kept in memory
+CONFIG_FILE_CACHE_SIZE = 64
+
+# Docker command fragments users paste into volume and argument values
+DOCKER_ARTIFACTS = ["--volume ", "-v ", "--env ", "-e "]
+DOCKER_END_ARTIFACTS = ["--volume", "-v", "--env", "-e"]
+
+# Nested locations config files commonly use for well-known properties
+COMMON_CONFIG_PATTERNS = {
+    "log_level": ["logging.level", "log.level"],
+    "enable_audit_logging": [
+        "logging.enableAudit",
+        "logging.audit",
+        "log.audit",
+    ],
+    "read_only_mode": ["security.readOnly", "security.readonly", "readonly"],
+    "max_file_size": [
+        "security.maxFileSize",
+        "limits.maxFileSize",
+        "performance.maxFileSize",
+    ],
+    "allowed_directories": [
+        "security.allowedDirs",
+        "security.directories",
+        "paths.allowed",
+    ],
+    "exclude_patterns": [
+        "security.excludePatterns",
+        "security.exclude",
+        "filters.exclude",
+    ],
+    "max_concurrent_operations": [
+        "performance.maxConcurrentOperations",
+        "limits.concurrent",
+    ],
+    "timeout_ms": [
+        "performance.timeoutMs",
+        "performance.timeout",
+        "limits.timeout",
+    ],
+}
+
+
+def _snake_to_camel(snake_str: str) -> str:
+    components = snake_str.split("_")
+    return components[0] + "".join(word.capitalize() for word in components[1:])
+
+
+def _common_patterns(prop_name: str) -> List[str]:
+    """Generate common nested configuration patterns for a property."""
+    patterns = list(COMMON_CONFIG_PATTERNS.get(prop_name, []))
+
+    # Generate generic patterns
+    camel_name = _snake_to_camel(prop_name)
+    patterns.extend(
+        [
+            f"config.{prop_name}",
+            f"settings.{prop_name}",
+            f"options.{prop_name}",
+            f"config.{camel_name}",
+            f"settings.{camel_name}",
+            f"options.{camel_name}",
+        ]
+    )
+    return patterns
+
+
+def _to_boolean(value: Any) -> bool:
+    return str(value).lower() in ("true", "1", "yes")
+
+
+def _to_array_string(value: Any) -> str:
+    if isinstance(value, str):
+        return value
+    return ",".join(str(v) for v in value)
+
+
+# Converters applied to CLI config values, by schema type
+_TYPE_CONVERTERS: Dict[str, Callable[[Any], Any]] = {
+    "boolean": _to_boolean,
+    "integer": int,
+    "number": float,
+    "array": _to_array_string,
+}
+
+
+def _parse_boolean(value: str) -> Any:
+    lowered = value.strip().lower()
+    if lowered in ("true", "1", "yes"):
+        return True
+    if lowered in ("false", "0", "no"):
+        return False
+    return value
+
+
+def _parse_array(value: str) -> List[str]:
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+# Parsers turning env var strings back into typed values for validation
+_ENV_PARSERS: Dict[str, Callable[[str], Any]] = {
+    "boolean": _parse_boolean,
+    "integer": int,
+    "number": float,
+    "array": _parse_array,
+    "object": json.loads,
+}
+
+
+@dataclass(frozen=True)
+class PropertyPlan:
+    """Everything needed to process one config_schema property."""
+
+    name: str
+    schema: Dict[str, Any]
+    env_mapping: str
+    type: str
+    convert: Callable[[Any], Any]
+    parse: Optional[Callable[[str], Any]]
+    file_mapping: Optional[str]
+    nested_paths: Tuple[Tuple[str, ...], ...]
+    volume_mount: bool
+    command_arg: bool
+
+
+class ConfigPlan:
+    """
+    A template's config_schema compiled into the lookups configuration
+    processing needs, so the schema is walked once instead of on every call.
+    """
+
+    def __init__(self, config_schema: Dict[str, Any]):
+        """
+        Compile a plan for a config schema.
+
+        Args:
+            config_schema: The template's config_schema
+        """
+        self.schema = config_schema or {}
+        self.properties: Dict[str, Any] = (config_schema or {}).get(
+            "properties", {}
+        ) or {}
+        self.property_plans: Tuple[PropertyPlan, ...] = tuple(
+            self._compile_property(name, schema or {})
+            for name, schema in self.properties.items()
+        )
+
+        # CLI keys may name a property or its env mapping, the first
+        # property matching either wins
+        self.by_key: Dict[str, PropertyPlan] = {}
+        for prop in self.property_plans:
+            self.by_key.setdefault(prop.name, prop)
+            self.by_key.setdefault(prop.env_mapping, prop)
+
+        self.mount_plans: Tuple[PropertyPlan, ...] = tuple(
+            prop
+            for prop in self.property_plans
+            if prop.volume_mount or prop.command_arg
+        )
+
+    @cached_property
+    def validator(self) -> "ConfigValidator":
+        """Validator for configs of this schema, compiled on first use."""
+        return ConfigValidator(self)
+
+    @staticmethod
+    def _compile_property(name: str, schema: Dict[str, Any]) -> PropertyPlan:
+        prop_type = schema.get("type", "string")
+        if not isinstance(prop_type, str):
+            # Union types are validated as given, without conversion
+            prop_type = ""
+        file_mapping = schema.get("file_mapping")
+        nested_paths: Tuple[Tuple[str, ...], ...] = ()
+        if file_mapping is None:
+            nested_paths = tuple(
+                tuple(pattern.split(".")) for pattern in _common_patterns(name)
+            )
+
+        return PropertyPlan(
+            name=name,
+            schema=schema,
+            env_mapping=schema.get("env_mapping", name.upper()),
+            type=prop_type,
+            convert=_TYPE_CONVERTERS.get(prop_type, str),
+            parse=_ENV_PARSERS.get(prop_type),
+            file_mapping=file_mapping,
+            nested_paths=nested_paths,
+            volume_mount=schema.get("volume_mount", False) is True,
+            command_arg=schema.get("command_arg", False) is True,
+        )
+
+
+class ConfigValidator:
+    """
+    Validates whole configs against a config_schema compiled once.
+
+    Configs are keyed by property name or env mapping, and values coming from
+    the environment are strings, so each value is parsed to its property type
+    before the compiled JSON-Schema checks run. Keys outside the schema are
+    allowed; with additionalProperties set to false they are reported as
+    warnings.
+    """
+
+    def __init__(self, plan: ConfigPlan):
+        """
+        Compile a validator from a configuration plan.
+
+        Args:
+            plan: Compiled plan of the config_schema
+        """
+        self.plan = plan
+        self.warn_unknown = plan.schema.get("additionalProperties", True) is False
+        schema = {
+            key: value
+            for key, value in plan.schema.items()
+            if key != "additionalProperties"
+        }
+
+        # Some templates mark properties as required on the property itself
+        required = list(schema.get("required") or [])
+        for prop in plan.property_plans:
+            if prop.schema.get("required") is True and prop.name not in required:
+                required.append(prop.name)
+        if required:
+            schema["required"] = required
+
+        self._validator = SchemaValidator(schema)
+
+    def validate(self, config: Dict[str, Any]) -> ValidationResult:
+        """
+        Validate one config in a single pass, reporting every error.
+
+        Args:
+            config: Configuration to validate
+
+        Returns:
+            ValidationResult with validation status and messages
+        """
+        instance = {}
+        warnings = []
+        for key, value in config.items():
+            prop = self.plan.by_key.get(key)
+            if prop is None:
+                if self.warn_unknown:
+                    warnings.append(f"Unknown field '{key}' in configuration")
+                continue
+
+            if isinstance(value, str) and prop.parse is not None:
+                try:
+                    value = prop.parse(value)
+                except ValueError:
+                    # Left as a string for the type check to report
+                    pass
+            instance[prop.name] = value
+
+        errors = self._validator.iter_errors(instance)
+        return ValidationResult(valid=not errors, errors=errors, warnings=warnings)
+
+    def validate_many(
+        self, configs: Iterable[Dict[str, Any]]
+    ) -> List[ValidationResult]:
+        """
+        Validate several configs against the same schema.
+
+        Args:
+            configs: Configurations to validate
+
+        Returns:
+            One ValidationResult per config, in order
+        """
+        return [self.validate(config) for config in configs]
+
+
+_plan_cache: LRUCache = LRUCache(maxsize=CONFIG_PLAN_CACHE_SIZE)
+_plan_cache_lock = threading.Lock()
+
+
+def get_config_plan(config_schema: Optional[Dict[str, Any]]) -> ConfigPlan:
+    """
+    Get the compiled plan of a config schema, compiling it only on first use.
+
+    Plans are cached by schema hash, so every template sharing a schema, and
+    every call for the same template, reuses one plan.
+
+    Args:
+        config_schema: The template's config_schema
+
+    Returns:
+        Compiled ConfigPlan
+    """
+    key = schema_hash(config_schema or {})
+
+    with _plan_cache_lock:
+        plan = _plan_cache.get(key)
+    if plan is not None:
+        return plan
+
+    plan = ConfigPlan(config_schema or {})
+    with _plan_cache_lock:
+        _plan_cache[key] = plan
+    return plan
+
+
+def clear_config_plan_cache() -> None:
+    """Drop all compiled configuration plans."""
+    with _plan_cache_lock:
+        _plan_cache.clear()
+
+
+_config_file_cache: LRUCache = LRUCache(maxsize=CONFIG_FILE_CACHE_SIZE)
+_config_file_cache_lock = threading.Lock()
+
+
+def _parse_config_file(config_path: Path) -> Any:
+    """Parse a JSON or YAML file, chosen by extension."""
+    with open(config_path, "r") as f:
+        if config_path.suffix.lower() in [".yaml", ".yml"]:
+            return yaml.load(f, Loader=YamlLoader)
+        return json.load(f)
+
+
+def read_config_file(config_file: Union[str, Path]) -> Any:
+    """
+    Parse a JSON/YAML config file, reusing the last parse while it is unchanged.
+
+    Parses are cached by (path, mtime, size). The returned object is shared
+    between callers and must not be modified, copy it first.
+
+    Args:
+        config_file: Path to the JSON or YAML file
+
+    Returns:
+        Parsed file contents
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+    """
+    config_path = Path(config_file)
+    if not config_path.exists():
+        raise FileNotFoundError(f"Config file not found: {config_file}")
+
+    try:
+        stat = config_path.stat()
+    except OSError:
+        # Cannot fingerprint the file, so do not cache it
+        return _parse_config_file(config_path)
+
+    key = (str(config_path.resolve()), stat.st_mtime_ns, stat.st_size)
+    with _config_file_cache_lock:
+        if key in _config_file_cache:
+            return _config_file_cache[key]
+
+    file_config = _parse_config_file(config_path)
+    with _config_file_cache_lock:
+        _config_file_cache[key] = file_config
+    return file_config
+
+
+def clear_config_file_cache() -> None:
+    """Drop all cached config file parses."""
+    with _config_file_cache_lock:
+        _config_file_cache.clear()
+
+
 class ConfigProcessor:
     """Unified configuration processor for MCP templates."""
 
@@ -358,41 +738,43 @@ class ConfigProcessor:
             ValidationResult with validation status and messages
         """
         try:
-            errors = []
-            warnings = []
-
             # If no schema provided, assume valid
             if not schema:
                 return ValidationResult(valid=True)
 
-            # Check required fields
-            required_fields = schema.get("required", [])
-            for field in required_fields:
-                if field not in config:
-                    errors.append(f"Required field '{field}' is missing")
-
-            # Check field types and constraints
-            properties = schema.get("properties", {})
-            for field, value in config.items():
-                if field in properties:
-                    field_schema = properties[field]
-                    field_errors = self._validate_field(field, value, field_schema)
-                    errors.extend(field_errors)
-
-            # Check for unknown fields
-            if schema.get("additionalProperties", True) is False:
-                for field in config:
-                    if field not in properties:
-                        warnings.append(f"Unknown field '{field}' in configuration")
-
-            return ValidationResult(
-                valid=len(errors) == 0, errors=errors, warnings=warnings
-            )
+            return get_config_plan(schema).validator.validate(config)
 
         except Exception as e:
             logger.error(f"Config validation failed: {e}")
             return ValidationResult(valid=False, errors=[f"Validation error: {str(e)}"])
 
+    def validate_configs(
+        self, configs: Iterable[Dict[str, Any]], schema: Dict[str, Any]
+    ) -> List[ValidationResult]:
+        """
+        Validate many configurations against one schema, compiling it once.
+
+        Args:
+            configs: Configurations to validate
+            schema: Configuration schema
+
+        Returns:
+            One ValidationResult per configuration, in order
+        """
+        configs = list(configs)
+        if not schema:
+            return [ValidationResult(valid=True) for _ in configs]
+
+        try:
+            validator = get_config_plan(schema).validator
+        except Exception as e:
+            logger.error(f"Config validation failed: {e}")
+            return [
+                ValidationResult(valid=False, errors=[f"Validation error: {str(e)}"])
+                for _ in configs
+            ]
+        return validator.validate_many(configs)
+
     def handle_volume_and_args_config_properties(
         self,
         template: Dict[str, Any],
@@ -413,53 +795,24 @@ class ConfigProcessor:
         Returns:
             Dictionary with updated template and config
         """
-        config_properties = template.get("config_schema", {}).get("properties", {})
+        plan = get_config_plan(template.get("config_schema"))
         command = []
         volumes = {}
 
         # Make a copy to avoid modifying during iteration
         config_copy = config.copy()
-        for prop_key, prop_value in config_properties.items():
-            delete_key = False
-            env_var_name = prop_value.get("env_mapping", prop_key.upper())
-            container_mount_path = None
-            host_path = None
+        for prop in plan.mount_plans:
+            env_var_name = prop.env_mapping
+            if env_var_name not in config_copy:
+                continue
+
+            path_parts = self._split_mount_value(config_copy[env_var_name])
             final_container_paths = []
 
             # Check if this property is a volume mount
-            if (
-                env_var_name in config_copy
-                and prop_value.get("volume_mount", False) is True
-            ):
-                config_value = config_copy[env_var_name]
-
-                # Clean up the value - remove Docker command artifacts and split by space
-                # Handle cases where users accidentally include Docker syntax
-                cleaned_value = config_value.strip()
-
-                # Remove common Docker command artifacts more carefully
-                docker_artifacts = ["--volume ", "-v ", "--env ", "-e "]
-                for artifact in docker_artifacts:
-                    cleaned_value = cleaned_value.replace(artifact, " ")
-
-                # Also handle cases where artifacts are at the end
-                end_artifacts = ["--volume", "-v", "--env", "-e"]
-                for artifact in end_artifacts:
-                    if cleaned_value.endswith(artifact):
-                        cleaned_value = cleaned_value[: -len(artifact)]
-
-                # Split by space to handle multiple paths, then filter out empty strings
-                path_parts = [
-                    part.strip() for part in cleaned_value.split() if part.strip()
-                ]
-
+            if prop.volume_mount:
                 for path_part in path_parts:
-                    if not path_part:
-                        continue
-
                     mount_value = path_part.split(":")
-                    container_mount_path = None
-                    host_path = None
 
                     # In most cases, it would be only the host path
                     if len(mount_value) == 1:
@@ -486,13 +839,8 @@ class ConfigProcessor:
                             volumes[host_path] = container_path
                             final_container_paths.append(container_path)
 
-                delete_key = True
-
             # Check if this property is a command argument
-            if (
-                env_var_name in config_copy
-                and prop_value.get("command_arg", False) is True
-            ):
+            if prop.command_arg:
                 # If this property is both volume_mount and command_arg, use container paths
                 if final_container_paths:
                     # Use the container paths for command arguments since the container
@@ -500,34 +848,15 @@ class ConfigProcessor:
                     command.extend(final_container_paths)
                 else:
                     # If not a volume mount, use the original value as-is
-                    config_value = config_copy[env_var_name]
-
-                    # Clean up the value for command arguments (remove Docker artifacts if any)
-                    cleaned_value = config_value.strip()
-                    docker_artifacts = ["--volume ", "-v ", "--env ", "-e "]
-                    for artifact in docker_artifacts:
-                        cleaned_value = cleaned_value.replace(artifact, " ")
-
-                    end_artifacts = ["--volume", "-v", "--env", "-e"]
-                    for artifact in end_artifacts:
-                        if cleaned_value.endswith(artifact):
-                            cleaned_value = cleaned_value[: -len(artifact)]
-
-                    # For space-separated paths in command args, split and add each
-                    path_parts = [
-                        part.strip() for part in cleaned_value.split() if part.strip()
-                    ]
                     command.extend(path_parts)
 
-                delete_key = True
-
-            if delete_key:
-                # Remove the key from config to avoid duplication
-                config.pop(env_var_name, None)
+            # Remove the key from config to avoid duplication
+            config.pop(env_var_name, None)
 
-        # Update template with volumes and commands
-        if "volumes" not in template or template["volumes"] is None:
-            template["volumes"] = {}
+        # Update a copy of the template with volumes and commands, the
+        # template itself may be shared through the template registry
+        template = dict(template)
+        template["volumes"] = dict(template.get("volumes") or {})
 
         if isinstance(additional_volumes, dict):
             # Key is local path and value is host path
@@ -540,45 +869,46 @@ class ConfigProcessor:
             volumes.update(additional_volumes)
 
         template["volumes"].update(volumes)
-
-        if "command" not in template or template["command"] is None:
-            template["command"] = []
-        template["command"].extend(command)
+        template["command"] = list(template.get("command") or []) + command
 
         return {
             "template": template,
             "config": config,
         }
 
+    def _split_mount_value(self, config_value: str) -> List[str]:
+        """
+        Split a volume or argument value into paths, dropping any Docker
+        command syntax users accidentally included.
+        """
+        cleaned_value = config_value.strip()
+        for artifact in DOCKER_ARTIFACTS:
+            cleaned_value = cleaned_value.replace(artifact, " ")
+
+        # Also handle cases where artifacts are at the end
+        for artifact in DOCKER_END_ARTIFACTS:
+            if cleaned_value.endswith(artifact):
+                cleaned_value = cleaned_value[: -len(artifact)]
+
+        # Split by space to handle multiple paths
+        return cleaned_value.split()
+
     def _load_json_yaml_config_file(self, config_file: str) -> Dict[str, Any]:
         """Load configuration from JSON/YAML file and map to environment variables."""
-        file_config = {}
-
         try:
-            config_path = Path(config_file)
-            if not config_path.exists():
-                raise FileNotFoundError(f"Config file not found: {config_file}")
-
-            # Load based on extension
-            if config_path.suffix.lower() in [".yaml", ".yml"]:
-                with open(config_path, "r") as f:
-                    file_config = yaml.safe_load(f)
-            else:
-                with open(config_path, "r") as f:
-                    file_config = json.load(f)
-
+            # Callers own the result, keep the cached parse untouched
+            return copy.deepcopy(read_config_file(config_file))
         except Exception as e:
             logger.error(f"Failed to load config file {config_file}: {e}")
             raise
 
-        return file_config
-
     def _load_config_file(
         self, config_file: str, template: Dict[str, Any]
     ) -> Dict[str, Any]:
         """Load configuration from JSON/YAML file and map to environment variables."""
         try:
-            file_config = self._load_json_yaml_config_file(config_file)
+            # Mapping only reads the parsed file, so no copy is needed
+            file_config = read_config_file(config_file)
             return self._map_file_config_to_env(file_config, template)
 
         except Exception as e:
@@ -590,115 +920,51 @@ class ConfigProcessor:
     ) -> Dict[str, Any]:
         """Map config file values to environment variables based on template schema."""
         env_config = {}
+        plan = get_config_plan(template.get("config_schema"))
 
-        # Get the config schema from template
-        config_schema = template.get("config_schema", {})
-        properties = config_schema.get("properties", {})
-
-        # Generic mapping: try to map config values directly to properties
-        # First, try direct property name mapping
-        for prop_name, prop_config in properties.items():
-            env_mapping = prop_config.get("env_mapping", prop_name.upper())
-
-            # Try direct property name mapping
-            if prop_name in file_config:
-                env_config[env_mapping] = self._convert_value_to_env_string(
-                    file_config[prop_name], prop_config
-                )
-
-            # Try nested mapping patterns
+        for prop in plan.property_plans:
+            # Try direct property name mapping, then nested mapping patterns
+            if prop.name in file_config:
+                value = file_config[prop.name]
             else:
-                nested_value = self._find_nested_config_value(
-                    file_config, prop_name, prop_config
-                )
-                if nested_value is not None:
-                    env_config[env_mapping] = self._convert_value_to_env_string(
-                        nested_value, prop_config
-                    )
+                value = self._find_nested_config_value(file_config, prop)
+                if value is None:
+                    continue
+
+            env_config[prop.env_mapping] = self._convert_value_to_env_string(
+                value, prop.schema
+            )
 
         return env_config
 
     def _find_nested_config_value(
-        self, file_config: Dict[str, Any], prop_name: str, prop_config: Dict[str, Any]
+        self, file_config: Dict[str, Any], prop: PropertyPlan
     ) -> Any:
         """Find config value using common nested patterns."""
         # Check if property config has a file_mapping hint
-        if "file_mapping" in prop_config:
-            return self._get_nested_value(file_config, prop_config["file_mapping"])
+        if prop.file_mapping is not None:
+            return self._get_nested_value(file_config, prop.file_mapping)
 
         # Try common nested patterns based on property name
-        common_patterns = self._generate_common_patterns(prop_name)
-        for pattern in common_patterns:
-            try:
-                value = self._get_nested_value(file_config, pattern)
-                if value is not None:
-                    return value
-            except (KeyError, AttributeError):
-                continue
+        for keys in prop.nested_paths:
+            value = file_config
+            for key in keys:
+                if not isinstance(value, dict) or key not in value:
+                    value = None
+                    break
+                value = value[key]
+            if value is not None:
+                return value
 
         return None
 
     def _generate_common_patterns(self, prop_name: str) -> List[str]:
         """Generate common nested configuration patterns for a property."""
-        patterns = []
-
-        # Common category mappings
-        category_mappings = {
-            "log_level": ["logging.level", "log.level"],
-            "enable_audit_logging": [
-                "logging.enableAudit",
-                "logging.audit",
-                "log.audit",
-            ],
-            "read_only_mode": ["security.readOnly", "security.readonly", "readonly"],
-            "max_file_size": [
-                "security.maxFileSize",
-                "limits.maxFileSize",
-                "performance.maxFileSize",
-            ],
-            "allowed_directories": [
-                "security.allowedDirs",
-                "security.directories",
-                "paths.allowed",
-            ],
-            "exclude_patterns": [
-                "security.excludePatterns",
-                "security.exclude",
-                "filters.exclude",
-            ],
-            "max_concurrent_operations": [
-                "performance.maxConcurrentOperations",
-                "limits.concurrent",
-            ],
-            "timeout_ms": [
-                "performance.timeoutMs",
-                "performance.timeout",
-                "limits.timeout",
-            ],
-        }
-
-        if prop_name in category_mappings:
-            patterns.extend(category_mappings[prop_name])
-
-        # Generate generic patterns
-        camel_name = self._snake_to_camel(prop_name)
-        patterns.extend(
-            [
-                f"config.{prop_name}",
-                f"settings.{prop_name}",
-                f"options.{prop_name}",
-                f"config.{camel_name}",
-                f"settings.{camel_name}",
-                f"options.{camel_name}",
-            ]
-        )
-
-        return patterns
+        return _common_patterns(prop_name)
 
     def _snake_to_camel(self, snake_str: str) -> str:
         """Convert snake_case to camelCase."""
-        components = snake_str.split("_")
-        return components[0] + "".join(word.capitalize() for word in components[1:])
+        return _snake_to_camel(snake_str)
 
     def _get_nested_value(self, data: Dict[str, Any], path: str) -> Any:
         """Get nested value from dictionary using dot notation."""
@@ -727,9 +993,7 @@ class ConfigProcessor:
     ) -> Dict[str, Any]:
         """Convert CLI config values to proper types based on template schema."""
         converted_config = {}
-        # Get the config schema from template
-        config_schema = template.get("config_schema", {})
-        properties = config_schema.get("properties", {})
+        plan = get_config_plan(template.get("config_schema"))
 
         for key, value in config_values.items():
             # Special handling for VOLUMES key from CLI --volumes parameter
@@ -740,51 +1004,22 @@ class ConfigProcessor:
 
             # Handle nested CLI config using double underscore notation
             if "__" in key:
-                nested_key = self._handle_nested_cli_config(key, value, properties)
+                nested_key = self._handle_nested_cli_config(key, value, plan.properties)
                 if nested_key:
                     key = nested_key
 
-            # Find the property config for type conversion
-            prop_config = None
-            env_mapping = None
-
-            # Try to find the property by name or env_mapping
-            for prop_name, prop_cfg in properties.items():
-                prop_env_mapping = prop_cfg.get("env_mapping", prop_name.upper())
-                if key == prop_name or key == prop_env_mapping:
-                    prop_config = prop_cfg
-                    env_mapping = prop_env_mapping
-                    break
+            # Find the property by name or env_mapping
+            prop = plan.by_key.get(key)
 
             # Convert value based on property type
-            if prop_config:
-                prop_type = prop_config.get("type", "string")
+            if prop:
                 try:
-                    if prop_type == "boolean":
-                        converted_config[env_mapping] = str(value).lower() in (
-                            "true",
-                            "1",
-                            "yes",
-                        )
-                    elif prop_type == "integer":
-                        converted_config[env_mapping] = int(value)
-                    elif prop_type == "number":
-                        converted_config[env_mapping] = float(value)
-                    elif prop_type == "array":
-                        # Handle comma-separated values
-                        if isinstance(value, str):
-                            converted_config[env_mapping] = value
-                        else:
-                            converted_config[env_mapping] = ",".join(
-                                str(v) for v in value
-                            )
-                    else:
-                        converted_config[env_mapping] = str(value)
+                    converted_config[prop.env_mapping] = prop.convert(value)
                 except (ValueError, TypeError) as e:
                     logger.warning(
-                        f"Failed to convert {key}={value} to {prop_type}: {e}"
+                        f"Failed to convert {key}={value} to {prop.type}: {e}"
                     )
-                    converted_config[env_mapping] = str(value)
+                    converted_config[prop.env_mapping] = str(value)
             else:
                 # No property config found, use the key as-is
                 converted_config[key] = str(value)
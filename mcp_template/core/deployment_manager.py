@@ -171,16 +171,8 @@ class DeploymentManager:
                     config_sources.get("backend_config_file")
                 )
 
-            # Handle volume mounts and command arguments
-            template_config_dict = (
-                self.config_processor.handle_volume_and_args_config_properties(
-                    template_info, config, volume_config
-                )
-            )
-            config = template_config_dict.get("config", config)
-            template_info = template_config_dict.get("template", template_info)
-
-            # Validate final configuration
+            # Validate the configuration before volume mount and command
+            # argument properties are moved out of it
             validation_result = self.config_processor.validate_config(
                 config, template_info.get("config_schema", {})
             )
@@ -192,6 +184,15 @@ class DeploymentManager:
                     duration=time.time() - start_time,
                 )
 
+            # Handle volume mounts and command arguments
+            template_config_dict = (
+                self.config_processor.handle_volume_and_args_config_properties(
+                    template_info, config, volume_config
+                )
+            )
+            config = template_config_dict.get("config", config)
+            template_info = template_config_dict.get("template", template_info)
+
             # Prepare deployment specification
 
             deployment_spec = {
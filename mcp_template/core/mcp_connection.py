@@ -10,12 +10,39 @@ import asyncio
 import json
 import logging
 import os
+import threading
 from typing import Any, Dict, List, Optional
 
 import aiohttp
+from cachetools import LRUCache
+
+from mcp_template.core.retry import (
+    TRANSIENT_STATUS_CODES,
+    RetryPolicy,
+    is_transient_error,
+)
 
 logger = logging.getLogger(__name__)
 
+# Attempts at an HTTP connection while it fails with transient errors, such
+# as a gateway error or a server that is still starting
+CONNECT_RETRIES = int(os.environ.get("MCP_CONNECT_RETRIES", "3"))
+CONNECT_RETRY_POLICY = RetryPolicy(
+    attempts=CONNECT_RETRIES, initial_delay=0.1, max_delay=1.0, deadline=5.0
+)
+
+# Number of servers whose working MCP endpoint path is remembered
+ENDPOINT_PATH_CACHE_SIZE = 256
+
+_endpoint_paths: LRUCache = LRUCache(maxsize=ENDPOINT_PATH_CACHE_SIZE)
+_endpoint_paths_lock = threading.Lock()
+
+
+def clear_endpoint_path_cache() -> None:
+    """Forget the endpoint paths that servers answered on."""
+    with _endpoint_paths_lock:
+        _endpoint_paths.clear()
+
 
 class MCPConnection:
     """
@@ -27,14 +54,26 @@ class MCPConnection:
     - websocket: WebSocket-based communication (future)
     """
 
-    def __init__(self, timeout: int = 30):
+    def __init__(
+        self,
+        timeout: int = 30,
+        session: Optional[aiohttp.ClientSession] = None,
+        retry_policy: RetryPolicy = CONNECT_RETRY_POLICY,
+    ):
         """
         Initialize MCP connection.
 
         Args:
             timeout: Timeout for MCP operations in seconds
+            session: HTTP session to share with other connections. It is
+                left open on disconnect. By default each HTTP connection
+                opens and closes its own session.
+            retry_policy: Retries of HTTP connection attempts that fail with
+                transient errors
         """
         self.timeout = timeout
+        self._shared_session = session
+        self.retry_policy = retry_policy
         self.process = None
         self.session_info = None
         self.server_info = None
@@ -53,7 +92,10 @@ class MCPConnection:
         """
         Connect to MCP server via HTTP with smart endpoint discovery.
 
-        Tries multiple common MCP endpoints until one works.
+        Tries multiple common MCP endpoints until one works. The path a server
+        answered on is remembered and tried first on the next connection. If
+        no endpoint worked and some failed with transient errors, all are
+        tried again under the retry policy.
 
         Args:
             base_url: Base URL of the HTTP server (e.g., "http://localhost:7071")
@@ -65,15 +107,37 @@ class MCPConnection:
         if endpoints is None:
             endpoints = ["/mcp", "/", "/tools", "/api/mcp", "/v1/mcp"]
 
-        for endpoint in endpoints:
-            try:
-                logger.debug(f"Trying endpoint: {base_url}{endpoint}")
-                if await self.connect_http(base_url, endpoint):
-                    logger.info(f"Successfully connected to {base_url}{endpoint}")
-                    return True
-            except Exception as e:
-                logger.debug(f"Endpoint {endpoint} failed: {e}")
-                continue
+        key = base_url.rstrip("/")
+        with _endpoint_paths_lock:
+            known = _endpoint_paths.get(key)
+        if known is not None:
+            endpoints = [known] + [e for e in endpoints if e != known]
+
+        async def try_endpoints() -> bool:
+            transient_error = None
+            for endpoint in endpoints:
+                try:
+                    logger.debug(f"Trying endpoint: {base_url}{endpoint}")
+                    if await self._connect_http_once(base_url, endpoint):
+                        logger.info(f"Successfully connected to {base_url}{endpoint}")
+                        with _endpoint_paths_lock:
+                            _endpoint_paths[key] = endpoint
+                        return True
+                except Exception as e:
+                    logger.debug(f"Endpoint {endpoint} failed: {e}")
+                    transient_error = e
+                    if isinstance(e, aiohttp.ClientConnectorError):
+                        # Nothing accepts connections, no other path will
+                        break
+            if transient_error is not None:
+                raise transient_error
+            return False
+
+        try:
+            if await self.retry_policy.acall(try_endpoints):
+                return True
+        except Exception as e:
+            logger.debug(f"Endpoints of {base_url} kept failing: {e}")
 
         logger.error(f"Failed to connect to any endpoint on {base_url}")
         return False
@@ -86,6 +150,9 @@ class MCPConnection:
         """
         Connect to MCP server via HTTP with FastMCP protocol support.
 
+        Attempts failing with transient errors are retried under the retry
+        policy.
+
         Args:
             base_url: Base URL of the HTTP server (e.g., "http://localhost:7071")
             endpoint: MCP endpoint path (default: "/mcp")
@@ -94,12 +161,37 @@ class MCPConnection:
             True if connection successful, False otherwise
         """
         try:
-            self.base_url = base_url.rstrip("/")
+            return await self.retry_policy.acall(
+                self._connect_http_once, base_url, endpoint
+            )
+        except Exception as e:
+            logger.error(f"Failed to connect to HTTP MCP server: {e}")
+            return False
+
+    async def _connect_http_once(self, base_url: str, endpoint: str) -> bool:
+        """
+        Make a single HTTP connection attempt.
+
+        Returns:
+            True if connection successful, False if it failed permanently
+
+        Raises:
+            Exception: Errors that a retry may fix, after disconnecting
+        """
+        try:
+            # Cluster service URLs go through a port-forward tunnel when this
+            # process runs outside the cluster
+            from mcp_template.backends.kubernetes_portforward import route_cluster_url
+
+            self.base_url = route_cluster_url(base_url).rstrip("/")
             self.transport_type = "http"
 
-            # Create HTTP session
-            timeout = aiohttp.ClientTimeout(total=self.timeout)
-            self.http_session = aiohttp.ClientSession(timeout=timeout)
+            # Create HTTP session, unless one is shared
+            if self._shared_session is not None:
+                self.http_session = self._shared_session
+            else:
+                timeout = aiohttp.ClientTimeout(total=self.timeout)
+                self.http_session = aiohttp.ClientSession(timeout=timeout)
 
             logger.info(f"Connecting to MCP server via HTTP: {self.base_url}{endpoint}")
 
@@ -114,8 +206,10 @@ class MCPConnection:
                 return False
 
         except Exception as e:
-            logger.error(f"Failed to connect to HTTP MCP server: {e}")
             await self.disconnect()
+            if is_transient_error(e):
+                raise
+            logger.error(f"Failed to connect to HTTP MCP server: {e}")
             return False
 
     async def connect_stdio(
@@ -205,7 +299,7 @@ class MCPConnection:
             }
 
             async with self.http_session.post(
-                full_url, json=init_request, headers=headers
+                full_url, json=init_request, headers=headers, timeout=self._http_timeout
             ) as response:
                 if response.status == 200:
                     response_text = await response.text()
@@ -238,11 +332,16 @@ class MCPConnection:
                     else:
                         logger.error(f"Invalid initialization response: {result}")
                         return False
+                elif response.status in TRANSIENT_STATUS_CODES:
+                    # Raised so the connection attempt can be retried
+                    response.raise_for_status()
                 else:
                     logger.error(f"HTTP initialization failed: {response.status}")
                     return False
 
         except Exception as e:
+            if is_transient_error(e):
+                raise
             logger.error(f"HTTP MCP session initialization failed: {e}")
             return False
 
@@ -284,7 +383,9 @@ class MCPConnection:
             headers: HTTP headers
         """
         try:
-            async with self.http_session.post(url, json=notification, headers=headers):
+            async with self.http_session.post(
+                url, json=notification, headers=headers, timeout=self._http_timeout
+            ):
                 # Notification, we don't need to process the response
                 pass
         except Exception as e:
@@ -369,7 +470,7 @@ class MCPConnection:
 
             full_url = f"{self.base_url}/mcp"  # Default endpoint
             async with self.http_session.post(
-                full_url, json=request, headers=headers
+                full_url, json=request, headers=headers, timeout=self._http_timeout
             ) as response:
                 if response.status == 200:
                     response_text = await response.text()
@@ -456,7 +557,7 @@ class MCPConnection:
 
             full_url = f"{self.base_url}/mcp"  # Default endpoint
             async with self.http_session.post(
-                full_url, json=request, headers=headers
+                full_url, json=request, headers=headers, timeout=self._http_timeout
             ) as response:
                 if response.status == 200:
                     response_text = await response.text()
@@ -576,8 +677,10 @@ class MCPConnection:
             finally:
                 self.process = None
 
-        # Handle HTTP cleanup
-        if self.http_session:
+        # Handle HTTP cleanup, a shared session belongs to its owner
+        if self.http_session is self._shared_session:
+            self.http_session = None
+        elif self.http_session:
             try:
                 await self.http_session.close()
             except Exception as e:
@@ -592,6 +695,11 @@ class MCPConnection:
         self.session_id = None
         self.transport_type = None
 
+    @property
+    def _http_timeout(self) -> aiohttp.ClientTimeout:
+        """Per-request timeout, which also applies on shared sessions."""
+        return aiohttp.ClientTimeout(total=self.timeout)
+
     def is_connected(self) -> bool:
         """Check if connection is active."""
         if self.transport_type == "stdio":
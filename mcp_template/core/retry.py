@@ -0,0 +1,225 @@
+"""
+Retry policy for discovery, MCP connections and other remote operations.
+
+A policy retries an operation with exponentially growing, jittered delays
+until it succeeds, runs out of attempts or would overrun its total deadline.
+Errors are classified first, so failures that can never succeed on retry,
+such as a missing image, a refused pull or a 404, are reported immediately
+instead of after the full backoff schedule.
+"""
+
+import asyncio
+import functools
+import inspect
+import logging
+import random
+import subprocess
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Iterator, Optional
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+# HTTP statuses worth retrying: timeouts, rate limits and gateway errors
+TRANSIENT_STATUS_CODES = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+# Docker errors that no retry will fix, matched against lower-cased stderr
+PERMANENT_DOCKER_ERRORS = (
+    "no such image",
+    "pull access denied",
+    "manifest unknown",
+    "repository does not exist",
+    "invalid reference format",
+    "unauthorized",
+    "executable file not found",
+)
+
+
+def is_transient_error(error: BaseException) -> bool:
+    """
+    Whether an operation that failed with an error may succeed on retry.
+
+    Args:
+        error: Exception raised by the operation
+
+    Returns:
+        True for timeouts, connection errors, rate limits, server errors and
+        docker failures not known to be permanent, False otherwise
+    """
+    # HTTP and Kubernetes API errors carry the response status
+    status = getattr(error, "status", None)
+    if isinstance(status, int) and not isinstance(error, OSError):
+        return status in TRANSIENT_STATUS_CODES
+
+    if isinstance(error, subprocess.CalledProcessError):
+        output = error.stderr or error.output or ""
+        if isinstance(output, bytes):
+            output = output.decode(errors="replace")
+        output = output.lower()
+        return not any(marker in output for marker in PERMANENT_DOCKER_ERRORS)
+
+    if isinstance(error, (FileNotFoundError, PermissionError)):
+        # Missing executables and permissions do not come back by themselves
+        return False
+
+    return isinstance(
+        error,
+        (
+            asyncio.TimeoutError,
+            subprocess.TimeoutExpired,
+            aiohttp.ClientConnectionError,
+            aiohttp.ClientPayloadError,
+            OSError,
+        ),
+    )
+
+
+def backoff_delays(
+    initial: float, maximum: float, factor: float = 2.0
+) -> Iterator[float]:
+    """
+    Yield exponentially growing delays with jitter.
+
+    Each delay is drawn between half and all of the current backoff step, so
+    concurrent callers do not retry in lockstep.
+
+    Args:
+        initial: First backoff step in seconds
+        maximum: Largest backoff step in seconds
+        factor: Growth of the step per delay
+
+    Yields:
+        Delays in seconds
+    """
+    step = initial
+    while True:
+        yield random.uniform(step / 2, step)
+        step = min(step * factor, maximum)
+
+
+def retry_after(error: BaseException) -> Optional[float]:
+    """Seconds a rate-limited server asked to wait, from its Retry-After header."""
+    headers = getattr(error, "headers", None)
+    if not headers:
+        return None
+    try:
+        return max(float(headers.get("Retry-After")), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    Exponential backoff with jitter, bounded by attempts and a total deadline.
+
+    Policies are immutable and can be shared. Call an operation through
+    call() or acall(), or decorate a function or coroutine function with the
+    policy itself.
+    """
+
+    attempts: int = 3
+    initial_delay: float = 0.25
+    max_delay: float = 5.0
+    multiplier: float = 2.0
+    deadline: Optional[float] = None
+    retryable: Callable[[BaseException], bool] = is_transient_error
+
+    def delays(self) -> Iterator[float]:
+        """Backoff delays between attempts, in seconds."""
+        return backoff_delays(self.initial_delay, self.max_delay, self.multiplier)
+
+    def call(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Call a function, retrying it on transient errors.
+
+        Returns:
+            Result of the first successful call
+
+        Raises:
+            The error of the last attempt, as soon as it is permanent or no
+            attempt or time is left
+        """
+        delays = self.delays()
+        started = time.monotonic()
+        for attempt in range(1, self.attempts + 1):
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                delay = self._next_delay(func, e, attempt, delays, started)
+                if delay is None:
+                    raise
+            time.sleep(delay)
+
+    async def acall(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """Await a coroutine function, retrying it on transient errors."""
+        delays = self.delays()
+        started = time.monotonic()
+        for attempt in range(1, self.attempts + 1):
+            try:
+                return await func(*args, **kwargs)
+            except Exception as e:
+                delay = self._next_delay(func, e, attempt, delays, started)
+                if delay is None:
+                    raise
+            await asyncio.sleep(delay)
+
+    def __call__(self, func: Callable[..., Any]) -> Callable[..., Any]:
+        """Decorate a function or coroutine function with this policy."""
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                return await self.acall(func, *args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return self.call(func, *args, **kwargs)
+
+        return wrapper
+
+    def _next_delay(
+        self,
+        func: Callable[..., Any],
+        error: Exception,
+        attempt: int,
+        delays: Iterator[float],
+        started: float,
+    ) -> Optional[float]:
+        """Delay before the next attempt, or None if the error is final."""
+        name = getattr(func, "__qualname__", repr(func))
+        if not self.retryable(error):
+            logger.debug("%s failed permanently: %s", name, error)
+            return None
+        if attempt >= self.attempts:
+            logger.debug("%s failed after %d attempts: %s", name, attempt, error)
+            return None
+
+        delay = next(delays)
+        requested = retry_after(error)
+        if requested is not None:
+            delay = max(delay, requested)
+
+        if self.deadline is not None:
+            remaining = self.deadline - (time.monotonic() - started)
+            if delay >= remaining:
+                logger.debug("%s out of retry budget: %s", name, error)
+                return None
+
+        logger.debug(
+            "%s failed (attempt %d/%d), retrying in %.2fs: %s",
+            name,
+            attempt,
+            self.attempts,
+            delay,
+            error,
+        )
+        return delay
+
+
+# Single attempt, for callers that retry at a higher level
+NO_RETRY = RetryPolicy(attempts=1)
@@ -0,0 +1,510 @@
+"""
+Compiled JSON-Schema validation for tool arguments.
+
+This module turns a JSON schema into a tree of small check functions once and
+keeps the compiled validators in a bounded LRU cache, so repeated validation of
+the same tool schema only pays for the checks themselves.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from cachetools import LRUCache
+
+logger = logging.getLogger(__name__)
+
+# Configuration constants
+MCP_SCHEMA_VALIDATOR_CACHE_SIZE = os.getenv("MCP_SCHEMA_VALIDATOR_CACHE_SIZE", 256)
+try:
+    MCP_SCHEMA_VALIDATOR_CACHE_SIZE = int(MCP_SCHEMA_VALIDATOR_CACHE_SIZE)
+except ValueError:
+    logger.warning(
+        "Value %s is not a valid integer. Setting validator cache size to 256",
+        MCP_SCHEMA_VALIDATOR_CACHE_SIZE,
+    )
+    MCP_SCHEMA_VALIDATOR_CACHE_SIZE = 256
+
+# A compiled check receives (value, path, errors) and appends error strings
+Check = Callable[[Any, str, List[str]], None]
+
+_TYPE_CHECKS: Dict[str, Callable[[Any], bool]] = {
+    "string": lambda v: isinstance(v, str),
+    "integer": lambda v: (
+        isinstance(v, int)
+        and not isinstance(v, bool)
+        or isinstance(v, float)
+        and v.is_integer()
+    ),
+    "number": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    "boolean": lambda v: isinstance(v, bool),
+    "array": lambda v: isinstance(v, (list, tuple)),
+    "object": lambda v: isinstance(v, dict),
+    "null": lambda v: v is None,
+}
+
+
+def _describe(path: str, message: str) -> str:
+    """Prefix an error message with the location it applies to."""
+    return f"'{path}' {message}" if path else message
+
+
+def _child_path(path: str, key: Any) -> str:
+    """Build the path of a nested property or array item."""
+    if isinstance(key, int):
+        return f"{path}[{key}]"
+    return f"{path}.{key}" if path else str(key)
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+class SchemaValidator:
+    """
+    JSON-Schema validator compiled once from a schema.
+
+    Supports the keywords used by MCP tool input schemas: type, enum, const,
+    properties, required, additionalProperties, patternProperties, items,
+    min/maxItems, uniqueItems, min/maxLength, pattern, numeric bounds,
+    multipleOf, min/maxProperties, allOf, anyOf, oneOf, not and local $ref
+    pointers (``#/$defs/...`` and ``#/definitions/...``).
+    """
+
+    def __init__(self, schema: Dict[str, Any]):
+        """
+        Compile a validator for a schema.
+
+        Args:
+            schema: JSON schema to compile
+        """
+        self.schema = schema or {}
+        self._refs: Dict[str, Check] = {}
+        self._check = self._compile(self.schema)
+
+    def iter_errors(self, instance: Any) -> List[str]:
+        """
+        Validate an instance and collect every error.
+
+        Args:
+            instance: Value to validate
+
+        Returns:
+            List of human readable error messages (empty when valid)
+        """
+        errors: List[str] = []
+        self._check(instance, "", errors)
+        return errors
+
+    def is_valid(self, instance: Any) -> bool:
+        """Return True if the instance satisfies the schema."""
+        return not self.iter_errors(instance)
+
+    def _compile(self, schema: Any) -> Check:
+        """Compile a (sub)schema into a single check function."""
+        if schema is True or schema == {}:
+            return lambda value, path, errors: None
+        if schema is False:
+            return lambda value, path, errors: errors.append(
+                _describe(path, "is not allowed")
+            )
+        if not isinstance(schema, dict):
+            return lambda value, path, errors: None
+
+        if "$ref" in schema:
+            return self._compile_ref(schema["$ref"])
+
+        checks: List[Check] = []
+        checks.extend(self._compile_type(schema))
+        checks.extend(self._compile_enum(schema))
+        checks.extend(self._compile_object(schema))
+        checks.extend(self._compile_array(schema))
+        checks.extend(self._compile_string(schema))
+        checks.extend(self._compile_number(schema))
+        checks.extend(self._compile_combinators(schema))
+
+        if len(checks) == 1:
+            return checks[0]
+
+        def check_all(value, path, errors):
+            for check in checks:
+                check(value, path, errors)
+
+        return check_all
+
+    def _compile_ref(self, ref: str) -> Check:
+        """Compile a local $ref lazily so recursive schemas terminate."""
+
+        def check_ref(value, path, errors):
+            check = self._refs.get(ref)
+            if check is None:
+                target = self._resolve_ref(ref)
+                # Placeholder guards against infinite recursion while compiling
+                self._refs[ref] = lambda v, p, e: None
+                check = self._compile(target)
+                self._refs[ref] = check
+            check(value, path, errors)
+
+        return check_ref
+
+    def _resolve_ref(self, ref: str) -> Any:
+        """Resolve a local JSON pointer against the root schema."""
+        if not ref.startswith("#"):
+            logger.debug("Ignoring non-local schema reference: %s", ref)
+            return {}
+
+        target: Any = self.schema
+        for part in ref.lstrip("#").split("/"):
+            if not part:
+                continue
+            part = part.replace("~1", "/").replace("~0", "~")
+            if isinstance(target, dict) and part in target:
+                target = target[part]
+            else:
+                logger.debug("Unresolvable schema reference: %s", ref)
+                return {}
+        return target
+
+    def _compile_type(self, schema: Dict[str, Any]) -> List[Check]:
+        if "type" not in schema:
+            return []
+
+        types = schema["type"]
+        types = [types] if isinstance(types, str) else list(types)
+        predicates = [_TYPE_CHECKS[t] for t in types if t in _TYPE_CHECKS]
+        if not predicates:
+            return []
+        expected = " or ".join(types)
+
+        def check_type(value, path, errors):
+            if not any(predicate(value) for predicate in predicates):
+                errors.append(
+                    _describe(
+                        path,
+                        f"must be of type {expected}, got {type(value).__name__}",
+                    )
+                )
+
+        return [check_type]
+
+    def _compile_enum(self, schema: Dict[str, Any]) -> List[Check]:
+        checks: List[Check] = []
+
+        if "enum" in schema:
+            allowed = list(schema["enum"])
+
+            def check_enum(value, path, errors):
+                if value not in allowed:
+                    errors.append(
+                        _describe(path, f"must be one of {allowed}, got {value!r}")
+                    )
+
+            checks.append(check_enum)
+
+        if "const" in schema:
+            expected = schema["const"]
+
+            def check_const(value, path, errors):
+                if value != expected:
+                    errors.append(_describe(path, f"must be {expected!r}"))
+
+            checks.append(check_const)
+
+        return checks
+
+    def _compile_object(self, schema: Dict[str, Any]) -> List[Check]:
+        properties = {
+            name: self._compile(sub_schema)
+            for name, sub_schema in schema.get("properties", {}).items()
+        }
+        pattern_properties = [
+            (re.compile(pattern), self._compile(sub_schema))
+            for pattern, sub_schema in schema.get("patternProperties", {}).items()
+        ]
+        required = schema.get("required", [])
+        # Draft 3 style boolean "required" on a property is not a name list
+        required = list(required) if isinstance(required, list) else []
+        additional = schema.get("additionalProperties", True)
+        additional_check = (
+            self._compile(additional) if isinstance(additional, dict) else None
+        )
+        min_properties = schema.get("minProperties")
+        max_properties = schema.get("maxProperties")
+
+        if not (
+            properties
+            or pattern_properties
+            or required
+            or additional is not True
+            or min_properties is not None
+            or max_properties is not None
+        ):
+            return []
+
+        def check_object(value, path, errors):
+            if not isinstance(value, dict):
+                return
+
+            for name in required:
+                if name not in value:
+                    errors.append(
+                        _describe(path, f"is missing required property '{name}'")
+                        if path
+                        else f"Missing required property '{name}'"
+                    )
+
+            for key, item in value.items():
+                matched = False
+                item_path = _child_path(path, key)
+                if key in properties:
+                    matched = True
+                    properties[key](item, item_path, errors)
+                for pattern, check in pattern_properties:
+                    if pattern.search(key):
+                        matched = True
+                        check(item, item_path, errors)
+                if matched:
+                    continue
+                if additional is False:
+                    errors.append(_describe(item_path, "is not an allowed property"))
+                elif additional_check is not None:
+                    additional_check(item, item_path, errors)
+
+            if min_properties is not None and len(value) < min_properties:
+                errors.append(
+                    _describe(path, f"must have at least {min_properties} properties")
+                )
+            if max_properties is not None and len(value) > max_properties:
+                errors.append(
+                    _describe(path, f"must have at most {max_properties} properties")
+                )
+
+        return [check_object]
+
+    def _compile_array(self, schema: Dict[str, Any]) -> List[Check]:
+        items = schema.get("items")
+        item_check: Optional[Check] = None
+        tuple_checks: List[Check] = []
+        if isinstance(items, list):
+            tuple_checks = [self._compile(sub_schema) for sub_schema in items]
+        elif items is not None:
+            item_check = self._compile(items)
+
+        min_items = schema.get("minItems")
+        max_items = schema.get("maxItems")
+        unique_items = schema.get("uniqueItems", False)
+
+        if not (
+            item_check
+            or tuple_checks
+            or min_items is not None
+            or max_items is not None
+            or unique_items
+        ):
+            return []
+
+        def check_array(value, path, errors):
+            if not isinstance(value, (list, tuple)):
+                return
+
+            if item_check is not None:
+                for index, item in enumerate(value):
+                    item_check(item, _child_path(path, index), errors)
+            for index, (item, check) in enumerate(zip(value, tuple_checks)):
+                check(item, _child_path(path, index), errors)
+
+            if min_items is not None and len(value) < min_items:
+                errors.append(_describe(path, f"must have at least {min_items} items"))
+            if max_items is not None and len(value) > max_items:
+                errors.append(_describe(path, f"must have at most {max_items} items"))
+            if unique_items:
+                seen = []
+                for item in value:
+                    if item in seen:
+                        errors.append(_describe(path, "must contain unique items"))
+                        break
+                    seen.append(item)
+
+        return [check_array]
+
+    def _compile_string(self, schema: Dict[str, Any]) -> List[Check]:
+        min_length = schema.get("minLength")
+        max_length = schema.get("maxLength")
+        pattern = re.compile(schema["pattern"]) if "pattern" in schema else None
+
+        if min_length is None and max_length is None and pattern is None:
+            return []
+
+        def check_string(value, path, errors):
+            if not isinstance(value, str):
+                return
+            if min_length is not None and len(value) < min_length:
+                errors.append(
+                    _describe(path, f"must be at least {min_length} characters")
+                )
+            if max_length is not None and len(value) > max_length:
+                errors.append(
+                    _describe(path, f"must be at most {max_length} characters")
+                )
+            if pattern is not None and not pattern.search(value):
+                errors.append(
+                    _describe(path, f"does not match pattern '{pattern.pattern}'")
+                )
+
+        return [check_string]
+
+    def _compile_number(self, schema: Dict[str, Any]) -> List[Check]:
+        bounds: List[Tuple[Callable[[Any], bool], str]] = []
+
+        minimum = schema.get("minimum")
+        maximum = schema.get("maximum")
+        exclusive_minimum = schema.get("exclusiveMinimum")
+        exclusive_maximum = schema.get("exclusiveMaximum")
+
+        # Draft 4 uses boolean exclusive flags that modify minimum/maximum
+        if exclusive_minimum is True and minimum is not None:
+            exclusive_minimum, minimum = minimum, None
+        if exclusive_maximum is True and maximum is not None:
+            exclusive_maximum, maximum = maximum, None
+
+        if _is_number(minimum):
+            bounds.append((lambda v: v >= minimum, f"must be >= {minimum}"))
+        if _is_number(maximum):
+            bounds.append((lambda v: v <= maximum, f"must be <= {maximum}"))
+        if _is_number(exclusive_minimum):
+            bounds.append(
+                (lambda v: v > exclusive_minimum, f"must be > {exclusive_minimum}")
+            )
+        if _is_number(exclusive_maximum):
+            bounds.append(
+                (lambda v: v < exclusive_maximum, f"must be < {exclusive_maximum}")
+            )
+
+        multiple_of = schema.get("multipleOf")
+        if _is_number(multiple_of) and multiple_of > 0:
+            bounds.append(
+                (
+                    lambda v: (v / multiple_of).is_integer(),
+                    f"must be a multiple of {multiple_of}",
+                )
+            )
+
+        if not bounds:
+            return []
+
+        def check_number(value, path, errors):
+            if not _is_number(value):
+                return
+            for predicate, message in bounds:
+                if not predicate(value):
+                    errors.append(_describe(path, f"{message}, got {value!r}"))
+
+        return [check_number]
+
+    def _compile_combinators(self, schema: Dict[str, Any]) -> List[Check]:
+        checks: List[Check] = []
+
+        if "allOf" in schema:
+            all_of = [self._compile(sub_schema) for sub_schema in schema["allOf"]]
+
+            def check_all_of(value, path, errors):
+                for check in all_of:
+                    check(value, path, errors)
+
+            checks.append(check_all_of)
+
+        if "anyOf" in schema:
+            any_of = [self._compile(sub_schema) for sub_schema in schema["anyOf"]]
+
+            def check_any_of(value, path, errors):
+                for check in any_of:
+                    branch_errors: List[str] = []
+                    check(value, path, branch_errors)
+                    if not branch_errors:
+                        return
+                errors.append(_describe(path, "does not match any allowed schema"))
+
+            checks.append(check_any_of)
+
+        if "oneOf" in schema:
+            one_of = [self._compile(sub_schema) for sub_schema in schema["oneOf"]]
+
+            def check_one_of(value, path, errors):
+                matches = 0
+                for check in one_of:
+                    branch_errors: List[str] = []
+                    check(value, path, branch_errors)
+                    if not branch_errors:
+                        matches += 1
+                if matches != 1:
+                    errors.append(
+                        _describe(
+                            path,
+                            f"must match exactly one allowed schema (matched {matches})",
+                        )
+                    )
+
+            checks.append(check_one_of)
+
+        if "not" in schema:
+            negated = self._compile(schema["not"])
+
+            def check_not(value, path, errors):
+                branch_errors: List[str] = []
+                negated(value, path, branch_errors)
+                if not branch_errors:
+                    errors.append(_describe(path, "matches a disallowed schema"))
+
+            checks.append(check_not)
+
+        return checks
+
+
+_validator_cache: LRUCache = LRUCache(maxsize=MCP_SCHEMA_VALIDATOR_CACHE_SIZE)
+_validator_cache_lock = threading.Lock()
+
+
+def schema_hash(schema: Dict[str, Any]) -> str:
+    """Return a stable hash for a schema, independent of key order."""
+    encoded = json.dumps(schema, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def get_validator(
+    schema: Dict[str, Any], template: str = "", tool: str = ""
+) -> SchemaValidator:
+    """
+    Get a compiled validator, compiling it only on first use.
+
+    Validators are cached per (template, tool, schema hash) in a bounded LRU,
+    so a changed schema for the same tool gets a fresh validator.
+
+    Args:
+        schema: JSON schema to validate against
+        template: Template name the schema belongs to
+        tool: Tool name the schema belongs to
+
+    Returns:
+        Compiled SchemaValidator
+    """
+    key = (template, tool, schema_hash(schema))
+
+    with _validator_cache_lock:
+        validator = _validator_cache.get(key)
+    if validator is not None:
+        return validator
+
+    validator = SchemaValidator(schema)
+    with _validator_cache_lock:
+        _validator_cache[key] = validator
+    return validator
+
+
+def clear_validator_cache() -> None:
+    """Drop all compiled validators."""
+    with _validator_cache_lock:
+        _validator_cache.clear()
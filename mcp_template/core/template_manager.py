@@ -13,6 +13,7 @@ from typing import Any, Dict, List, Optional
 from mcp_template.backends import get_backend
 from mcp_template.core.cache import CacheManager
 from mcp_template.template.utils.discovery import TemplateDiscovery
+from mcp_template.template.utils.search import get_search_index
 
 logger = logging.getLogger(__name__)
 
@@ -51,24 +52,19 @@ class TemplateManager:
             Dictionary mapping template names to template metadata
         """
         try:
-            # Check persistent cache first
-            cache_key = "templates"
-            cached_templates = self.cache_manager.get(cache_key)
-
-            if cached_templates is not None:
-                # Extract data from cache structure
-                templates = cached_templates.get("data", cached_templates)
-            elif not self._cache_valid:
+            # Discovery is served from the process-wide template registry,
+            # which only re-parses templates changed on disk
+            if not self._cache_valid:
                 templates = self.template_discovery.discover_templates()
                 self._template_cache = templates
                 self._cache_valid = True
-                # Store in persistent cache
-                self.cache_manager.set(cache_key, templates)
             else:
                 templates = self._template_cache.copy()
 
             # Add deployment status if requested
             if include_deployed_status:
+                # Cached entries are shared, so annotate copies instead
+                templates = {name: dict(info) for name, info in templates.items()}
                 try:
                     # Get all deployments and filter by template
                     all_deployments = self.backend.list_deployments()
@@ -140,8 +136,11 @@ class TemplateManager:
             Template metadata dictionary or None if not found
         """
         try:
-            templates = self.list_templates()
-            return templates.get(template_id)
+            if self._cache_valid:
+                return self._template_cache.get(template_id)
+
+            # Load just this template instead of discovering the whole catalogue
+            return self.template_discovery.get_template_config(template_id)
         except Exception as e:
             logger.error(f"Failed to get template info for {template_id}: {e}")
             return None
@@ -178,39 +177,26 @@ class TemplateManager:
 
     def search_templates(self, query: str) -> Dict[str, Dict]:
         """
-        Search templates by name, description, or tags.
+        Search templates by name, description, tags, or tool names.
+
+        Every word of the query must match a word of the template, either
+        exactly, as a prefix, or as a substring.
 
         Args:
             query: Search query string
 
         Returns:
-            Dictionary of matching templates
+            Dictionary of matching templates, best match first
         """
         try:
             all_templates = self.list_templates()
-            matching_templates = {}
-
-            query_lower = query.lower()
-
-            for name, info in all_templates.items():
-                # Search in name
-                if query_lower in name.lower():
-                    matching_templates[name] = info
-                    continue
+            if not query:
+                return all_templates
 
-                # Search in description
-                description = info.get("description", "").lower()
-                if query_lower in description:
-                    matching_templates[name] = info
-                    continue
-
-                # Search in tags
-                tags = info.get("tags", [])
-                if any(query_lower in tag.lower() for tag in tags):
-                    matching_templates[name] = info
-                    continue
-
-            return matching_templates
+            # The index is built once per template snapshot and shared; the
+            # cached catalogue still knows the snapshot it was copied from
+            index = get_search_index(self._template_cache or all_templates)
+            return {name: all_templates[name] for name in index.search(query)}
 
         except Exception as e:
             logger.error(f"Failed to search templates: {e}")
@@ -262,7 +248,8 @@ class TemplateManager:
         """Force refresh of the template cache."""
         self._cache_valid = False
         self._template_cache = {}
-        # Clear persistent cache
+        self.template_discovery.refresh()
+        # Drop the template list persisted by older versions
         self.cache_manager.delete("templates")
 
     def get_template_path(self, template_id: str) -> Optional[Path]:
@@ -283,7 +270,8 @@ class TemplateManager:
             if template_path.exists() and template_path.is_dir():
                 return template_path
 
-            return None
+            # Templates from additional template sources
+            return self.template_discovery.get_template_path(template_id)
 
         except Exception as e:
             logger.error(f"Failed to get template path for {template_id}: {e}")
@@ -72,6 +72,21 @@ class ToolCaller:
             self.docker_service = DockerDeploymentService()
         else:
             self.docker_service = None  # For mock/other backends
+        self._kubernetes_service = None
+
+    @property
+    def stdio_service(self):
+        """Backend that runs stdio tool calls, or None if unsupported."""
+        if self.backend_type == "kubernetes":
+            if self._kubernetes_service is None:
+                # Connecting to the cluster is deferred until a stdio call
+                from mcp_template.backends.kubernetes import (
+                    KubernetesDeploymentService,
+                )
+
+                self._kubernetes_service = KubernetesDeploymentService()
+            return self._kubernetes_service
+        return self.docker_service
 
     def _call_http_api(self, url: str, method: str = "GET", data: Dict = None) -> Dict:
         """Make HTTP API call with error handling."""
@@ -253,7 +268,11 @@ class ToolCaller:
         Returns:
             ToolCallResult with structured response
         """
-        if not self.docker_service:
+        try:
+            stdio_service = self.stdio_service
+        except RuntimeError as e:
+            raise ToolCallError(f"Backend not available for stdio calls: {e}")
+        if not stdio_service:
             raise ToolCallError("Docker backend not available for stdio calls")
 
         # Validate stdio transport support
@@ -295,7 +314,7 @@ class ToolCaller:
         json_input = json.dumps(mcp_request)
 
         try:
-            result = self.docker_service.run_stdio_command(
+            result = stdio_service.run_stdio_command(
                 template_name,
                 config,
                 template,
@@ -15,6 +15,7 @@ from mcp_template.backends import get_backend
 from mcp_template.core.cache import CacheManager
 from mcp_template.core.config_processor import ConfigProcessor
 from mcp_template.core.deployment_manager import DeploymentManager
+from mcp_template.core.schema_validator import get_validator
 from mcp_template.core.template_manager import TemplateManager
 from mcp_template.core.tool_caller import ToolCaller
 from mcp_template.tools import DockerProbe, KubernetesProbe
@@ -513,8 +514,9 @@ class ToolManager:
             List of static tool definitions
         """
         try:
-            # Get tools from template manager
-            tools = self.template_manager.get_template_tools(template_id)
+            # Get tools from template manager, copied so the template's own
+            # list is left untouched
+            tools = list(self.template_manager.get_template_tools(template_id))
 
             # Also check for dedicated tools.json file
             template_path = self.template_manager.get_template_path(template_id)
@@ -775,6 +777,64 @@ class ToolManager:
             logger.error(f"Tool validation failed: {e}")
             return False
 
+    def get_tool_input_schema(
+        self, template_or_deployment: str, tool_name: str
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get the known input schema of a tool without running any discovery.
+
+        Only previously discovered (cached) tools are consulted, so this never
+        starts a container or makes a network call.
+
+        Args:
+            template_or_deployment: Template name or deployment ID
+            tool_name: Name of the tool
+
+        Returns:
+            The tool's inputSchema, or None if the schema is not known
+        """
+        cached_tools = (self.get_cached_tools(template_or_deployment) or {}).get(
+            "data", {}
+        )
+        for tool in cached_tools.get("tools") or []:
+            if isinstance(tool, dict) and tool.get("name") == tool_name:
+                return tool.get("inputSchema") or tool.get("input_schema") or None
+
+        return None
+
+    def validate_tool_arguments(
+        self,
+        template_or_deployment: str,
+        tool_name: str,
+        parameters: Optional[Dict[str, Any]],
+    ) -> List[str]:
+        """
+        Validate tool arguments against the tool's input schema.
+
+        Validators are compiled once per (template, tool, schema) and cached,
+        so repeated calls only pay for the checks themselves. Tools whose
+        schema is not known yet are not validated.
+
+        Args:
+            template_or_deployment: Template name or deployment ID
+            tool_name: Name of the tool
+            parameters: Tool arguments to validate
+
+        Returns:
+            List of validation errors (empty if valid or schema unknown)
+        """
+        try:
+            input_schema = self.get_tool_input_schema(template_or_deployment, tool_name)
+        except Exception as e:
+            logger.debug(f"Could not load input schema for {tool_name}: {e}")
+            return []
+
+        if not input_schema:
+            return []
+
+        validator = get_validator(input_schema, template_or_deployment, tool_name)
+        return validator.iter_errors(parameters if parameters is not None else {})
+
     def call_tool(
         self,
         template_or_deployment: str,
@@ -784,6 +844,7 @@ class ToolManager:
         timeout: int = 30,
         pull_image: bool = True,
         force_stdio: bool = False,
+        validate_arguments: bool = True,
     ) -> Dict[str, Any]:
         """
         Call a tool using the best available transport.
@@ -802,10 +863,24 @@ class ToolManager:
             timeout: Timeout for the call
             pull_image: Whether to pull image for stdio calls
             force_stdio: Force stdio transport even if HTTP is available
+            validate_arguments: Reject arguments that do not match the tool's
+                known input schema before any container or HTTP work
 
         Returns:
             Tool call result with success/error information
         """
+        if validate_arguments:
+            validation_errors = self.validate_tool_arguments(
+                template_or_deployment, tool_name, parameters
+            )
+            if validation_errors:
+                return {
+                    "success": False,
+                    "error": f"Invalid arguments for tool '{tool_name}': "
+                    + "; ".join(validation_errors),
+                    "validation_errors": validation_errors,
+                }
+
         try:
             self.tool_caller = ToolCaller()
 
@@ -842,7 +917,10 @@ class ToolManager:
                             external_port = ports.split("->")[0]
                             endpoint = f"http://127.0.0.1:{external_port}/mcp/"
                         elif deployment_info.get("endpoint"):
-                            endpoint = deployment_info.get("endpoint")
+                            # Spread calls across replicas where the backend can
+                            endpoint = self.backend.select_endpoint(
+                                deployment_info.get("id", template_or_deployment)
+                            ) or deployment_info.get("endpoint")
 
                         if endpoint:
                             logger.info(
@@ -17,6 +17,7 @@ import asyncio
 import json
 import logging
 import os
+import random
 import sys
 import time
 from dataclasses import dataclass
@@ -73,6 +74,70 @@ class RateLimiter:
         self.requests.append(now)
 
 
+class RetryPolicy:
+    """
+    Retries of failed API requests with exponential backoff and jitter.
+
+    Rate-limited requests wait as long as Zendesk's Retry-After header asks.
+    Server and connection errors back off exponentially, and no retry starts
+    that would end past the deadline. Other client errors are not retried.
+
+    Writes may already have been applied when a server error or timeout comes
+    back, so they are only retried when Zendesk certainly did not process
+    them: on 429 and when the connection could not be opened.
+    """
+
+    TRANSIENT_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+    # PUT is left out, ticket updates append their comment on every call
+    IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "DELETE"})
+
+    def __init__(
+        self,
+        attempts: int = 3,
+        initial_delay: float = 0.5,
+        max_delay: float = 8.0,
+        deadline: float = 120.0,
+    ):
+        self.attempts = attempts
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+
+    def next_delay(
+        self,
+        attempt: int,
+        started: float,
+        status: Optional[int] = None,
+        headers: Optional[dict] = None,
+        method: str = "GET",
+        error: Optional[BaseException] = None,
+    ) -> Optional[float]:
+        """Seconds to wait before retrying, or None if the failure is final."""
+        if attempt >= self.attempts:
+            return None
+        if method.upper() not in self.IDEMPOTENT_METHODS and not (
+            status == 429 or isinstance(error, aiohttp.ClientConnectorError)
+        ):
+            return None
+        if status is not None and status not in self.TRANSIENT_STATUS_CODES:
+            return None
+
+        delay = None
+        if status == 429 and headers:
+            try:
+                delay = float(headers.get("Retry-After"))
+            except (TypeError, ValueError):
+                pass
+        if delay is None:
+            step = min(self.initial_delay * 2 ** (attempt - 1), self.max_delay)
+            delay = random.uniform(step / 2, step)
+
+        if time.monotonic() - started + delay > self.deadline:
+            return None
+        return delay
+
+
 class ZendeskMCPServer:
     """
     Comprehensive Zendesk MCP Server implementation using FastMCP.
@@ -105,6 +170,7 @@ class ZendeskMCPServer:
         rate_config = self.config.get_rate_limit_config()
         self.rate_limiter = RateLimiter(rate_config["requests_per_minute"])
         self.timeout = rate_config["timeout_seconds"]
+        self.retry_policy = RetryPolicy()
 
         # Initialize cache
         cache_config = self.config.get_cache_config()
@@ -243,34 +309,49 @@ class ZendeskMCPServer:
             if data:
                 kwargs["json"] = data
 
-            async with self.session.request(method, url, **kwargs) as response:
-                response_text = await response.text()
-
-                if response.status == 429:
-                    # Rate limited, wait and retry once
-                    retry_after = int(response.headers.get("Retry-After", 60))
-                    self.logger.warning(f"Rate limited, waiting {retry_after} seconds")
-                    await asyncio.sleep(retry_after)
-
-                    async with self.session.request(
-                        method, url, **kwargs
-                    ) as retry_response:
-                        retry_text = await retry_response.text()
-                        retry_response.raise_for_status()
-                        result = json.loads(retry_text)
-                elif response.status >= 400:
-                    self.logger.error(f"API error {response.status}: {response_text}")
-                    response.raise_for_status()
-                else:
-                    result = json.loads(response_text)
-
-                # Cache successful GET requests
-                if method.upper() == "GET" and use_cache and cache_key:
-                    self._cache_data(cache_key, result)
-
-                return result
-
-        except aiohttp.ClientError as e:
+            started = time.monotonic()
+            attempt = 0
+            while True:
+                attempt += 1
+                try:
+                    async with self.session.request(method, url, **kwargs) as response:
+                        response_text = await response.text()
+
+                        if response.status < 400:
+                            result = json.loads(response_text)
+                            break
+
+                        delay = self.retry_policy.next_delay(
+                            attempt,
+                            started,
+                            response.status,
+                            response.headers,
+                            method=method,
+                        )
+                        if delay is None:
+                            self.logger.error(
+                                f"API error {response.status}: {response_text}"
+                            )
+                            response.raise_for_status()
+                        reason = f"API error {response.status}"
+                except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                    delay = self.retry_policy.next_delay(
+                        attempt, started, method=method, error=e
+                    )
+                    if delay is None:
+                        raise
+                    reason = str(e) or type(e).__name__
+
+                self.logger.warning(f"{reason}, retrying in {delay:.2f} seconds")
+                await asyncio.sleep(delay)
+
+            # Cache successful GET requests
+            if method.upper() == "GET" and use_cache and cache_key:
+                self._cache_data(cache_key, result)
+
+            return result
+
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
             self.logger.error(f"HTTP request failed: {e}")
             raise
         except json.JSONDecodeError as e:
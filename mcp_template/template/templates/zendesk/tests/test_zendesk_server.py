@@ -10,14 +10,51 @@ import asyncio
 import json
 import os
 import sys
+import time
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import aiohttp
 import pytest
 from aiohttp import ClientSession
 
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
-from server import CacheEntry, RateLimiter, ZendeskMCPServer
+from server import CacheEntry, RateLimiter, RetryPolicy, ZendeskMCPServer
+
+
+class TestRetryPolicy:
+    """Test cases for the RetryPolicy class."""
+
+    def test_reads_retry_on_server_errors(self):
+        """Test idempotent requests are retried on server errors and timeouts."""
+        policy = RetryPolicy()
+        started = time.monotonic()
+
+        assert policy.next_delay(1, started, 502, method="GET") is not None
+        assert (
+            policy.next_delay(1, started, error=asyncio.TimeoutError(), method="GET")
+            is not None
+        )
+
+    def test_writes_retry_only_when_not_processed(self):
+        """Test writes are not retried once Zendesk may have applied them."""
+        policy = RetryPolicy()
+        started = time.monotonic()
+        refused = aiohttp.ClientConnectorError(MagicMock(), OSError("refused"))
+
+        for method in ("POST", "PUT"):
+            assert policy.next_delay(1, started, 502, method=method) is None
+            assert (
+                policy.next_delay(
+                    1, started, error=asyncio.TimeoutError(), method=method
+                )
+                is None
+            )
+            assert (
+                policy.next_delay(1, started, 429, {"Retry-After": "2"}, method=method)
+                == 2.0
+            )
+            assert policy.next_delay(1, started, error=refused, method=method)
 
 
 class TestRateLimiter:
@@ -8,8 +8,24 @@ configuration management, and reusable deployment utilities.
 
 from .creation import TemplateCreator
 from .discovery import TemplateDiscovery
+from .registry import (
+    TemplateCatalogue,
+    TemplateRegistry,
+    TemplateSnapshot,
+    get_template_registry,
+)
+from .search import TemplateSearchIndex, get_search_index
+from .sources import TemplateSource, get_template_sources
 
 __all__ = [
+    "TemplateCatalogue",
     "TemplateDiscovery",
     "TemplateCreator",
+    "TemplateRegistry",
+    "TemplateSearchIndex",
+    "TemplateSnapshot",
+    "TemplateSource",
+    "get_search_index",
+    "get_template_registry",
+    "get_template_sources",
 ]
@@ -2,11 +2,23 @@
 Template discovery module for MCP server templates.
 """
 
+import copy
 import json
 import logging
 from pathlib import Path
-from typing import Any, Dict, Optional
-
+from typing import Any, Dict, List, Optional
+
+from mcp_template.template.utils.registry import (
+    TemplateCatalogue,
+    TemplateSnapshot,
+    get_template_registry,
+)
+from mcp_template.template.utils.sources import (
+    TemplateSource,
+    fetch_template_sources,
+    get_template_source,
+    get_template_sources,
+)
 from mcp_template.utils import TEMPLATES_DIR
 
 logger = logging.getLogger(__name__)
@@ -20,35 +32,53 @@ DEFAULT_LOGS_PATH = "/logs"
 class TemplateDiscovery:
     """Dynamic template discovery from templates directory."""
 
-    def __init__(self, templates_dir: Optional[Path] = None):
-        """Initialize template discovery."""
+    def __init__(
+        self,
+        templates_dir: Optional[Path] = None,
+        sources: Optional[List[TemplateSource]] = None,
+    ):
+        """
+        Initialize template discovery.
+
+        Args:
+            templates_dir: Templates directory (defaults to the bundled templates)
+            sources: Additional template sources, in precedence order. Defaults
+                to the sources listed in MCP_TEMPLATE_SOURCES when using the
+                bundled templates directory, and to none otherwise.
+        """
         if templates_dir is None:
             # Default to templates directory relative to this file
             self.templates_dir = TEMPLATES_DIR
+            default_sources = get_template_sources()
         else:
             self.templates_dir = templates_dir
+            default_sources = []
+
+        self.sources = default_sources if sources is None else list(sources)
 
-    def discover_templates(self) -> Dict[str, Dict[str, Any]]:
-        """Discover all valid templates in the templates directory."""
-        templates = {}
-        if not self.templates_dir.exists():
-            logger.warning("Templates directory not found: %s", self.templates_dir)
-            return templates
+    def discover_templates(self) -> TemplateCatalogue:
+        """
+        Discover all valid templates in the templates directory and sources.
 
-        for template_dir in self.templates_dir.iterdir():
-            if not template_dir.is_dir():
-                continue
+        Parsing is delegated to the process-wide registry of each directory, so
+        only templates changed since the last discovery are re-read. The
+        returned configurations are copies, so callers may modify them.
+        """
+        snapshot = self.get_snapshot()
+        return TemplateCatalogue(snapshot, copy.deepcopy(dict(snapshot.templates)))
 
-            template_name = template_dir.name
-            template_config = self._load_template_config(template_dir)
+    def get_snapshot(self) -> TemplateSnapshot:
+        """Get the current immutable snapshot of all discovered templates."""
+        if not self.sources:
+            registry = get_template_registry(self.templates_dir)
+            return registry.snapshot(self._load_template_config)
 
-            if template_config:
-                templates[template_name] = template_config
-                logger.debug("Discovered template: %s", template_name)
-            else:
-                logger.debug("Skipped invalid template: %s", template_name)
+        local_source = get_template_source(str(self.templates_dir))
+        return fetch_template_sources([local_source, *self.sources], self)
 
-        return templates
+    def refresh(self):
+        """Force the next discovery to re-parse every template."""
+        get_template_registry(self.templates_dir).invalidate()
 
     def _load_template_config(self, template_dir: Path) -> Optional[Dict[str, Any]]:
         """Load and validate a template configuration."""
@@ -131,17 +161,30 @@ class TemplateDiscovery:
         return config
 
     def get_template_config(self, template_name: str) -> Optional[Dict[str, Any]]:
-        """Get configuration for a specific template."""
-        template_dir = self.templates_dir / template_name
-        if not template_dir.exists():
-            return None
-        return self._load_template_config(template_dir)
+        """
+        Get configuration for a specific template.
+
+        Only the template's own directory is checked and, if it changed since
+        it was last loaded, parsed. The configuration is a copy, so callers
+        may modify it.
+        """
+        registry = get_template_registry(self.templates_dir)
+        config = registry.get_template(template_name, self._load_template_config)
+        if config is None and self.sources:
+            # Not a bundled template, look it up in the merged sources
+            config = self.get_snapshot().templates.get(template_name)
+        return copy.deepcopy(config)
 
     def get_template_path(self, template_name: str) -> Optional[Path]:
         """Get the path to a specific template."""
         template_dir = self.templates_dir / template_name
         if template_dir.exists() and template_dir.is_dir():
             return template_dir
+
+        for source in self.sources:
+            template_dir = source.template_path(template_name)
+            if template_dir is not None:
+                return template_dir
         return None
 
     def _get_docker_image(
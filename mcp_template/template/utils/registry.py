@@ -0,0 +1,220 @@
+"""
+Process-wide template registry.
+
+Every TemplateDiscovery (and so every TemplateManager) of a process shares one
+registry per templates directory. The registry fingerprints each template
+directory by mtime and size, re-parses only the directories that changed
+since the previous scan and publishes the result as an immutable snapshot.
+"""
+
+import logging
+import stat
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# (template dir mtime_ns, template.json mtime_ns, template.json size)
+Fingerprint = Tuple[int, int, int]
+TemplateLoader = Callable[[Path], Optional[Dict[str, Any]]]
+
+
+@dataclass(frozen=True)
+class TemplateSnapshot:
+    """
+    Immutable view of the templates found by one scan.
+
+    The template configurations are shared by every consumer of the snapshot
+    and must be treated as read-only; copy them before making changes.
+    """
+
+    templates: Mapping[str, Dict[str, Any]] = field(
+        default_factory=lambda: MappingProxyType({})
+    )
+    fingerprints: Mapping[str, Fingerprint] = field(
+        default_factory=lambda: MappingProxyType({})
+    )
+    generation: int = 0
+
+
+class TemplateCatalogue(dict):
+    """
+    Caller-owned copy of a snapshot's templates.
+
+    Remembers the snapshot it was copied from, so derived data such as the
+    search index can be shared between every copy of one snapshot.
+    """
+
+    def __init__(self, snapshot: TemplateSnapshot, templates: Dict[str, Any]):
+        super().__init__(templates)
+        self.snapshot = snapshot
+
+
+class TemplateRegistry:
+    """Incrementally rescanned registry of the templates in one directory."""
+
+    def __init__(self, templates_dir: Path):
+        """
+        Initialize template registry.
+
+        Args:
+            templates_dir: Directory containing one sub-directory per template
+        """
+        self.templates_dir = templates_dir
+        self._snapshot = TemplateSnapshot()
+        # Templates loaded one at a time, outside of a full scan
+        self._loaded: Dict[str, Tuple[Fingerprint, Optional[Dict[str, Any]]]] = {}
+        self._lock = threading.Lock()
+        self.parse_count = 0
+
+    def snapshot(self, loader: TemplateLoader) -> TemplateSnapshot:
+        """
+        Get the current snapshot, rescanning the templates directory.
+
+        Template directories whose fingerprint is unchanged keep their parsed
+        configuration; when nothing changed the previous snapshot object is
+        returned as is.
+
+        Args:
+            loader: Parses a template directory, returning None if invalid
+
+        Returns:
+            Snapshot of all valid templates
+        """
+        with self._lock:
+            previous = self._snapshot
+            fingerprints = self._scan()
+
+            if fingerprints == previous.fingerprints:
+                return previous
+
+            templates = {}
+            for name, fingerprint in fingerprints.items():
+                if previous.fingerprints.get(name) == fingerprint:
+                    config = previous.templates.get(name)
+                else:
+                    config = self._load(name, fingerprint, loader)
+
+                if config:
+                    templates[name] = config
+                    logger.debug("Discovered template: %s", name)
+                else:
+                    logger.debug("Skipped invalid template: %s", name)
+
+            self._snapshot = TemplateSnapshot(
+                templates=MappingProxyType(templates),
+                fingerprints=MappingProxyType(fingerprints),
+                generation=previous.generation + 1,
+            )
+            return self._snapshot
+
+    def get_template(
+        self, template_name: str, loader: TemplateLoader
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get a single template without scanning the whole directory.
+
+        Only the template's own directory is fingerprinted, and it is parsed
+        only if neither the current snapshot nor an earlier single-template
+        load has it at that fingerprint.
+
+        Args:
+            template_name: Name of the template directory
+            loader: Parses a template directory, returning None if invalid
+
+        Returns:
+            Template configuration, or None if missing or invalid
+        """
+        if template_name in ("", ".", "..") or "/" in template_name:
+            return None
+
+        fingerprint = self._fingerprint(self.templates_dir / template_name)
+        if fingerprint is None:
+            return None
+
+        with self._lock:
+            if self._snapshot.fingerprints.get(template_name) == fingerprint:
+                return self._snapshot.templates.get(template_name)
+            return self._load(template_name, fingerprint, loader)
+
+    def invalidate(self):
+        """Forget all parsed templates so the next snapshot re-parses them."""
+        with self._lock:
+            self._snapshot = TemplateSnapshot(generation=self._snapshot.generation)
+            self._loaded.clear()
+
+    def _load(
+        self, template_name: str, fingerprint: Fingerprint, loader: TemplateLoader
+    ) -> Optional[Dict[str, Any]]:
+        """Parse a template unless it was already loaded at this fingerprint."""
+        loaded = self._loaded.get(template_name)
+        if loaded is not None and loaded[0] == fingerprint:
+            return loaded[1]
+
+        config = loader(self.templates_dir / template_name)
+        self.parse_count += 1
+        self._loaded[template_name] = (fingerprint, config)
+        return config
+
+    def _scan(self) -> Dict[str, Fingerprint]:
+        """Fingerprint every template directory without reading any file."""
+        fingerprints = {}
+        if not self.templates_dir.exists():
+            logger.warning("Templates directory not found: %s", self.templates_dir)
+            return fingerprints
+
+        for template_dir in self.templates_dir.iterdir():
+            fingerprint = self._fingerprint(template_dir)
+            if fingerprint is not None:
+                fingerprints[template_dir.name] = fingerprint
+
+        return fingerprints
+
+    @staticmethod
+    def _fingerprint(template_dir: Path) -> Optional[Fingerprint]:
+        """Fingerprint a template directory, None if it isn't a directory."""
+        try:
+            dir_stat = template_dir.stat()
+        except OSError:
+            return None
+        if not stat.S_ISDIR(dir_stat.st_mode):
+            return None
+
+        try:
+            json_stat = (template_dir / "template.json").stat()
+        except OSError:
+            # Missing template.json: not a template, nothing to parse
+            return (dir_stat.st_mtime_ns, -1, -1)
+
+        return (dir_stat.st_mtime_ns, json_stat.st_mtime_ns, json_stat.st_size)
+
+
+_registries: Dict[Path, TemplateRegistry] = {}
+_registries_lock = threading.Lock()
+
+
+def get_template_registry(templates_dir: Path) -> TemplateRegistry:
+    """
+    Get the process-wide registry for a templates directory.
+
+    Args:
+        templates_dir: Directory containing one sub-directory per template
+
+    Returns:
+        Registry shared by all callers using the same directory
+    """
+    key = Path(templates_dir).resolve()
+    with _registries_lock:
+        registry = _registries.get(key)
+        if registry is None:
+            registry = _registries[key] = TemplateRegistry(key)
+        return registry
+
+
+def clear_template_registries():
+    """Drop all registries, mainly useful for tests."""
+    with _registries_lock:
+        _registries.clear()
@@ -0,0 +1,215 @@
+"""
+Inverted-index search over template catalogues.
+
+The index maps every token of a template's id, name, tags, tool names and
+description to the templates containing it. Queries look tokens up by prefix
+in a sorted vocabulary and by substring through an n-gram map instead of
+scanning every template or token, and results are ranked by which fields
+matched and how closely.
+"""
+
+import re
+import threading
+from bisect import bisect_left
+from collections import OrderedDict, defaultdict
+from typing import Any, Dict, Hashable, Iterable, List, Mapping, Set, Tuple, Union
+
+from mcp_template.template.utils.registry import TemplateSnapshot
+
+# Field weights: a hit on the template id or name outranks a hit on a tag,
+# which outranks a tool name, which outranks the description
+FIELD_WEIGHTS = {"name": 8.0, "tags": 4.0, "tools": 2.0, "description": 1.0}
+
+# Multipliers for how a query token matched an indexed token
+EXACT_MATCH = 2.0
+PREFIX_MATCH = 1.0
+INFIX_MATCH = 0.5
+
+SEARCH_INDEX_CACHE_SIZE = 8
+
+# Longest substring indexed for infix matches; longer query tokens are
+# narrowed down by intersecting their n-grams of this length
+NGRAM_SIZE = 3
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase alphanumeric tokens."""
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+class TemplateSearchIndex:
+    """Token-level inverted index over a mapping of templates."""
+
+    def __init__(self, templates: Mapping[str, Dict[str, Any]]):
+        """
+        Build the index.
+
+        Args:
+            templates: Mapping of template ids to template configurations
+        """
+        self.templates = templates
+        self.names = sorted(templates)
+        self._postings: Dict[str, Dict[str, float]] = defaultdict(dict)
+
+        for template_id, info in templates.items():
+            for field, text in self._fields(template_id, info):
+                weight = FIELD_WEIGHTS[field]
+                for token in tokenize(text):
+                    postings = self._postings[token]
+                    postings[template_id] = max(postings.get(template_id, 0), weight)
+
+        self.vocabulary = sorted(self._postings)
+
+        # Every substring of up to NGRAM_SIZE characters -> tokens containing it
+        self._ngrams: Dict[str, Set[str]] = defaultdict(set)
+        for token in self.vocabulary:
+            for size in range(1, NGRAM_SIZE + 1):
+                for start in range(len(token) - size + 1):
+                    self._ngrams[token[start : start + size]].add(token)
+
+    @staticmethod
+    def _fields(template_id: str, info: Any) -> Iterable[Tuple[str, str]]:
+        """Yield the (field, text) pairs of a template that are indexed."""
+        yield "name", template_id
+        if not isinstance(info, dict):
+            return
+
+        if isinstance(info.get("name"), str):
+            yield "name", info["name"]
+        for tag in info.get("tags") or []:
+            if isinstance(tag, str):
+                yield "tags", tag
+        for tool in info.get("tools") or []:
+            if isinstance(tool, dict) and isinstance(tool.get("name"), str):
+                yield "tools", tool["name"]
+        if isinstance(info.get("description"), str):
+            yield "description", info["description"]
+
+    def search(self, query: str) -> List[str]:
+        """
+        Find templates matching every token of a query.
+
+        Query tokens match indexed tokens exactly, by prefix or, ranked
+        lowest, as a substring.
+
+        Args:
+            query: Search query string
+
+        Returns:
+            Matching template ids, best match first
+        """
+        scores: Dict[str, float] = {}
+        for position, query_token in enumerate(tokenize(query)):
+            token_scores = self._score_token(query_token)
+            if position == 0:
+                scores = token_scores
+            else:
+                scores = {
+                    template_id: score + token_scores[template_id]
+                    for template_id, score in scores.items()
+                    if template_id in token_scores
+                }
+            if not scores:
+                break
+
+        return sorted(
+            scores, key=lambda template_id: (-scores[template_id], template_id)
+        )
+
+    def complete(self, prefix: str) -> List[str]:
+        """Get the template ids starting with prefix, in sorted order."""
+        start = bisect_left(self.names, prefix)
+        matches = []
+        for name in self.names[start:]:
+            if not name.startswith(prefix):
+                break
+            matches.append(name)
+        return matches
+
+    def _score_token(self, query_token: str) -> Dict[str, float]:
+        """Score every template containing a token matching query_token."""
+        scores: Dict[str, float] = {}
+
+        def add(token: str, multiplier: float):
+            for template_id, weight in self._postings[token].items():
+                score = weight * multiplier
+                if score > scores.get(template_id, 0):
+                    scores[template_id] = score
+
+        start = bisect_left(self.vocabulary, query_token)
+        for token in self.vocabulary[start:]:
+            if not token.startswith(query_token):
+                break
+            add(token, EXACT_MATCH if token == query_token else PREFIX_MATCH)
+
+        for token in self._infix_candidates(query_token):
+            if not token.startswith(query_token) and query_token in token:
+                add(token, INFIX_MATCH)
+
+        return scores
+
+    def _infix_candidates(self, query_token: str) -> Set[str]:
+        """Tokens that may contain query_token, found through the n-gram map."""
+        if len(query_token) <= NGRAM_SIZE:
+            return self._ngrams.get(query_token, set())
+
+        grams = sorted(
+            (
+                self._ngrams.get(query_token[start : start + NGRAM_SIZE], set())
+                for start in range(len(query_token) - NGRAM_SIZE + 1)
+            ),
+            key=len,
+        )
+        return grams[0].intersection(*grams[1:])
+
+
+# Cached indexes, each with the object whose identity its key holds
+_indexes: "OrderedDict[Hashable, Tuple[TemplateSearchIndex, Any]]" = OrderedDict()
+_indexes_lock = threading.Lock()
+
+
+def get_search_index(
+    templates: Union[TemplateSnapshot, Mapping[str, Dict[str, Any]], Iterable[str]],
+) -> TemplateSearchIndex:
+    """
+    Get the search index of a template mapping, building it at most once.
+
+    Registry snapshots, and the catalogues copied from them by
+    TemplateDiscovery.discover_templates, are recognized by the snapshot's
+    identity, so every copy of one snapshot shares one index. Other mappings
+    are recognized by the identity of their template configurations.
+
+    Args:
+        templates: Registry snapshot, mapping of template ids to
+            configurations, or template ids
+
+    Returns:
+        Search index of the templates
+    """
+    snapshot = getattr(templates, "snapshot", templates)
+    if isinstance(snapshot, TemplateSnapshot):
+        key: Hashable = ("snapshot", id(snapshot))
+        owner: Any = snapshot
+        templates = snapshot.templates
+    else:
+        if not isinstance(templates, Mapping):
+            templates = {name: None for name in templates}
+        key = tuple((name, id(info)) for name, info in templates.items())
+        owner = templates
+
+    with _indexes_lock:
+        cached = _indexes.get(key)
+        if cached is not None:
+            _indexes.move_to_end(key)
+            return cached[0]
+
+    # The owner is kept alive with the index, so the ids in its key stay
+    # unique for as long as the index is cached
+    index = TemplateSearchIndex(templates)
+    with _indexes_lock:
+        _indexes[key] = (index, owner)
+        while len(_indexes) > SEARCH_INDEX_CACHE_SIZE:
+            _indexes.popitem(last=False)
+    return index
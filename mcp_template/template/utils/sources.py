@@ -0,0 +1,493 @@
+"""
+Template sources for template discovery.
+
+Besides the bundled templates directory, templates can come from other local
+directories, tarballs (local or over HTTP) and HTTP JSON indexes. Sources
+listed in MCP_TEMPLATE_SOURCES are fetched in parallel and merged into one
+registry snapshot, earlier sources taking precedence over later ones.
+
+Remote sources revalidate with ETag/If-Modified-Since at most once per
+MCP_TEMPLATE_SOURCE_REFRESH_INTERVAL seconds, and fall back to their last
+good copy when the server can't be reached.
+"""
+
+import hashlib
+import logging
+import os
+import shutil
+import tarfile
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import requests
+
+from mcp_template.template.utils.registry import TemplateSnapshot, get_template_registry
+
+if TYPE_CHECKING:
+    from mcp_template.core.cache import CacheManager
+    from mcp_template.template.utils.discovery import TemplateDiscovery
+
+logger = logging.getLogger(__name__)
+
+# Comma-separated list of template directories, tarballs and index URLs
+MCP_TEMPLATE_SOURCES = os.getenv("MCP_TEMPLATE_SOURCES", "")
+
+MCP_TEMPLATE_SOURCE_REFRESH_INTERVAL = os.getenv(
+    "MCP_TEMPLATE_SOURCE_REFRESH_INTERVAL", 300.0
+)
+if isinstance(MCP_TEMPLATE_SOURCE_REFRESH_INTERVAL, str):
+    try:
+        MCP_TEMPLATE_SOURCE_REFRESH_INTERVAL = float(
+            MCP_TEMPLATE_SOURCE_REFRESH_INTERVAL
+        )
+    except ValueError:
+        logger.warning(
+            "Value %s is not a valid number. Setting template source refresh "
+            "interval to 300 seconds",
+            MCP_TEMPLATE_SOURCE_REFRESH_INTERVAL,
+        )
+        MCP_TEMPLATE_SOURCE_REFRESH_INTERVAL = 300.0
+
+TARBALL_SUFFIXES = (".tar.gz", ".tgz", ".tar")
+SOURCE_CACHE_DIR = Path.home() / ".mcp" / "cache" / "template-sources"
+
+# Validators of remote sources are kept long after the source was fetched,
+# the server decides whether they are still current
+SOURCE_CACHE_MAX_AGE_HOURS = 24 * 30
+
+
+class TemplateSource(ABC):
+    """Abstract base class for template sources."""
+
+    def __init__(self, location: str):
+        """
+        Initialize template source.
+
+        Args:
+            location: Directory, tarball path or URL of the source
+        """
+        self.location = location
+
+    @abstractmethod
+    def fetch(self, discovery: "TemplateDiscovery") -> Mapping[str, Dict[str, Any]]:
+        """
+        Get the templates of this source.
+
+        The same mapping object is returned for as long as the source is
+        unchanged, so callers can cheaply detect changes.
+
+        Args:
+            discovery: Discovery used to turn template.json data into configs
+
+        Returns:
+            Mapping of template names to template configurations
+        """
+
+    def template_path(self, template_name: str) -> Optional[Path]:
+        """Get the local directory of a template, if the source has one."""
+        return None
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.location!r})"
+
+
+class LocalTemplateSource(TemplateSource):
+    """Directory containing one sub-directory per template."""
+
+    def __init__(self, templates_dir: Path):
+        super().__init__(str(templates_dir))
+        self.templates_dir = Path(templates_dir)
+
+    def fetch(self, discovery: "TemplateDiscovery") -> Mapping[str, Dict[str, Any]]:
+        registry = get_template_registry(self.templates_dir)
+        return registry.snapshot(discovery._load_template_config).templates
+
+    def template_path(self, template_name: str) -> Optional[Path]:
+        template_dir = self.templates_dir / template_name
+        if (template_dir / "template.json").is_file():
+            return template_dir
+        return None
+
+
+class RemoteTemplateSource(TemplateSource):
+    """Base class for sources revalidated with HTTP conditional requests."""
+
+    def __init__(
+        self,
+        location: str,
+        refresh_interval: float = MCP_TEMPLATE_SOURCE_REFRESH_INTERVAL,
+        timeout: int = 10,
+        cache_manager: Optional["CacheManager"] = None,
+    ):
+        """
+        Initialize remote template source.
+
+        Args:
+            location: Tarball path or URL of the source
+            refresh_interval: Minimum seconds between two revalidations
+            timeout: HTTP request timeout in seconds
+            cache_manager: Cache for the validators of the last fetch
+        """
+        # Imported here to avoid a circular import through mcp_template.core
+        from mcp_template.core.cache import CacheManager
+
+        super().__init__(location)
+        self.refresh_interval = refresh_interval
+        self.timeout = timeout
+        self.cache_manager = cache_manager or CacheManager(
+            max_age_hours=SOURCE_CACHE_MAX_AGE_HOURS
+        )
+        self.cache_key = (
+            "template-source-" + hashlib.sha256(location.encode()).hexdigest()[:16]
+        )
+        self._templates: Optional[Mapping[str, Dict[str, Any]]] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def is_remote(self) -> bool:
+        return self.location.startswith(("http://", "https://"))
+
+    def fetch(self, discovery: "TemplateDiscovery") -> Mapping[str, Dict[str, Any]]:
+        with self._lock:
+            if (
+                self._templates is not None
+                and time.time() - self._checked_at < self.refresh_interval
+            ):
+                return self._templates
+
+            cached = self.cache_manager.get(self.cache_key)
+            entry = dict(cached["data"]) if cached else {}
+            try:
+                refreshed = self._refresh(entry)
+            except (requests.RequestException, OSError, ValueError) as e:
+                logger.warning(
+                    "Failed to fetch template source %s: %s", self.location, e
+                )
+                # Keep serving the last good copy, if there is one
+                refreshed = None
+                if not entry:
+                    self._checked_at = time.time()
+                    return self._templates or MappingProxyType({})
+
+            self._checked_at = time.time()
+            if refreshed is not None:
+                entry = refreshed
+                self.cache_manager.set(self.cache_key, entry)
+            elif self._templates is not None:
+                return self._templates
+
+            self._templates = MappingProxyType(self._load(entry, discovery))
+            return self._templates
+
+    def _conditional_get(self, entry: Dict[str, Any]) -> Optional[requests.Response]:
+        """
+        GET the source URL, revalidating the validators stored in entry.
+
+        Returns:
+            The response, or None if the server answered 304 Not Modified
+        """
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+        response = requests.get(self.location, headers=headers, timeout=self.timeout)
+        if response.status_code == 304 and headers:
+            logger.debug("Template source %s not modified", self.location)
+            return None
+
+        response.raise_for_status()
+        return response
+
+    @staticmethod
+    def _validators(response: requests.Response) -> Dict[str, Any]:
+        """Get the validators to revalidate a response with."""
+        return {
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+        }
+
+    @abstractmethod
+    def _refresh(self, entry: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Bring the source up to date.
+
+        Args:
+            entry: Entry stored by the previous successful refresh, if any
+
+        Returns:
+            New entry to store if the source changed, None otherwise
+        """
+
+    @abstractmethod
+    def _load(
+        self, entry: Dict[str, Any], discovery: "TemplateDiscovery"
+    ) -> Dict[str, Dict[str, Any]]:
+        """Build the template configurations of an up to date entry."""
+
+
+class HTTPIndexTemplateSource(RemoteTemplateSource):
+    """
+    JSON index served over HTTP.
+
+    The index maps template names to template.json documents, either as
+    {"templates": {name: data}} or as {"templates": [data, ...]} where each
+    document carries its name in "id".
+    """
+
+    def _refresh(self, entry: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        response = self._conditional_get(entry)
+        if response is None:
+            return None
+        return {**self._validators(response), "index": response.json()}
+
+    def _load(
+        self, entry: Dict[str, Any], discovery: "TemplateDiscovery"
+    ) -> Dict[str, Dict[str, Any]]:
+        index = entry.get("index") or {}
+        documents = index.get("templates", {}) if isinstance(index, dict) else {}
+        if isinstance(documents, list):
+            documents = {
+                document["id"]: document
+                for document in documents
+                if isinstance(document, dict) and document.get("id")
+            }
+
+        templates = {}
+        for name, template_data in documents.items():
+            try:
+                templates[name] = discovery._generate_template_config(
+                    template_data, Path(name)
+                )
+            except (AttributeError, KeyError, TypeError) as e:
+                logger.debug("Skipped invalid template %s in index: %s", name, e)
+        return templates
+
+
+class TarballTemplateSource(RemoteTemplateSource):
+    """
+    Tarball of template directories, given as a local path or an HTTP URL.
+
+    The tarball is extracted once into the template source cache directory
+    and its templates are then served from the registry like any local
+    directory, so unchanged tarballs are neither downloaded nor re-parsed.
+    """
+
+    def __init__(self, location: str, cache_dir: Path = SOURCE_CACHE_DIR, **kwargs):
+        super().__init__(location, **kwargs)
+        self.extract_dir = cache_dir / self.cache_key
+
+    def template_path(self, template_name: str) -> Optional[Path]:
+        return LocalTemplateSource(self._templates_root()).template_path(template_name)
+
+    def _refresh(self, entry: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        if not self.is_remote:
+            stat = Path(self.location).stat()
+            fingerprint = [stat.st_mtime_ns, stat.st_size]
+            if entry.get("fingerprint") == fingerprint and self.extract_dir.exists():
+                return None
+            self._extract(Path(self.location))
+            return {"fingerprint": fingerprint}
+
+        # Validators are useless once the extraction they refer to is lost
+        response = self._conditional_get(entry if self.extract_dir.exists() else {})
+        if response is None:
+            return None
+
+        with tempfile.NamedTemporaryFile(suffix=".tar") as tarball:
+            tarball.write(response.content)
+            tarball.flush()
+            self._extract(Path(tarball.name))
+        return self._validators(response)
+
+    def _load(
+        self, entry: Dict[str, Any], discovery: "TemplateDiscovery"
+    ) -> Dict[str, Dict[str, Any]]:
+        return dict(LocalTemplateSource(self._templates_root()).fetch(discovery))
+
+    def _templates_root(self) -> Path:
+        """Get the directory holding the template directories."""
+        # Tarballs created from a directory (e.g. git archives) wrap the
+        # templates in a single top-level directory
+        children = (
+            [child for child in self.extract_dir.iterdir() if child.is_dir()]
+            if self.extract_dir.exists()
+            else []
+        )
+        if len(children) == 1 and not (children[0] / "template.json").exists():
+            return children[0]
+        return self.extract_dir
+
+    def _extract(self, tarball_path: Path):
+        """Extract a tarball, atomically replacing the previous extraction."""
+        self.extract_dir.parent.mkdir(parents=True, exist_ok=True)
+        staging = Path(
+            tempfile.mkdtemp(
+                dir=self.extract_dir.parent, prefix=f".{self.extract_dir.name}."
+            )
+        )
+        try:
+            with tarfile.open(tarball_path) as tar:
+                _safe_extract(tar, staging)
+
+            previous = None
+            if self.extract_dir.exists():
+                previous = self.extract_dir.with_name(staging.name + ".old")
+                os.replace(self.extract_dir, previous)
+            os.replace(staging, self.extract_dir)
+            if previous is not None:
+                shutil.rmtree(previous, ignore_errors=True)
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+
+def _safe_extract(tar: tarfile.TarFile, destination: Path):
+    """Extract regular files and directories that stay inside destination."""
+    destination = destination.resolve()
+    for member in tar.getmembers():
+        target = (destination / member.name).resolve()
+        if destination not in target.parents and target != destination:
+            raise ValueError(f"Unsafe path in template tarball: {member.name}")
+        if member.isdir():
+            target.mkdir(parents=True, exist_ok=True)
+        elif member.isfile():
+            target.parent.mkdir(parents=True, exist_ok=True)
+            with tar.extractfile(member) as source, open(target, "wb") as f:
+                shutil.copyfileobj(source, f)
+        else:
+            logger.debug("Skipped non-regular tarball member: %s", member.name)
+
+
+def create_template_source(spec: str) -> TemplateSource:
+    """
+    Create a template source from a directory, tarball path or URL.
+
+    Args:
+        spec: Location of the source
+
+    Returns:
+        Tarball source for .tar/.tar.gz/.tgz locations, HTTP index source for
+        other URLs and local directory source otherwise
+    """
+    is_url = spec.startswith(("http://", "https://"))
+    path = spec.split("?", 1)[0] if is_url else spec
+    if path.endswith(TARBALL_SUFFIXES):
+        return TarballTemplateSource(spec)
+    if is_url:
+        return HTTPIndexTemplateSource(spec)
+    return LocalTemplateSource(Path(spec).expanduser())
+
+
+_sources: Dict[str, TemplateSource] = {}
+_sources_lock = threading.Lock()
+
+
+def get_template_source(spec: str) -> TemplateSource:
+    """
+    Get the process-wide template source for a location.
+
+    Args:
+        spec: Directory, tarball path or URL of the source
+
+    Returns:
+        Source shared by all callers using the same location
+    """
+    with _sources_lock:
+        source = _sources.get(spec)
+        if source is None:
+            source = _sources[spec] = create_template_source(spec)
+        return source
+
+
+def get_template_sources(specs: Optional[str] = None) -> List[TemplateSource]:
+    """
+    Get the process-wide template sources for a comma-separated spec list.
+
+    Args:
+        specs: Comma-separated source locations (defaults to MCP_TEMPLATE_SOURCES)
+
+    Returns:
+        Sources in precedence order
+    """
+    if specs is None:
+        specs = MCP_TEMPLATE_SOURCES
+
+    return [
+        get_template_source(spec)
+        for spec in (item.strip() for item in specs.split(","))
+        if spec
+    ]
+
+
+# Per tuple of sources: the source results the snapshot was merged from
+_merged_snapshots: Dict[
+    Tuple[TemplateSource, ...],
+    Tuple[Tuple[Mapping[str, Dict[str, Any]], ...], TemplateSnapshot],
+] = {}
+_merged_lock = threading.Lock()
+
+
+def fetch_template_sources(
+    sources: Sequence[TemplateSource],
+    discovery: "TemplateDiscovery",
+    max_workers: int = 8,
+) -> TemplateSnapshot:
+    """
+    Fetch sources in parallel and merge them into one snapshot.
+
+    Templates from earlier sources take precedence over templates with the
+    same name from later ones. A source that fails contributes no templates.
+    The merged snapshot is reused as long as no source changed.
+
+    Args:
+        sources: Sources in precedence order
+        discovery: Discovery used to turn template.json data into configs
+        max_workers: Maximum number of sources fetched concurrently
+
+    Returns:
+        Merged snapshot of all sources
+    """
+
+    def fetch(source: TemplateSource) -> Mapping[str, Dict[str, Any]]:
+        try:
+            return source.fetch(discovery)
+        except Exception as e:
+            logger.warning("Failed to fetch template source %s: %s", source, e)
+            return MappingProxyType({})
+
+    if len(sources) == 1:
+        results = [fetch(sources[0])]
+    else:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(sources))) as pool:
+            results = list(pool.map(fetch, sources))
+
+    sources_key = tuple(sources)
+    with _merged_lock:
+        cached = _merged_snapshots.get(sources_key)
+        if cached is not None and all(
+            previous is result for previous, result in zip(cached[0], results)
+        ):
+            return cached[1]
+
+        templates: Dict[str, Dict[str, Any]] = {}
+        for source, result in zip(sources, results):
+            for name, config in result.items():
+                if name in templates:
+                    logger.debug("Template %s from %s is shadowed", name, source)
+                    continue
+                templates[name] = config
+
+        generation = cached[1].generation + 1 if cached is not None else 1
+        snapshot = TemplateSnapshot(
+            templates=MappingProxyType(templates), generation=generation
+        )
+        _merged_snapshots[sources_key] = (tuple(results), snapshot)
+        return snapshot
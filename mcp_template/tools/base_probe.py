@@ -9,12 +9,17 @@ import asyncio
 import json
 import logging
 import os
+import threading
+import uuid
+import weakref
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import aiohttp
+from cachetools import LRUCache
 
 from mcp_template.core.mcp_connection import MCPConnection
+from mcp_template.core.retry import RetryPolicy
 
 from .mcp_client_probe import MCPClientProbe
 
@@ -24,9 +29,80 @@ logger = logging.getLogger(__name__)
 DISCOVERY_TIMEOUT = int(os.environ.get("MCP_DISCOVERY_TIMEOUT", "60"))
 DISCOVERY_RETRIES = int(os.environ.get("MCP_DISCOVERY_RETRIES", "3"))
 DISCOVERY_RETRY_SLEEP = int(os.environ.get("MCP_DISCOVERY_RETRY_SLEEP", "5"))
+DISCOVERY_RETRY_DEADLINE = int(os.environ.get("MCP_DISCOVERY_RETRY_DEADLINE", "30"))
 CONTAINER_PORT_RANGE = (8000, 9000)
 CONTAINER_HEALTH_CHECK_TIMEOUT = 15
 
+# First backoff step between discovery attempts, in seconds. Steps double up
+# to DISCOVERY_RETRY_SLEEP, and no retry starts past DISCOVERY_RETRY_DEADLINE.
+DISCOVERY_RETRY_INITIAL_DELAY = 0.5
+
+DISCOVERY_RETRY_POLICY = RetryPolicy(
+    attempts=DISCOVERY_RETRIES,
+    initial_delay=DISCOVERY_RETRY_INITIAL_DELAY,
+    max_delay=DISCOVERY_RETRY_SLEEP,
+    deadline=DISCOVERY_RETRY_DEADLINE,
+)
+
+# Number of deployments whose working endpoint is remembered
+DEPLOYMENT_ENDPOINT_CACHE_SIZE = 256
+
+# Deployment fields that change when a deployment is replaced or moves, e.g.
+# a new container id or pod IP, invalidating its remembered endpoint
+ENDPOINT_FINGERPRINT_FIELDS = (
+    "id",
+    "container_id",
+    "pod_ip",
+    "pod_ips",
+    "host",
+    "ports",
+    "endpoint",
+    "created",
+)
+
+_deployment_endpoints: LRUCache = LRUCache(maxsize=DEPLOYMENT_ENDPOINT_CACHE_SIZE)
+_deployment_endpoints_lock = threading.Lock()
+
+
+def _deployment_fingerprint(deployment_info: Dict) -> Tuple[str, ...]:
+    """Identify the running instance behind a deployment."""
+    return tuple(
+        json.dumps(deployment_info.get(field), sort_keys=True, default=str)
+        for field in ENDPOINT_FINGERPRINT_FIELDS
+    )
+
+
+def clear_deployment_endpoint_cache() -> None:
+    """Forget the endpoints that deployments were last reached on."""
+    with _deployment_endpoints_lock:
+        _deployment_endpoints.clear()
+
+
+_probe_sessions: (
+    "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aiohttp.ClientSession]"
+) = weakref.WeakKeyDictionary()
+
+
+def get_probe_session() -> aiohttp.ClientSession:
+    """
+    Get the HTTP session shared by async discoveries on the running loop.
+
+    Returns:
+        Session that stays open until close_probe_session() is awaited
+    """
+    loop = asyncio.get_running_loop()
+    session = _probe_sessions.get(loop)
+    if session is None or session.closed:
+        session = _probe_sessions[loop] = aiohttp.ClientSession()
+    return session
+
+
+async def close_probe_session() -> None:
+    """Close the shared HTTP session of the running loop, if any."""
+    session = _probe_sessions.pop(asyncio.get_running_loop(), None)
+    if session is not None:
+        await session.close()
+
 
 class BaseProbe(ABC):
     """Base class for MCP server tool discovery probes."""
@@ -57,6 +133,32 @@ class BaseProbe(ABC):
         """
         pass
 
+    async def adiscover_tools_from_image(
+        self,
+        image_name: str,
+        server_args: Optional[List[str]] = None,
+        env_vars: Optional[Dict[str, str]] = None,
+        timeout: int = DISCOVERY_TIMEOUT,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Discover tools from MCP server image without blocking the event loop.
+
+        Probes without a native async implementation run
+        discover_tools_from_image in a worker thread.
+
+        Args:
+            image_name: Container image name to probe
+            server_args: Arguments to pass to the MCP server
+            env_vars: Environment variables to pass to the container
+            timeout: Timeout for discovery process
+
+        Returns:
+            Dictionary containing discovered tools and metadata, or None if failed
+        """
+        return await asyncio.to_thread(
+            self.discover_tools_from_image, image_name, server_args, env_vars, timeout
+        )
+
     def _get_default_endpoints(self) -> List[str]:
         """Get default endpoints to probe for MCP tools."""
         return [
@@ -122,7 +224,8 @@ class BaseProbe(ABC):
 
         safe_name = image_name.replace("/", "-").replace(":", "-")
         timestamp = int(time.time())
-        return f"{prefix}-{safe_name}-{timestamp}"
+        # Concurrent discoveries of one image start within the same second
+        return f"{prefix}-{safe_name}-{timestamp}-{uuid.uuid4().hex[:8]}"
 
     def _prepare_environment_variables(
         self, env_vars: Optional[Dict[str, str]]
@@ -151,7 +254,12 @@ class BaseProbe(ABC):
         # Attempt HTTP discovery as fallback for all images
         return True
 
-    async def _async_discover_via_http(self, endpoint: str, timeout: int) -> List[Dict]:
+    async def _async_discover_via_http(
+        self,
+        endpoint: str,
+        timeout: int,
+        session: Optional[aiohttp.ClientSession] = None,
+    ) -> List[Dict]:
         """
         Async MCP JSON-RPC discovery using unified MCPConnection.
 
@@ -161,6 +269,7 @@ class BaseProbe(ABC):
         Args:
             endpoint: HTTP endpoint URL for the MCP server
             timeout: Timeout for the entire discovery process
+            session: Shared HTTP session, or None for a session per connection
 
         Returns:
             List of discovered tools, empty list if discovery fails
@@ -172,14 +281,14 @@ class BaseProbe(ABC):
             base_url = f"{parsed.scheme}://{parsed.netloc}"
 
             # Use unified MCPConnection with smart endpoint discovery
-            tools = await self._try_mcp_connection_smart(base_url, timeout)
+            tools = await self._try_mcp_connection_smart(base_url, timeout, session)
             if tools:
                 logger.info(f"Discovered {len(tools)} tools via smart MCP connection")
                 return tools
 
             # If smart discovery fails, try with the specific endpoint path
             if parsed.path and parsed.path != "/":
-                tools = await self._try_mcp_handshake(endpoint, timeout)
+                tools = await self._try_mcp_handshake(endpoint, timeout, session)
                 if tools:
                     logger.info(f"Discovered {len(tools)} tools via specific endpoint")
                     return tools
@@ -227,14 +336,17 @@ class BaseProbe(ABC):
             return []
 
     async def _try_mcp_connection_smart(
-        self, base_url: str, timeout: int
+        self,
+        base_url: str,
+        timeout: int,
+        session: Optional[aiohttp.ClientSession] = None,
     ) -> List[Dict]:
         """Try MCP connection with smart endpoint discovery using MCPConnection."""
         try:
             logger.debug(f"Trying smart MCP connection to {base_url}")
 
             # Use MCPConnection for unified protocol handling with smart discovery
-            connection = MCPConnection(timeout=timeout)
+            connection = MCPConnection(timeout=timeout, session=session)
 
             try:
                 # Connect via HTTP with smart endpoint discovery
@@ -258,7 +370,12 @@ class BaseProbe(ABC):
             logger.debug(f"Smart MCP connection failed for {base_url}: {e}")
             return []
 
-    async def _try_mcp_handshake(self, endpoint: str, timeout: int) -> List[Dict]:
+    async def _try_mcp_handshake(
+        self,
+        endpoint: str,
+        timeout: int,
+        session: Optional[aiohttp.ClientSession] = None,
+    ) -> List[Dict]:
         """Try full MCP handshake using unified MCPConnection."""
         try:
             # Parse URL to get base URL and path
@@ -271,7 +388,7 @@ class BaseProbe(ABC):
             logger.debug(f"Trying MCP handshake to {endpoint}")
 
             # Use MCPConnection for unified protocol handling
-            connection = MCPConnection(timeout=timeout)
+            connection = MCPConnection(timeout=timeout, session=session)
 
             try:
                 # Connect via HTTP with specific endpoint
@@ -411,7 +528,9 @@ class BaseProbe(ABC):
         """
         Discover tools from a running deployment via HTTP.
 
-        This method intelligently resolves endpoints and tests multiple patterns:
+        The endpoint a deployment answered on is remembered until the
+        deployment's instance (container id, pod IP, ports) changes. Otherwise
+        this method intelligently resolves endpoints and tests multiple patterns:
         1. User-provided endpoint as-is
         2. Common MCP patterns (/mcp, /tools, etc.)
         3. For Kubernetes ClusterIP, falls back to port-forwarding if needed
@@ -423,20 +542,81 @@ class BaseProbe(ABC):
         Returns:
             List of discovered tools, empty list if discovery fails
         """
+        return asyncio.run(
+            self._discover_tools_from_deployment(deployment_info, timeout)
+        )
+
+    async def adiscover_tools_from_deployment(
+        self, deployment_info: Dict, timeout: int = 30
+    ) -> List[Dict]:
+        """
+        Discover tools from a running deployment without blocking the event loop.
+
+        Same as discover_tools_from_deployment, over the HTTP session shared
+        by async discoveries on the running loop.
+
+        Args:
+            deployment_info: Dictionary containing deployment details (ports, host, etc.)
+            timeout: Timeout for the discovery process
+
+        Returns:
+            List of discovered tools, empty list if discovery fails
+        """
+        return await self._discover_tools_from_deployment(
+            deployment_info, timeout, get_probe_session()
+        )
+
+    async def _discover_tools_from_deployment(
+        self,
+        deployment_info: Dict,
+        timeout: int,
+        session: Optional[aiohttp.ClientSession] = None,
+    ) -> List[Dict]:
+        """Discover tools from a deployment, shared by the sync and async API."""
         try:
-            candidate_endpoints = self._resolve_candidate_endpoints(deployment_info)
+            deployment_key = deployment_info.get("id") or deployment_info.get("name")
+            fingerprint = _deployment_fingerprint(deployment_info)
+
+            # Go straight to the endpoint that worked last time, as long as
+            # the deployment is still the same instance
+            with _deployment_endpoints_lock:
+                cached = _deployment_endpoints.get(deployment_key)
+            if cached and cached[0] == fingerprint:
+                tools = await self._try_endpoint_with_patterns(
+                    cached[1], timeout, session
+                )
+                if tools:
+                    return tools
+            if cached:
+                with _deployment_endpoints_lock:
+                    _deployment_endpoints.pop(deployment_key, None)
+
+            # Resolution may query the cluster API, which blocks
+            candidate_endpoints = await asyncio.to_thread(
+                self._resolve_candidate_endpoints, deployment_info
+            )
 
             # Try each candidate endpoint with multiple HTTP discovery approaches
             for endpoint in candidate_endpoints:
                 logger.debug(f"Trying endpoint: {endpoint}")
-                tools = self._try_endpoint_with_patterns(endpoint, timeout)
+                tools = await self._try_endpoint_with_patterns(
+                    endpoint, timeout, session
+                )
                 if tools:
                     logger.info(f"✓ Successfully discovered tools from {endpoint}")
+                    if deployment_key:
+                        with _deployment_endpoints_lock:
+                            _deployment_endpoints[deployment_key] = (
+                                fingerprint,
+                                endpoint,
+                            )
                     return tools
 
             # If all direct endpoints failed for Kubernetes ClusterIP, try port-forwarding
             if self._is_kubernetes_cluster_ip_endpoint(deployment_info):
-                tools = self._try_kubernetes_port_forward(deployment_info, timeout)
+                tools = await self._try_kubernetes_port_forward(
+                    deployment_info, timeout, session
+                )
                 if tools:
                     return tools
 
@@ -517,8 +697,9 @@ class BaseProbe(ABC):
                     except ApiException:
                         pass
 
-            # Fallback: assume localhost with potential port-forward
-            return f"http://127.0.0.1:{port}"
+            # Fallback: the service name itself, which MCPConnection tunnels
+            # through a port-forward when running outside the cluster
+            return service_endpoint
 
         except Exception as e:
             logger.debug(f"Failed to resolve Kubernetes ClusterIP: {e}")
@@ -576,8 +757,11 @@ class BaseProbe(ABC):
 
         return endpoints
 
-    def _try_endpoint_with_patterns(
-        self, base_endpoint: str, timeout: int
+    async def _try_endpoint_with_patterns(
+        self,
+        base_endpoint: str,
+        timeout: int,
+        session: Optional[aiohttp.ClientSession] = None,
     ) -> List[Dict]:
         """
         Try an endpoint with smart MCPConnection discovery.
@@ -585,26 +769,19 @@ class BaseProbe(ABC):
         Uses MCPConnection's smart endpoint discovery which automatically
         tests common MCP paths and handles FastMCP protocol properly.
         """
-
-        async def _try_mcp_smart_discovery():
-            connection = MCPConnection(timeout=timeout)
-            try:
-                # Use smart endpoint discovery - this handles all the patterns internally
-                success = await connection.connect_http_smart(base_endpoint)
-                if success:
-                    tools = await connection.list_tools()
-                    if tools:
-                        return self._normalize_mcp_tools(tools)
-            finally:
-                await connection.disconnect()
-            return []
-
-        # Run async discovery in sync context
+        connection = MCPConnection(timeout=timeout, session=session)
         try:
-            return asyncio.run(_try_mcp_smart_discovery())
+            # Use smart endpoint discovery - this handles all the patterns internally
+            success = await connection.connect_http_smart(base_endpoint)
+            if success:
+                tools = await connection.list_tools()
+                if tools:
+                    return self._normalize_mcp_tools(tools)
         except Exception as e:
             logger.debug(f"Smart MCP discovery failed for {base_endpoint}: {e}")
-            return []
+        finally:
+            await connection.disconnect()
+        return []
 
     def _is_kubernetes_cluster_ip_endpoint(self, deployment_info: Dict) -> bool:
         """
@@ -615,68 +792,47 @@ class BaseProbe(ABC):
             hasattr(self, "namespace") and "10." in endpoint
         )  # Common ClusterIP range
 
-    def _try_kubernetes_port_forward(
-        self, deployment_info: Dict, timeout: int
+    async def _try_kubernetes_port_forward(
+        self,
+        deployment_info: Dict,
+        timeout: int,
+        session: Optional[aiohttp.ClientSession] = None,
     ) -> List[Dict]:
         """
         Try Kubernetes port-forwarding as a last resort for ClusterIP services.
 
-        This sets up a temporary port-forward and tests the endpoint.
+        The deployment's service is reached through a tunnel from the shared
+        port-forward pool, which stays open for later discoveries and calls.
         """
         try:
-            import socket
-            import subprocess
-            import time
+            import re
+
+            from mcp_template.backends.kubernetes_portforward import (
+                get_port_forward_pool,
+            )
 
             deployment_name = deployment_info.get("name") or deployment_info.get("id")
             if not deployment_name:
                 return []
 
             # Extract port from endpoint or deployment info
-            port = "8080"  # Default
-            endpoint = deployment_info.get("endpoint", "")
-            if endpoint:
-                import re
-
-                port_match = re.search(r":(\d+)", endpoint)
-                if port_match:
-                    port = port_match.group(1)
-
-            # Find a free local port
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-                s.bind(("", 0))
-                local_port = s.getsockname()[1]
-
-            # Start port-forward in background
-            cmd = [
-                "kubectl",
-                "port-forward",
-                f"service/{deployment_name}",
-                f"{local_port}:{port}",
-                "-n",
-                getattr(self, "namespace", "default"),
-            ]
-
-            logger.info(f"Starting kubectl port-forward: {' '.join(cmd)}")
-            process = subprocess.Popen(
-                cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
-            )
-
-            # Give port-forward time to establish
-            time.sleep(2)
+            port = 8080  # Default
+            port_match = re.search(r":(\d+)", deployment_info.get("endpoint", ""))
+            if port_match:
+                port = int(port_match.group(1))
+
+            # Loading the kubeconfig for a new pool blocks
+            pool = await asyncio.to_thread(get_port_forward_pool)
+            if pool is None:
+                return []
 
-            try:
-                # Test the forwarded endpoint
-                forwarded_endpoint = f"http://127.0.0.1:{local_port}"
-                tools = self._try_endpoint_with_patterns(forwarded_endpoint, timeout)
-                return tools
-            finally:
-                # Clean up port-forward
-                try:
-                    process.terminate()
-                    process.wait(timeout=5)
-                except:
-                    process.kill()
+            tunnel = pool.tunnel(
+                getattr(self, "namespace", "default"), deployment_name, port
+            )
+            forwarded_endpoint = f"http://127.0.0.1:{tunnel.local_port}"
+            return await self._try_endpoint_with_patterns(
+                forwarded_endpoint, timeout, session
+            )
 
         except Exception as e:
             logger.debug(f"Port-forward attempt failed: {e}")
@@ -3,25 +3,53 @@ Docker probe for discovering MCP server tools from Docker images.
 """
 
 import asyncio
+import json
 import logging
-import socket
 import subprocess
 import time
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
-import requests
-from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_fixed
+from mcp_template.core.retry import is_transient_error
+from mcp_template.utils.cleanup_reaper import (
+    discovery_label_args,
+    get_container_reaper,
+)
+from mcp_template.utils.image_utils import TOOLS_LABEL, parse_tools_label
 
 from .base_probe import (
-    CONTAINER_PORT_RANGE,
-    DISCOVERY_RETRIES,
-    DISCOVERY_RETRY_SLEEP,
+    DISCOVERY_RETRY_POLICY,
     DISCOVERY_TIMEOUT,
     BaseProbe,
+    get_probe_session,
 )
+from .docker_readiness import wait_for_container_ready
 
 logger = logging.getLogger(__name__)
 
+# Port the MCP server listens on inside discovery containers
+HTTP_CONTAINER_PORT = 8000
+
+
+async def _run_docker(cmd: List[str], timeout: float) -> Tuple[int, str, str]:
+    """
+    Run a docker command as an asyncio subprocess.
+
+    The process is killed if it times out or the caller is cancelled.
+
+    Returns:
+        Return code, stdout and stderr
+    """
+    process = await asyncio.create_subprocess_exec(
+        *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+    )
+    try:
+        stdout, stderr = await asyncio.wait_for(process.communicate(), timeout)
+    except BaseException:
+        if process.returncode is None:
+            process.kill()
+        raise
+    return process.returncode, stdout.decode(), stderr.decode()
+
 
 class DockerProbe(BaseProbe):
     """Probe Docker containers to discover MCP server tools."""
@@ -30,32 +58,6 @@ class DockerProbe(BaseProbe):
         """Initialize Docker probe."""
         super().__init__()
 
-    def _background_cleanup(self, container_name: str, max_retries: int = 3):
-        """Background cleanup with retries."""
-
-        for attempt in range(max_retries):
-            try:
-                time.sleep(2**attempt)  # Exponential backoff: 1s, 2s, 4s
-                subprocess.run(
-                    ["docker", "rm", "-f", container_name],
-                    capture_output=True,
-                    text=True,
-                    timeout=30,
-                    check=False,
-                )
-                logger.info(
-                    f"Background cleanup successful for {container_name} on attempt {attempt + 1}"
-                )
-                return
-            except (subprocess.TimeoutExpired, subprocess.CalledProcessError) as e:
-                logger.debug(
-                    f"Background cleanup attempt {attempt + 1} failed for {container_name}: {e}"
-                )
-                if attempt == max_retries - 1:
-                    logger.error(
-                        f"Background cleanup failed after {max_retries} attempts for {container_name}"
-                    )
-
     def discover_tools_from_image(
         self,
         image_name: str,
@@ -77,34 +79,220 @@ class DockerProbe(BaseProbe):
         """
         logger.info("Discovering tools from MCP Docker image: %s", image_name)
 
+        # Images declaring their tools need no container at all
+        result = self._try_image_label_discovery(image_name)
+        if result:
+            return result
+
+        # Try MCP stdio first, a failure still leaves the HTTP probe
         try:
-            # Try MCP stdio first
             result = self._try_mcp_stdio_discovery(image_name, server_args, env_vars)
             if result:
                 return result
+        except (subprocess.SubprocessError, OSError) as e:
+            logger.debug("MCP stdio discovery failed for %s: %s", image_name, e)
 
-            # Fallback to HTTP probe (for non-standard MCP servers)
+        # Fallback to HTTP probe (for non-standard MCP servers)
+        try:
             return self._try_http_discovery(image_name, timeout)
+        except (subprocess.SubprocessError, OSError) as e:
+            logger.error("Failed to discover tools from image %s: %s", image_name, e)
+            return None
+
+    async def adiscover_tools_from_image(
+        self,
+        image_name: str,
+        server_args: Optional[List[str]] = None,
+        env_vars: Optional[Dict[str, str]] = None,
+        timeout: int = DISCOVERY_TIMEOUT,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Discover tools from MCP server Docker image on the running event loop.
+
+        Docker commands run as asyncio subprocesses and HTTP goes through the
+        shared probe session, so many discoveries can run concurrently on one
+        loop. Cancelling a discovery removes the container it started.
+
+        Args:
+            image_name: Docker image name to probe
+            server_args: Arguments to pass to the MCP server
+            env_vars: Environment variables to pass to the container
+            timeout: Timeout for discovery process
+
+        Returns:
+            Dictionary containing discovered tools and metadata, or None if failed
+        """
+        logger.info("Discovering tools from MCP Docker image: %s", image_name)
 
-        except (subprocess.TimeoutExpired, subprocess.CalledProcessError, OSError) as e:
+        try:
+            result = await self._atry_image_label_discovery(image_name)
+            if result:
+                return result
+
+            # A stdio failure still leaves the HTTP probe
+            try:
+                result = await self._atry_mcp_stdio_discovery(
+                    image_name, server_args, env_vars
+                )
+                if result:
+                    return result
+            except (asyncio.TimeoutError, subprocess.SubprocessError, OSError) as e:
+                logger.debug("MCP stdio discovery failed for %s: %s", image_name, e)
+
+            return await self._atry_http_discovery(image_name, timeout)
+
+        except (asyncio.TimeoutError, subprocess.SubprocessError, OSError) as e:
             logger.error("Failed to discover tools from image %s: %s", image_name, e)
             return None
 
-    @retry(
-        stop=stop_after_attempt(DISCOVERY_RETRIES),
-        wait=wait_fixed(DISCOVERY_RETRY_SLEEP),
-        retry=retry_if_exception_type(
-            (subprocess.TimeoutExpired, subprocess.CalledProcessError, OSError)
-        ),
-        reraise=True,
-    )
+    @DISCOVERY_RETRY_POLICY
+    async def _atry_mcp_stdio_discovery(
+        self,
+        image_name: str,
+        server_args: Optional[List[str]],
+        env_vars: Optional[Dict[str, str]],
+    ) -> Optional[Dict[str, Any]]:
+        """Async variant of _try_mcp_stdio_discovery."""
+        result = await self.mcp_client.discover_tools_from_docker_mcp(
+            image_name, server_args or [], env_vars
+        )
+        if result:
+            logger.info(
+                "Successfully discovered tools via MCP stdio from %s", image_name
+            )
+            result["discovery_method"] = "docker_mcp_stdio"
+        return result
+
+    async def _atry_image_label_discovery(
+        self, image_name: str
+    ) -> Optional[Dict[str, Any]]:
+        """Async variant of _try_image_label_discovery."""
+        try:
+            returncode, stdout, _ = await _run_docker(
+                self._image_labels_command(image_name), timeout=10
+            )
+        except (asyncio.TimeoutError, OSError) as e:
+            logger.debug("Failed to inspect image %s: %s", image_name, e)
+            return None
+
+        if returncode != 0:
+            return None
+        return self._label_discovery_result(image_name, stdout)
+
+    @DISCOVERY_RETRY_POLICY
+    async def _atry_http_discovery(
+        self, image_name: str, timeout: int
+    ) -> Optional[Dict[str, Any]]:
+        """Async variant of _try_http_discovery."""
+        container_name = self._generate_container_name(image_name)
+        try:
+            cmd = self._http_container_command(image_name, container_name)
+            returncode, _, stderr = await _run_docker(cmd, timeout=30)
+            if returncode != 0:
+                logger.error("Failed to start container %s: %s", container_name, stderr)
+                error = subprocess.CalledProcessError(returncode, cmd, stderr=stderr)
+                if is_transient_error(error):
+                    raise error
+                return None
+
+            _, stdout, _ = await _run_docker(
+                self._published_port_command(container_name), timeout=10
+            )
+            port = self._parse_published_port(container_name, stdout)
+            if not port:
+                return None
+
+            session = get_probe_session()
+            if not await wait_for_container_ready(
+                container_name, port, timeout, session=session
+            ):
+                return None
+
+            endpoint = f"http://localhost:{port}/mcp"
+            tools = await self._async_discover_via_http(endpoint, timeout, session)
+            if tools:
+                return self._http_discovery_result(
+                    image_name, container_name, port, tools
+                )
+            return None
+
+        except (asyncio.TimeoutError, OSError) as e:
+            if is_transient_error(e):
+                raise
+            logger.debug("HTTP discovery failed for %s: %s", image_name, e)
+            return None
+
+        finally:
+            # Queued for removal, which also happens if the discovery is cancelled
+            self._cleanup_container(container_name)
+
+    def _try_image_label_discovery(self, image_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Read the tools an image declares in its io.mcp.tools label.
+
+        Only local images are inspected. An image that is not pulled yet is
+        discovered by running it, which pulls it anyway.
+        """
+        try:
+            result = subprocess.run(
+                self._image_labels_command(image_name),
+                capture_output=True,
+                text=True,
+                timeout=10,
+                check=False,
+            )
+        except (subprocess.TimeoutExpired, OSError) as e:
+            logger.debug("Failed to inspect image %s: %s", image_name, e)
+            return None
+
+        if result.returncode != 0:
+            return None
+        return self._label_discovery_result(image_name, result.stdout)
+
+    @staticmethod
+    def _image_labels_command(image_name: str) -> List[str]:
+        return [
+            "docker",
+            "image",
+            "inspect",
+            "--format={{json .Config.Labels}}",
+            image_name,
+        ]
+
+    def _label_discovery_result(
+        self, image_name: str, inspect_output: str
+    ) -> Optional[Dict[str, Any]]:
+        """Build the discovery result from `docker image inspect` labels."""
+        try:
+            labels = json.loads(inspect_output or "null")
+        except json.JSONDecodeError:
+            return None
+
+        tools = parse_tools_label(labels)
+        if tools is None:
+            return None
+
+        logger.info("Discovered tools from %s label of %s", TOOLS_LABEL, image_name)
+        return {
+            "tools": self._normalize_mcp_tools(tools),
+            "discovery_method": "docker_image_label",
+            "timestamp": time.time(),
+            "source_image": image_name,
+        }
+
+    @DISCOVERY_RETRY_POLICY
     def _try_mcp_stdio_discovery(
         self,
         image_name: str,
         server_args: Optional[List[str]],
         env_vars: Optional[Dict[str, str]],
     ) -> Optional[Dict[str, Any]]:
-        """Try to discover tools using MCP stdio protocol."""
+        """
+        Try to discover tools using MCP stdio protocol.
+
+        Transient errors are raised so the retry policy can try again, other
+        failures return None right away.
+        """
         try:
             args = server_args or []
             result = self.mcp_client.discover_tools_from_docker_sync(
@@ -119,35 +307,30 @@ class DockerProbe(BaseProbe):
 
             return result
 
-        except (subprocess.TimeoutExpired, subprocess.CalledProcessError, OSError) as e:
+        except (subprocess.SubprocessError, OSError) as e:
+            if is_transient_error(e):
+                raise
             logger.debug("MCP stdio discovery failed for %s: %s", image_name, e)
             return None
 
-    @retry(
-        stop=stop_after_attempt(DISCOVERY_RETRIES),
-        wait=wait_fixed(DISCOVERY_RETRY_SLEEP),
-        retry=retry_if_exception_type(
-            (subprocess.TimeoutExpired, subprocess.CalledProcessError, OSError)
-        ),
-        reraise=True,
-    )
+    @DISCOVERY_RETRY_POLICY
     def _try_http_discovery(
         self, image_name: str, timeout: int
     ) -> Optional[Dict[str, Any]]:
-        """Try to discover tools using HTTP endpoints with proper MCP protocol."""
+        """
+        Try to discover tools using HTTP endpoints with proper MCP protocol.
+
+        Each attempt runs a fresh container. Transient errors are raised so
+        the retry policy can try again, other failures return None right away.
+        """
         container_name = None
         try:
             # Generate unique container name
             container_name = self._generate_container_name(image_name)
 
-            # Find available port
-            port = self._find_available_port()
+            # Start container with HTTP server on a port picked by Docker
+            port = self._start_http_container(image_name, container_name)
             if not port:
-                logger.error("No available ports found for container")
-                return None
-
-            # Start container with HTTP server
-            if not self._start_http_container(image_name, container_name, port):
                 return None
 
             # Wait for container to be ready
@@ -159,18 +342,15 @@ class DockerProbe(BaseProbe):
             tools = asyncio.run(self._async_discover_via_http(endpoint, timeout))
 
             if tools:
-                return {
-                    "tools": self._normalize_mcp_tools(tools),
-                    "discovery_method": "docker_http_probe",
-                    "timestamp": time.time(),
-                    "source_image": image_name,
-                    "container_name": container_name,
-                    "port": port,
-                }
+                return self._http_discovery_result(
+                    image_name, container_name, port, tools
+                )
 
             return None
 
-        except (subprocess.TimeoutExpired, subprocess.CalledProcessError, OSError) as e:
+        except (subprocess.SubprocessError, OSError) as e:
+            if is_transient_error(e):
+                raise
             logger.debug("HTTP discovery failed for %s: %s", image_name, e)
             return None
 
@@ -179,159 +359,108 @@ class DockerProbe(BaseProbe):
             if container_name:
                 self._cleanup_container(container_name)
 
-    def _find_available_port(self) -> Optional[int]:
-        """Find an available port for the container."""
-        for port in range(CONTAINER_PORT_RANGE[0], CONTAINER_PORT_RANGE[1]):
-            try:
-                with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
-                    sock.bind(("localhost", port))
-                    return port
-            except OSError:
-                continue
-        return None
+    def _http_discovery_result(
+        self, image_name: str, container_name: str, port: int, tools: List[Dict]
+    ) -> Dict[str, Any]:
+        return {
+            "tools": self._normalize_mcp_tools(tools),
+            "discovery_method": "docker_http_probe",
+            "timestamp": time.time(),
+            "source_image": image_name,
+            "container_name": container_name,
+            "port": port,
+        }
 
     def _start_http_container(
-        self, image_name: str, container_name: str, port: int
-    ) -> bool:
-        """Start container with HTTP server (fallback method)."""
-        try:
-            cmd = [
-                "docker",
-                "run",
-                "-d",
-                "--name",
-                container_name,
-                "-p",
-                f"{port}:8000",
-                image_name,
-            ]
+        self, image_name: str, container_name: str
+    ) -> Optional[int]:
+        """
+        Start container with HTTP server (fallback method).
+
+        The server port is published on host port 0, so Docker assigns a free
+        port atomically and parallel discoveries never collide.
 
+        Returns:
+            Host port the server is published on, or None if the container
+            cannot start, e.g. because the image does not exist
+
+        Raises:
+            subprocess.CalledProcessError: If docker failed in a way a retry
+                may fix
+            subprocess.TimeoutExpired: If docker did not answer in time
+        """
+        cmd = self._http_container_command(image_name, container_name)
+        try:
             result = subprocess.run(
                 cmd, capture_output=True, text=True, timeout=30, check=False
             )
-
-            if result.returncode == 0:
-                logger.debug("Container %s started successfully", container_name)
-                return True
-            else:
-                logger.error(
-                    "Failed to start container %s: %s", container_name, result.stderr
-                )
-                return False
-
         except subprocess.TimeoutExpired:
             logger.error("Timeout starting container %s", container_name)
-            return False
-        except (subprocess.CalledProcessError, OSError) as e:
+            raise
+        except OSError as e:
             logger.error("Error starting container %s: %s", container_name, e)
-            return False
+            return None
 
-    def _wait_for_container_ready(
-        self, container_name: str, port: int, timeout: int
-    ) -> bool:
-        """Wait for container to be ready to accept requests."""
-        start_time = time.time()
+        if result.returncode != 0:
+            logger.error(
+                "Failed to start container %s: %s", container_name, result.stderr
+            )
+            error = subprocess.CalledProcessError(
+                result.returncode, cmd, stderr=result.stderr
+            )
+            if is_transient_error(error):
+                raise error
+            return None
 
-        while time.time() - start_time < timeout:
-            try:
-                # Check if container is still running
-                if not self._is_container_running(container_name):
-                    logger.debug("Container %s is not running", container_name)
-                    return False
-
-                # Try different health check endpoints for different server types
-                health_endpoints = ["/health", "/mcp", "/", "/api/health"]
-
-                for endpoint in health_endpoints:
-                    try:
-                        response = requests.get(
-                            f"http://localhost:{port}{endpoint}", timeout=2
-                        )
-                        if (
-                            response.status_code < 500
-                        ):  # Any non-server-error response is good
-                            logger.debug(
-                                "Container %s is ready (endpoint: %s)",
-                                container_name,
-                                endpoint,
-                            )
-                            return True
-                    except requests.RequestException:
-                        continue  # Try next endpoint
-
-                # If no endpoint worked, try simple port connectivity check
-                try:
-                    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                    sock.settimeout(2)
-                    result = sock.connect_ex(("localhost", port))
-                    sock.close()
-                    if result == 0:  # Port is open
-                        logger.debug(
-                            "Container %s port %d is open", container_name, port
-                        )
-                        return True
-                except socket.error:
-                    pass
-
-            except requests.RequestException:
-                # Expected during startup, continue waiting
-                pass
-
-            time.sleep(1)
-
-        logger.warning(
-            "Container %s did not become ready within %d seconds",
+        logger.debug("Container %s started successfully", container_name)
+        return self._get_published_port(container_name)
+
+    @staticmethod
+    def _http_container_command(image_name: str, container_name: str) -> List[str]:
+        return [
+            "docker",
+            "run",
+            "-d",
+            "--name",
             container_name,
-            timeout,
+            *discovery_label_args(),
+            "-p",
+            f"0:{HTTP_CONTAINER_PORT}",
+            image_name,
+        ]
+
+    @staticmethod
+    def _published_port_command(container_name: str) -> List[str]:
+        return ["docker", "port", container_name, f"{HTTP_CONTAINER_PORT}/tcp"]
+
+    def _get_published_port(self, container_name: str) -> Optional[int]:
+        """Read the host port Docker assigned to the container's server port."""
+        result = subprocess.run(
+            self._published_port_command(container_name),
+            capture_output=True,
+            text=True,
+            timeout=10,
+            check=False,
         )
-        return False
+        return self._parse_published_port(container_name, result.stdout)
 
-    def _is_container_running(self, container_name: str) -> bool:
-        """Check if container is still running."""
-        try:
-            result = subprocess.run(
-                ["docker", "inspect", "--format={{.State.Running}}", container_name],
-                capture_output=True,
-                text=True,
-                check=True,
-                timeout=5,
-            )
-            return result.stdout.strip() == "true"
-
-        except (subprocess.CalledProcessError, subprocess.TimeoutExpired):
-            return False
+    @staticmethod
+    def _parse_published_port(container_name: str, output: str) -> Optional[int]:
+        # One line per host address, e.g. "0.0.0.0:49153" and "[::]:49153"
+        for line in output.splitlines():
+            _, _, port = line.strip().rpartition(":")
+            if port.isdigit():
+                return int(port)
 
-    def _cleanup_container(self, container_name: str) -> None:
-        """Clean up container synchronously, with background fallback on timeout/error."""
-        try:
-            # Stop container with short timeout
-            subprocess.run(
-                ["docker", "stop", container_name],
-                capture_output=True,
-                timeout=5,  # Reduced timeout
-                check=False,
-            )
+        logger.error("No published port for container %s", container_name)
+        return None
 
-            # Try to remove container synchronously first
-            subprocess.run(
-                ["docker", "rm", "-f", container_name],
-                capture_output=True,
-                timeout=30,
-                check=True,
-            )
-            logger.debug("Successfully cleaned up container %s", container_name)
+    def _wait_for_container_ready(
+        self, container_name: str, port: int, timeout: int
+    ) -> bool:
+        """Wait for container to be ready to accept requests."""
+        return asyncio.run(wait_for_container_ready(container_name, port, timeout))
 
-        except subprocess.TimeoutExpired:
-            logger.warning(
-                "Timeout cleaning up container %s, scheduling background cleanup",
-                container_name,
-            )
-            self._background_cleanup(container_name)
-        except (subprocess.CalledProcessError, OSError) as e:
-            logger.warning(
-                "Error cleaning up container %s: %s, scheduling background cleanup",
-                container_name,
-                e,
-            )
-            # Still try cleanup
-            self._background_cleanup(container_name)
+    def _cleanup_container(self, container_name: str) -> None:
+        """Queue a container for removal by the background reaper."""
+        get_container_reaper().submit(container_name)
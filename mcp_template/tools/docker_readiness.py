@@ -0,0 +1,296 @@
+"""
+Readiness detection for containers started by the Docker probe.
+
+A container is ready once its server answers HTTP on the published port, or
+once Docker reports it healthy when the image defines a HEALTHCHECK. Probes
+are retried with jittered exponential backoff starting at a few tens of
+milliseconds, so fast servers are picked up almost immediately while slow
+ones are not hammered. Container exits and health transitions come from a
+single process-wide `docker events` subscription instead of one
+`docker inspect` per poll.
+"""
+
+import asyncio
+import atexit
+import json
+import logging
+import subprocess
+import threading
+from contextlib import AsyncExitStack
+from typing import Callable, Dict, List, Optional
+
+import aiohttp
+
+from mcp_template.core.retry import backoff_delays
+
+logger = logging.getLogger(__name__)
+
+# Backoff between readiness probes, in seconds
+READINESS_INITIAL_DELAY = 0.02
+READINESS_MAX_DELAY = 1.0
+READINESS_BACKOFF_FACTOR = 2.0
+
+# Seconds a single HTTP readiness probe may take
+READINESS_PROBE_TIMEOUT = 2.0
+PROBE_TIMEOUT = aiohttp.ClientTimeout(total=READINESS_PROBE_TIMEOUT)
+
+# Paths probed in order; any non-server-error response means ready
+HEALTH_ENDPOINTS = ("/health", "/mcp", "/", "/api/health")
+
+DOCKER_EVENTS_COMMAND = [
+    "docker",
+    "events",
+    "--filter",
+    "type=container",
+    "--filter",
+    "event=die",
+    "--filter",
+    "event=health_status",
+    "--format",
+    "{{json .}}",
+]
+
+EXIT_ACTION = "die"
+HEALTHY_ACTION = "health_status: healthy"
+UNHEALTHY_ACTION = "health_status: unhealthy"
+
+
+class ContainerEventWatcher:
+    """Single `docker events` subscription fanned out to per-container listeners."""
+
+    def __init__(self, command: Optional[List[str]] = None):
+        """
+        Initialize the watcher. The subscription starts on first use.
+
+        Args:
+            command: Command streaming container events as JSON lines
+        """
+        self.command = command or DOCKER_EVENTS_COMMAND
+        self._listeners: Dict[str, List[Callable[[str], None]]] = {}
+        self._process: Optional[subprocess.Popen] = None
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        """Whether the events subscription is alive."""
+        return self._process is not None and self._process.poll() is None
+
+    def subscribe(self, container_name: str, callback: Callable[[str], None]) -> bool:
+        """
+        Call back with each exit or health event of a container.
+
+        Args:
+            container_name: Name of the container
+            callback: Called with the event action from the watcher thread
+
+        Returns:
+            True if events will be delivered, False if no subscription could
+            be started
+        """
+        with self._lock:
+            if not self.running and not self._start():
+                return False
+            self._listeners.setdefault(container_name, []).append(callback)
+            return True
+
+    def unsubscribe(self, container_name: str, callback: Callable[[str], None]):
+        """Stop calling back for a container."""
+        with self._lock:
+            callbacks = self._listeners.get(container_name, [])
+            if callback in callbacks:
+                callbacks.remove(callback)
+            if not callbacks:
+                self._listeners.pop(container_name, None)
+
+    def close(self) -> None:
+        """Stop the events subscription."""
+        with self._lock:
+            process, self._process = self._process, None
+        if process is not None and process.poll() is None:
+            process.terminate()
+
+    def _start(self) -> bool:
+        try:
+            process = subprocess.Popen(
+                self.command,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+            )
+        except OSError as e:
+            logger.debug("Cannot subscribe to docker events: %s", e)
+            return False
+
+        self._process = process
+        threading.Thread(
+            target=self._read, args=(process,), name="docker events", daemon=True
+        ).start()
+        return True
+
+    def _read(self, process: subprocess.Popen) -> None:
+        for line in process.stdout:
+            try:
+                event = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+            actor = event.get("Actor") or {}
+            name = (actor.get("Attributes") or {}).get("name")
+            action = event.get("Action") or event.get("status") or ""
+            with self._lock:
+                callbacks = list(self._listeners.get(name, []))
+            for callback in callbacks:
+                callback(action)
+        logger.debug("docker events subscription ended")
+
+
+_watcher: Optional[ContainerEventWatcher] = None
+_watcher_lock = threading.Lock()
+
+
+def get_container_event_watcher() -> ContainerEventWatcher:
+    """Get the process-wide container event watcher."""
+    global _watcher
+    with _watcher_lock:
+        if _watcher is None:
+            _watcher = ContainerEventWatcher()
+        return _watcher
+
+
+def close_container_event_watcher() -> None:
+    """Stop the shared events subscription."""
+    global _watcher
+    with _watcher_lock:
+        watcher, _watcher = _watcher, None
+    if watcher is not None:
+        watcher.close()
+
+
+async def inspect_container_state(container_name: str) -> Optional[Dict]:
+    """
+    Read the State of a container.
+
+    Args:
+        container_name: Name of the container
+
+    Returns:
+        State as reported by `docker inspect`, or None if it is unavailable
+    """
+    try:
+        process = await asyncio.create_subprocess_exec(
+            "docker",
+            "inspect",
+            "--format={{json .State}}",
+            container_name,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        stdout, _ = await asyncio.wait_for(process.communicate(), timeout=5)
+    except (OSError, asyncio.TimeoutError) as e:
+        logger.debug("Failed to inspect container %s: %s", container_name, e)
+        return None
+
+    if process.returncode != 0:
+        return None
+    try:
+        return json.loads(stdout)
+    except json.JSONDecodeError:
+        return None
+
+
+async def _server_responds(session: aiohttp.ClientSession, port: int) -> bool:
+    """Whether anything answers HTTP on the port without a server error."""
+    for endpoint in HEALTH_ENDPOINTS:
+        try:
+            async with session.get(
+                f"http://localhost:{port}{endpoint}", timeout=PROBE_TIMEOUT
+            ) as response:
+                if response.status < 500:
+                    return True
+        except (aiohttp.ClientError, asyncio.TimeoutError, OSError):
+            # Nothing is listening yet, the other paths will not answer either
+            return False
+    return False
+
+
+async def wait_for_container_ready(
+    container_name: str,
+    port: int,
+    timeout: float,
+    session: Optional[aiohttp.ClientSession] = None,
+) -> bool:
+    """
+    Wait until a container's server accepts requests.
+
+    Args:
+        container_name: Name of the container
+        port: Host port the server is published on
+        timeout: Seconds to wait
+        session: HTTP session to probe with, or None for a new one
+
+    Returns:
+        True once the server answers or Docker reports it healthy, False if
+        the container exits, turns unhealthy or the timeout passes
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    events: asyncio.Queue = asyncio.Queue()
+
+    def on_event(action: str) -> None:
+        loop.call_soon_threadsafe(events.put_nowait, action)
+
+    watcher = get_container_event_watcher()
+    subscribed = watcher.subscribe(container_name, on_event)
+    try:
+        # Inspect once after subscribing, later changes arrive as events
+        state = await inspect_container_state(container_name)
+        if not state or not state.get("Running"):
+            logger.debug("Container %s is not running", container_name)
+            return False
+        if (state.get("Health") or {}).get("Status") == "healthy":
+            return True
+
+        delays = backoff_delays(
+            READINESS_INITIAL_DELAY, READINESS_MAX_DELAY, READINESS_BACKOFF_FACTOR
+        )
+        async with AsyncExitStack() as stack:
+            if session is None:
+                session = await stack.enter_async_context(aiohttp.ClientSession())
+            while True:
+                if await _server_responds(session, port):
+                    logger.debug("Container %s is ready", container_name)
+                    return True
+
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    action = await asyncio.wait_for(
+                        events.get(), min(next(delays), remaining)
+                    )
+                except asyncio.TimeoutError:
+                    if not (subscribed and watcher.running):
+                        state = await inspect_container_state(container_name)
+                        if not state or not state.get("Running"):
+                            return False
+                    continue
+
+                if action == HEALTHY_ACTION:
+                    logger.debug("Container %s reported healthy", container_name)
+                    return True
+                if action in (EXIT_ACTION, UNHEALTHY_ACTION):
+                    logger.debug("Container %s: %s", container_name, action)
+                    return False
+    finally:
+        if subscribed:
+            watcher.unsubscribe(container_name, on_event)
+
+    logger.warning(
+        "Container %s did not become ready within %d seconds",
+        container_name,
+        timeout,
+    )
+    return False
+
+
+atexit.register(close_container_event_watcher)
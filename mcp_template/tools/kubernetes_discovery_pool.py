@@ -0,0 +1,358 @@
+"""
+Reusable HTTP discovery workers for the Kubernetes probe.
+
+A worker is a pod running an image plus a ClusterIP service in front of it.
+Workers are named after a hash of the image, environment and port, so every
+probe in every process that discovers the same image finds and reuses the
+same worker instead of paying a scheduling and image-pull cycle. Each use
+stamps the pod with a last-used time, and workers unused for longer than the
+TTL are garbage-collected by label selector.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from kubernetes import watch
+from kubernetes.client.rest import ApiException
+
+logger = logging.getLogger(__name__)
+
+# Seconds an unused discovery worker is kept before it is garbage-collected
+DISCOVERY_WORKER_TTL = int(os.environ.get("MCP_K8S_DISCOVERY_WORKER_TTL", "600"))
+
+# Minimum seconds between two garbage collection sweeps of a pool
+DISCOVERY_GC_INTERVAL = 60
+
+DISCOVERY_COMPONENT_SELECTOR = "app.kubernetes.io/component=discovery"
+DISCOVERY_KEY_LABEL = "mcp-template.io/discovery-key"
+LAST_USED_ANNOTATION = "mcp-template.io/last-used"
+
+
+def worker_key(image_name: str, env_vars: Optional[Dict[str, str]], port: int) -> str:
+    """Short stable hash identifying interchangeable discovery workers."""
+    encoded = json.dumps(
+        [image_name, sorted((env_vars or {}).items()), port], default=str
+    ).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+
+class DiscoveryWorkerPool:
+    """HTTP discovery workers in a namespace, reused across discoveries."""
+
+    def __init__(
+        self,
+        core_v1,
+        namespace: str,
+        ttl: int = DISCOVERY_WORKER_TTL,
+        gc_interval: int = DISCOVERY_GC_INTERVAL,
+    ):
+        """
+        Initialize the pool.
+
+        Args:
+            core_v1: Kubernetes CoreV1Api client
+            namespace: Namespace the workers run in
+            ttl: Seconds an unused worker is kept
+            gc_interval: Minimum seconds between garbage collection sweeps
+        """
+        self.core_v1 = core_v1
+        self.namespace = namespace
+        self.ttl = ttl
+        self.gc_interval = gc_interval
+        self._last_gc: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def acquire(
+        self,
+        image_name: str,
+        port: int,
+        env_vars: Optional[Dict[str, str]] = None,
+        timeout: int = 60,
+    ) -> Optional[str]:
+        """
+        Get the URL of a ready worker for an image, starting one if needed.
+
+        Args:
+            image_name: Image the worker runs
+            port: Port the MCP server listens on
+            env_vars: Environment variables of the worker
+            timeout: Seconds to wait for a new worker to become ready
+
+        Returns:
+            Cluster-internal URL of the worker's service, or None if it did not
+            become ready
+
+        Raises:
+            TimeoutError: If an exited worker is still terminating after timeout
+        """
+        self._maybe_collect_garbage()
+
+        key = worker_key(image_name, env_vars, port)
+        name = f"mcp-discovery-{key}"
+        pod = self._read_pod(name)
+
+        if pod is not None and pod.status.phase in ("Failed", "Succeeded"):
+            # The pod name is taken until the old pod is gone; the service
+            # selects by name and is kept for the replacement
+            logger.debug("Discovery worker %s exited, replacing it", name)
+            self._delete_pod(name, timeout)
+            pod = None
+
+        if pod is None:
+            self._create_worker(name, key, image_name, port, env_vars)
+        else:
+            logger.debug("Reusing discovery worker %s for %s", name, image_name)
+
+        if not self._is_ready(pod) and not self._wait_for_ready(name, timeout):
+            return None
+
+        self._touch(name)
+        return f"http://{name}.{self.namespace}.svc.cluster.local:{port}"
+
+    def discard(
+        self, image_name: str, port: int, env_vars: Optional[Dict[str, str]] = None
+    ) -> None:
+        """Delete the worker of an image, e.g. after it failed to answer."""
+        key = worker_key(image_name, env_vars, port)
+        self._delete_worker(f"mcp-discovery-{key}", key)
+
+    def collect_garbage(self) -> int:
+        """
+        Delete workers unused for longer than the TTL, or no longer running.
+
+        Returns:
+            Number of workers deleted
+        """
+        with self._lock:
+            self._last_gc = time.monotonic()
+
+        try:
+            pods = self.core_v1.list_namespaced_pod(
+                namespace=self.namespace, label_selector=DISCOVERY_COMPONENT_SELECTOR
+            ).items
+        except ApiException as e:
+            logger.debug("Failed to list discovery workers: %s", e)
+            return 0
+
+        now = time.time()
+        deleted = 0
+        for pod in pods:
+            annotations = pod.metadata.annotations or {}
+            try:
+                last_used = float(annotations.get(LAST_USED_ANNOTATION, 0))
+            except ValueError:
+                last_used = 0
+
+            finished = pod.status.phase in ("Failed", "Succeeded")
+            if finished or now - last_used > self.ttl:
+                key = (pod.metadata.labels or {}).get(DISCOVERY_KEY_LABEL)
+                self._delete_worker(pod.metadata.name, key)
+                deleted += 1
+
+        if deleted:
+            logger.info("Garbage-collected %d discovery workers", deleted)
+        return deleted
+
+    def _maybe_collect_garbage(self) -> None:
+        with self._lock:
+            due = (
+                self._last_gc is None
+                or time.monotonic() - self._last_gc >= self.gc_interval
+            )
+        if due:
+            self.collect_garbage()
+
+    def _read_pod(self, name: str):
+        try:
+            return self.core_v1.read_namespaced_pod(name=name, namespace=self.namespace)
+        except ApiException as e:
+            if e.status == 404:
+                return None
+            raise
+
+    @staticmethod
+    def _is_ready(pod) -> bool:
+        if pod is None or pod.status.phase != "Running":
+            return False
+        statuses = pod.status.container_statuses or []
+        return bool(statuses) and all(status.ready for status in statuses)
+
+    def _wait_for_ready(self, name: str, timeout: int) -> bool:
+        watcher = watch.Watch()
+        try:
+            for event in watcher.stream(
+                self.core_v1.list_namespaced_pod,
+                namespace=self.namespace,
+                field_selector=f"metadata.name={name}",
+                timeout_seconds=timeout,
+            ):
+                pod = event["object"]
+                if self._is_ready(pod):
+                    return True
+                if pod.status.phase in ("Failed", "Succeeded"):
+                    logger.debug("Discovery worker %s exited", name)
+                    return False
+        finally:
+            watcher.stop()
+
+        logger.warning("Discovery worker %s not ready after %d seconds", name, timeout)
+        return False
+
+    def _delete_pod(self, name: str, timeout: int) -> None:
+        """Delete a worker pod and wait until it has terminated."""
+        try:
+            self.core_v1.delete_namespaced_pod(name=name, namespace=self.namespace)
+        except ApiException as e:
+            if e.status != 404:
+                raise
+
+        pod = self._read_pod(name)
+        if pod is None:
+            return
+
+        watcher = watch.Watch()
+        try:
+            for event in watcher.stream(
+                self.core_v1.list_namespaced_pod,
+                namespace=self.namespace,
+                field_selector=f"metadata.name={name}",
+                resource_version=pod.metadata.resource_version,
+                timeout_seconds=timeout,
+            ):
+                if event["type"] == "DELETED":
+                    return
+        finally:
+            watcher.stop()
+
+        if self._read_pod(name) is not None:
+            raise TimeoutError(
+                f"Discovery worker {name} still terminating after {timeout} seconds"
+            )
+
+    def _touch(self, name: str) -> None:
+        body = {"metadata": {"annotations": {LAST_USED_ANNOTATION: str(time.time())}}}
+        try:
+            self.core_v1.patch_namespaced_pod(
+                name=name, namespace=self.namespace, body=body
+            )
+        except ApiException as e:
+            logger.debug("Failed to stamp discovery worker %s: %s", name, e)
+
+    def _labels(self, name: str, key: str) -> Dict[str, str]:
+        return {
+            "app.kubernetes.io/managed-by": "mcp-templates",
+            "app.kubernetes.io/component": "discovery",
+            "app.kubernetes.io/instance": name,
+            DISCOVERY_KEY_LABEL: key,
+        }
+
+    def _create_worker(
+        self,
+        name: str,
+        key: str,
+        image_name: str,
+        port: int,
+        env_vars: Optional[Dict[str, str]],
+    ) -> None:
+        labels = self._labels(name, key)
+        pod_manifest: Dict[str, Any] = {
+            "apiVersion": "v1",
+            "kind": "Pod",
+            "metadata": {
+                "name": name,
+                "namespace": self.namespace,
+                "labels": labels,
+                "annotations": {LAST_USED_ANNOTATION: str(time.time())},
+            },
+            "spec": {
+                "restartPolicy": "Never",
+                "containers": [
+                    {
+                        "name": "mcp-http-probe",
+                        "image": image_name,
+                        "ports": [{"containerPort": port}],
+                        "env": [
+                            {"name": k, "value": v} for k, v in (env_vars or {}).items()
+                        ],
+                        "resources": {
+                            "requests": {"memory": "64Mi", "cpu": "100m"},
+                            "limits": {"memory": "256Mi", "cpu": "500m"},
+                        },
+                    }
+                ],
+            },
+        }
+        service_manifest = {
+            "apiVersion": "v1",
+            "kind": "Service",
+            "metadata": {"name": name, "namespace": self.namespace, "labels": labels},
+            "spec": {
+                "selector": {"app.kubernetes.io/instance": name},
+                "ports": [{"protocol": "TCP", "port": port, "targetPort": port}],
+                "type": "ClusterIP",
+            },
+        }
+
+        # Another probe may have started the same worker concurrently
+        for create, manifest in (
+            (self.core_v1.create_namespaced_pod, pod_manifest),
+            (self.core_v1.create_namespaced_service, service_manifest),
+        ):
+            try:
+                create(namespace=self.namespace, body=manifest)
+            except ApiException as e:
+                if e.status != 409:
+                    raise
+        logger.info("Started discovery worker %s for %s", name, image_name)
+
+    def _delete_worker(self, name: str, key: Optional[str]) -> None:
+        try:
+            self.core_v1.delete_namespaced_pod(name=name, namespace=self.namespace)
+        except ApiException as e:
+            if e.status != 404:
+                logger.debug("Failed to delete discovery worker %s: %s", name, e)
+
+        selector = (
+            f"{DISCOVERY_KEY_LABEL}={key}"
+            if key
+            else f"app.kubernetes.io/instance={name}"
+        )
+        try:
+            self.core_v1.delete_collection_namespaced_service(
+                namespace=self.namespace, label_selector=selector
+            )
+        except ApiException as e:
+            logger.debug("Failed to delete service of worker %s: %s", name, e)
+
+
+_pools: Dict[str, DiscoveryWorkerPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_discovery_pool(core_v1, namespace: str) -> DiscoveryWorkerPool:
+    """
+    Get the process-wide discovery worker pool of a namespace.
+
+    Args:
+        core_v1: Kubernetes CoreV1Api client, used if the pool is created
+        namespace: Namespace of the pool
+
+    Returns:
+        Discovery worker pool shared by probes
+    """
+    with _pools_lock:
+        pool = _pools.get(namespace)
+        if pool is None:
+            pool = _pools[namespace] = DiscoveryWorkerPool(core_v1, namespace)
+        return pool
+
+
+def clear_discovery_pools() -> None:
+    """Forget all pools. Workers keep running until their TTL expires."""
+    with _pools_lock:
+        _pools.clear()
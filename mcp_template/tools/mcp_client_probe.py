@@ -6,8 +6,15 @@ import asyncio
 import json
 import logging
 import time
+import uuid
 from typing import Any, Dict, List, Optional
 
+from mcp_template.core.retry import is_transient_error
+from mcp_template.utils.cleanup_reaper import (
+    discovery_label_args,
+    get_container_reaper,
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -37,52 +44,57 @@ class MCPClientProbe:
             Dictionary containing discovered tools and metadata, or None if failed
         """
         try:
-            logger.info("Starting MCP server with command: %s", " ".join(command))
-
-            # Start the MCP server process
-            process = await asyncio.create_subprocess_exec(
-                *command,
-                stdin=asyncio.subprocess.PIPE,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                cwd=working_dir,
-            )
+            return await self._discover_tools_from_command(command, working_dir)
+        except Exception as e:
+            logger.error("Failed to discover tools from MCP server: %s", e)
+            return None
 
-            try:
-                # Initialize MCP connection
-                result = await self._initialize_mcp_session(process)
-                if not result:
-                    return None
+    async def _discover_tools_from_command(
+        self, command: List[str], working_dir: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Discover tools via command line, raising timeouts and process errors."""
+        logger.info("Starting MCP server with command: %s", " ".join(command))
+
+        # Start the MCP server process
+        process = await asyncio.create_subprocess_exec(
+            *command,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            cwd=working_dir,
+        )
 
-                # List tools
-                tools = await self._list_tools(process)
-                if not tools:
-                    return None
+        try:
+            # Initialize MCP connection
+            result = await self._initialize_mcp_session(process)
+            if not result:
+                return None
 
-                return {
-                    "discovery_method": "mcp_client",
-                    "timestamp": time.time(),
-                    "tools": self._normalize_mcp_tools(tools),
-                    "command": command,
-                    "server_info": result.get("serverInfo", {}),
-                }
+            # List tools
+            tools = await self._list_tools(process)
+            if not tools:
+                return None
 
-            finally:
-                # Cleanup process
-                try:
-                    if process.returncode is None:
-                        process.terminate()
-                        await asyncio.wait_for(process.wait(), timeout=5)
-                except (ProcessLookupError, asyncio.TimeoutError):
-                    try:
-                        process.kill()
-                        await process.wait()
-                    except ProcessLookupError:
-                        pass
+            return {
+                "discovery_method": "mcp_client",
+                "timestamp": time.time(),
+                "tools": self._normalize_mcp_tools(tools),
+                "command": command,
+                "server_info": result.get("serverInfo", {}),
+            }
 
-        except Exception as e:
-            logger.error("Failed to discover tools from MCP server: %s", e)
-            return None
+        finally:
+            # Cleanup process
+            try:
+                if process.returncode is None:
+                    process.terminate()
+                    await asyncio.wait_for(process.wait(), timeout=5)
+            except (ProcessLookupError, asyncio.TimeoutError):
+                try:
+                    process.kill()
+                    await process.wait()
+                except ProcessLookupError:
+                    pass
 
     async def discover_tools_from_docker_mcp(
         self,
@@ -100,9 +112,13 @@ class MCPClientProbe:
 
         Returns:
             Dictionary containing discovered tools and metadata, or None if failed
+
+        Raises:
+            Transient errors (timeouts, failures to start the container) so
+            callers can retry with a fresh container
         """
 
-        container_name = f"mcp-discovery-{image_name.replace('/', '-').replace(':', '-')}-{int(time.time())}"
+        container_name = f"mcp-discovery-{image_name.replace('/', '-').replace(':', '-')}-{int(time.time())}-{uuid.uuid4().hex[:8]}"
 
         try:
             # Build docker command
@@ -113,6 +129,7 @@ class MCPClientProbe:
                 "-i",
                 "--name",
                 container_name,
+                *discovery_label_args(),
             ]
 
             # Add environment variables
@@ -126,24 +143,17 @@ class MCPClientProbe:
             if args:
                 docker_cmd.extend(args)
 
-            return await self.discover_tools_from_command(docker_cmd)
+            return await self._discover_tools_from_command(docker_cmd)
 
         except Exception as e:
+            if is_transient_error(e):
+                raise
             logger.debug("MCP discovery failed for Docker server %s: %s", image_name, e)
             return None
         finally:
-            # Cleanup container if it's still running
-            try:
-                process = await asyncio.create_subprocess_exec(
-                    "docker",
-                    "stop",
-                    container_name,
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE,
-                )
-                await asyncio.wait_for(process.wait(), timeout=10)
-            except Exception:
-                pass
+            # The container removes itself on exit, the reaper removes it in
+            # the background if it is still running
+            get_container_reaper().submit(container_name)
 
     async def _initialize_mcp_session(
         self, process: asyncio.subprocess.Process
@@ -192,7 +202,7 @@ class MCPClientProbe:
 
         except asyncio.TimeoutError:
             logger.error("Timeout during MCP initialization")
-            return None
+            raise
         except Exception as e:
             logger.error("Error during MCP initialization: %s", e)
             return None
@@ -200,8 +210,14 @@ class MCPClientProbe:
     async def _read_json_response(
         self, process: asyncio.subprocess.Process, operation: str
     ) -> Optional[Dict[str, Any]]:
-        """Read JSON response from MCP server, skipping non-JSON lines."""
+        """
+        Read JSON response from MCP server, skipping non-JSON lines.
+
+        Raises:
+            asyncio.TimeoutError: If the server stopped writing before answering
+        """
         max_attempts = 20  # Increased attempts to handle more startup output
+        timed_out = False
 
         for attempt in range(max_attempts):
             try:
@@ -214,6 +230,7 @@ class MCPClientProbe:
                     logger.error(f"No response from MCP server during {operation}")
                     return None
 
+                timed_out = False
                 line = response_line.decode().strip()
                 logger.debug(
                     f"Raw MCP response line {attempt + 1} for {operation}: {line}"
@@ -230,8 +247,14 @@ class MCPClientProbe:
                 logger.debug(
                     f"Timeout on line {attempt + 1} during {operation}, continuing..."
                 )
+                timed_out = True
                 continue
 
+        if timed_out:
+            raise asyncio.TimeoutError(
+                f"No response from MCP server during {operation}"
+            )
+
         logger.error(
             f"No valid JSON response found from MCP server for {operation} after {max_attempts} attempts"
         )
@@ -276,7 +299,7 @@ class MCPClientProbe:
 
         except asyncio.TimeoutError:
             logger.error("Timeout during MCP tools/list")
-            return None
+            raise
         except Exception as e:
             logger.error("Error during MCP tools/list: %s", e)
             return None
@@ -331,14 +354,7 @@ class MCPClientProbe:
         self, command: List[str], working_dir: Optional[str] = None
     ) -> Optional[Dict[str, Any]]:
         """Synchronous wrapper for discovering tools."""
-        try:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            return loop.run_until_complete(
-                self.discover_tools_from_command(command, working_dir)
-            )
-        finally:
-            loop.close()
+        return asyncio.run(self.discover_tools_from_command(command, working_dir))
 
     def discover_tools_from_docker_sync(
         self,
@@ -347,11 +363,6 @@ class MCPClientProbe:
         env_vars: Optional[Dict[str, str]] = None,
     ) -> Optional[Dict[str, Any]]:
         """Synchronous wrapper for discovering tools from Docker."""
-        try:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            return loop.run_until_complete(
-                self.discover_tools_from_docker_mcp(image_name, args, env_vars)
-            )
-        finally:
-            loop.close()
+        return asyncio.run(
+            self.discover_tools_from_docker_mcp(image_name, args, env_vars)
+        )
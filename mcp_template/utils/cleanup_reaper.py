@@ -0,0 +1,285 @@
+"""
+Background removal of discovery containers and pods.
+
+Discoveries hand the containers and pods they are done with to a reaper
+instead of waiting for them to be torn down. A worker thread removes
+everything queued so far in one batch, a single `docker rm -f a b c` for
+containers or a single label-selector delete for pods, so discovery latency
+never includes teardown. The container reaper starts with a sweep of
+discovery containers whose owning process has exited, which catches anything
+an earlier run queued but never got to remove.
+"""
+
+import atexit
+import functools
+import logging
+import os
+import socket
+import subprocess
+import threading
+import time
+import weakref
+from typing import Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Label on discovery containers, valued with the owning host and process
+DISCOVERY_OWNER_LABEL = "mcp-template.io/discovery-owner"
+
+# Label carrying a pod's own name, so pods can be deleted by set selector
+POD_NAME_LABEL = "app.kubernetes.io/instance"
+
+# Names removed per docker command or delete request
+REAPER_BATCH_SIZE = 50
+
+# Seconds a batch removal may take
+REAPER_COMMAND_TIMEOUT = 60
+
+# Seconds an idle reaper thread waits for more work before it exits
+REAPER_IDLE_TIMEOUT = 5
+
+# Seconds queued removals may hold up interpreter exit
+REAPER_EXIT_TIMEOUT = 30
+
+
+def discovery_owner() -> str:
+    """Label value naming this process as the owner of a container."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def discovery_label_args() -> List[str]:
+    """`docker run` arguments marking a container as a discovery of this process."""
+    return ["--label", f"{DISCOVERY_OWNER_LABEL}={discovery_owner()}"]
+
+
+def _owner_exited(owner: str) -> bool:
+    host, _, pid = owner.rpartition(":")
+    if host != socket.gethostname() or not pid.isdigit():
+        # Other hosts sweep their own containers
+        return False
+    if int(pid) == os.getpid():
+        return False
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return True
+    except OSError:
+        # Alive, but owned by another user
+        return False
+    return False
+
+
+class Reaper:
+    """Names queued for removal, removed in batches by a background thread."""
+
+    def __init__(
+        self,
+        remove: Callable[[List[str]], None],
+        sweep: Optional[Callable[[], List[str]]] = None,
+        batch_size: int = REAPER_BATCH_SIZE,
+        name: str = "reaper",
+    ):
+        """
+        Initialize the reaper.
+
+        Args:
+            remove: Removes a batch of names, called from the reaper thread
+            sweep: Finds leftovers to remove, run once when the reaper starts
+            batch_size: Most names passed to one remove call
+            name: Name of the reaper thread
+        """
+        self.remove = remove
+        self.batch_size = batch_size
+        self.name = name
+        self._sweep = sweep
+        self._pending: List[str] = []
+        self._busy = False
+        self._thread: Optional[threading.Thread] = None
+        self._condition = threading.Condition()
+        _reapers.add(self)
+
+        if sweep is not None:
+            with self._condition:
+                self._busy = True
+                self._start()
+
+    def submit(self, *names: str) -> None:
+        """Queue names for removal and return right away."""
+        with self._condition:
+            self._pending.extend(name for name in names if name not in self._pending)
+            if self._thread is None:
+                self._start()
+            self._condition.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every queued name has been removed.
+
+        Args:
+            timeout: Seconds to wait, or None to wait as long as it takes
+
+        Returns:
+            True if the queue drained, False if the timeout passed first
+        """
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: not self._pending and not self._busy, timeout
+            )
+
+    def _start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        if self._sweep is not None:
+            try:
+                leftovers = self._sweep()
+            except Exception as e:
+                logger.debug("%s sweep failed: %s", self.name, e)
+                leftovers = []
+            if leftovers:
+                logger.info("Removing %d leftover discovery resources", len(leftovers))
+            with self._condition:
+                self._sweep = None
+                self._busy = False
+                self._pending.extend(leftovers)
+
+        while True:
+            with self._condition:
+                if not self._condition.wait_for(
+                    lambda: self._pending, REAPER_IDLE_TIMEOUT
+                ):
+                    self._thread = None
+                    return
+                batch = self._pending[: self.batch_size]
+                del self._pending[: self.batch_size]
+                self._busy = True
+
+            try:
+                self.remove(batch)
+            except Exception as e:
+                logger.warning("%s failed to remove %s: %s", self.name, batch, e)
+            finally:
+                with self._condition:
+                    self._busy = False
+                    self._condition.notify_all()
+
+
+_reapers: "weakref.WeakSet[Reaper]" = weakref.WeakSet()
+
+
+def remove_containers(names: List[str]) -> None:
+    """Force-remove containers with a single docker command."""
+    result = subprocess.run(
+        ["docker", "rm", "-f", *names],
+        capture_output=True,
+        text=True,
+        timeout=REAPER_COMMAND_TIMEOUT,
+        check=False,
+    )
+    # Containers started with --rm may be gone already
+    errors = [
+        line
+        for line in result.stderr.splitlines()
+        if line and "no such container" not in line.lower()
+    ]
+    if result.returncode != 0 and errors:
+        logger.warning("Failed to remove containers: %s", "; ".join(errors))
+    else:
+        logger.debug("Removed containers %s", ", ".join(names))
+
+
+def find_leftover_containers() -> List[str]:
+    """Names of discovery containers whose owning process has exited."""
+    try:
+        result = subprocess.run(
+            [
+                "docker",
+                "ps",
+                "-a",
+                "--filter",
+                f"label={DISCOVERY_OWNER_LABEL}",
+                "--format",
+                f'{{{{.Names}}}}\t{{{{.Label "{DISCOVERY_OWNER_LABEL}"}}}}',
+            ],
+            capture_output=True,
+            text=True,
+            timeout=REAPER_COMMAND_TIMEOUT,
+            check=False,
+        )
+    except (subprocess.TimeoutExpired, OSError) as e:
+        logger.debug("Cannot list discovery containers: %s", e)
+        return []
+    if result.returncode != 0:
+        return []
+
+    leftovers = []
+    for line in result.stdout.splitlines():
+        name, _, owner = line.partition("\t")
+        if name and _owner_exited(owner):
+            leftovers.append(name)
+    return leftovers
+
+
+def delete_pods(core_v1, namespace: str, names: List[str]) -> None:
+    """Delete pods labelled with their names in a single request."""
+    core_v1.delete_collection_namespaced_pod(
+        namespace=namespace,
+        label_selector=f"{POD_NAME_LABEL} in ({','.join(names)})",
+    )
+    logger.debug("Deleted pods %s in %s", ", ".join(names), namespace)
+
+
+def pod_reaper(core_v1, namespace: str) -> Reaper:
+    """
+    Create a reaper deleting pods of a namespace.
+
+    Args:
+        core_v1: Kubernetes CoreV1Api client
+        namespace: Namespace of the pods
+
+    Returns:
+        Reaper of pods labelled with POD_NAME_LABEL
+    """
+    return Reaper(
+        functools.partial(delete_pods, core_v1, namespace),
+        name=f"pod reaper {namespace}",
+    )
+
+
+_container_reaper: Optional[Reaper] = None
+_container_reaper_lock = threading.Lock()
+
+
+def get_container_reaper() -> Reaper:
+    """Get the process-wide reaper of discovery containers."""
+    global _container_reaper
+    with _container_reaper_lock:
+        if _container_reaper is None:
+            _container_reaper = Reaper(
+                remove_containers,
+                sweep=find_leftover_containers,
+                name="container reaper",
+            )
+        return _container_reaper
+
+
+def flush_reapers(timeout: float = REAPER_EXIT_TIMEOUT) -> bool:
+    """
+    Wait for every reaper to remove what it has queued.
+
+    Args:
+        timeout: Seconds to wait in total
+
+    Returns:
+        True if all queues drained in time
+    """
+    deadline = time.monotonic() + timeout
+    drained = True
+    for reaper in list(_reapers):
+        remaining = max(deadline - time.monotonic(), 0)
+        drained = reaper.flush(remaining) and drained
+    return drained
+
+
+atexit.register(flush_reapers)
@@ -2,8 +2,15 @@
 Image utility functions for handling registry prefixes and image references.
 """
 
+import json
+import logging
 import os
-from typing import Optional
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Image label carrying the tools an MCP server image serves, as JSON
+TOOLS_LABEL = "io.mcp.tools"
 
 
 def get_default_registry() -> str:
@@ -52,3 +59,72 @@ def normalize_image_name(image_name: str, registry: Optional[str] = None) -> str
         registry = get_default_registry()
 
     return f"{registry}/{image_name}"
+
+
+def build_tools_label(tools: List[Dict[str, Any]]) -> str:
+    """Serialize template tools as the value of the tools image label.
+
+    Tools are written in the shape of an MCP tools/list result. Template
+    parameter lists are converted to JSON input schemas.
+
+    Args:
+        tools: Tools as declared in a template.json
+
+    Returns:
+        JSON list of tools with name, description and inputSchema
+    """
+    label_tools = []
+    for tool in tools:
+        schema = tool.get("inputSchema")
+        if schema is None:
+            parameters = tool.get("parameters") or []
+            if isinstance(parameters, dict):
+                schema = parameters
+            else:
+                schema = {
+                    "type": "object",
+                    "properties": {
+                        param["name"]: {
+                            "type": param.get("type", "string"),
+                            "description": param.get("description", ""),
+                        }
+                        for param in parameters
+                    },
+                    "required": [
+                        param["name"] for param in parameters if param.get("required")
+                    ],
+                }
+        label_tools.append(
+            {
+                "name": tool["name"],
+                "description": tool.get("description", ""),
+                "inputSchema": schema,
+            }
+        )
+    return json.dumps(label_tools, separators=(",", ":"))
+
+
+def parse_tools_label(labels: Optional[Dict[str, str]]) -> Optional[List[Dict]]:
+    """Read the tools declared by an image's labels.
+
+    Args:
+        labels: Image labels, as in `docker image inspect` Config.Labels
+
+    Returns:
+        List of MCP tools, or None if the image does not declare them
+    """
+    value = (labels or {}).get(TOOLS_LABEL)
+    if not value:
+        return None
+
+    try:
+        tools = json.loads(value)
+    except json.JSONDecodeError:
+        logger.warning("Ignoring malformed %s image label", TOOLS_LABEL)
+        return None
+
+    if isinstance(tools, dict):
+        tools = tools.get("tools")
+    if not isinstance(tools, list):
+        return None
+    return tools
@@ -289,8 +289,8 @@ class TestToolsIntegrationErrorHandling:
     def test_resource_exhaustion_scenario(self):
         """Test behavior under resource exhaustion."""
         # Simulate out of memory or disk space
-        with patch.object(DockerProbe, "_find_available_port") as mock_port:
-            mock_port.return_value = None  # No ports available
+        with patch.object(DockerProbe, "_start_http_container") as mock_start:
+            mock_start.return_value = None  # Container could not be started
 
             docker_probe = DockerProbe()
             result = docker_probe.discover_tools_from_image("resource-heavy:latest")
@@ -350,8 +350,8 @@ class TestToolsIntegrationPerformance:
         # Test with very short timeout using current API
         docker_probe = DockerProbe()
 
-        # Mock the available port method to return None (no available ports)
-        with patch.object(docker_probe, "_find_available_port", return_value=None):
+        # Mock the container start to return None (no published port)
+        with patch.object(docker_probe, "_start_http_container", return_value=None):
             result = docker_probe.discover_tools_from_image(
                 "slow-starting-server:latest", timeout=1
             )
@@ -2,6 +2,7 @@
 Test docker backend functionality.
 """
 
+import socket
 from unittest.mock import Mock, patch
 
 import pytest
@@ -194,6 +195,24 @@ class TestDockerDeploymentService:
             assert any(":8080" in port for port in port_args)  # Container port 8080
             assert any(":9001" in port for port in port_args)  # Container port 9001
 
+    def test_prepare_port_mappings_busy_port_is_assigned_by_docker(self):
+        """Test a taken host port is left for Docker to assign."""
+        with patch(
+            "mcp_template.backends.docker.DockerDeploymentService._ensure_docker_available"
+        ):
+            service = DockerDeploymentService()
+
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as taken:
+            taken.bind(("", 0))
+            taken.listen(1)
+            busy_port = taken.getsockname()[1]
+
+            port_mappings = service._prepare_port_mappings(
+                {"ports": {str(busy_port): 7071}}
+            )
+
+        assert port_mappings == ["-p", "0:7071"]
+
     def test_prepare_volume_mounts(self):
         """Test volume mount preparation."""
         with patch(
@@ -5,12 +5,16 @@ Tests the KubernetesDeploymentService class with comprehensive mocking
 of Kubernetes client libraries and APIs.
 """
 
+import copy
 from unittest.mock import Mock, patch
 
 import pytest
 from kubernetes.client.rest import ApiException
 
-from mcp_template.backends.kubernetes import KubernetesDeploymentService
+from mcp_template.backends.kubernetes import (
+    KubernetesDeploymentService,
+    clear_render_cache,
+)
 
 pytestmark = [pytest.mark.unit, pytest.mark.kubernetes]
 
@@ -176,11 +180,11 @@ class TestKubernetesDeploymentService:
             mock_core_instance.get_api_resources.return_value = Mock()
             mock_core_instance.read_namespace.return_value = Mock()
 
-            # Mock successful resource creation
-            mock_apps_instance.create_namespaced_deployment.return_value = Mock(
+            # Mock successful resource apply
+            mock_apps_instance.patch_namespaced_deployment.return_value = Mock(
                 metadata=Mock(name="test-deployment")
             )
-            mock_core_instance.create_namespaced_service.return_value = Mock(
+            mock_core_instance.patch_namespaced_service.return_value = Mock(
                 metadata=Mock(name="test-service")
             )
 
@@ -214,8 +218,8 @@ class TestKubernetesDeploymentService:
             mock_core_instance.get_api_resources.return_value = Mock()
             mock_core_instance.read_namespace.return_value = Mock()
 
-            # Mock deployment creation failure
-            mock_apps_instance.create_namespaced_deployment.side_effect = ApiException(
+            # Mock deployment apply failure
+            mock_apps_instance.patch_namespaced_deployment.side_effect = ApiException(
                 status=500, reason="Internal Server Error"
             )
 
@@ -272,6 +276,7 @@ class TestKubernetesDeploymentService:
             patch("mcp_template.backends.kubernetes.client.AppsV1Api") as mock_apps,
             patch("mcp_template.backends.kubernetes.client.CoreV1Api") as mock_core,
             patch("mcp_template.backends.kubernetes.client.AutoscalingV1Api"),
+            patch("mcp_template.backends.kubernetes.client.AutoscalingV2Api"),
         ):
             mock_core_instance = Mock()
             mock_apps_instance = Mock()
@@ -444,3 +449,315 @@ class TestKubernetesDeploymentService:
 
             assert "message" in result
             assert "not applicable" in result["message"]
+
+
+@pytest.fixture
+def k8s_service():
+    """KubernetesDeploymentService with mocked API clients."""
+    with (
+        patch("mcp_template.backends.kubernetes.config.load_kube_config"),
+        patch("mcp_template.backends.kubernetes.client.AppsV1Api"),
+        patch("mcp_template.backends.kubernetes.client.CoreV1Api"),
+        patch("mcp_template.backends.kubernetes.client.AutoscalingV1Api"),
+        patch("mcp_template.backends.kubernetes.client.AutoscalingV2Api"),
+        patch("mcp_template.backends.kubernetes.client.DiscoveryV1Api"),
+    ):
+        service = KubernetesDeploymentService(namespace="mcp")
+
+    service.apps_v1.list_namespaced_deployment.return_value = Mock(items=[])
+    service.core_v1.list_namespaced_service.return_value = Mock(items=[])
+    service.core_v1.list_namespaced_config_map.return_value = Mock(items=[])
+    autoscaling = service.autoscaling_v2
+    autoscaling.list_namespaced_horizontal_pod_autoscaler.return_value = Mock(items=[])
+    # Live objects serialize back to the manifest they were applied from
+    serialize = service.core_v1.api_client.sanitize_for_serialization
+    serialize.side_effect = lambda obj: copy.deepcopy(obj.manifest)
+    clear_render_cache()
+    return service
+
+
+def _live_object(manifest):
+    """Mock a live object as the API would return it for an applied manifest."""
+    obj = Mock()
+    obj.metadata.name = manifest["metadata"]["name"]
+    obj.metadata.labels = manifest["metadata"]["labels"]
+    obj.metadata.annotations = dict(manifest["metadata"]["annotations"])
+    obj.manifest = copy.deepcopy(manifest)
+    return obj
+
+
+class TestKubernetesDeploymentPlanning:
+    """Test dry-run planning, diffing and server-side apply."""
+
+    REQUEST = {
+        "template_id": "demo",
+        "config": {"env": {"LOG_LEVEL": "info"}},
+        "template_data": {"docker_image": "demo", "transport": ["http"]},
+    }
+
+    def test_renders_are_memoized(self, k8s_service):
+        with patch.object(
+            k8s_service, "_render_deployment", wraps=k8s_service._render_deployment
+        ) as render:
+            first = k8s_service.plan_deployments([self.REQUEST])
+            second = k8s_service.plan_deployments([dict(self.REQUEST)])
+
+        assert render.call_count == 1
+        assert first[0]["manifests"] is second[0]["manifests"]
+
+    def test_new_deployment_is_created(self, k8s_service):
+        plans = k8s_service.plan_deployments([self.REQUEST])
+
+        assert plans[0]["deployment_name"] == "demo"
+        assert [(c["kind"], c["action"]) for c in plans[0]["changes"]] == [
+            ("Deployment", "create"),
+            ("Service", "create"),
+            ("ConfigMap", "create"),
+        ]
+
+        result = k8s_service.apply_plan(plans)
+
+        assert result["success"] is True
+        assert len(result["applied"]) == 3
+        call = k8s_service.apps_v1.patch_namespaced_deployment.call_args
+        assert call.kwargs["field_manager"] == "mcp-templates"
+        assert call.kwargs["_content_type"] == "application/apply-patch+yaml"
+
+    def test_unchanged_deployments_cost_no_writes(self, k8s_service):
+        manifests = k8s_service.plan_deployments([self.REQUEST])[0]["manifests"]
+        deployment, service_manifest, configmap = (
+            _live_object(manifest) for manifest in manifests
+        )
+        k8s_service.apps_v1.list_namespaced_deployment.return_value = Mock(
+            items=[deployment]
+        )
+        k8s_service.core_v1.list_namespaced_service.return_value = Mock(
+            items=[service_manifest]
+        )
+        k8s_service.core_v1.list_namespaced_config_map.return_value = Mock(
+            items=[configmap]
+        )
+
+        changed = dict(self.REQUEST, config={"env": {"LOG_LEVEL": "debug"}})
+        plans = k8s_service.plan_deployments([self.REQUEST, changed])
+
+        assert plans[0]["changed"] is False
+        assert plans[1]["changes"][0]["action"] == "update"
+
+        result = k8s_service.apply_plan(plans[:1])
+        assert len(result["unchanged"]) == 3
+        k8s_service.apps_v1.patch_namespaced_deployment.assert_not_called()
+        k8s_service.core_v1.patch_namespaced_service.assert_not_called()
+        # One list call per kind for the whole batch
+        assert k8s_service.apps_v1.list_namespaced_deployment.call_count == 2
+
+    def test_out_of_band_changes_are_updated(self, k8s_service):
+        manifests = k8s_service.plan_deployments([self.REQUEST])[0]["manifests"]
+        deployment, service_manifest, configmap = (
+            _live_object(manifest) for manifest in manifests
+        )
+        # kubectl scale and a hand-set image leave the hash annotation intact
+        deployment.manifest["spec"]["replicas"] = 5
+        deployment.manifest["spec"]["template"]["spec"]["containers"][0][
+            "image"
+        ] = "demo:hotfix"
+        # Fields added by the API server are not drift
+        service_manifest.manifest["spec"]["clusterIP"] = "10.0.0.1"
+        k8s_service.apps_v1.list_namespaced_deployment.return_value = Mock(
+            items=[deployment]
+        )
+        k8s_service.core_v1.list_namespaced_service.return_value = Mock(
+            items=[service_manifest]
+        )
+        k8s_service.core_v1.list_namespaced_config_map.return_value = Mock(
+            items=[configmap]
+        )
+
+        plans = k8s_service.plan_deployments([self.REQUEST])
+
+        assert [(c["kind"], c["action"]) for c in plans[0]["changes"]] == [
+            ("Deployment", "update"),
+            ("Service", "unchanged"),
+            ("ConfigMap", "unchanged"),
+        ]
+
+    def test_removed_resources_are_deleted(self, k8s_service):
+        manifests = k8s_service.plan_deployments([self.REQUEST])[0]["manifests"]
+        k8s_service.core_v1.list_namespaced_config_map.return_value = Mock(
+            items=[_live_object(manifests[2])]
+        )
+
+        plans = k8s_service.plan_deployments([dict(self.REQUEST, config={})])
+
+        assert plans[0]["changes"][-1] == {
+            "kind": "ConfigMap",
+            "name": "demo-config",
+            "action": "delete",
+        }
+        k8s_service.apply_plan(plans)
+        k8s_service.core_v1.delete_namespaced_config_map.assert_called_once_with(
+            name="demo-config", namespace="mcp"
+        )
+
+
+def _deployment_status(generation, observed, replicas, updated, available, total=None):
+    deployment = Mock()
+    deployment.metadata.generation = generation
+    deployment.spec.replicas = replicas
+    deployment.status.observed_generation = observed
+    deployment.status.updated_replicas = updated
+    deployment.status.available_replicas = available
+    deployment.status.replicas = replicas if total is None else total
+    return deployment
+
+
+class TestKubernetesInPlaceUpdates:
+    """Test create-or-patch deploys and rollout tracking."""
+
+    TEMPLATE = {"docker_image": "demo", "transport": ["http"]}
+
+    def test_named_deploy_is_applied_in_place(self, k8s_service):
+        with (
+            patch.object(k8s_service, "_wait_for_deployment_ready"),
+            patch.object(k8s_service, "_get_deployment_details", return_value={}),
+        ):
+            result = k8s_service.update_deployment(
+                "demo", "demo", {"env": {"LOG_LEVEL": "debug"}}, self.TEMPLATE
+            )
+
+        assert result["success"] is True
+        assert result["deployment_name"] == "demo"
+        k8s_service.apps_v1.patch_namespaced_deployment.assert_called_once()
+        k8s_service.apps_v1.create_namespaced_deployment.assert_not_called()
+        deployment = k8s_service.apps_v1.patch_namespaced_deployment.call_args.kwargs[
+            "body"
+        ]
+        assert deployment["spec"]["strategy"]["rollingUpdate"]["maxUnavailable"] == 0
+
+    def test_failed_update_keeps_live_deployment(self, k8s_service):
+        k8s_service.core_v1.patch_namespaced_service.side_effect = ApiException(
+            status=422
+        )
+
+        result = k8s_service.update_deployment("demo", "demo", {}, self.TEMPLATE)
+
+        assert result["success"] is False
+        k8s_service.apps_v1.delete_namespaced_deployment.assert_not_called()
+
+    def test_wait_for_rollout_follows_watch(self, k8s_service):
+        events = [
+            {"object": _deployment_status(2, 1, 2, 2, 2)},
+            {"object": _deployment_status(2, 2, 2, 1, 2, total=3)},
+            {"object": _deployment_status(2, 2, 2, 2, 2)},
+        ]
+        with patch("mcp_template.backends.kubernetes.watch.Watch") as mock_watch:
+            mock_watch.return_value.stream.return_value = iter(events)
+            k8s_service.wait_for_rollout("demo", timeout=30)
+
+        kwargs = mock_watch.return_value.stream.call_args.kwargs
+        assert kwargs["field_selector"] == "metadata.name=demo"
+        mock_watch.return_value.stop.assert_called_once()
+
+    def test_wait_for_rollout_times_out(self, k8s_service):
+        with (
+            patch("mcp_template.backends.kubernetes.watch.Watch") as mock_watch,
+            patch("mcp_template.backends.kubernetes.time.monotonic") as monotonic,
+        ):
+            monotonic.side_effect = [0, 0, 31]
+            mock_watch.return_value.stream.return_value = iter([])
+            with pytest.raises(RuntimeError, match="did not become ready"):
+                k8s_service.wait_for_rollout("demo", timeout=30)
+
+    def test_rollout_history(self, k8s_service):
+        def replica_set(name, revision, image):
+            rs = Mock()
+            rs.metadata.name = name
+            rs.metadata.annotations = {"deployment.kubernetes.io/revision": revision}
+            rs.spec.template.spec.containers = [Mock(image=image)]
+            rs.status.replicas = 0
+            return rs
+
+        k8s_service.apps_v1.list_namespaced_replica_set.return_value = Mock(
+            items=[
+                replica_set("demo-b", "2", "demo:2"),
+                replica_set("demo-a", "1", "demo:1"),
+            ]
+        )
+
+        history = k8s_service.get_rollout_history("demo")
+
+        assert [entry["revision"] for entry in history] == [1, 2]
+        assert history[1]["image"] == "demo:2"
+
+
+def _endpoint_slice(port, *endpoints):
+    endpoint_slice = Mock()
+    http_port = Mock(port=port)
+    http_port.name = "http"
+    endpoint_slice.ports = [http_port]
+    endpoint_slice.endpoints = [
+        Mock(addresses=[address], conditions=Mock(ready=ready))
+        for address, ready in endpoints
+    ]
+    return endpoint_slice
+
+
+class TestKubernetesScaling:
+    """Test scaling, autoscaler manifests and replica-aware routing."""
+
+    def test_scale_deployment(self, k8s_service):
+        assert k8s_service.scale_deployment("demo", 3) is True
+
+        k8s_service.apps_v1.patch_namespaced_deployment_scale.assert_called_once_with(
+            name="demo", namespace="mcp", body={"spec": {"replicas": 3}}
+        )
+
+    def test_scale_deployment_failure(self, k8s_service):
+        k8s_service.apps_v1.patch_namespaced_deployment_scale.side_effect = (
+            ApiException(status=404)
+        )
+
+        assert k8s_service.scale_deployment("missing", 2) is False
+        with pytest.raises(ValueError):
+            k8s_service.scale_deployment("demo", -1)
+
+    def test_hpa_rendered_when_autoscaling_enabled(self, k8s_service):
+        k8s_service.set_config(
+            {"autoscaling": {"enabled": True, "min_replicas": 2, "max_replicas": 6}}
+        )
+        values = k8s_service._create_helm_values(
+            "demo", {}, {"docker_image": "demo", "transport": ["http"]}
+        )
+
+        manifests = k8s_service._render_helm_template("demo", values)
+        kinds = [manifest["kind"] for manifest in manifests]
+
+        assert kinds == ["Deployment", "Service", "HorizontalPodAutoscaler"]
+        assert "replicas" not in manifests[0]["spec"]
+        hpa = manifests[2]["spec"]
+        assert (hpa["minReplicas"], hpa["maxReplicas"]) == (2, 6)
+        assert hpa["scaleTargetRef"]["name"] == "demo"
+
+    def test_select_endpoint_round_robin_over_ready_pods(self, k8s_service):
+        k8s_service.in_cluster = True
+        k8s_service.discovery_v1.list_namespaced_endpoint_slice.return_value = Mock(
+            items=[
+                _endpoint_slice(
+                    8080, ("10.0.0.2", True), ("10.0.0.1", None), ("10.0.0.3", False)
+                )
+            ]
+        )
+
+        picks = [k8s_service.select_endpoint("demo") for _ in range(3)]
+
+        assert picks == [
+            "http://10.0.0.1:8080",
+            "http://10.0.0.2:8080",
+            "http://10.0.0.1:8080",
+        ]
+        # Endpoints are listed once and reused
+        k8s_service.discovery_v1.list_namespaced_endpoint_slice.assert_called_once()
+
+    def test_select_endpoint_outside_cluster(self, k8s_service):
+        assert k8s_service.select_endpoint("demo") is None
+        k8s_service.discovery_v1.list_namespaced_endpoint_slice.assert_not_called()
@@ -0,0 +1,155 @@
+"""
+Test port-forward tunnels against a stubbed port-forward websocket.
+"""
+
+import socket
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from mcp_template.backends import kubernetes_portforward
+from mcp_template.backends.kubernetes_portforward import (
+    PortForwardPool,
+    PortForwardTunnel,
+    parse_service_url,
+    route_cluster_url,
+)
+from mcp_template.core.mcp_connection import MCPConnection
+
+pytestmark = [pytest.mark.unit, pytest.mark.kubernetes]
+
+
+class StubPortForward:
+    """Port-forward stand-in whose remote end echoes bytes back upper-cased."""
+
+    def __init__(self):
+        self._local, remote = socket.socketpair()
+        threading.Thread(target=self._echo, args=(remote,), daemon=True).start()
+
+    @staticmethod
+    def _echo(remote):
+        with remote:
+            while data := remote.recv(1024):
+                remote.sendall(data.upper())
+
+    def socket(self, port):
+        return self._local
+
+    def close(self):
+        self._local.close()
+
+
+def _core_v1():
+    """CoreV1Api mock with service demo:8080 backed by one ready pod."""
+    core_v1 = Mock()
+    service = core_v1.read_namespaced_service.return_value
+    service.spec.ports = [Mock(port=8080, target_port="http")]
+    service.spec.selector = {"app.kubernetes.io/instance": "demo"}
+
+    container_port = Mock(container_port=7071)
+    container_port.name = "http"
+    pod = Mock()
+    pod.metadata.name = "demo-abc"
+    pod.metadata.deletion_timestamp = None
+    pod.status.phase = "Running"
+    pod.status.container_statuses = [Mock(ready=True)]
+    pod.spec.containers = [Mock(ports=[container_port])]
+    core_v1.list_namespaced_pod.return_value = Mock(items=[pod])
+    return core_v1
+
+
+def _roundtrip(port, payload):
+    with socket.create_connection(("127.0.0.1", port), timeout=5) as conn:
+        conn.sendall(payload)
+        return conn.recv(1024)
+
+
+class TestPortForwardTunnels:
+    """Test URL routing, forwarding and tunnel reuse."""
+
+    def test_parse_service_url(self):
+        assert parse_service_url(
+            "http://demo.mcp-servers.svc.cluster.local:8080/mcp"
+        ) == ("demo", "mcp-servers", 8080)
+        assert parse_service_url("http://localhost:8080") is None
+        assert parse_service_url("http://svc.cluster.local") is None
+
+    def test_connections_are_forwarded_to_ready_pod(self):
+        core_v1 = _core_v1()
+        with patch.object(
+            kubernetes_portforward,
+            "portforward",
+            side_effect=lambda *args, **kwargs: StubPortForward(),
+        ) as mock_forward:
+            tunnel = PortForwardTunnel(core_v1, "mcp", "demo", 8080)
+            try:
+                assert _roundtrip(tunnel.local_port, b"ping") == b"PING"
+                assert _roundtrip(tunnel.local_port, b"pong") == b"PONG"
+            finally:
+                tunnel.close()
+
+        # The named target port resolved to the container port, once
+        assert mock_forward.call_args.args[1:] == ("demo-abc", "mcp")
+        assert mock_forward.call_args.kwargs["ports"] == "7071"
+        core_v1.read_namespaced_service.assert_called_once()
+
+    def test_pool_reuses_tunnel_per_service(self):
+        pool = PortForwardPool(Mock())
+        try:
+            url = pool.local_url("http://demo.mcp.svc.cluster.local:8080/mcp")
+            again = pool.local_url("http://demo.mcp.svc.cluster.local:8080/tools")
+            other = pool.local_url("http://other.mcp.svc.cluster.local:8080")
+
+            port = pool.tunnel("mcp", "demo", 8080).local_port
+            assert url == f"http://127.0.0.1:{port}/mcp"
+            assert again == f"http://127.0.0.1:{port}/tools"
+            assert other != f"http://127.0.0.1:{port}"
+            assert pool.local_url("http://localhost:1234") == "http://localhost:1234"
+        finally:
+            pool.close()
+
+    def test_idle_tunnel_closes_itself(self):
+        tunnel = PortForwardTunnel(Mock(), "mcp", "demo", 8080, idle_timeout=0)
+
+        deadline = time.monotonic() + 5
+        while not tunnel.closed and time.monotonic() < deadline:
+            time.sleep(0.05)
+
+        assert tunnel.closed
+
+    def test_route_cluster_url_only_outside_cluster(self, monkeypatch):
+        pool = Mock()
+        pool.local_url.return_value = "http://127.0.0.1:4000/mcp"
+        url = "http://demo.mcp.svc.cluster.local:8080/mcp"
+
+        with patch.object(
+            kubernetes_portforward, "get_port_forward_pool", return_value=pool
+        ):
+            monkeypatch.delenv("KUBERNETES_SERVICE_HOST", raising=False)
+            assert route_cluster_url(url) == "http://127.0.0.1:4000/mcp"
+
+            monkeypatch.setenv("KUBERNETES_SERVICE_HOST", "10.0.0.1")
+            assert route_cluster_url(url) == url
+
+    @pytest.mark.asyncio
+    async def test_mcp_connection_routes_service_urls(self):
+        connection = MCPConnection(timeout=5)
+
+        with (
+            patch.object(
+                kubernetes_portforward,
+                "route_cluster_url",
+                return_value="http://127.0.0.1:4000/",
+            ),
+            patch.object(
+                MCPConnection, "_initialize_mcp_session_http", return_value=True
+            ),
+        ):
+            assert await connection.connect_http(
+                "http://demo.mcp.svc.cluster.local:8080"
+            )
+
+        assert connection.base_url == "http://127.0.0.1:4000"
+        await connection.disconnect()
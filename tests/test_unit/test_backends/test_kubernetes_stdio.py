@@ -0,0 +1,243 @@
+"""
+Test the Kubernetes stdio transport over a stubbed websocket attach stream.
+"""
+
+import json
+from unittest.mock import Mock, patch
+
+import pytest
+
+from mcp_template.backends.kubernetes_stdio import (
+    StdioAttachSession,
+    StdioPodPool,
+    StdioPodSpec,
+    StdioSessionError,
+    close_stdio_pools,
+)
+from mcp_template.utils.cleanup_reaper import flush_reapers
+
+pytestmark = [pytest.mark.unit, pytest.mark.kubernetes]
+
+
+class StubAttachStream:
+    """Websocket stand-in answering JSON-RPC requests like an MCP server."""
+
+    def __init__(self, respond=True):
+        self.respond = respond
+        self.sent = []
+        self.open = True
+        self._lines = ["server starting"]
+
+    def is_open(self):
+        return self.open
+
+    def write_stdin(self, data):
+        for line in data.splitlines():
+            message = json.loads(line)
+            self.sent.append(message)
+            if "id" not in message or not self.respond:
+                continue
+
+            if message["method"] == "initialize":
+                result = {"protocolVersion": "2025-03-26", "capabilities": {}}
+            elif message["method"] == "tools/list":
+                result = {"tools": [{"name": "echo", "description": "Echo"}]}
+            else:
+                result = {"content": [{"type": "text", "text": "ok"}]}
+
+            self._lines.append(json.dumps({"jsonrpc": "2.0", "method": "log"}))
+            self._lines.append(
+                json.dumps({"id": message["id"], "jsonrpc": "2.0", "result": result})
+            )
+
+    def readline_stdout(self, timeout=None):
+        return self._lines.pop(0) if self._lines else ""
+
+    def close(self):
+        self.open = False
+
+
+@pytest.fixture
+def attach():
+    """Patch the websocket attach so each connect gets a new stub stream."""
+    streams = []
+
+    def connect(*args, **kwargs):
+        streams.append(StubAttachStream())
+        return streams[-1]
+
+    running = {"object": Mock(status=Mock(phase="Running"))}
+    with (
+        patch("mcp_template.backends.kubernetes_stdio.stream", side_effect=connect),
+        patch("mcp_template.backends.kubernetes_stdio.watch.Watch") as mock_watch,
+    ):
+        mock_watch.return_value.stream.return_value = [running]
+        yield streams
+
+
+class TestStdioAttachSession:
+    """Test the JSON-RPC exchange over one attach stream."""
+
+    def test_initializes_once_and_matches_ids(self, attach):
+        session = StdioAttachSession(Mock(), "mcp", "github-stdio-1")
+        session.connect()
+
+        first = session.request("tools/list")
+        second = session.request("tools/call", {"name": "echo", "arguments": {}})
+
+        methods = [message["method"] for message in attach[0].sent]
+        assert methods == [
+            "initialize",
+            "notifications/initialized",
+            "tools/list",
+            "tools/call",
+        ]
+        assert first["result"]["tools"][0]["name"] == "echo"
+        assert second["id"] == attach[0].sent[3]["id"]
+
+    def test_attach_does_not_open_stderr(self):
+        with patch("mcp_template.backends.kubernetes_stdio.stream") as mock_stream:
+            StdioAttachSession(Mock(), "mcp", "github-stdio-1").connect()
+
+        kwargs = mock_stream.call_args.kwargs
+        assert kwargs["stdout"] is True
+        assert kwargs["stderr"] is False
+
+    def test_timeout_raises(self):
+        session = StdioAttachSession(Mock(), "mcp", "slow", timeout=0.05)
+        session._ws = StubAttachStream(respond=False)
+
+        with pytest.raises(StdioSessionError, match="No response"):
+            session.request("tools/list")
+
+    def test_closed_stream_raises(self):
+        session = StdioAttachSession(Mock(), "mcp", "gone")
+        session._ws = StubAttachStream()
+        session._ws.close()
+
+        with pytest.raises(StdioSessionError, match="closed"):
+            session.request("tools/list")
+
+
+class TestStdioPodPool:
+    """Test warm pod reuse, replacement and reaping."""
+
+    def setup_method(self):
+        close_stdio_pools()
+        self.core_v1 = Mock()
+        self.pool = StdioPodPool(self.core_v1, "mcp")
+        self.spec = StdioPodSpec.build("mcp/github:latest", name="github-stdio")
+
+    def test_pod_is_reused_across_sessions(self, attach):
+        for _ in range(3):
+            with self.pool.session(self.spec) as session:
+                session.request("tools/list")
+
+        assert self.core_v1.create_namespaced_pod.call_count == 1
+        assert len(attach) == 1
+        methods = [message["method"] for message in attach[0].sent]
+        assert methods.count("initialize") == 1
+
+        with self.pool.session(StdioPodSpec.build("mcp/gitlab:latest")):
+            pass
+        assert self.core_v1.create_namespaced_pod.call_count == 2
+
+    def test_pod_manifest_keeps_stdin_open(self):
+        manifest = self.pool.pod_manifest("github-stdio-1", self.spec)
+        container = manifest["spec"]["containers"][0]
+
+        assert container["stdin"] is True
+        assert container["stdinOnce"] is False
+        assert {"name": "MCP_TRANSPORT", "value": "stdio"} in container["env"]
+        assert (
+            manifest["metadata"]["labels"]["mcp-template.io/stdio-spec"]
+            == self.spec.key
+        )
+
+    def test_failed_session_replaces_pod(self, attach):
+        with pytest.raises(StdioSessionError):
+            with self.pool.session(self.spec) as session:
+                attach[0].close()
+                session.request("tools/list")
+
+        assert flush_reapers(5)
+        self.core_v1.delete_collection_namespaced_pod.assert_called_once()
+        with self.pool.session(self.spec) as session:
+            assert session.request("tools/list")["result"]
+        assert self.core_v1.create_namespaced_pod.call_count == 2
+
+    def test_idle_pods_are_reaped(self, attach):
+        with self.pool.session(self.spec):
+            pass
+
+        self.pool.idle_timeout = -1
+        assert self.pool.reap_idle() == 1
+        assert attach[0].open is False
+
+        # Deleted by the pool's reaper, by the pod's name label
+        pod = self.core_v1.create_namespaced_pod.call_args.kwargs["body"]
+        assert flush_reapers(5)
+        self.core_v1.delete_collection_namespaced_pod.assert_called_once_with(
+            namespace="mcp",
+            label_selector=f"app.kubernetes.io/instance in ({pod['metadata']['name']})",
+        )
+
+
+class TestKubernetesStdioCommand:
+    """Test stdio tool calls and discovery through the pool."""
+
+    def setup_method(self):
+        close_stdio_pools()
+
+    def test_run_stdio_command_reuses_warm_pod(self, attach):
+        from mcp_template.backends.kubernetes import KubernetesDeploymentService
+        from mcp_template.core.tool_caller import ToolCaller
+
+        with patch.object(KubernetesDeploymentService, "__init__", return_value=None):
+            service = KubernetesDeploymentService()
+        service.namespace = "mcp"
+        service.core_v1 = Mock()
+        request = json.dumps(
+            {
+                "jsonrpc": "2.0",
+                "id": 1,
+                "method": "tools/call",
+                "params": {"name": "echo", "arguments": {}},
+            }
+        )
+        template = {"image": "mcp/github:latest", "env_vars": {"LOG_LEVEL": "info"}}
+
+        results = [
+            service.run_stdio_command(
+                "github", {"GITHUB_TOKEN": "t"}, template, request
+            )
+            for _ in range(2)
+        ]
+
+        assert [result["status"] for result in results] == ["completed"] * 2
+        service.core_v1.create_namespaced_pod.assert_called_once()
+        pod = service.core_v1.create_namespaced_pod.call_args.kwargs["body"]
+        env = {e["name"]: e["value"] for e in pod["spec"]["containers"][0]["env"]}
+        assert env == {
+            "GITHUB_TOKEN": "t",
+            "LOG_LEVEL": "info",
+            "MCP_TRANSPORT": "stdio",
+        }
+
+        with patch.object(ToolCaller, "__init__", return_value=None):
+            parsed = ToolCaller()._parse_stdio_response_enhanced(results[0], "echo")
+        assert parsed.success is True
+
+    def test_probe_discovers_tools_over_attach(self, attach):
+        from mcp_template.tools.kubernetes_probe import KubernetesProbe
+
+        with patch.object(KubernetesProbe, "_init_kubernetes_client"):
+            probe = KubernetesProbe(namespace="mcp")
+        probe.k8s_core_v1 = Mock()
+
+        first = probe._discover_tools_via_kubernetes_mcp("mcp/github:latest")
+        second = probe._discover_tools_via_kubernetes_mcp("mcp/github:latest")
+
+        assert first["discovery_method"] == "kubernetes_mcp_stdio"
+        assert [tool["name"] for tool in second["tools"]] == ["echo"]
+        probe.k8s_core_v1.create_namespaced_pod.assert_called_once()
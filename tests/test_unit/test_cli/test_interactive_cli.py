@@ -5,6 +5,7 @@ These tests focus on individual functions and methods in isolation,
 using mocks for external dependencies like MCPClient.
 """
 
+from types import MappingProxyType
 from unittest.mock import Mock, patch
 
 import pytest
@@ -37,6 +38,7 @@ from mcp_template.cli.interactive_cli import (
     stop_server,
     unselect_template,
 )
+from mcp_template.template.utils.registry import TemplateSnapshot
 
 pytestmark = pytest.mark.unit
 
@@ -657,11 +659,10 @@ class TestReadlineCompletion:
     def test_completer_template_completion(self, mock_get_session, mock_readline):
         """Test completer function for template name completion."""
         mock_session = Mock()
-        mock_session.client.list_templates.return_value = [
-            "demo",
-            "filesystem",
-            "github",
-        ]
+        discovery = mock_session.client.template_manager.template_discovery
+        discovery.get_snapshot.return_value = TemplateSnapshot(
+            templates=MappingProxyType({"demo": {}, "filesystem": {}, "github": {}})
+        )
         mock_get_session.return_value = mock_session
         mock_readline.get_line_buffer.return_value = "select dem"
 
@@ -6,12 +6,23 @@ Tests for newly enhanced features including:
 - CLI integration improvements
 """
 
+import os
+import sqlite3
+import struct
 import tempfile
+import threading
+import time
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
-from mcp_template.core.cache import CacheManager
+from mcp_template.core.cache import (
+    COMPACT_CACHE_HEADER,
+    CacheManager,
+    MemoryCacheTier,
+    SQLiteCacheStore,
+)
 
 
 @pytest.mark.unit
@@ -79,3 +90,473 @@ class TestCacheManager:
 
             # Should be None now (expired)
             assert cache_manager.get("test_key") is None
+
+    @pytest.mark.parametrize(
+        "storage, cache_format",
+        [("file", "json"), ("file", "compact"), ("sqlite", "json")],
+    )
+    def test_get_honors_max_age_of_the_entry(self, storage, cache_format):
+        """Test entries expire by the max age they were written with."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            options = dict(
+                cache_dir=Path(temp_dir),
+                storage=storage,
+                cache_format=cache_format,
+                use_memory_cache=False,
+            )
+            long_lived = CacheManager(max_age_hours=720, **options)
+            short_lived = CacheManager(max_age_hours=24, **options)
+            two_days_ago = time.time() - 48 * 3600
+            long_lived.store.write(
+                "validators",
+                {
+                    "data": {"etag": "abc"},
+                    "timestamp": two_days_ago,
+                    "cache_key": "validators",
+                    "max_age": 720 * 3600,
+                },
+            )
+            short_lived.store.write(
+                "legacy",
+                {"data": {}, "timestamp": two_days_ago, "cache_key": "legacy"},
+            )
+
+            assert short_lived.get("validators")["data"] == {"etag": "abc"}
+            # Legacy entries are only stale for the short-lived manager
+            assert short_lived.get("legacy") is None
+            assert long_lived.get("legacy") is not None
+
+
+@pytest.mark.unit
+class TestCacheManagerMemoryTier:
+    """Test the in-memory LRU tier in front of the cache files."""
+
+    def test_repeated_get_served_from_memory(self):
+        """Test repeated lookups don't reopen the cache file."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache_manager = CacheManager(cache_dir=Path(temp_dir))
+            cache_manager.set("test_key", {"key": "value"})
+
+            with patch("builtins.open", side_effect=AssertionError("file opened")):
+                for _ in range(3):
+                    assert cache_manager.get("test_key")["data"] == {"key": "value"}
+
+            assert cache_manager.memory_hits == 3
+            assert cache_manager.get_cache_info()["memory_hits"] == 3
+
+    def test_external_write_invalidates_memory(self):
+        """Test a file rewritten by another manager is picked up via mtime."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            first = CacheManager(cache_dir=Path(temp_dir))
+            second = CacheManager(cache_dir=Path(temp_dir), use_memory_cache=False)
+
+            first.set("test_key", {"version": 1})
+            assert first.get("test_key")["data"] == {"version": 1}
+
+            second.set("test_key", {"version": 22})
+            assert first.get("test_key")["data"] == {"version": 22}
+            assert first.memory_misses == 1
+
+    def test_removed_file_is_not_served_from_memory(self):
+        """Test that deleting the file on disk drops the memory entry."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache_manager = CacheManager(cache_dir=Path(temp_dir))
+            cache_manager.set("test_key", {"key": "value"})
+            assert cache_manager.get("test_key") is not None
+
+            cache_manager.store.path_for("test_key").unlink()
+            assert cache_manager.get("test_key") is None
+
+    def test_memory_tier_is_bounded(self):
+        """Test the memory tier evicts least recently used entries."""
+        tier = MemoryCacheTier(max_entries=2)
+        tier.put(Path("/a"), (1, 1), {"a": 1})
+        tier.put(Path("/b"), (1, 1), {"b": 1})
+        assert tier.get(Path("/a"), (1, 1)) == {"a": 1}
+
+        tier.put(Path("/c"), (1, 1), {"c": 1})
+
+        assert len(tier) == 2
+        assert tier.get(Path("/b"), (1, 1)) is None
+        assert tier.get(Path("/a"), (2, 1)) is None
+
+
+@pytest.mark.unit
+class TestCacheManagerCompactFormat:
+    """Test the compact on-disk cache format."""
+
+    def test_compact_set_and_get(self):
+        """Test compact entries round-trip with the same envelope as JSON."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache_manager = CacheManager(
+                cache_dir=Path(temp_dir), cache_format="compact"
+            )
+            cache_manager.set("test_key", {"tools": [{"name": "echo"}]})
+
+            cache_file = cache_manager.store.path_for("test_key")
+            assert cache_file.suffix == ".mcpc"
+            assert cache_file.read_bytes().startswith(b"MCPC")
+
+            reader = CacheManager(
+                cache_dir=Path(temp_dir),
+                cache_format="compact",
+                use_memory_cache=False,
+            )
+            retrieved = reader.get("test_key")
+            assert retrieved["data"] == {"tools": [{"name": "echo"}]}
+            assert retrieved["cache_key"] == "test_key"
+            assert "timestamp" in retrieved
+
+    def test_cache_info_reads_only_headers(self):
+        """Test expiry scans don't decode payloads."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache_manager = CacheManager(
+                cache_dir=Path(temp_dir), cache_format="compact"
+            )
+            cache_manager.set("fresh", {"key": "value"})
+            cache_manager.set("stale", {"key": "value"})
+
+            stale_file = cache_manager.store.path_for("stale")
+            raw = bytearray(stale_file.read_bytes())
+            COMPACT_CACHE_HEADER.pack_into(
+                raw,
+                0,
+                b"MCPC",
+                2,
+                0.0,
+                3600.0,
+                5,
+                len(raw) - COMPACT_CACHE_HEADER.size - 5,
+            )
+            stale_file.write_bytes(bytes(raw))
+
+            with patch("json.loads", side_effect=AssertionError("payload decoded")):
+                info = cache_manager.get_cache_info()
+                assert cache_manager.get("stale") is None
+
+            assert info["total_files"] == 2
+            assert info["expired_files"] == 1
+            assert info["valid_files"] == 1
+            assert info["cache_format"] == "compact"
+
+    def test_corrupted_compact_file_is_removed(self):
+        """Test truncated compact files are treated as invalid."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache_manager = CacheManager(
+                cache_dir=Path(temp_dir), cache_format="compact"
+            )
+            cache_manager.set("test_key", {"key": "value"})
+            cache_file = cache_manager.store.path_for("test_key")
+            cache_file.write_bytes(cache_file.read_bytes()[:-3])
+
+            assert cache_manager.get("test_key") is None
+            assert not cache_file.exists()
+
+    def test_invalid_format_rejected(self):
+        """Test unknown formats raise a ValueError."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with pytest.raises(ValueError):
+                CacheManager(cache_dir=Path(temp_dir), cache_format="pickle")
+
+
+@pytest.mark.unit
+class TestCacheManagerStorage:
+    """Test pluggable cache storage engines."""
+
+    def test_unknown_storage_rejected(self):
+        """Test unknown storage engines raise a ValueError."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with pytest.raises(ValueError):
+                CacheManager(cache_dir=Path(temp_dir), storage="redis")
+
+    def test_sqlite_set_get_and_remove(self):
+        """Test the SQLite store keeps the same entry envelope."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache_manager = CacheManager(cache_dir=Path(temp_dir), storage="sqlite")
+            assert isinstance(cache_manager.store, SQLiteCacheStore)
+
+            cache_manager.set("test_key", {"tools": [{"name": "echo"}]})
+            retrieved = cache_manager.get("test_key")
+            assert retrieved["data"] == {"tools": [{"name": "echo"}]}
+            assert retrieved["cache_key"] == "test_key"
+
+            assert cache_manager.delete("test_key") is True
+            assert cache_manager.get("test_key") is None
+
+    def test_sqlite_writes_visible_across_managers(self):
+        """Test another manager's write invalidates the memory tier."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            first = CacheManager(cache_dir=Path(temp_dir), storage="sqlite")
+            second = CacheManager(
+                cache_dir=Path(temp_dir), storage="sqlite", use_memory_cache=False
+            )
+
+            first.set("test_key", {"version": 1})
+            assert first.get("test_key")["data"] == {"version": 1}
+
+            second.set("test_key", {"version": 2})
+            assert first.get("test_key")["data"] == {"version": 2}
+
+    def test_sqlite_bulk_expiry_and_info(self):
+        """Test expired entries are counted and cleared with indexed queries."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache_manager = CacheManager(
+                cache_dir=Path(temp_dir), storage="sqlite", max_age_hours=1.0
+            )
+            cache_manager.set("fresh", {"key": "value"})
+            cache_manager.store.write(
+                "stale", {"data": {}, "timestamp": 0.0, "cache_key": "stale"}
+            )
+
+            info = cache_manager.get_cache_info()
+            assert info["total_files"] == 2
+            assert info["expired_files"] == 1
+            assert info["storage"] == "SQLiteCacheStore"
+
+            assert cache_manager.clear_expired() == 1
+            assert cache_manager.get("fresh") is not None
+            assert cache_manager.clear_all() == 1
+
+    def test_sqlite_expiry_query_uses_index(self):
+        """Test both expiry branches are answered from the expires_at index."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            store = SQLiteCacheStore(Path(temp_dir) / "cache.sqlite3")
+            plan = store._connection().execute(
+                "EXPLAIN QUERY PLAN SELECT COUNT(*) FROM cache_entries "
+                f"WHERE {SQLiteCacheStore._EXPIRED}",
+                (0.0, 0.0),
+            )
+            details = [row[-1] for row in plan]
+            assert not any(detail.startswith("SCAN") for detail in details)
+            assert any("idx_cache_entries_expires_at" in d for d in details)
+
+    def test_sqlite_concurrent_writers(self):
+        """Test concurrent writers from several threads don't lose entries."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache_manager = CacheManager(cache_dir=Path(temp_dir), storage="sqlite")
+
+            def writer(index):
+                for i in range(20):
+                    assert cache_manager.set(f"key_{index}_{i}", {"i": i})
+
+            threads = [threading.Thread(target=writer, args=(n,)) for n in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            assert cache_manager.get_cache_info()["total_files"] == 80
+
+    def test_file_store_concurrent_writes_to_same_key(self):
+        """Test concurrent writers of one key never leave temp files behind."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache_manager = CacheManager(cache_dir=Path(temp_dir))
+
+            def writer(index):
+                for i in range(20):
+                    assert cache_manager.set("shared", {"writer": index, "i": i})
+
+            threads = [threading.Thread(target=writer, args=(n,)) for n in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            assert cache_manager.get("shared")["data"]["i"] == 19
+            assert list(Path(temp_dir).glob("*.tmp")) == []
+
+
+@pytest.mark.unit
+class TestCacheManagerSweeper:
+    """Test expiry sweeping and size/count bounded eviction."""
+
+    def _age(self, cache_manager, key, accessed_at, modified_at=None):
+        cache_file = cache_manager.store.path_for(key)
+        if modified_at is None:
+            modified_at = cache_file.stat().st_mtime
+        os.utime(cache_file, (accessed_at, modified_at))
+
+    def test_sweep_removes_expired_files_by_mtime(self):
+        """Test expired files are found from their mtime without parsing them."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache_manager = CacheManager(cache_dir=Path(temp_dir), max_age_hours=1.0)
+            cache_manager.set("fresh", {"key": "value"})
+            cache_manager.set("stale", {"key": "value"})
+            self._age(cache_manager, "stale", 0, 0)
+
+            with patch.object(cache_manager.store, "read") as read:
+                assert cache_manager.sweep() == 1
+            read.assert_not_called()
+
+            assert cache_manager.get("fresh") is not None
+            assert not cache_manager.store.path_for("stale").exists()
+
+    def test_sweep_evicts_least_recently_accessed(self):
+        """Test entries beyond max_entries are evicted oldest access first."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache_manager = CacheManager(cache_dir=Path(temp_dir), max_entries=2)
+            for key in ("a", "b", "c"):
+                cache_manager.set(key, {"key": key})
+
+            now = time.time()
+            self._age(cache_manager, "a", now - 10)
+            self._age(cache_manager, "b", now - 100)
+            self._age(cache_manager, "c", now - 5)
+
+            assert cache_manager.sweep() == 1
+            assert cache_manager.get("b") is None
+            assert cache_manager.get("a") is not None
+            assert cache_manager.get("c") is not None
+
+    def test_get_records_access_without_changing_stamp(self):
+        """Test a cache hit bumps the access time but keeps the entry stamp."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache_manager = CacheManager(cache_dir=Path(temp_dir))
+            cache_manager.set("test_key", {"key": "value"})
+            self._age(cache_manager, "test_key", 0)
+            stamp = cache_manager.store.stamp("test_key")
+
+            assert cache_manager.get("test_key") is not None
+
+            assert cache_manager.store.stamp("test_key") == stamp
+            assert cache_manager.store.scan()[0].accessed_at > 0
+
+    def test_sqlite_sweep_enforces_max_bytes(self):
+        """Test the SQLite store tracks entry sizes for max_bytes eviction."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache_manager = CacheManager(
+                cache_dir=Path(temp_dir), storage="sqlite", max_bytes=1500
+            )
+            for index in range(3):
+                cache_manager.store.write(
+                    f"key_{index}",
+                    {
+                        "data": {"blob": "x" * 600},
+                        "timestamp": time.time() + index,
+                        "cache_key": f"key_{index}",
+                    },
+                )
+
+            assert cache_manager.sweep() == 1
+            assert cache_manager.get("key_0") is None
+            assert cache_manager.get("key_2") is not None
+
+    def test_writes_trigger_sweep_after_interval(self):
+        """Test set() sweeps opportunistically once the interval has passed."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache_manager = CacheManager(
+                cache_dir=Path(temp_dir), max_entries=1, sweep_interval=0
+            )
+            cache_manager.set("first", {"key": "value"})
+            self._age(cache_manager, "first", 0)
+            cache_manager.set("second", {"key": "value"})
+
+            assert cache_manager.get_cache_info()["total_files"] == 1
+            assert cache_manager.get("second") is not None
+
+            lazy = CacheManager(
+                cache_dir=Path(temp_dir), max_entries=1, sweep_interval=3600
+            )
+            lazy.set("third", {"key": "value"})
+            assert lazy.get_cache_info()["total_files"] == 2
+
+    @pytest.mark.parametrize("storage", ["file", "sqlite"])
+    def test_sweep_honors_max_age_of_each_entry(self, storage):
+        """Test a short-lived manager does not expire longer-lived entries."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            long_lived = CacheManager(
+                cache_dir=Path(temp_dir), storage=storage, max_age_hours=720
+            )
+            short_lived = CacheManager(
+                cache_dir=Path(temp_dir),
+                storage=storage,
+                max_age_hours=24,
+                sweep_interval=0,
+            )
+            two_days_ago = time.time() - 48 * 3600
+            for key, manager in (("validators", long_lived), ("tools", short_lived)):
+                manager.store.write(
+                    key,
+                    {
+                        "data": {"key": key},
+                        "timestamp": two_days_ago,
+                        "cache_key": key,
+                        "max_age": manager.max_age_hours * 3600,
+                    },
+                )
+                if storage == "file":
+                    self._age(manager, key, two_days_ago, two_days_ago)
+
+            short_lived.set("fresh", {"key": "value"})
+
+            assert long_lived.get("validators")["data"] == {"key": "validators"}
+            assert short_lived.store.stamp("tools") is None
+            assert short_lived.get_cache_info()["expired_files"] == 0
+
+    def test_compact_entries_without_max_age_are_read(self):
+        """Test version 1 compact entries still load and expire by cutoff."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache_manager = CacheManager(
+                cache_dir=Path(temp_dir), cache_format="compact", max_age_hours=1.0
+            )
+            for key, timestamp in (("old", 0.0), ("recent", time.time())):
+                payload = b'{"key":"value"}'
+                cache_manager.store.path_for(key).write_bytes(
+                    struct.pack("<4sB3xdII", b"MCPC", 1, timestamp, len(key), 15)
+                    + key.encode()
+                    + payload
+                )
+            self._age(cache_manager, "old", 0, 0)
+
+            assert cache_manager.get("recent")["data"] == {"key": "value"}
+            assert cache_manager.sweep() == 1
+            assert cache_manager.store.stamp("old") is None
+
+    def test_sqlite_schema_migration(self):
+        """Test databases without the accounting columns are upgraded."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            conn = sqlite3.connect(str(Path(temp_dir) / "cache.sqlite3"))
+            with conn:
+                conn.execute(
+                    "CREATE TABLE cache_entries (cache_key TEXT PRIMARY KEY, "
+                    "timestamp REAL NOT NULL, version INTEGER NOT NULL DEFAULT 1, "
+                    "payload BLOB NOT NULL)"
+                )
+                conn.execute(
+                    "INSERT INTO cache_entries VALUES (?, ?, 1, ?)",
+                    ("old", time.time(), b'{"key":"value"}'),
+                )
+            conn.close()
+
+            cache_manager = CacheManager(cache_dir=Path(temp_dir), storage="sqlite")
+            (entry,) = cache_manager.store.scan()
+            assert entry.size == 15
+            assert entry.accessed_at > 0
+            assert cache_manager.get("old")["data"] == {"key": "value"}
+
+    def test_sqlite_schema_migration_backfills_expiry(self):
+        """Test rows written with a max age get expires_at on upgrade."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            conn = sqlite3.connect(str(Path(temp_dir) / "cache.sqlite3"))
+            with conn:
+                conn.execute(
+                    "CREATE TABLE cache_entries (cache_key TEXT PRIMARY KEY, "
+                    "timestamp REAL NOT NULL, version INTEGER NOT NULL DEFAULT 1, "
+                    "payload BLOB NOT NULL, size INTEGER NOT NULL DEFAULT 0, "
+                    "accessed_at REAL NOT NULL DEFAULT 0, max_age REAL)"
+                )
+                conn.executemany(
+                    "INSERT INTO cache_entries VALUES (?, ?, 1, '{}', 2, ?, ?)",
+                    [
+                        ("short", time.time() - 120, time.time(), 60.0),
+                        ("legacy", time.time() - 120, time.time(), None),
+                    ],
+                )
+            conn.close()
+
+            cache_manager = CacheManager(
+                cache_dir=Path(temp_dir), storage="sqlite", max_age_hours=1.0
+            )
+            assert cache_manager.store.count(time.time() - 3600) == (2, 1)
+            assert cache_manager.clear_expired() == 1
+            assert cache_manager.store.stamp("legacy") is not None
@@ -6,12 +6,18 @@ merging configuration from multiple sources and processing volume mounts and com
 """
 
 import json
+import os
 from unittest.mock import mock_open, patch
 
 import pytest
 import yaml
 
-from mcp_template.core.config_processor import ConfigProcessor
+from mcp_template.core.config_processor import (
+    ConfigProcessor,
+    clear_config_file_cache,
+    clear_config_plan_cache,
+    get_config_plan,
+)
 
 
 @pytest.mark.unit
@@ -724,6 +730,152 @@ class TestConfigProcessorFileMapping:
         assert result == "42"
 
 
+@pytest.mark.unit
+class TestConfigFileCache:
+    """Test reuse of parsed config files."""
+
+    def setup_method(self):
+        clear_config_file_cache()
+
+    def test_unchanged_file_parsed_once(self, config_processor, tmp_path):
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text(yaml.dump({"logging": {"level": "DEBUG"}}))
+
+        with patch("yaml.load", wraps=yaml.load) as load:
+            first = config_processor._load_json_yaml_config_file(str(config_file))
+            second = config_processor._load_json_yaml_config_file(str(config_file))
+
+        assert load.call_count == 1
+        assert first == second == {"logging": {"level": "DEBUG"}}
+
+        # Every caller gets its own copy
+        first["logging"]["level"] = "ERROR"
+        assert second["logging"]["level"] == "DEBUG"
+
+    def test_changed_file_is_reparsed(self, config_processor, tmp_path):
+        config_file = tmp_path / "config.json"
+        config_file.write_text(json.dumps({"port": 8080}))
+        assert config_processor._load_json_yaml_config_file(str(config_file)) == {
+            "port": 8080
+        }
+
+        config_file.write_text(json.dumps({"port": 90}))
+        stat = config_file.stat()
+        os.utime(config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        assert config_processor._load_json_yaml_config_file(str(config_file)) == {
+            "port": 90
+        }
+
+
+@pytest.mark.unit
+class TestConfigPlan:
+    """Test compiled configuration plans."""
+
+    SCHEMA = {
+        "properties": {
+            "log_level": {"type": "string"},
+            "max_size": {"type": "integer", "env_mapping": "MAX_SIZE"},
+            "data_dir": {
+                "env_mapping": "DATA_DIR",
+                "volume_mount": True,
+                "command_arg": True,
+            },
+        }
+    }
+
+    def setup_method(self):
+        clear_config_plan_cache()
+
+    def test_plan_shared_by_schema_hash(self):
+        plan = get_config_plan(self.SCHEMA)
+
+        assert get_config_plan(json.loads(json.dumps(self.SCHEMA))) is plan
+        assert plan.by_key["MAX_SIZE"] is plan.by_key["max_size"]
+        assert [prop.name for prop in plan.mount_plans] == ["data_dir"]
+        assert ("logging", "level") in plan.by_key["log_level"].nested_paths
+
+    def test_repeated_preparation_skips_schema_walk(self, config_processor, tmp_path):
+        template = {"config_schema": self.SCHEMA, "env_vars": {}}
+        config_file = tmp_path / "config.json"
+        config_file.write_text(json.dumps({"logging": {"level": "DEBUG"}}))
+
+        with patch(
+            "mcp_template.core.config_processor._common_patterns",
+            return_value=["logging.level"],
+        ) as patterns:
+            for _ in range(3):
+                config = config_processor.prepare_configuration(
+                    template=template,
+                    config_file=str(config_file),
+                    config_values={"max_size": "10"},
+                )
+                result = config_processor.handle_volume_and_args_config_properties(
+                    template, dict(config, DATA_DIR="/data")
+                )
+
+        # One pattern list per property without a file_mapping, compiled once
+        assert patterns.call_count == 3
+        assert config["LOG_LEVEL"] == "DEBUG"
+        assert config["MAX_SIZE"] == 10
+        assert result["template"]["volumes"] == {"/data": "/mnt/data"}
+        assert result["template"]["command"] == ["/mnt/data"]
+
+
+@pytest.mark.unit
+class TestConfigProcessorValidation:
+    """Test compiled validation of whole configs."""
+
+    SCHEMA = {
+        "type": "object",
+        "properties": {
+            "api_token": {"type": "string", "env_mapping": "API_TOKEN"},
+            "port": {"type": "integer", "minimum": 1, "env_mapping": "MCP_PORT"},
+            "debug": {"type": "boolean", "env_mapping": "DEBUG"},
+            "mode": {"type": "string", "enum": ["fast", "safe"], "required": True},
+        },
+        "required": ["api_token"],
+        "additionalProperties": False,
+    }
+
+    def test_env_string_values_validated_by_type(self, config_processor):
+        result = config_processor.validate_config(
+            {
+                "API_TOKEN": "secret",
+                "MCP_PORT": "8080",
+                "DEBUG": "true",
+                "mode": "fast",
+            },
+            self.SCHEMA,
+        )
+
+        assert result.valid
+        assert result.errors == []
+
+    def test_all_errors_reported_in_one_pass(self, config_processor):
+        result = config_processor.validate_config(
+            {"MCP_PORT": "0", "DEBUG": "maybe", "mode": "slow", "EXTRA": "1"},
+            self.SCHEMA,
+        )
+
+        assert not result.valid
+        assert len(result.errors) == 4
+        assert "Missing required property 'api_token'" in result.errors
+        assert result.warnings == ["Unknown field 'EXTRA' in configuration"]
+
+        # Properties can also be marked required on themselves
+        result = config_processor.validate_config({"API_TOKEN": "a"}, self.SCHEMA)
+        assert result.errors == ["Missing required property 'mode'"]
+
+    def test_validate_many_configs(self, config_processor):
+        configs = [{"API_TOKEN": "a", "mode": "safe"}, {"mode": "safe"}, {}]
+
+        results = config_processor.validate_configs(configs, self.SCHEMA)
+
+        assert [result.valid for result in results] == [True, False, False]
+        assert config_processor.validate_configs(configs, {})[2].valid
+
+
 @pytest.mark.unit
 class TestConfigProcessorTemplateOverrides:
     """Test template override functionality in ConfigProcessor."""
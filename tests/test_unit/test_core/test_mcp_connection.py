@@ -4,9 +4,11 @@ import asyncio
 import json
 from unittest.mock import AsyncMock, Mock, patch
 
+import aiohttp
 import pytest
 
-from mcp_template.core.mcp_connection import MCPConnection
+from mcp_template.core.mcp_connection import MCPConnection, clear_endpoint_path_cache
+from mcp_template.core.retry import RetryPolicy
 
 
 @pytest.mark.unit
@@ -380,3 +382,105 @@ class TestMCPConnection:
         conn.session_info = session_info
 
         assert conn.get_session_info() == session_info
+
+
+class TestSharedSession:
+    """Test connections over a session owned by the caller."""
+
+    @pytest.mark.asyncio
+    async def test_shared_session_is_left_open(self):
+        session = Mock(closed=False, close=AsyncMock())
+        connection = MCPConnection(timeout=5, session=session)
+
+        with patch.object(
+            MCPConnection, "_initialize_mcp_session_http", return_value=True
+        ):
+            assert await connection.connect_http("http://localhost:7071")
+
+        assert connection.http_session is session
+        await connection.disconnect()
+        session.close.assert_not_called()
+        assert connection.http_session is None
+
+
+class TestEndpointPathCache:
+    """Test that the endpoint path a server answered on is tried first."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        clear_endpoint_path_cache()
+
+    @pytest.mark.asyncio
+    async def test_known_path_is_tried_first(self):
+        attempts = []
+
+        async def connect_http_once(base_url, endpoint):
+            attempts.append(endpoint)
+            return endpoint == "/api/mcp"
+
+        connection = MCPConnection()
+        with patch.object(
+            connection, "_connect_http_once", side_effect=connect_http_once
+        ):
+            assert await connection.connect_http_smart("http://localhost:7071/")
+            attempts.clear()
+            assert await connection.connect_http_smart("http://localhost:7071")
+
+        assert attempts == ["/api/mcp"]
+
+
+class TestConnectRetries:
+    """Test that only transient connection failures are retried."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        clear_endpoint_path_cache()
+
+    @pytest.mark.asyncio
+    async def test_gateway_error_is_retried(self):
+        unavailable = aiohttp.ClientResponseError(Mock(), (), status=503)
+        connection = MCPConnection(
+            retry_policy=RetryPolicy(attempts=3, initial_delay=0.01)
+        )
+
+        with patch.object(
+            MCPConnection,
+            "_initialize_mcp_session_http",
+            AsyncMock(side_effect=[unavailable, True]),
+        ) as mock_init:
+            assert await connection.connect_http("http://localhost:7071")
+
+        assert mock_init.await_count == 2
+        await connection.disconnect()
+
+    @pytest.mark.asyncio
+    async def test_sweep_stops_when_nothing_listens(self):
+        attempts = []
+
+        async def connect_http_once(base_url, endpoint):
+            attempts.append(endpoint)
+            raise aiohttp.ClientConnectorError(Mock(), ConnectionRefusedError())
+
+        connection = MCPConnection(
+            retry_policy=RetryPolicy(attempts=2, initial_delay=0.01)
+        )
+        with patch.object(
+            connection, "_connect_http_once", side_effect=connect_http_once
+        ):
+            assert not await connection.connect_http_smart("http://localhost:7071")
+
+        # One path per sweep, swept once more after a short backoff
+        assert attempts == ["/mcp", "/mcp"]
+
+    @pytest.mark.asyncio
+    async def test_missing_endpoints_are_not_retried(self):
+        connection = MCPConnection(retry_policy=RetryPolicy(attempts=3))
+
+        with patch.object(
+            connection, "_connect_http_once", AsyncMock(return_value=False)
+        ) as mock_once:
+            assert not await connection.connect_http_smart(
+                "http://localhost:7071", endpoints=["/mcp", "/"]
+            )
+
+        assert mock_once.await_count == 2
@@ -0,0 +1,113 @@
+"""
+Unit tests for the retry policy (mcp_template.core.retry).
+"""
+
+import asyncio
+import subprocess
+from unittest.mock import AsyncMock, Mock, patch
+
+import aiohttp
+import pytest
+
+from mcp_template.core.retry import RetryPolicy, is_transient_error
+
+pytestmark = pytest.mark.unit
+
+
+def _response_error(status, headers=None):
+    return aiohttp.ClientResponseError(
+        Mock(real_url="http://localhost"), (), status=status, headers=headers
+    )
+
+
+class TestErrorClassification:
+    """Test which errors are worth retrying."""
+
+    @pytest.mark.parametrize(
+        "error",
+        [
+            subprocess.TimeoutExpired("docker", 30),
+            asyncio.TimeoutError(),
+            ConnectionRefusedError(),
+            subprocess.CalledProcessError(1, "docker", stderr="daemon busy"),
+            _response_error(503),
+            _response_error(429),
+            Mock(spec=Exception, status=500),
+        ],
+    )
+    def test_transient_errors(self, error):
+        assert is_transient_error(error)
+
+    @pytest.mark.parametrize(
+        "error",
+        [
+            subprocess.CalledProcessError(
+                125, "docker", stderr="Unable to find image: pull access denied"
+            ),
+            FileNotFoundError("docker"),
+            _response_error(404),
+            ValueError("bad response"),
+        ],
+    )
+    def test_permanent_errors(self, error):
+        assert not is_transient_error(error)
+
+
+class TestRetryPolicy:
+    """Test backoff, attempts and the deadline."""
+
+    @patch("time.sleep")
+    def test_transient_error_is_retried_with_growing_delays(self, mock_sleep):
+        func = Mock(side_effect=[OSError("busy"), OSError("busy"), "done"])
+        policy = RetryPolicy(attempts=3, initial_delay=1, max_delay=10)
+
+        assert policy.call(func) == "done"
+
+        first, second = (c.args[0] for c in mock_sleep.call_args_list)
+        assert 0.5 <= first <= 1
+        assert 1 <= second <= 2
+
+    @patch("time.sleep")
+    def test_permanent_error_fails_immediately(self, mock_sleep):
+        func = Mock(side_effect=FileNotFoundError("docker"))
+
+        with pytest.raises(FileNotFoundError):
+            RetryPolicy(attempts=3).call(func)
+
+        func.assert_called_once()
+        mock_sleep.assert_not_called()
+
+    @patch("time.sleep")
+    def test_last_error_is_raised_after_all_attempts(self, mock_sleep):
+        func = Mock(side_effect=OSError("busy"))
+
+        with pytest.raises(OSError):
+            RetryPolicy(attempts=3).call(func)
+
+        assert func.call_count == 3
+        assert mock_sleep.call_count == 2
+
+    @patch("time.sleep")
+    def test_no_retry_past_deadline(self, mock_sleep):
+        func = Mock(side_effect=OSError("busy"))
+        policy = RetryPolicy(attempts=5, initial_delay=2, deadline=1)
+
+        with pytest.raises(OSError):
+            policy.call(func)
+
+        func.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_decorated_coroutine_honors_retry_after(self):
+        func = AsyncMock(
+            side_effect=[_response_error(429, {"Retry-After": "3"}), "done"]
+        )
+
+        @RetryPolicy(attempts=2, initial_delay=0.1)
+        async def request():
+            return await func()
+
+        with patch("asyncio.sleep") as mock_sleep:
+            assert await request() == "done"
+
+        mock_sleep.assert_awaited_once_with(3.0)
@@ -0,0 +1,144 @@
+"""
+Tests for compiled JSON-Schema validation of tool arguments.
+"""
+
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from mcp_template.core.cache import CacheManager
+from mcp_template.core.schema_validator import (
+    SchemaValidator,
+    clear_validator_cache,
+    get_validator,
+)
+from mcp_template.core.tool_manager import ToolManager
+
+ECHO_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "message": {"type": "string", "minLength": 1},
+        "count": {"type": "integer", "minimum": 1, "maximum": 10},
+        "mode": {"type": "string", "enum": ["plain", "loud"]},
+        "tags": {"type": "array", "items": {"type": "string"}, "uniqueItems": True},
+    },
+    "required": ["message"],
+    "additionalProperties": False,
+}
+
+
+@pytest.mark.unit
+class TestSchemaValidator:
+    """Test the compiled schema validator."""
+
+    def test_valid_arguments(self):
+        validator = SchemaValidator(ECHO_SCHEMA)
+        assert validator.iter_errors({"message": "hi", "count": 3}) == []
+        assert validator.is_valid({"message": "hi", "tags": ["a", "b"]})
+
+    def test_collects_all_errors(self):
+        validator = SchemaValidator(ECHO_SCHEMA)
+        errors = validator.iter_errors(
+            {"count": "3", "mode": "quiet", "tags": ["a", 1, "a"], "extra": True}
+        )
+
+        assert "Missing required property 'message'" in errors
+        assert any(e.startswith("'count' must be of type integer") for e in errors)
+        assert any(e.startswith("'mode' must be one of") for e in errors)
+        assert "'tags[1]' must be of type string, got int" in errors
+        assert "'tags' must contain unique items" in errors
+        assert "'extra' is not an allowed property" in errors
+
+    def test_numeric_bounds_and_bool_is_not_integer(self):
+        validator = SchemaValidator(ECHO_SCHEMA)
+        assert validator.iter_errors({"message": "x", "count": 11}) == [
+            "'count' must be <= 10, got 11"
+        ]
+        assert not validator.is_valid({"message": "x", "count": True})
+
+    def test_local_refs_and_combinators(self):
+        schema = {
+            "type": "object",
+            "$defs": {
+                "node": {
+                    "type": "object",
+                    "properties": {
+                        "value": {"anyOf": [{"type": "string"}, {"type": "null"}]},
+                        "children": {
+                            "type": "array",
+                            "items": {"$ref": "#/$defs/node"},
+                        },
+                    },
+                    "required": ["value"],
+                }
+            },
+            "properties": {"root": {"$ref": "#/$defs/node"}},
+        }
+        validator = SchemaValidator(schema)
+
+        assert validator.is_valid(
+            {"root": {"value": "a", "children": [{"value": None}]}}
+        )
+        errors = validator.iter_errors({"root": {"value": 1, "children": [{}]}})
+        assert "'root.value' does not match any allowed schema" in errors
+        assert "'root.children[0]' is missing required property 'value'" in errors
+
+    def test_get_validator_is_cached_per_schema(self):
+        clear_validator_cache()
+        first = get_validator(ECHO_SCHEMA, "demo", "echo")
+
+        assert get_validator(dict(ECHO_SCHEMA), "demo", "echo") is first
+        assert get_validator({"type": "object"}, "demo", "echo") is not first
+        assert get_validator(ECHO_SCHEMA, "demo", "other") is not first
+
+
+@pytest.mark.unit
+class TestToolManagerArgumentValidation:
+    """Test that ToolManager rejects invalid arguments before calling a tool."""
+
+    def setup_method(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.tool_manager = ToolManager(backend_type="mock")
+        self.tool_manager.cache_manager = CacheManager(
+            cache_dir=Path(self.temp_dir.name)
+        )
+        self.tool_manager._cache_tools(
+            "demo",
+            [{"name": "echo", "description": "Echo", "inputSchema": ECHO_SCHEMA}],
+            "stdio",
+            "image",
+        )
+
+    def teardown_method(self):
+        self.temp_dir.cleanup()
+
+    def test_invalid_arguments_rejected_without_transport(self):
+        with patch.object(self.tool_manager.backend, "get_deployment_info") as info:
+            result = self.tool_manager.call_tool("demo", "echo", {"count": 3})
+
+        info.assert_not_called()
+        assert result["success"] is False
+        assert "Invalid arguments for tool 'echo'" in result["error"]
+        assert result["validation_errors"] == ["Missing required property 'message'"]
+
+    def test_unknown_schema_is_not_validated(self):
+        assert self.tool_manager.validate_tool_arguments("demo", "unknown", {}) == []
+        assert self.tool_manager.validate_tool_arguments("other", "echo", {}) == []
+
+    def test_validation_can_be_disabled(self):
+        with (
+            patch("mcp_template.core.tool_manager.ToolCaller"),
+            patch.object(
+                self.tool_manager.template_manager,
+                "get_template_info",
+                return_value=None,
+            ),
+        ):
+            result = self.tool_manager.call_tool(
+                "demo", "echo", {}, validate_arguments=False, force_stdio=True
+            )
+
+        assert "validation_errors" not in result
+        assert result["error"] == "Template 'demo' not found"
@@ -141,8 +141,8 @@ class TestTemplateManager:
 
         with patch.object(
             self.template_manager.template_discovery,
-            "discover_templates",
-            return_value=mock_templates,
+            "get_template_config",
+            side_effect=mock_templates.get,
         ):
             info = self.template_manager.get_template_info("demo")
 
@@ -256,13 +256,24 @@ class TestTemplateManager:
 
         with patch.object(
             self.template_manager.template_discovery,
-            "discover_templates",
-            return_value=mock_templates,
+            "get_template_config",
+            side_effect=mock_templates.get,
         ):
             info = self.template_manager.get_template_info("nonexistent")
 
         assert info is None
 
+    def test_get_template_info_does_not_discover_catalogue(self):
+        """Test one-template lookups load only that template."""
+        with patch.object(
+            self.template_manager.template_discovery, "discover_templates"
+        ) as mock_discover:
+            assert self.template_manager.validate_template("demo") is True
+            info = self.template_manager.get_template_info("demo")
+
+        mock_discover.assert_not_called()
+        assert info["docker_image"] == "dataeverything/mcp-demo"
+
     def test_validate_template_valid(self):
         """Test validation of valid template."""
         mock_templates = {
@@ -276,8 +287,8 @@ class TestTemplateManager:
 
         with patch.object(
             self.template_manager.template_discovery,
-            "discover_templates",
-            return_value=mock_templates,
+            "get_template_config",
+            side_effect=mock_templates.get,
         ):
             is_valid = self.template_manager.validate_template("demo")
 
@@ -294,8 +305,8 @@ class TestTemplateManager:
 
         with patch.object(
             self.template_manager.template_discovery,
-            "discover_templates",
-            return_value=mock_templates,
+            "get_template_config",
+            side_effect=mock_templates.get,
         ):
             is_valid = self.template_manager.validate_template("incomplete")
 
@@ -307,8 +318,8 @@ class TestTemplateManager:
 
         with patch.object(
             self.template_manager.template_discovery,
-            "discover_templates",
-            return_value=mock_templates,
+            "get_template_config",
+            side_effect=mock_templates.get,
         ):
             is_valid = self.template_manager.validate_template("nonexistent")
 
@@ -381,8 +392,8 @@ class TestTemplateManager:
 
         with patch.object(
             self.template_manager.template_discovery,
-            "discover_templates",
-            return_value=mock_templates,
+            "get_template_config",
+            side_effect=mock_templates.get,
         ):
             schema = self.template_manager.get_template_config_schema("demo")
 
@@ -411,8 +422,8 @@ class TestTemplateManager:
 
         with patch.object(
             self.template_manager.template_discovery,
-            "discover_templates",
-            return_value=mock_templates,
+            "get_template_config",
+            side_effect=mock_templates.get,
         ):
             tools = self.template_manager.get_template_tools("demo")
 
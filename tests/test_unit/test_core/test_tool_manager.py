@@ -14,6 +14,22 @@ from mcp_template.core.cache import CacheManager
 from mcp_template.core.tool_manager import ToolManager
 
 
+@pytest.mark.unit
+class TestStaticToolDiscovery:
+    """Test tool discovery from template files."""
+
+    def test_repeated_discovery_leaves_template_config_unchanged(self):
+        """Test tools.json entries are not added to the shared template config."""
+        from mcp_template.core.template_manager import TemplateManager
+
+        tool_manager = ToolManager(backend_type="mock")
+        for _ in range(3):
+            assert len(tool_manager.discover_tools_static("github")) == 77
+
+        template_info = TemplateManager(backend_type="mock").get_template_info("github")
+        assert template_info.get("tools", []) == []
+
+
 @pytest.mark.unit
 @pytest.mark.docker
 class TestGitHubToolDiscovery:
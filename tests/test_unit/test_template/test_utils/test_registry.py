@@ -0,0 +1,109 @@
+"""
+Test the process-wide template registry.
+"""
+
+import json
+import os
+
+import pytest
+
+from mcp_template.template.utils.discovery import TemplateDiscovery
+from mcp_template.template.utils.registry import (
+    clear_template_registries,
+    get_template_registry,
+)
+
+
+def _write_template(templates_dir, name, description="Test template"):
+    template_dir = templates_dir / name
+    template_dir.mkdir(exist_ok=True)
+    (template_dir / "template.json").write_text(
+        json.dumps({"name": name.title(), "description": description})
+    )
+    return template_dir
+
+
+@pytest.mark.unit
+class TestTemplateRegistry:
+    """Test fingerprinting, incremental rescans and snapshot sharing."""
+
+    def setup_method(self):
+        clear_template_registries()
+
+    def test_discoveries_share_one_registry(self, tmp_path):
+        _write_template(tmp_path, "alpha")
+
+        first = TemplateDiscovery(templates_dir=tmp_path)
+        second = TemplateDiscovery(templates_dir=tmp_path)
+
+        assert first.get_snapshot() is second.get_snapshot()
+        assert get_template_registry(tmp_path).parse_count == 1
+
+    def test_only_changed_templates_are_reparsed(self, tmp_path):
+        _write_template(tmp_path, "alpha")
+        _write_template(tmp_path, "beta")
+        discovery = TemplateDiscovery(templates_dir=tmp_path)
+        registry = get_template_registry(tmp_path)
+
+        before = discovery.get_snapshot()
+        assert registry.parse_count == 2
+
+        beta_json = tmp_path / "beta" / "template.json"
+        beta_json.write_text(json.dumps({"name": "Beta", "description": "Changed"}))
+        stat = beta_json.stat()
+        os.utime(beta_json, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        after = discovery.get_snapshot()
+        assert registry.parse_count == 3
+        assert after is not before
+        assert after.generation == before.generation + 1
+        assert after.templates["alpha"] is before.templates["alpha"]
+        assert after.templates["beta"]["description"] == "Changed"
+
+    def test_added_and_removed_templates(self, tmp_path):
+        _write_template(tmp_path, "alpha")
+        discovery = TemplateDiscovery(templates_dir=tmp_path)
+        assert set(discovery.discover_templates()) == {"alpha"}
+
+        _write_template(tmp_path, "beta")
+        assert set(discovery.discover_templates()) == {"alpha", "beta"}
+
+        (tmp_path / "alpha" / "template.json").unlink()
+        assert set(discovery.discover_templates()) == {"beta"}
+
+    def test_snapshot_is_immutable(self, tmp_path):
+        _write_template(tmp_path, "alpha")
+        snapshot = TemplateDiscovery(templates_dir=tmp_path).get_snapshot()
+
+        with pytest.raises(TypeError):
+            snapshot.templates["beta"] = {}
+
+    def test_refresh_reparses_everything(self, tmp_path):
+        _write_template(tmp_path, "alpha")
+        discovery = TemplateDiscovery(templates_dir=tmp_path)
+        registry = get_template_registry(tmp_path)
+
+        discovery.discover_templates()
+        discovery.refresh()
+        discovery.discover_templates()
+
+        assert registry.parse_count == 2
+
+    def test_single_template_lookup(self, tmp_path):
+        _write_template(tmp_path, "alpha")
+        _write_template(tmp_path, "beta")
+        discovery = TemplateDiscovery(templates_dir=tmp_path)
+        registry = get_template_registry(tmp_path)
+
+        config = discovery.get_template_config("alpha")
+        assert config["name"] == "Alpha"
+        config["name"] = "Changed"
+        assert discovery.get_template_config("alpha")["name"] == "Alpha"
+        assert discovery.get_template_config("missing") is None
+        assert discovery.get_template_config("..") is None
+        assert registry.parse_count == 1
+
+        # A full scan reuses the template loaded on its own
+        snapshot = discovery.get_snapshot()
+        assert snapshot.templates["alpha"]["name"] == "Alpha"
+        assert registry.parse_count == 2
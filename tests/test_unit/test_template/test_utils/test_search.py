@@ -0,0 +1,105 @@
+"""
+Test the inverted-index template search.
+"""
+
+import json
+from unittest.mock import patch
+
+import pytest
+
+from mcp_template.template.utils.discovery import TemplateDiscovery
+from mcp_template.template.utils.search import TemplateSearchIndex, get_search_index
+
+TEMPLATES = {
+    "filesystem": {
+        "name": "Filesystem",
+        "description": "Secure file operations",
+        "tags": ["files", "storage"],
+        "tools": [{"name": "read_file"}, {"name": "list_directory"}],
+    },
+    "github": {
+        "name": "GitHub",
+        "description": "Work with repositories and files on GitHub",
+        "tags": ["git", "vcs"],
+        "tools": [{"name": "create_issue"}],
+    },
+    "postgres": {
+        "name": "PostgreSQL",
+        "description": "Query a database",
+        "tags": ["database", "sql"],
+        "tools": [{"name": "run_query"}],
+    },
+}
+
+
+@pytest.mark.unit
+class TestTemplateSearchIndex:
+    """Test token matching, ranking and completion."""
+
+    def test_prefix_match_ranked_by_field(self):
+        index = TemplateSearchIndex(TEMPLATES)
+
+        # "file" is a name prefix of filesystem but only a word of github's
+        # description
+        assert index.search("file") == ["filesystem", "github"]
+
+    def test_tool_names_and_tags_are_indexed(self):
+        index = TemplateSearchIndex(TEMPLATES)
+
+        assert index.search("issue") == ["github"]
+        assert index.search("sql") == ["postgres"]
+
+    def test_all_query_tokens_must_match(self):
+        index = TemplateSearchIndex(TEMPLATES)
+
+        assert index.search("file github") == ["github"]
+        assert index.search("file sql") == []
+
+    def test_substring_matches_rank_last(self):
+        index = TemplateSearchIndex(TEMPLATES)
+
+        assert index.search("system") == ["filesystem"]
+        assert index.search("gres") == ["postgres"]
+
+    def test_complete_template_ids(self):
+        index = TemplateSearchIndex(TEMPLATES)
+
+        assert index.complete("") == ["filesystem", "github", "postgres"]
+        assert index.complete("gi") == ["github"]
+        assert index.complete("x") == []
+
+    def test_index_shared_between_copies_of_a_snapshot(self):
+        first = get_search_index(TEMPLATES)
+
+        assert get_search_index(dict(TEMPLATES)) is first
+        assert get_search_index({**TEMPLATES, "demo": {}}) is not first
+        assert get_search_index(["demo", "github"]).complete("d") == ["demo"]
+
+    def test_index_shared_between_catalogues_of_a_snapshot(self, tmp_path):
+        for name in ("alpha", "beta"):
+            (tmp_path / name).mkdir()
+            (tmp_path / name / "template.json").write_text(
+                json.dumps({"name": name.title(), "docker_image": f"mcp/{name}"})
+            )
+
+        with patch(
+            "mcp_template.template.utils.search.TemplateSearchIndex",
+            wraps=TemplateSearchIndex,
+        ) as build:
+            indexes = {
+                id(get_search_index(TemplateDiscovery(tmp_path).discover_templates()))
+                for _ in range(4)
+            }
+            snapshot = TemplateDiscovery(tmp_path).get_snapshot()
+            assert get_search_index(snapshot).complete("a") == ["alpha"]
+
+        assert len(indexes) == 1
+        build.assert_called_once()
+
+    def test_infix_lookup_skips_unrelated_tokens(self):
+        index = TemplateSearchIndex(TEMPLATES)
+
+        assert index._infix_candidates("ory") == {"directory"}
+        assert index.search("es") == ["filesystem", "postgres", "github"]
+        assert index._infix_candidates("tgres") == {"postgres", "postgresql"}
+        assert index._infix_candidates("zzz") == set()
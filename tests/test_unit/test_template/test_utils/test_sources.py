@@ -0,0 +1,204 @@
+"""
+Test template sources and their merge into one registry snapshot.
+"""
+
+import io
+import json
+import tarfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from mcp_template.core.cache import CacheManager
+from mcp_template.template.utils.discovery import TemplateDiscovery
+from mcp_template.template.utils.sources import (
+    HTTPIndexTemplateSource,
+    LocalTemplateSource,
+    TarballTemplateSource,
+    create_template_source,
+)
+
+
+def _write_template(templates_dir, name, description="Test template"):
+    template_dir = templates_dir / name
+    template_dir.mkdir(parents=True, exist_ok=True)
+    (template_dir / "template.json").write_text(
+        json.dumps({"name": name.title(), "description": description})
+    )
+    return template_dir
+
+
+def _tarball(members):
+    """Build an in-memory tar.gz from a {path: text} mapping."""
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as tar:
+        for path, text in members.items():
+            data = text.encode()
+            info = tarfile.TarInfo(path)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+    return buffer.getvalue()
+
+
+class _CatalogServer:
+    """Local HTTP stand-in serving documents with an ETag."""
+
+    def __init__(self):
+        self.documents = {}
+        self.requests = []
+        catalog = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                catalog.requests.append((self.path, dict(self.headers)))
+                body = catalog.documents.get(self.path)
+                if body is None:
+                    self.send_response(404)
+                    self.end_headers()
+                    return
+
+                etag = f'"{hash(body)}"'
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+
+                self.send_response(200)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def url(self, path):
+        return f"http://127.0.0.1:{self.server.server_port}{path}"
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def catalog_server():
+    server = _CatalogServer()
+    yield server
+    server.close()
+
+
+@pytest.mark.unit
+class TestTemplateSources:
+    """Test local, tarball and HTTP index template sources."""
+
+    def test_create_template_source(self, tmp_path):
+        assert isinstance(create_template_source(str(tmp_path)), LocalTemplateSource)
+        assert isinstance(
+            create_template_source("https://example.com/index.json"),
+            HTTPIndexTemplateSource,
+        )
+        assert isinstance(
+            create_template_source("https://example.com/templates.tar.gz?ref=main"),
+            TarballTemplateSource,
+        )
+
+    def test_http_index_revalidates_with_etag(self, catalog_server, tmp_path):
+        catalog_server.documents["/index.json"] = json.dumps(
+            {"templates": [{"id": "remote", "name": "Remote", "tags": ["web"]}]}
+        ).encode()
+        source = HTTPIndexTemplateSource(
+            catalog_server.url("/index.json"),
+            refresh_interval=0,
+            cache_manager=CacheManager(cache_dir=tmp_path),
+        )
+        discovery = TemplateDiscovery(templates_dir=tmp_path / "none", sources=[])
+
+        first = source.fetch(discovery)
+        second = source.fetch(discovery)
+
+        assert first["remote"]["name"] == "Remote"
+        assert first["remote"]["image"] == "dataeverything/mcp-remote:latest"
+        assert second is first
+        assert "If-None-Match" not in catalog_server.requests[0][1]
+        assert catalog_server.requests[1][1]["If-None-Match"].startswith('"')
+
+    def test_http_index_serves_last_good_copy(self, catalog_server, tmp_path):
+        catalog_server.documents["/index.json"] = json.dumps(
+            {"templates": {"remote": {"name": "Remote"}}}
+        ).encode()
+        cache_manager = CacheManager(cache_dir=tmp_path)
+        url = catalog_server.url("/index.json")
+        discovery = TemplateDiscovery(templates_dir=tmp_path / "none", sources=[])
+        HTTPIndexTemplateSource(url, cache_manager=cache_manager).fetch(discovery)
+
+        catalog_server.documents.clear()
+        restarted = HTTPIndexTemplateSource(url, cache_manager=cache_manager)
+
+        assert set(restarted.fetch(discovery)) == {"remote"}
+
+    def test_tarball_over_http(self, catalog_server, tmp_path):
+        catalog_server.documents["/templates.tar.gz"] = _tarball(
+            {
+                "catalog-main/packed/template.json": json.dumps({"name": "Packed"}),
+                "catalog-main/packed/Dockerfile": "FROM scratch\n",
+            }
+        )
+        source = TarballTemplateSource(
+            catalog_server.url("/templates.tar.gz"),
+            cache_dir=tmp_path / "sources",
+            refresh_interval=0,
+            cache_manager=CacheManager(cache_dir=tmp_path),
+        )
+        discovery = TemplateDiscovery(templates_dir=tmp_path / "none", sources=[])
+
+        first = source.fetch(discovery)
+        second = source.fetch(discovery)
+
+        assert first["packed"]["name"] == "Packed"
+        assert second is first
+        assert len(catalog_server.requests) == 2
+        assert (source.template_path("packed") / "Dockerfile").exists()
+
+    def test_unsafe_tarball_is_rejected(self, tmp_path):
+        tarball = tmp_path / "evil.tar.gz"
+        tarball.write_bytes(_tarball({"../escape/template.json": "{}"}))
+        source = TarballTemplateSource(
+            str(tarball),
+            cache_dir=tmp_path / "sources",
+            cache_manager=CacheManager(cache_dir=tmp_path),
+        )
+
+        assert source.fetch(TemplateDiscovery(sources=[])) == {}
+        assert not (tmp_path / "escape").exists()
+
+    def test_sources_are_merged_in_precedence_order(self, catalog_server, tmp_path):
+        bundled = tmp_path / "bundled"
+        _write_template(bundled, "shared", "Bundled version")
+        extra = tmp_path / "extra"
+        _write_template(extra, "shared", "Extra version")
+        _write_template(extra, "local")
+        catalog_server.documents["/index.json"] = json.dumps(
+            {"templates": {"remote": {"name": "Remote"}}}
+        ).encode()
+
+        discovery = TemplateDiscovery(
+            templates_dir=bundled,
+            sources=[
+                LocalTemplateSource(extra),
+                HTTPIndexTemplateSource(
+                    catalog_server.url("/index.json"),
+                    cache_manager=CacheManager(cache_dir=tmp_path),
+                ),
+            ],
+        )
+
+        snapshot = discovery.get_snapshot()
+        assert set(snapshot.templates) == {"shared", "local", "remote"}
+        assert snapshot.templates["shared"]["description"] == "Bundled version"
+        assert discovery.get_template_path("local") == extra / "local"
+        assert discovery.get_snapshot() is snapshot
@@ -19,6 +19,9 @@ from mcp_template.tools.base_probe import (
     DISCOVERY_RETRY_SLEEP,
     DISCOVERY_TIMEOUT,
     BaseProbe,
+    clear_deployment_endpoint_cache,
+    close_probe_session,
+    get_probe_session,
 )
 from mcp_template.tools.mcp_client_probe import MCPClientProbe
 
@@ -226,6 +229,90 @@ class TestBaseProbeIntegration:
             probe.discover_tools_from_image("error")
 
 
+class TestDeploymentEndpointCache:
+    """Test that deployments are reached on their last working endpoint."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        clear_deployment_endpoint_cache()
+        self.probe = ConcreteProbe()
+        self.deployment = {"id": "abc123", "name": "demo", "ports": "7071/tcp"}
+
+    def _discover(self, deployment, working):
+        tools = [{"name": "echo"}]
+        with (
+            patch.object(
+                self.probe,
+                "_resolve_candidate_endpoints",
+                return_value=["http://10.0.0.5:7071", "http://localhost:7071"],
+            ) as resolve,
+            patch.object(
+                self.probe,
+                "_try_endpoint_with_patterns",
+                side_effect=lambda endpoint, timeout, session: (
+                    tools if endpoint == working else []
+                ),
+            ) as attempt,
+        ):
+            assert self.probe.discover_tools_from_deployment(deployment) == tools
+        return resolve, attempt
+
+    def test_cached_endpoint_skips_resolution(self):
+        self._discover(self.deployment, "http://localhost:7071")
+        resolve, attempt = self._discover(self.deployment, "http://localhost:7071")
+
+        resolve.assert_not_called()
+        attempt.assert_awaited_once_with("http://localhost:7071", 30, None)
+
+    def test_replaced_deployment_is_resolved_again(self):
+        self._discover(self.deployment, "http://localhost:7071")
+        moved = dict(self.deployment, container_id="def456")
+        resolve, _ = self._discover(moved, "http://localhost:7071")
+
+        resolve.assert_called_once()
+
+    def test_failing_cached_endpoint_is_resolved_again(self):
+        self._discover(self.deployment, "http://localhost:7071")
+        resolve, attempt = self._discover(self.deployment, "http://10.0.0.5:7071")
+
+        resolve.assert_called_once()
+        assert attempt.call_args_list[0].args[0] == "http://localhost:7071"
+
+        resolve, _ = self._discover(self.deployment, "http://10.0.0.5:7071")
+        resolve.assert_not_called()
+
+
+class TestBaseProbeAsync:
+    """Test the async discovery API."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        clear_deployment_endpoint_cache()
+        self.probe = ConcreteProbe()
+
+    @pytest.mark.asyncio
+    async def test_image_discovery_defaults_to_worker_thread(self):
+        result = await self.probe.adiscover_tools_from_image("test-image")
+        assert result == {"tools": [], "image": "test-image"}
+
+    @pytest.mark.asyncio
+    async def test_deployment_discovery_shares_session(self):
+        tools = [{"name": "echo"}]
+        deployment = {"id": "abc123", "endpoint": "http://localhost:7071"}
+
+        with patch.object(
+            self.probe, "_try_endpoint_with_patterns", return_value=tools
+        ) as attempt:
+            assert await self.probe.adiscover_tools_from_deployment(deployment) == tools
+            clear_deployment_endpoint_cache()
+            await self.probe.adiscover_tools_from_deployment(deployment)
+
+        sessions = {c.args[2] for c in attempt.await_args_list}
+        assert sessions == {get_probe_session()}
+        await close_probe_session()
+        assert next(iter(sessions)).closed
+
+
 class TestBaseProbeLogging:
     """Test logging behavior in BaseProbe."""
 
@@ -4,19 +4,32 @@ Unit tests for the Docker probe module (mcp_template.tools.docker_probe).
 Tests Docker container-based MCP server tool discovery functionality.
 """
 
+import asyncio
+import json
 import subprocess
 import threading
 import time
-from unittest.mock import Mock, call, patch
+from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 import requests
 
 pytestmark = pytest.mark.unit
 
+from mcp_template.tools.base_probe import close_probe_session
 from mcp_template.tools.docker_probe import DockerProbe
 
 
+@pytest.fixture(autouse=True)
+def reaper():
+    """Collect queued removals instead of running docker in the background."""
+    reaper = Mock()
+    with patch(
+        "mcp_template.tools.docker_probe.get_container_reaper", return_value=reaper
+    ):
+        yield reaper
+
+
 class TestDockerProbe:
     """Test the DockerProbe class."""
 
@@ -29,81 +42,187 @@ class TestDockerProbe:
         assert isinstance(self.probe, DockerProbe)
         assert hasattr(self.probe, "mcp_client")
 
-    @patch("subprocess.run")
-    def test_cleanup_container_success(self, mock_run):
-        """Test successful container cleanup."""
-        mock_run.return_value = Mock(returncode=0)
-
-        # Run cleanup in a way that doesn't block test
-        self.probe._cleanup_container("test-container")
-
-        # Give the thread a moment to execute
-        time.sleep(0.1)
+    def test_cleanup_container_is_queued(self, reaper):
+        """Test containers are handed to the reaper instead of removed inline."""
+        with patch("subprocess.run") as mock_run:
+            self.probe._cleanup_container("test-container")
 
-        # Verify subprocess was called (may need slight delay for thread execution)
-        # We can't assert the exact call immediately due to threading
+        reaper.submit.assert_called_once_with("test-container")
+        mock_run.assert_not_called()
 
     @patch("subprocess.run")
-    def test_cleanup_container_timeout(self, mock_run):
-        """Test container cleanup with timeout."""
-        mock_run.side_effect = subprocess.TimeoutExpired("docker", 10)
+    def test_start_http_container_reads_assigned_port(self, mock_run):
+        """Test Docker picks the host port and it is read back."""
+        mock_run.side_effect = [
+            Mock(returncode=0, stdout="abc123\n"),
+            Mock(returncode=0, stdout="0.0.0.0:49153\n[::]:49153\n"),
+        ]
 
-        with patch.object(self.probe, "_background_cleanup") as mock_bg_cleanup:
-            self.probe._cleanup_container("test-container")
-            time.sleep(0.1)  # Allow thread to execute
+        port = self.probe._start_http_container("test-image", "test-container")
+
+        assert port == 49153
+        run_cmd = mock_run.call_args_list[0].args[0]
+        assert run_cmd[run_cmd.index("-p") + 1] == "0:8000"
+        assert mock_run.call_args_list[1].args[0] == [
+            "docker",
+            "port",
+            "test-container",
+            "8000/tcp",
+        ]
 
     @patch("subprocess.run")
-    def test_cleanup_container_failure(self, mock_run):
-        """Test container cleanup failure."""
-        mock_run.side_effect = subprocess.CalledProcessError(1, "docker")
+    def test_start_http_container_failure(self, mock_run):
+        """Test no port is returned when the container does not start."""
+        mock_run.return_value = Mock(returncode=125, stderr="no such image")
 
-        # Should not raise exception, just log
-        self.probe._cleanup_container("test-container")
-        time.sleep(0.1)
+        assert self.probe._start_http_container("missing", "test-container") is None
+        mock_run.assert_called_once()
 
+    @patch("time.sleep")
     @patch("subprocess.run")
-    def test_background_cleanup_success(self, mock_run):
-        """Test successful background cleanup."""
-        mock_run.return_value = Mock(returncode=0)
-
-        self.probe._background_cleanup("test-container")
-
-        mock_run.assert_called_with(
-            ["docker", "rm", "-f", "test-container"],
-            capture_output=True,
-            text=True,
-            timeout=30,
-            check=False,
+    def test_http_discovery_of_missing_image_is_not_retried(self, mock_run, mock_sleep):
+        """Test permanent docker errors fail without backoff."""
+        mock_run.return_value = Mock(
+            returncode=125, stderr="pull access denied for missing"
         )
 
+        assert self.probe._try_http_discovery("missing", 10) is None
+
+        run_cmds = [c.args[0] for c in mock_run.call_args_list if "run" in c.args[0]]
+        assert len(run_cmds) == 1
+        mock_sleep.assert_not_called()
+
+    @patch("time.sleep")
     @patch("subprocess.run")
+    def test_http_discovery_retries_transient_docker_errors(self, mock_run, mock_sleep):
+        """Test transient docker errors are retried with a fresh container."""
+        mock_run.return_value = Mock(returncode=1, stderr="daemon busy")
+
+        with pytest.raises(subprocess.CalledProcessError):
+            self.probe._try_http_discovery("busy-image", 10)
+
+        run_cmds = [c.args[0] for c in mock_run.call_args_list if "run" in c.args[0]]
+        assert len(run_cmds) == 3
+        assert len({cmd[cmd.index("--name") + 1] for cmd in run_cmds}) == 3
+        assert all(c.args[0] < 5 for c in mock_sleep.call_args_list)
+
     @patch("time.sleep")
-    def test_background_cleanup_retries(self, mock_sleep, mock_run):
-        """Test background cleanup with retries."""
-        # First two attempts fail, third succeeds
-        mock_run.side_effect = [
-            subprocess.CalledProcessError(1, "docker"),
-            subprocess.TimeoutExpired("docker", 30),
-            Mock(returncode=0),
-        ]
+    def test_stdio_discovery_retries_transient_failures(self, mock_sleep):
+        """Test a timed out stdio discovery is retried with a new container."""
+        tools = {"tools": [{"name": "echo"}]}
+        with patch.object(
+            self.probe.mcp_client,
+            "discover_tools_from_docker_sync",
+            side_effect=[asyncio.TimeoutError(), tools],
+        ) as mock_stdio:
+            result = self.probe._try_mcp_stdio_discovery("slow-image", None, None)
+
+        assert result["discovery_method"] == "docker_mcp_stdio"
+        assert mock_stdio.call_count == 2
+        mock_sleep.assert_called_once()
 
-        self.probe._background_cleanup("test-container", max_retries=3)
+    @patch("subprocess.run")
+    def test_discovery_from_image_label_skips_container(self, mock_run):
+        """Test labeled images are discovered without starting a container."""
+        tools = [{"name": "echo", "description": "Echo", "inputSchema": {}}]
+        labels = {"io.mcp.tools": json.dumps(tools)}
+        mock_run.return_value = Mock(returncode=0, stdout=json.dumps(labels))
+
+        with patch.object(self.probe, "_try_mcp_stdio_discovery") as mock_stdio:
+            result = self.probe.discover_tools_from_image("labeled-image")
 
-        assert mock_run.call_count == 3
-        # Verify exponential backoff
-        mock_sleep.assert_has_calls([call(1), call(2)])
+        assert result["discovery_method"] == "docker_image_label"
+        assert result["tools"][0]["name"] == "echo"
+        mock_stdio.assert_not_called()
+        mock_run.assert_called_once()
 
     @patch("subprocess.run")
-    @patch("time.sleep")
-    def test_background_cleanup_max_retries_exceeded(self, mock_sleep, mock_run):
-        """Test background cleanup when max retries exceeded."""
-        mock_run.side_effect = subprocess.CalledProcessError(1, "docker")
+    def test_unlabeled_image_falls_back_to_container(self, mock_run):
+        """Test images without the label are still run."""
+        mock_run.return_value = Mock(returncode=0, stdout="null")
+
+        with patch.object(
+            self.probe, "_try_mcp_stdio_discovery", return_value={"tools": []}
+        ) as mock_stdio:
+            self.probe.discover_tools_from_image("plain-image")
 
-        self.probe._background_cleanup("test-container", max_retries=2)
+        mock_stdio.assert_called_once()
+
+
+class TestDockerProbeAsync:
+    """Test async discovery on asyncio subprocesses."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.probe = DockerProbe()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_label_discoveries(self):
+        """Test many images are discovered concurrently on one loop."""
+        labels = {"io.mcp.tools": json.dumps([{"name": "echo"}])}
+        run_docker = AsyncMock(return_value=(0, json.dumps(labels), ""))
+
+        with patch("mcp_template.tools.docker_probe._run_docker", run_docker):
+            results = await asyncio.gather(
+                *(self.probe.adiscover_tools_from_image(f"image-{i}") for i in range(5))
+            )
+
+        assert [r["discovery_method"] for r in results] == ["docker_image_label"] * 5
+        assert run_docker.await_count == 5
+
+    @pytest.mark.asyncio
+    async def test_stdio_discovery_retries_transient_failures(self):
+        """Test async stdio discovery is retried before falling back to HTTP."""
+        tools = {"tools": [{"name": "echo"}]}
+        stdio = AsyncMock(
+            side_effect=[OSError("Resource temporarily unavailable"), tools]
+        )
 
-        assert mock_run.call_count == 2
-        # With max_retries=2, exponential backoff calls sleep with 1 and 2
-        mock_sleep.assert_has_calls([call(1), call(2)])
+        with (
+            patch.object(self.probe, "_atry_image_label_discovery", return_value=None),
+            patch.object(
+                self.probe.mcp_client, "discover_tools_from_docker_mcp", stdio
+            ),
+            patch.object(self.probe, "_atry_http_discovery") as http,
+            patch("asyncio.sleep", AsyncMock()),
+        ):
+            result = await self.probe.adiscover_tools_from_image("busy-image")
+
+        assert result["discovery_method"] == "docker_mcp_stdio"
+        assert stdio.await_count == 2
+        http.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_cancelled_http_discovery_removes_container(self, reaper):
+        """Test cancelling a discovery still removes its container."""
+        commands = []
+
+        async def run_docker(cmd, timeout):
+            commands.append(cmd)
+            if cmd[1] == "port":
+                return 0, "0.0.0.0:49153\n", ""
+            return 0, "abc123\n", ""
+
+        async def never_ready(*args, **kwargs):
+            await asyncio.Event().wait()
+
+        with (
+            patch("mcp_template.tools.docker_probe._run_docker", run_docker),
+            patch(
+                "mcp_template.tools.docker_probe.wait_for_container_ready", never_ready
+            ),
+        ):
+            task = asyncio.create_task(
+                self.probe._atry_http_discovery("test-image", timeout=30)
+            )
+            await asyncio.sleep(0.05)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        container_name = commands[0][commands[0].index("--name") + 1]
+        reaper.submit.assert_called_once_with(container_name)
+        await close_probe_session()
 
 
 if __name__ == "__main__":
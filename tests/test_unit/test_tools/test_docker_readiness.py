@@ -0,0 +1,167 @@
+"""
+Test container readiness detection for the Docker probe.
+"""
+
+import asyncio
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from itertools import islice
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from mcp_template.tools import docker_readiness
+from mcp_template.tools.docker_readiness import (
+    ContainerEventWatcher,
+    backoff_delays,
+    wait_for_container_ready,
+)
+
+pytestmark = pytest.mark.unit
+
+
+def _events_command(*events, delay=0.1):
+    """Command printing container events as `docker events` would."""
+    lines = [
+        json.dumps({"Action": action, "Actor": {"Attributes": {"name": name}}})
+        for name, action in events
+    ]
+    script = (
+        f"import time; time.sleep({delay}); print({chr(10).join(lines)!r}, "
+        "flush=True); time.sleep(5)"
+    )
+    return [sys.executable, "-c", script]
+
+
+class NotFoundHandler(BaseHTTPRequestHandler):
+    """Server answering every request with 404, which counts as ready."""
+
+    def do_GET(self):
+        self.send_response(404)
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def running():
+    """Report every container as running, without a health check."""
+    with patch.object(
+        docker_readiness,
+        "inspect_container_state",
+        AsyncMock(return_value={"Running": True}),
+    ) as inspect:
+        yield inspect
+
+
+def _watch(watcher):
+    return patch.object(
+        docker_readiness, "get_container_event_watcher", return_value=watcher
+    )
+
+
+class TestBackoff:
+    """Test the readiness backoff schedule."""
+
+    def test_delays_grow_with_jitter_up_to_maximum(self):
+        delays = list(islice(backoff_delays(0.02, 1.0), 10))
+
+        assert 0.01 <= delays[0] <= 0.02
+        assert 0.02 <= delays[1] <= 0.04
+        assert all(0.5 <= delay <= 1.0 for delay in delays[7:])
+
+
+class TestWaitForContainerReady:
+    """Test readiness through HTTP probes, health status and exit events."""
+
+    def test_fast_server_is_detected_quickly(self, running):
+        server = HTTPServer(("localhost", 0), NotFoundHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        watcher = Mock(subscribe=Mock(return_value=False))
+
+        try:
+            start = time.monotonic()
+            with _watch(watcher):
+                ready = asyncio.run(
+                    wait_for_container_ready("fast", server.server_port, 10)
+                )
+        finally:
+            server.shutdown()
+
+        assert ready is True
+        assert time.monotonic() - start < 1
+
+    def test_exit_event_stops_waiting(self, running):
+        watcher = ContainerEventWatcher(_events_command(("slow", "die")))
+
+        try:
+            start = time.monotonic()
+            with (
+                _watch(watcher),
+                patch.object(
+                    docker_readiness, "_server_responds", AsyncMock(return_value=False)
+                ),
+            ):
+                assert asyncio.run(wait_for_container_ready("slow", 1, 10)) is False
+        finally:
+            watcher.close()
+
+        assert time.monotonic() - start < 5
+        # A single subscription was used, no inspect per poll
+        running.assert_awaited_once()
+
+    def test_health_events_decide_readiness(self, running):
+        for action, expected in (
+            ("health_status: healthy", True),
+            ("health_status: unhealthy", False),
+        ):
+            watcher = ContainerEventWatcher(
+                _events_command(("other", "die"), ("web", action))
+            )
+            try:
+                with (
+                    _watch(watcher),
+                    patch.object(
+                        docker_readiness,
+                        "_server_responds",
+                        AsyncMock(return_value=False),
+                    ),
+                ):
+                    ready = asyncio.run(wait_for_container_ready("web", 1, 10))
+            finally:
+                watcher.close()
+            assert ready is expected
+
+    def test_healthy_container_is_ready_without_probing(self):
+        probe = AsyncMock()
+        with (
+            _watch(Mock(subscribe=Mock(return_value=False))),
+            patch.object(
+                docker_readiness,
+                "inspect_container_state",
+                AsyncMock(
+                    return_value={"Running": True, "Health": {"Status": "healthy"}}
+                ),
+            ),
+            patch.object(docker_readiness, "_server_responds", probe),
+        ):
+            assert asyncio.run(wait_for_container_ready("web", 1, 10)) is True
+
+        probe.assert_not_awaited()
+
+    def test_exit_is_polled_without_events(self):
+        inspect = AsyncMock(side_effect=[{"Running": True}, {"Running": False}])
+        with (
+            _watch(Mock(subscribe=Mock(return_value=False))),
+            patch.object(docker_readiness, "inspect_container_state", inspect),
+            patch.object(
+                docker_readiness, "_server_responds", AsyncMock(return_value=False)
+            ),
+        ):
+            assert asyncio.run(wait_for_container_ready("gone", 1, 10)) is False
+
+        assert inspect.await_count == 2
@@ -0,0 +1,180 @@
+"""
+Test the reusable Kubernetes discovery worker pool.
+"""
+
+import time
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+from kubernetes.client.rest import ApiException
+
+from mcp_template.tools.kubernetes_discovery_pool import (
+    LAST_USED_ANNOTATION,
+    DiscoveryWorkerPool,
+    worker_key,
+)
+from mcp_template.tools.kubernetes_probe import KubernetesProbe
+
+pytestmark = [pytest.mark.unit, pytest.mark.kubernetes]
+
+
+def _pod(name, phase="Running", ready=True, last_used=None, key="abc"):
+    pod = Mock()
+    pod.metadata.name = name
+    pod.metadata.labels = {"mcp-template.io/discovery-key": key}
+    pod.metadata.annotations = (
+        {LAST_USED_ANNOTATION: str(last_used)} if last_used is not None else {}
+    )
+    pod.status.phase = phase
+    pod.status.container_statuses = [Mock(ready=ready)]
+    return pod
+
+
+@pytest.fixture
+def core_v1():
+    core_v1 = Mock()
+    core_v1.list_namespaced_pod.return_value = Mock(items=[])
+    core_v1.read_namespaced_pod.side_effect = ApiException(status=404)
+    return core_v1
+
+
+class TestDiscoveryWorkerPool:
+    """Test worker reuse and garbage collection."""
+
+    def test_worker_is_started_once_and_reused(self, core_v1):
+        pool = DiscoveryWorkerPool(core_v1, "mcp")
+        name = f"mcp-discovery-{worker_key('mcp/demo:latest', None, 8000)}"
+
+        with patch("mcp_template.tools.kubernetes_discovery_pool.watch.Watch") as w:
+            w.return_value.stream.return_value = [{"object": _pod(name)}]
+            url = pool.acquire("mcp/demo:latest", 8000)
+
+        assert url == f"http://{name}.mcp.svc.cluster.local:8000"
+        core_v1.create_namespaced_pod.assert_called_once()
+        service = core_v1.create_namespaced_service.call_args.kwargs["body"]
+        assert service["spec"]["selector"] == {"app.kubernetes.io/instance": name}
+
+        core_v1.read_namespaced_pod.side_effect = None
+        core_v1.read_namespaced_pod.return_value = _pod(name)
+        assert pool.acquire("mcp/demo:latest", 8000) == url
+
+        core_v1.create_namespaced_pod.assert_called_once()
+        assert core_v1.patch_namespaced_pod.call_count == 2
+        # Garbage collection is rate limited
+        core_v1.list_namespaced_pod.assert_called_once()
+
+    def test_concurrently_created_worker_is_adopted(self, core_v1):
+        core_v1.create_namespaced_pod.side_effect = ApiException(status=409)
+        core_v1.create_namespaced_service.side_effect = ApiException(status=409)
+        pool = DiscoveryWorkerPool(core_v1, "mcp")
+
+        with patch("mcp_template.tools.kubernetes_discovery_pool.watch.Watch") as w:
+            w.return_value.stream.return_value = [{"object": _pod("worker")}]
+            assert pool.acquire("mcp/demo:latest", 8000)
+
+    def test_unready_worker_returns_none(self, core_v1):
+        pool = DiscoveryWorkerPool(core_v1, "mcp")
+
+        with patch("mcp_template.tools.kubernetes_discovery_pool.watch.Watch") as w:
+            w.return_value.stream.return_value = [{"object": _pod("w", "Failed")}]
+            assert pool.acquire("mcp/demo:latest", 8000) is None
+
+    def test_exited_worker_is_replaced(self, core_v1):
+        name = f"mcp-discovery-{worker_key('mcp/demo:latest', None, 8000)}"
+        core_v1.read_namespaced_pod.side_effect = [
+            _pod(name, "Failed"),
+            _pod(name, "Failed"),
+            ApiException(status=404),
+        ]
+        pool = DiscoveryWorkerPool(core_v1, "mcp")
+
+        with patch("mcp_template.tools.kubernetes_discovery_pool.watch.Watch") as w:
+            w.return_value.stream.side_effect = [
+                [{"type": "DELETED", "object": _pod(name, "Failed")}],
+                [{"type": "MODIFIED", "object": _pod(name)}],
+            ]
+            url = pool.acquire("mcp/demo:latest", 8000)
+
+        assert url == f"http://{name}.mcp.svc.cluster.local:8000"
+        core_v1.delete_namespaced_pod.assert_called_once_with(
+            name=name, namespace="mcp"
+        )
+        core_v1.create_namespaced_pod.assert_called_once()
+        core_v1.delete_collection_namespaced_service.assert_not_called()
+
+    def test_exited_worker_stuck_terminating_raises(self, core_v1):
+        core_v1.read_namespaced_pod.side_effect = None
+        core_v1.read_namespaced_pod.return_value = _pod("w", "Failed")
+        pool = DiscoveryWorkerPool(core_v1, "mcp")
+
+        with patch("mcp_template.tools.kubernetes_discovery_pool.watch.Watch") as w:
+            w.return_value.stream.return_value = []
+            with pytest.raises(TimeoutError):
+                pool.acquire("mcp/demo:latest", 8000, timeout=1)
+
+        core_v1.create_namespaced_pod.assert_not_called()
+
+    def test_expired_and_finished_workers_are_collected(self, core_v1):
+        now = time.time()
+        core_v1.list_namespaced_pod.return_value = Mock(
+            items=[
+                _pod("fresh", last_used=now, key="fresh"),
+                _pod("stale", last_used=now - 3600, key="stale"),
+                _pod("exited", phase="Succeeded", last_used=now, key="exited"),
+            ]
+        )
+        pool = DiscoveryWorkerPool(core_v1, "mcp", ttl=600)
+
+        assert pool.collect_garbage() == 2
+
+        selector = core_v1.list_namespaced_pod.call_args.kwargs["label_selector"]
+        assert selector == "app.kubernetes.io/component=discovery"
+        deleted = [c.kwargs["name"] for c in core_v1.delete_namespaced_pod.mock_calls]
+        assert deleted == ["stale", "exited"]
+        core_v1.delete_collection_namespaced_service.assert_any_call(
+            namespace="mcp", label_selector="mcp-template.io/discovery-key=stale"
+        )
+
+
+class TestKubernetesProbeHttpDiscovery:
+    """Test HTTP discovery through the worker pool."""
+
+    def setup_method(self):
+        with patch.object(KubernetesProbe, "_init_kubernetes_client"):
+            self.probe = KubernetesProbe(namespace="mcp")
+        self.probe.k8s_core_v1 = Mock()
+
+    def _discover(self, pool, tools):
+        connection = Mock(
+            connect_http_smart=AsyncMock(return_value=True),
+            list_tools=AsyncMock(return_value=tools),
+            disconnect=AsyncMock(),
+        )
+        with (
+            patch(
+                "mcp_template.tools.kubernetes_probe.get_discovery_pool",
+                return_value=pool,
+            ),
+            patch(
+                "mcp_template.core.mcp_connection.MCPConnection",
+                return_value=connection,
+            ),
+        ):
+            return self.probe._try_http_discovery("mcp/demo:latest", timeout=5)
+
+    def test_tools_discovered_from_worker(self):
+        pool = Mock()
+        pool.acquire.return_value = "http://worker.mcp.svc.cluster.local:8000"
+
+        result = self._discover(pool, [{"name": "echo", "description": "Echo"}])
+
+        assert result["discovery_method"] == "kubernetes_http_mcp"
+        assert result["service_url"] == pool.acquire.return_value
+        pool.discard.assert_not_called()
+
+    def test_worker_without_tools_is_discarded(self):
+        pool = Mock()
+        pool.acquire.return_value = "http://worker.mcp.svc.cluster.local:8000"
+
+        assert self._discover(pool, []) is None
+        pool.discard.assert_called_once_with("mcp/demo:latest", 8000, None)
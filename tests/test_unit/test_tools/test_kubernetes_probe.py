@@ -96,13 +96,13 @@ class TestKubernetesProbeConfiguration:
     def test_inherits_base_constants(self):
         """Test that Kubernetes probe inherits base probe constants."""
         from mcp_template.tools.kubernetes_probe import (
-            DISCOVERY_RETRIES,
-            DISCOVERY_RETRY_SLEEP,
+            DISCOVERY_RETRY_POLICY,
             DISCOVERY_TIMEOUT,
         )
 
-        assert DISCOVERY_RETRIES == 3
-        assert DISCOVERY_RETRY_SLEEP == 5
+        # Built from DISCOVERY_RETRIES and DISCOVERY_RETRY_SLEEP
+        assert DISCOVERY_RETRY_POLICY.attempts == 3
+        assert DISCOVERY_RETRY_POLICY.max_delay == 5
         assert DISCOVERY_TIMEOUT == 60
 
 
@@ -121,5 +121,49 @@ class TestMCPClientProbe:
                 mock_process.terminate.assert_called_once()
 
 
+class TestMCPClientProbeDocker:
+    """Test stdio discovery from Docker images."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.probe = MCPClientProbe()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "error", [asyncio.TimeoutError(), OSError("Resource temporarily unavailable")]
+    )
+    async def test_transient_errors_are_raised(self, error):
+        """Test failures worth retrying reach the caller's retry policy."""
+        with (
+            patch.object(self.probe, "_discover_tools_from_command", side_effect=error),
+            patch("mcp_template.tools.mcp_client_probe.get_container_reaper") as reaper,
+        ):
+            with pytest.raises(type(error)):
+                await self.probe.discover_tools_from_docker_mcp("test-image")
+
+        reaper.return_value.submit.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_missing_docker_returns_none(self):
+        """Test permanent failures are not raised."""
+        with (
+            patch(
+                "asyncio.create_subprocess_exec",
+                side_effect=FileNotFoundError("docker"),
+            ),
+            patch("mcp_template.tools.mcp_client_probe.get_container_reaper"),
+        ):
+            assert await self.probe.discover_tools_from_docker_mcp("test-image") is None
+
+    @pytest.mark.asyncio
+    async def test_silent_server_times_out(self):
+        """Test a server that never answers raises a timeout."""
+        process = Mock()
+        process.stdout.readline = Mock(side_effect=asyncio.TimeoutError())
+
+        with pytest.raises(asyncio.TimeoutError):
+            await self.probe._read_json_response(process, "initialization")
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,110 @@
+"""
+Unit tests for the background cleanup reaper.
+"""
+
+import os
+import socket
+import subprocess
+import threading
+from unittest.mock import Mock, patch
+
+import pytest
+
+from mcp_template.utils.cleanup_reaper import (
+    DISCOVERY_OWNER_LABEL,
+    Reaper,
+    discovery_label_args,
+    find_leftover_containers,
+    remove_containers,
+)
+
+pytestmark = pytest.mark.unit
+
+
+class TestReaper:
+    """Test queueing, batching and sweeping."""
+
+    def test_names_queued_during_removal_form_one_batch(self):
+        batches = []
+        release = threading.Event()
+
+        def remove(names):
+            batches.append(list(names))
+            release.wait(5)
+
+        reaper = Reaper(remove)
+        reaper.submit("a")
+        while not batches:
+            release.wait(0.01)
+        reaper.submit("b", "c")
+        reaper.submit("d", "b")
+        release.set()
+
+        assert reaper.flush(5)
+        assert batches == [["a"], ["b", "c", "d"]]
+
+    def test_submit_does_not_wait_for_removal(self):
+        release = threading.Event()
+        reaper = Reaper(lambda names: release.wait(5))
+
+        reaper.submit("slow")
+
+        assert not reaper.flush(0.05)
+        release.set()
+        assert reaper.flush(5)
+
+    def test_leftovers_are_swept_on_start(self):
+        remove = Mock()
+        reaper = Reaper(remove, sweep=lambda: ["old-1", "old-2"])
+
+        assert reaper.flush(5)
+        remove.assert_called_once_with(["old-1", "old-2"])
+
+    def test_failed_removal_does_not_stop_the_reaper(self):
+        remove = Mock(side_effect=[RuntimeError("api down"), None])
+        reaper = Reaper(remove)
+
+        reaper.submit("a")
+        assert reaper.flush(5)
+        reaper.submit("b")
+        assert reaper.flush(5)
+
+        assert remove.call_count == 2
+
+
+class TestContainerRemoval:
+    """Test batched docker removal and the leftover sweep."""
+
+    @patch("subprocess.run")
+    def test_containers_are_removed_in_one_command(self, mock_run):
+        mock_run.return_value = Mock(
+            returncode=1, stderr="Error response from daemon: No such container: b\n"
+        )
+
+        remove_containers(["a", "b", "c"])
+
+        mock_run.assert_called_once()
+        assert mock_run.call_args.args[0] == ["docker", "rm", "-f", "a", "b", "c"]
+
+    @patch("subprocess.run")
+    def test_only_containers_of_exited_processes_are_leftovers(self, mock_run):
+        host = socket.gethostname()
+        exited = subprocess.Popen(["true"])
+        exited.wait()
+        mock_run.return_value = Mock(
+            returncode=0,
+            stdout=(
+                f"mine\t{host}:{os.getpid()}\n"
+                f"orphan\t{host}:{exited.pid}\n"
+                f"remote\tother-host:{exited.pid}\n"
+            ),
+        )
+
+        assert find_leftover_containers() == ["orphan"]
+        assert f"label={DISCOVERY_OWNER_LABEL}" in mock_run.call_args.args[0]
+
+    def test_label_names_this_process(self):
+        assert discovery_label_args() == [
+            "--label",
+            f"{DISCOVERY_OWNER_LABEL}={socket.gethostname()}:{os.getpid()}",
+        ]
@@ -2,13 +2,20 @@
 Unit tests for image utility functions.
 """
 
+import json
 import os
 import unittest
 from unittest.mock import patch
 
 import pytest
 
-from mcp_template.utils.image_utils import get_default_registry, normalize_image_name
+from mcp_template.utils.image_utils import (
+    TOOLS_LABEL,
+    build_tools_label,
+    get_default_registry,
+    normalize_image_name,
+    parse_tools_label,
+)
 
 pytestmark = pytest.mark.unit
 
@@ -139,5 +146,46 @@ class TestImageUtils(unittest.TestCase):
         self.assertEqual(result, "custom.registry.com/nginx")
 
 
+class TestToolsLabel(unittest.TestCase):
+    """Test the tools image label."""
+
+    def test_template_tools_roundtrip_as_mcp_tools(self):
+        """Test template parameters become an input schema in the label."""
+        label = build_tools_label(
+            [
+                {
+                    "name": "say_hello",
+                    "description": "Greet",
+                    "parameters": [
+                        {"name": "name", "type": "string", "required": True}
+                    ],
+                }
+            ]
+        )
+
+        tools = parse_tools_label({TOOLS_LABEL: label})
+
+        self.assertEqual(tools[0]["name"], "say_hello")
+        self.assertEqual(
+            tools[0]["inputSchema"],
+            {
+                "type": "object",
+                "properties": {"name": {"type": "string", "description": ""}},
+                "required": ["name"],
+            },
+        )
+
+    def test_parse_tools_label(self):
+        """Test missing, wrapped and malformed labels."""
+        tools = [{"name": "echo"}]
+
+        self.assertIsNone(parse_tools_label(None))
+        self.assertIsNone(parse_tools_label({"other": "x"}))
+        self.assertIsNone(parse_tools_label({TOOLS_LABEL: "not json"}))
+        self.assertEqual(
+            parse_tools_label({TOOLS_LABEL: json.dumps({"tools": tools})}), tools
+        )
+
+
 if __name__ == "__main__":
     unittest.main()